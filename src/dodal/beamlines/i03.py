@@ -65,6 +65,7 @@ from dodal.devices.zebra.zebra_constants_mapping import (
 from dodal.devices.zebra.zebra_controlled_shutter import MXZebraShutter
 from dodal.devices.zocalo import ZocaloResults, ZocaloSource
 from dodal.log import set_beamline as set_log_beamline
+from dodal.plan_stubs.check_topup import TopupGate
 from dodal.utils import BeamlinePrefix, get_beamline_name
 
 ZOOM_PARAMS_FILE = (
@@ -117,7 +118,10 @@ def daq_configuration_path() -> str:
 
 @devices.factory()
 def aperture_scatterguard(config_client: ConfigClient) -> ApertureScatterguard:
-    params = config_client.get_file_contents(BEAMLINE_PARAMETERS_PATH, dict)
+    # Always fetched fresh as the positions are used to avoid collisions
+    params = config_client.get_file_contents(
+        BEAMLINE_PARAMETERS_PATH, dict, reset_cached_result=True
+    )
     return ApertureScatterguard(
         aperture_prefix=f"{PREFIX.beamline_prefix}-MO-MAPT-01:",
         scatterguard_prefix=f"{PREFIX.beamline_prefix}-MO-SCAT-01:",
@@ -247,6 +251,11 @@ def synchrotron() -> Synchrotron:
     return Synchrotron()
 
 
+@devices.factory()
+def topup_gate(synchrotron: Synchrotron) -> TopupGate:
+    return TopupGate(synchrotron)
+
+
 @devices.factory()
 def undulator(
     baton: Baton, daq_configuration_path: str, config_client: ConfigClient
@@ -164,7 +164,10 @@ def backlight() -> Backlight:
 
 @devices.factory()
 def aperture_scatterguard(config_client: ConfigClient) -> ApertureScatterguard:
-    params = config_client.get_file_contents(BEAMLINE_PARAMETERS_PATH, dict)
+    # Always fetched fresh as the positions are used to avoid collisions
+    params = config_client.get_file_contents(
+        BEAMLINE_PARAMETERS_PATH, dict, reset_cached_result=True
+    )
     return ApertureScatterguard(
         aperture_prefix=f"{PREFIX.beamline_prefix}-MO-MAPT-01:",
         scatterguard_prefix=f"{PREFIX.beamline_prefix}-MO-SCAT-01:",
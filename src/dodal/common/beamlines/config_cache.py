@@ -0,0 +1,234 @@
+"""Process-wide cache of files fetched from the daq-config-server.
+
+Devices that read the same files (eg beamline parameters or lookup tables) share one
+cache per ConfigClient, see get_config_cache. Cached files are served immediately
+until they are older than the cache's TTL, after which they are fetched again before
+being served. The old contents are only served if fetching them again fails, so
+devices built after a file is changed see the change. Fetches can be started early
+with prefetch so that devices built together fetch their files in parallel, and
+callbacks can be subscribed to be told when a file's contents change.
+"""
+
+import asyncio
+import copy
+import threading
+import time
+import weakref
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar
+
+from daq_config_server.client import ConfigClient
+
+from dodal.log import LOGGER
+
+T = TypeVar("T")
+
+DEFAULT_TTL_S = 10.0
+"""How long a file is used before it is fetched again from the config server."""
+
+_ConfigKey = tuple[str, type]
+_Subscriber = tuple[Callable[[Any], None], asyncio.AbstractEventLoop | None]
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="config_cache"
+            )
+        return _executor
+
+
+def _copy_if_mutable(value: T) -> T:
+    # Callers are free to modify the dicts and lists they are given, as they were
+    # when each call fetched its own copy
+    if isinstance(value, dict | list):
+        return copy.deepcopy(value)
+    return value
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fetched_at: float
+
+
+class ConfigCache:
+    """Cache of files fetched with a ConfigClient.
+
+    Dicts and lists are copied before being returned, other values (eg pydantic
+    models of lookup tables) are shared between callers and should not be modified.
+
+    Args:
+        config_client (ConfigClient): The client used to fetch files.
+        ttl_s (float): How long a file is used before it is fetched again.
+    """
+
+    def __init__(self, config_client: ConfigClient, ttl_s: float = DEFAULT_TTL_S):
+        # Weak so that the cache does not keep its client alive in get_config_cache
+        self._client_ref = weakref.ref(config_client)
+        self.ttl_s = ttl_s
+        self._entries: dict[_ConfigKey, _Entry] = {}
+        self._in_flight: dict[_ConfigKey, Future] = {}
+        self._subscribers: dict[_ConfigKey, list[_Subscriber]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    @property
+    def config_client(self) -> ConfigClient:
+        client = self._client_ref()
+        if client is None:
+            raise ReferenceError("The ConfigClient for this cache no longer exists")
+        return client
+
+    def get(self, file_path: str | Path, desired_return_type: type[T] = str) -> T:
+        """Get the contents of a file, only waiting for the config server if the file
+        has not been fetched in the last ttl_s seconds.
+        """
+        result = self._lookup((str(file_path), desired_return_type))
+        if isinstance(result, _Entry):
+            return _copy_if_mutable(result.value)
+        return _copy_if_mutable(result.result())
+
+    async def get_async(
+        self, file_path: str | Path, desired_return_type: type[T] = str
+    ) -> T:
+        """Get the contents of a file without blocking the event loop."""
+        result = self._lookup((str(file_path), desired_return_type))
+        if isinstance(result, _Entry):
+            return _copy_if_mutable(result.value)
+        return _copy_if_mutable(await asyncio.wrap_future(result))
+
+    def prefetch(self, file_path: str | Path, desired_return_type: type = str):
+        """Start fetching a file in the background if it is not cached or is older
+        than ttl_s.
+        """
+        self._lookup((str(file_path), desired_return_type))
+
+    def subscribe(
+        self,
+        file_path: str | Path,
+        desired_return_type: type[T],
+        callback: Callable[[T], None],
+    ) -> Callable[[], None]:
+        """Call callback with the new contents of a file whenever it is found to have
+        changed. If subscribed from within an event loop the callback is run in that
+        loop, otherwise it is run in the thread that fetched the file.
+
+        Returns:
+            A function that removes the subscription.
+        """
+        key = (str(file_path), desired_return_type)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        subscriber = (callback, loop)
+        with self._lock:
+            self._subscribers[key].append(subscriber)
+
+        def unsubscribe():
+            with self._lock:
+                if subscriber in self._subscribers[key]:
+                    self._subscribers[key].remove(subscriber)
+
+        return unsubscribe
+
+    def clear(self):
+        """Forget all cached files, they will be fetched again when next used."""
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key: _ConfigKey) -> _Entry | Future:
+        """Get the cached entry for a file if it is younger than ttl_s, otherwise the
+        future of fetching it again. If a file that was fetched before fails to be
+        fetched again, the future gives the old contents.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return self._start_fetch(key)
+            if time.monotonic() - entry.fetched_at > self.ttl_s:
+                return _or_on_failure(self._start_fetch(key), entry)
+            return entry
+
+    def _start_fetch(self, key: _ConfigKey) -> Future:
+        # Must be called with the lock held
+        if (future := self._in_flight.get(key)) is None:
+            future = _get_executor().submit(self._fetch, key)
+            self._in_flight[key] = future
+        return future
+
+    def _fetch(self, key: _ConfigKey) -> Any:
+        file_path, desired_return_type = key
+        try:
+            # The client has its own cache, which must be skipped to see changes
+            value = self.config_client.get_file_contents(
+                file_path, desired_return_type, reset_cached_result=True
+            )
+        except Exception as e:
+            LOGGER.warning(f"Failed to fetch {file_path} from the config server: {e}")
+            with self._lock:
+                del self._in_flight[key]
+            raise
+        with self._lock:
+            previous = self._entries.get(key)
+            self._entries[key] = _Entry(value, time.monotonic())
+            del self._in_flight[key]
+            subscribers = list(self._subscribers[key])
+        if previous is not None and previous.value != value:
+            LOGGER.info(f"{file_path} has changed on the config server")
+            for callback, loop in subscribers:
+                self._notify(callback, loop, value)
+        return value
+
+    @staticmethod
+    def _notify(
+        callback: Callable[[Any], None],
+        loop: asyncio.AbstractEventLoop | None,
+        value: Any,
+    ):
+        value = _copy_if_mutable(value)
+        if loop is None or loop.is_closed():
+            try:
+                callback(value)
+            except Exception as e:
+                LOGGER.error(f"Config change callback {callback} failed: {e}")
+        else:
+            loop.call_soon_threadsafe(callback, value)
+
+
+def _or_on_failure(fetch: Future, previous: _Entry) -> Future:
+    result = Future()
+
+    def set_result(fetch: Future):
+        if fetch.exception() is None:
+            result.set_result(fetch.result())
+        else:
+            age_s = time.monotonic() - previous.fetched_at
+            LOGGER.warning(f"Using contents fetched {age_s:.0f}s ago instead")
+            result.set_result(previous.value)
+
+    fetch.add_done_callback(set_result)
+    return result
+
+
+_caches: "weakref.WeakKeyDictionary[ConfigClient, ConfigCache]" = (
+    weakref.WeakKeyDictionary()
+)
+_caches_lock = threading.Lock()
+
+
+def get_config_cache(config_client: ConfigClient) -> ConfigCache:
+    """Get the cache shared by everything in this process that uses config_client."""
+    with _caches_lock:
+        if (cache := _caches.get(config_client)) is None:
+            cache = _caches[config_client] = ConfigCache(config_client)
+        return cache
@@ -0,0 +1,162 @@
+"""On-disk cache of the dependency graph of a DeviceManager.
+
+Resolving which devices need to be built, and in which order, requires inspecting
+the signature of every factory. The result only changes when the source of the
+modules defining the factories changes, so it can be saved to disk and reused by
+later processes (eg a restarted BlueAPI worker or repeated ``dodal connect`` calls).
+"""
+
+import hashlib
+import json
+import os
+import sys
+from collections.abc import Iterable
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, ValidationError
+
+from dodal.log import LOGGER
+
+if TYPE_CHECKING:
+    from dodal.device_manager import DeviceFactory, DeviceManager, V1DeviceFactory
+
+DODAL_DEVICE_GRAPH_CACHE = "DODAL_DEVICE_GRAPH_CACHE"
+"""Environment variable giving the directory used to cache device graphs."""
+
+
+class DeviceGraph(BaseModel):
+    """The resolved dependency graph of all factories in a device manager."""
+
+    modules: list[str]
+    source_hash: str
+    dependencies: dict[str, list[str]]
+    optional_dependencies: dict[str, list[str]]
+    build_levels: dict[str, list[list[str]]] = {}
+    """Build levels for previously requested sets of devices, see build_key."""
+
+
+class DeviceGraphCache:
+    """Directory of device graphs, one file per set of beamline modules.
+
+    A cached graph is only used if the source of every module that defines a
+    factory in the device manager is unchanged since the graph was saved.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._graphs: dict[str, DeviceGraph] = {}
+        self._file_hashes: dict[Path, tuple[tuple[int, int], str]] = {}
+
+    @classmethod
+    def from_environment(cls) -> "DeviceGraphCache | None":
+        """Create a cache in the directory given by DODAL_DEVICE_GRAPH_CACHE if set."""
+        if directory := os.environ.get(DODAL_DEVICE_GRAPH_CACHE):
+            return cls(Path(directory))
+        return None
+
+    def load(self, manager: "DeviceManager") -> DeviceGraph | None:
+        """Get the cached graph for a manager if it is still valid.
+
+        Dependencies of every factory are restored from the graph so that their
+        signatures do not need to be inspected.
+        """
+        factories = manager.get_all_factories()
+        modules = _factory_modules(factories.values())
+        source_hash = self._source_hash(modules)
+        graph = self._graphs.get(source_hash) or self._read(modules)
+        if (
+            graph is None
+            or graph.source_hash != source_hash
+            or graph.dependencies.keys() != factories.keys()
+        ):
+            return None
+        for name, factory in factories.items():
+            factory.dependencies = set(graph.dependencies[name])
+            factory.optional_dependencies = set(graph.optional_dependencies[name])
+        self._graphs[source_hash] = graph
+        return graph
+
+    def save(
+        self,
+        manager: "DeviceManager",
+        key: str,
+        levels: list[list[str]],
+        graph: DeviceGraph | None = None,
+    ):
+        """Add the build levels for a set of devices to the cached graph."""
+        if graph is None:
+            factories = manager.get_all_factories()
+            modules = _factory_modules(factories.values())
+            graph = DeviceGraph(
+                modules=modules,
+                source_hash=self._source_hash(modules),
+                dependencies={
+                    name: sorted(f.dependencies) for name, f in factories.items()
+                },
+                optional_dependencies={
+                    name: sorted(f.optional_dependencies)
+                    for name, f in factories.items()
+                },
+            )
+            self._graphs[graph.source_hash] = graph
+        graph.build_levels[key] = levels
+        try:
+            self._write(graph)
+        except OSError as e:
+            LOGGER.warning(f"Unable to save device graph to {self.directory}: {e}")
+
+    def _source_hash(self, modules: Iterable[str]) -> str:
+        digest = hashlib.sha256()
+        for module_name in modules:
+            digest.update(module_name.encode())
+            module = sys.modules.get(module_name)
+            if source := getattr(module, "__file__", None):
+                digest.update(self._file_hash(Path(source)).encode())
+        return digest.hexdigest()
+
+    def _file_hash(self, path: Path) -> str:
+        # Only rehash files whose size or modification time has changed
+        stat = path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        if (cached := self._file_hashes.get(path)) and cached[0] == version:
+            return cached[1]
+        file_hash = hashlib.sha256(path.read_bytes()).hexdigest()
+        self._file_hashes[path] = (version, file_hash)
+        return file_hash
+
+    def _path(self, modules: list[str]) -> Path:
+        name = hashlib.sha256(",".join(modules).encode()).hexdigest()[:16]
+        return self.directory / f"{name}.json"
+
+    def _read(self, modules: list[str]) -> DeviceGraph | None:
+        try:
+            return DeviceGraph.model_validate_json(self._path(modules).read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValidationError) as e:
+            LOGGER.warning(f"Ignoring unreadable device graph cache: {e}")
+            return None
+
+    def _write(self, graph: DeviceGraph):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so that concurrent readers never see a
+        # partially written graph
+        with NamedTemporaryFile(
+            "w", dir=self.directory, suffix=".tmp", delete=False
+        ) as tmp:
+            tmp.write(graph.model_dump_json())
+        os.replace(tmp.name, self._path(graph.modules))
+
+
+def build_key(factories: Iterable[str], fixtures: Iterable[str]) -> str:
+    """Key identifying a request to build a set of devices with a set of fixtures."""
+    return json.dumps([sorted(factories), sorted(fixtures)])
+
+
+def _factory_modules(
+    factories: Iterable["DeviceFactory | V1DeviceFactory"],
+) -> list[str]:
+    # Factories copy the module of the function they wrap
+    return sorted({f.__module__ for f in factories})
@@ -1,5 +1,8 @@
+from collections.abc import Sequence
 from typing import Protocol, runtime_checkable
 
+import numpy as np
+from numpy.typing import ArrayLike
 from pydantic import BaseModel, ConfigDict, StrictFloat, validate_call
 
 from dodal.common.general_maths.absorber_geometry import (
@@ -9,6 +12,7 @@ from dodal.common.general_maths.absorber_geometry import (
 from dodal.common.general_maths.material_absorption_maths import (
     MaterialAbsorptionSpectrum,
     attenuation_from_natural_log_of_transmission,
+    attenuations_at_depths_cm,
 )
 
 
@@ -83,6 +87,15 @@ class Absorber(BaseModel):
         _ln_t = -(thickness_cm * _alpha)
         return attenuation_from_natural_log_of_transmission(_ln_t)
 
+    def _attenuations_bn(
+        self, *, xray_energies_kev: ArrayLike, thickness_cm: float
+    ) -> np.ndarray:
+        """Array version of _attenuation_bn, for many x-ray energies at once."""
+        _alphas = self.spectrum.absorption_coefficients_per_cm(
+            energies_kev=xray_energies_kev
+        )
+        return attenuations_at_depths_cm(thickness_cm, _alphas)
+
 
 class FoilAbsorber(Absorber):
     """System level representation of an foil absorbing filter, typically wheel mounted.
@@ -104,6 +117,13 @@ class FoilAbsorber(Absorber):
             xray_energy_kev=xray_energy_kev, thickness_cm=_thickness_cm
         )
 
+    def calculate_absorptions_bn(self, *, xray_energies_kev: ArrayLike) -> np.ndarray:
+        """Absorption (Bn) at each of an array of x-ray energies (keV)."""
+        return self._attenuations_bn(
+            xray_energies_kev=xray_energies_kev,
+            thickness_cm=self.geometry_model.get_thickness_cm(),
+        )
+
 
 class WedgeAbsorber(Absorber):
     """System level representation of an foil absorbing filter, typically wheel mounted.
@@ -131,3 +151,69 @@ class WedgeAbsorber(Absorber):
         return self._attenuation_bn(
             xray_energy_kev=xray_energy_kev, thickness_cm=_thickness_cm
         )
+
+    def calculate_absorptions_bn(
+        self,
+        *,
+        xray_energies_kev: ArrayLike,
+        motor_position_mm: float,
+    ) -> np.ndarray:
+        """Absorption (Bn) at each of an array of x-ray energies (keV), with the
+        wedge at one motor position.
+        """
+        _thickness_cm = self.geometry_model.thickness_cm_at_motor_position_mm(
+            motor_position_mm=motor_position_mm
+        )
+        return self._attenuations_bn(
+            xray_energies_kev=xray_energies_kev, thickness_cm=_thickness_cm
+        )
+
+
+def all_absorber_states(number_of_absorbers: int) -> np.ndarray:
+    """Every combination of absorbers in and out of the beam.
+
+    Returns:
+        (np.ndarray): Boolean array of shape (2**number_of_absorbers,
+            number_of_absorbers), where row n has absorber i in the beam if bit i of
+            n is set.
+    """
+    states = np.arange(2**number_of_absorbers)[:, np.newaxis]
+    return (states >> np.arange(number_of_absorbers)) & 1 == 1
+
+
+def absorber_stack_absorptions_bn(
+    absorbers: Sequence[FoilAbsorber],
+    xray_energies_kev: ArrayLike,
+    states: ArrayLike | None = None,
+) -> np.ndarray:
+    """Absorption (Bn) of a stack of foil absorbers, for each combination of absorbers
+    in the beam at each x-ray energy.
+
+    As absorption in Barnett units adds up through the stack, the absorption of each
+    absorber is calculated once per energy and the combinations are a single matrix
+    product, so all 2**16 states of a 16 filter attenuator can be evaluated at once.
+
+    Args:
+        absorbers (Sequence[FoilAbsorber]): The absorbers in the stack.
+        xray_energies_kev (ArrayLike): 1D array of x-ray energies (keV).
+        states (ArrayLike, optional): Boolean array of shape (number of states,
+            number of absorbers) of which absorbers are in the beam. Defaults to
+            all_absorber_states.
+
+    Returns:
+        (np.ndarray): Absorption of shape (number of states, number of energies).
+    """
+    energies = np.atleast_1d(np.asarray(xray_energies_kev, dtype=float))
+    in_beam = np.asarray(
+        all_absorber_states(len(absorbers)) if states is None else states, dtype=bool
+    )
+    if in_beam.ndim != 2 or in_beam.shape[1] != len(absorbers):
+        _msg = f"Expected states of shape (n, {len(absorbers)}), got {in_beam.shape}"
+        raise ValueError(_msg)
+    absorptions = np.array(
+        [
+            absorber.calculate_absorptions_bn(xray_energies_kev=energies)
+            for absorber in absorbers
+        ]
+    ).reshape(len(absorbers), len(energies))
+    return in_beam @ absorptions
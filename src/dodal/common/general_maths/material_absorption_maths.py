@@ -1,7 +1,10 @@
 from collections.abc import Callable
+from functools import cached_property
 from typing import Annotated, Final, Protocol, runtime_checkable
 
+import numpy as np
 from numpy.polynomial import polynomial
+from numpy.typing import ArrayLike
 from pydantic import (
     BaseModel,
     ConfigDict,
@@ -13,6 +16,7 @@ from pydantic import (
 from dodal.common.general_maths.interval import ClosedInterval
 from dodal.common.general_maths.transmission_interconversion import (
     attenuation_from_natural_log_of_transmission,
+    attenuations_from_natural_log_of_transmission,
     natural_log_of_transmission_from_attenuation,
 )
 
@@ -47,10 +51,59 @@ class AbsorptionCalculator(Protocol):
         ...
 
 
-class BaseAbsorptionCalculator(AbsorptionCalculator):
-    def __init__(self, _calculation: Callable[[float], float]):
+@runtime_checkable
+class BatchAbsorptionCalculator(Protocol):
+    """Interface for calculating absorption per cm at many x-ray energies at once."""
+
+    def absorption_coefficients_per_cm(self, *, energies_kev: ArrayLike) -> np.ndarray:
+        """Logarithmic contribution to x-ray absorption per cm at each photon energy.
+
+        Args:
+            energies_kev (ArrayLike): Positive photon energies in kilo-electronvolts.
+
+        Returns:
+            (np.ndarray): Absorption per cm, with the same shape as energies_kev.
+        """
+        ...
+
+
+def _validated_energies_kev(energies_kev: ArrayLike) -> np.ndarray:
+    energies = np.asarray(energies_kev, dtype=float)
+    if not np.all(energies > 0):
+        _msg = f"X-ray energies must be positive, got {energies[~(energies > 0)]}"
+        raise ValueError(_msg)
+    return energies
+
+
+def absorption_coefficients_per_cm(
+    calculator: AbsorptionCalculator, energies_kev: ArrayLike
+) -> np.ndarray:
+    """Absorption per cm of any calculator at each of an array of energies in keV.
+
+    Calculators that are not BatchAbsorptionCalculators are called once per energy.
+    """
+    if isinstance(calculator, BatchAbsorptionCalculator):
+        return calculator.absorption_coefficients_per_cm(energies_kev=energies_kev)
+    energies = _validated_energies_kev(energies_kev)
+    return np.array(
+        [
+            calculator.absorption_coefficient_per_cm(energy_kev=float(energy))
+            for energy in energies.flat
+        ]
+    ).reshape(energies.shape)
+
+
+class BaseAbsorptionCalculator(AbsorptionCalculator, BatchAbsorptionCalculator):
+    def __init__(
+        self,
+        _calculation: Callable[[float], float],
+        _batch_calculation: Callable[[np.ndarray], np.ndarray] | None = None,
+    ):
         # store the calculator functionality in the base class
         self._calculate: Final[Callable[[float], float]] = _calculation
+        self._calculate_batch: Final = _batch_calculation or np.vectorize(
+            _calculation, otypes=[float]
+        )
 
     @validate_call
     def absorption_coefficient_per_cm(
@@ -58,6 +111,9 @@ class BaseAbsorptionCalculator(AbsorptionCalculator):
     ) -> float:
         return self._calculate(energy_kev)
 
+    def absorption_coefficients_per_cm(self, *, energies_kev: ArrayLike) -> np.ndarray:
+        return self._calculate_batch(_validated_energies_kev(energies_kev))
+
 
 class CompoundAbsorptionCalculator(BaseAbsorptionCalculator):
     """Advanced physics model for mass attenuation per cm as a function of x-ray energy in keV.
@@ -73,7 +129,11 @@ class CompoundAbsorptionCalculator(BaseAbsorptionCalculator):
             # lambda k is energy in keV
             lambda k: sum(
                 c.absorption_coefficient_per_cm(energy_kev=k) for c in contributions
-            )
+            ),
+            lambda k: sum(
+                (absorption_coefficients_per_cm(c, k) for c in contributions),
+                np.zeros_like(k),
+            ),
         )
 
 
@@ -91,7 +151,10 @@ class PolynomialAbsorptionCorrection(BaseAbsorptionCalculator):
             correction = polynomial.polyval(energy_kev, coefficients_per_cm)
             return float(correction)  # numpy did not specify float as the return type
 
-        super().__init__(_calculate_correction)
+        super().__init__(
+            _calculate_correction,
+            lambda k: polynomial.polyval(k, coefficients_per_cm),
+        )
 
 
 class SingleRollOffAbsorptionCalculator(BaseAbsorptionCalculator):
@@ -106,6 +169,7 @@ class SingleRollOffAbsorptionCalculator(BaseAbsorptionCalculator):
         roll_off: negative exponent of energy dependence above the resonant edge.
     """
 
+    @validate_call
     def __init__(
         self,
         *,
@@ -118,7 +182,8 @@ class SingleRollOffAbsorptionCalculator(BaseAbsorptionCalculator):
                 energy_kev=k,
                 photon_absorption_factor_per_unit_length=material_factor_per_cm,
                 energy_dependence_exponent=roll_off,
-            )
+            ),
+            lambda k: material_factor_per_cm * k**roll_off,
         )
 
 
@@ -203,6 +268,72 @@ class MaterialAbsorptionSpectrum(BaseModel):
         _msg = f"Absorption of x-ray energy at {energy_kev} keV is outside the valid interval of any calculator in this modelled spectrum."
         raise ValueError(_msg)
 
+    @cached_property
+    def _edges(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Lower and upper endpoints of the intervals, and whether each is included."""
+        intervals = [segment.kev_energy_interval for segment in self.intervals]
+        return (
+            np.array([interval.lower for interval in intervals]),
+            np.array([interval.upper for interval in intervals]),
+            np.array([interval.lower in interval for interval in intervals]),
+            np.array([interval.upper in interval for interval in intervals]),
+        )
+
+    @cached_property
+    def _intervals_are_ordered(self) -> bool:
+        lowers, uppers, _, _ = self._edges
+        return bool(np.all(uppers[:-1] <= lowers[1:]))
+
+    def _in_interval(self, index: np.ndarray, energies_kev: np.ndarray) -> np.ndarray:
+        lowers, uppers, lower_included, upper_included = self._edges
+        lower, upper = lowers[index], uppers[index]
+        return (
+            (energies_kev > lower) | ((energies_kev == lower) & lower_included[index])
+        ) & ((energies_kev < upper) | ((energies_kev == upper) & upper_included[index]))
+
+    def _interval_indices(self, energies_kev: np.ndarray) -> np.ndarray:
+        """Index of the first interval holding each energy, or -1 if there is none."""
+        last = len(self.intervals) - 1
+        if not self._intervals_are_ordered:
+            indices = np.full(energies_kev.shape, -1)
+            for i in range(last, -1, -1):
+                indices[self._in_interval(np.full_like(indices, i), energies_kev)] = i
+            return indices
+        _, uppers, _, _ = self._edges
+        # The first interval that ends at or above each energy. An energy on an
+        # excluded upper endpoint can only be in the interval after.
+        indices = np.minimum(np.searchsorted(uppers, energies_kev), last)
+        on_excluded_upper = ~self._in_interval(indices, energies_kev)
+        indices[on_excluded_upper] = np.minimum(indices[on_excluded_upper] + 1, last)
+        indices[~self._in_interval(indices, energies_kev)] = -1
+        return indices
+
+    def absorption_coefficients_per_cm(self, *, energies_kev: ArrayLike) -> np.ndarray:
+        """Absorption per cm at each of an array of photon energies in keV.
+
+        Energies are validated once for the whole array and the interval of each is
+        found with a binary search, rather than searching the intervals in turn for
+        every energy.
+
+        Raises:
+            ValueError: If any energy is not positive or is outside every interval.
+
+        Returns:
+            (np.ndarray): Absorption per cm, with the same shape as energies_kev.
+        """
+        energies = _validated_energies_kev(energies_kev)
+        indices = self._interval_indices(energies)
+        if np.any(outside := indices < 0):
+            _msg = f"Absorption of x-ray energies at {energies[outside]} keV are outside the valid interval of any calculator in this modelled spectrum."
+            raise ValueError(_msg)
+        coefficients = np.empty(energies.shape)
+        for i, segment in enumerate(self.intervals):
+            if np.any(in_segment := indices == i):
+                coefficients[in_segment] = absorption_coefficients_per_cm(
+                    segment.absorption_calculator, energies[in_segment]
+                )
+        return coefficients
+
 
 @validate_call
 def photon_mass_attenuation_per_unit_length(
@@ -252,6 +383,26 @@ def attenuation_at_depth_cm(
     return attenuation_from_natural_log_of_transmission(ln_t)
 
 
+def attenuations_at_depths_cm(
+    depths_cm: ArrayLike, absorption_coefficients_per_cm: ArrayLike
+) -> np.ndarray:
+    """Attenuation in Barnett units for arrays of depths and absorption coefficients,
+    which are broadcast together.
+
+    Raises:
+        ValueError: If any depth is negative or any absorption coefficient is not
+            positive.
+    """
+    depths = np.asarray(depths_cm, dtype=float)
+    coefficients = np.asarray(absorption_coefficients_per_cm, dtype=float)
+    if not np.all(depths >= 0):
+        raise ValueError(f"Absorber depths must not be negative, got {depths}")
+    if not np.all(coefficients > 0):
+        _msg = f"Absorption coefficients must be positive, got {coefficients}"
+        raise ValueError(_msg)
+    return attenuations_from_natural_log_of_transmission(-(depths * coefficients))
+
+
 @validate_call
 def thickness_cm_required_to_attenuate(
     target_attenuation_bn: Annotated[StrictFloat, Field(ge=0)],
@@ -1,6 +1,8 @@
 import math
 from typing import Annotated
 
+import numpy as np
+from numpy.typing import ArrayLike
 from pydantic import Field, StrictFloat, validate_call
 
 CANONICAL_NON_ABSORPTION = 0  # Absorption (Bn) when absorber is absent
@@ -67,3 +69,22 @@ def transmission_from_attenutation(
     """
     ln_t = natural_log_of_transmission_from_attenuation(attenuation_bn)
     return math.exp(ln_t)
+
+
+def attenuations_from_natural_log_of_transmission(ln_t: ArrayLike) -> np.ndarray:
+    """Converts an array of natural logs of transmission fractions into Barnett
+    attenuation units.
+    """
+    return _CANONICAL_BARNETT_CONVERSION * np.asarray(ln_t, dtype=float)
+
+
+def transmissions_from_attenuations(attenuations_bn: ArrayLike) -> np.ndarray:
+    """Converts an array of Barnett attenuation units into transmission fractions.
+
+    Raises:
+        ValueError: If any attenuation is negative.
+    """
+    attenuations = np.asarray(attenuations_bn, dtype=float)
+    if not np.all(attenuations >= 0):
+        raise ValueError(f"Attenuations must not be negative, got {attenuations}")
+    return np.exp(_REVERSE_BARNETT_CONVERSION * attenuations)
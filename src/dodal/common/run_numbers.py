@@ -0,0 +1,87 @@
+"""Allocation of unique run numbers for the nexus files of a data directory.
+
+dodal.utils.get_run_number finds the next run number by listing the whole directory,
+which is slow for visit directories with tens of thousands of files and does not stop
+two processes from choosing the same number. RunNumberAllocator instead keeps the last
+allocated number in a counter file that is locked while each number is allocated.
+"""
+
+import fcntl
+import os
+import re
+from pathlib import Path
+
+from dodal.log import LOGGER
+
+COUNTER_FILE_SUFFIX = ".run_number"
+
+
+class RunNumberAllocator:
+    """Allocates run numbers for nexus files named "{prefix}_{run number}.nxs".
+
+    The last allocated number is stored in a hidden counter file in the directory,
+    which is locked while a number is allocated so that processes sharing the
+    directory are never given the same number. The directory is only listed when the
+    counter file is first created. After that, files written by anything not using
+    the allocator are found by checking whether the file for each candidate number
+    exists, so allocating does not depend on the number of files in the directory.
+    Only files named exactly "{prefix}_{run number}.nxs" are counted, including when
+    the directory is listed, so with an empty prefix that is "_{run number}.nxs".
+
+    Numbers are allocated as they are asked for, so a number that is allocated but
+    never written to is skipped rather than reused.
+
+    Args:
+        directory (str | Path): The directory the nexus files are written to.
+        prefix (str): The prefix of the nexus file names.
+    """
+
+    def __init__(self, directory: str | Path, prefix: str = ""):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.counter_file = self.directory / f".{prefix}{COUNTER_FILE_SUFFIX}"
+
+    def _nexus_file_exists(self, run_number: int) -> bool:
+        return (self.directory / f"{self.prefix}_{run_number}.nxs").exists()
+
+    def _first_run_number(self) -> int:
+        nexus_file = re.compile(rf"{re.escape(self.prefix)}_(\d+)\.nxs")
+        run_numbers = [
+            int(match[1])
+            for file_name in os.listdir(self.directory)
+            if (match := nexus_file.fullmatch(file_name))
+        ]
+        return max(run_numbers, default=0) + 1
+
+    def _next_run_number(self, counter_contents: str) -> int:
+        try:
+            return int(counter_contents) + 1
+        except ValueError:
+            if counter_contents:
+                LOGGER.warning(
+                    f"Ignoring invalid run number {counter_contents!r} in "
+                    f"{self.counter_file}"
+                )
+            return self._first_run_number()
+
+    def allocate(self) -> int:
+        """Allocate the next run number, which will not be given out again."""
+        try:
+            fd = os.open(self.counter_file, os.O_RDWR | os.O_CREAT, 0o664)
+        except OSError as e:
+            LOGGER.warning(
+                f"Cannot use run number counter {self.counter_file}, falling back to "
+                f"searching {self.directory}: {e}"
+            )
+            return self._first_run_number()
+        # The lock is released when the file is closed
+        with os.fdopen(fd, "r+") as counter:
+            fcntl.flock(counter, fcntl.LOCK_EX)
+            run_number = self._next_run_number(counter.read().strip())
+            while self._nexus_file_exists(run_number):
+                run_number += 1
+            counter.seek(0)
+            counter.truncate()
+            counter.write(str(run_number))
+            counter.flush()
+        return run_number
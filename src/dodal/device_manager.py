@@ -1,11 +1,13 @@
 import asyncio
 import inspect
+import time
 import typing
 from collections import UserDict
 from collections.abc import Callable, Iterable, Mapping, MutableMapping
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from functools import cached_property, wraps
 from inspect import Parameter, cleandoc
-from types import NoneType
+from types import MappingProxyType, NoneType
 from typing import (
     Annotated,
     Any,
@@ -21,6 +23,7 @@ from bluesky.run_engine import get_bluesky_event_loop
 from ophyd.sim import make_fake_device
 
 from dodal.common.beamlines.beamline_utils import wait_for_connection
+from dodal.common.beamlines.device_graph_cache import DeviceGraphCache, build_key
 from dodal.utils import (
     AnyDevice,
     OphydV1Device,
@@ -66,12 +69,41 @@ class LazyFixtures(UserDict[str, Any]):
         return self.data[key]
 
 
+class _FactoryDoc:
+    """Docstring of a factory wrapper, combining the docstring of the wrapped
+    function with that of the device it returns.
+
+    The combined docstring is only needed for help and documentation, so it is not
+    built until it is first read rather than for every factory when a beamline module
+    is imported.
+    """
+
+    def __init__(self, class_doc: str | None):
+        self._class_doc = class_doc
+
+    def __get__(self, instance, owner=None) -> str | None:
+        if instance is None:
+            return self._class_doc
+        if (doc := instance.__dict__.get("_doc", _EMPTY)) is _EMPTY:
+            doc = instance.__dict__["_doc"] = _format_doc(
+                instance.__dict__.get("_factory_doc"), instance.return_type
+            )
+        return doc
+
+    def __set__(self, instance, value: str | None):
+        # functools.wraps sets this to the docstring of the wrapped function
+        instance.__dict__["_factory_doc"] = value
+        instance.__dict__.pop("_doc", None)
+
+
 class DeviceFactory(Generic[Args, V2]):
     """Wrapper around a device factory (any function returning a device) that holds
     a reference to a device manager that can provide dependencies, along with
     default connection information for how the created device should be connected.
     """
 
+    __doc__ = _FactoryDoc(__doc__)
+
     def __init__(
         self,
         factory: Callable[Args, V2],
@@ -81,13 +113,7 @@ class DeviceFactory(Generic[Args, V2]):
         skip: SkipType,
         manager: "DeviceManager",
     ):
-        for name, param in inspect.signature(factory).parameters.items():
-            if param.kind == Parameter.POSITIONAL_ONLY:
-                raise ValueError(
-                    f"{factory.__name__} has positional only argument '{name}'"
-                )
-            elif param.kind == Parameter.VAR_POSITIONAL:
-                raise ValueError(f"{factory.__name__} has variadic argument '{name}'")
+        _check_factory_arguments(factory)
 
         self.factory = factory
         self.use_factory_name = use_factory_name
@@ -97,8 +123,10 @@ class DeviceFactory(Generic[Args, V2]):
         self._manager = manager
         wraps(factory)(self)
 
-        return_type = inspect.get_annotations(factory).get("return")
-        self.__doc__ = _format_doc(self, return_type)
+    @property
+    def return_type(self) -> type[V2] | None:
+        """The annotated return type of the underlying factory function, if any."""
+        return inspect.get_annotations(self.factory).get("return")
 
     @property
     def name(self) -> str:
@@ -176,6 +204,8 @@ class V1DeviceFactory(Generic[Args, V1]):
     information for how the created device should be connected.
     """
 
+    __doc__ = _FactoryDoc(__doc__)
+
     def __init__(
         self,
         *,
@@ -197,7 +227,11 @@ class V1DeviceFactory(Generic[Args, V1]):
         self.post_create = init or (lambda x: x)
         self._manager = manager
         wraps(init)(self)
-        self.__doc__ = _format_doc(self, factory)
+
+    @property
+    def return_type(self) -> type[V1]:
+        """The type of the device built."""
+        return self.factory
 
     @property
     def name(self) -> str:
@@ -275,13 +309,34 @@ class ConnectionSpec(NamedTuple):
     timeout: float
 
 
-class ConnectionResult(NamedTuple):
-    """Wrapper around results of building and connecting devices."""
-
+class _ConnectionResultFields(NamedTuple):
     devices: dict[str, AnyDevice]
     build_errors: dict[str, Exception]
     connection_errors: dict[str, Exception]
 
+
+class ConnectionResult(_ConnectionResultFields):
+    """Wrapper around results of building and connecting devices."""
+
+    _connect_times: Mapping[str, float]
+
+    def __new__(
+        cls,
+        devices: dict[str, AnyDevice],
+        build_errors: dict[str, Exception],
+        connection_errors: dict[str, Exception],
+        connect_times: Mapping[str, float] | None = None,
+    ):
+        result = super().__new__(cls, devices, build_errors, connection_errors)
+        # Kept out of the tuple so that its fields are unchanged
+        result._connect_times = MappingProxyType(dict(connect_times or {}))
+        return result
+
+    @property
+    def connect_times(self) -> Mapping[str, float]:
+        """Time in seconds taken to connect each ophyd-async device."""
+        return self.__dict__.get("_connect_times", MappingProxyType({}))
+
     def or_raise(self) -> dict[str, Any]:
         """Re-raise any errors from build or connect stage or return devices."""
         if self.build_errors or self.connection_errors:
@@ -293,41 +348,37 @@ class ConnectionResult(NamedTuple):
         return self.devices
 
 
-class DeviceBuildResult(NamedTuple):
-    """Wrapper around the results of building devices."""
-
+class _DeviceBuildResultFields(NamedTuple):
     devices: dict[str, AnyDevice]
     errors: dict[str, Exception]
     connection_specs: dict[str, ConnectionSpec]
 
-    def connect(self, timeout: float | None = None) -> ConnectionResult:
-        """Connect all devices that didn't fail to build."""
-        connections = {}
-        connected = {}
-        loop: asyncio.EventLoop = get_bluesky_event_loop()  # type: ignore
-        for name, device in self.devices.items():
-            if not isinstance(device, OphydV2Device):
-                # TODO: Remove when ophyd v1 support is no longer required - see #1718
-                # V1 devices are connected at creation time assuming wait is not set to False
-                connected[name] = device
-                continue
-            mock, dev_timeout = self.connection_specs[name]
-            timeout = timeout or dev_timeout or DEFAULT_TIMEOUT
-            fut = asyncio.run_coroutine_threadsafe(
-                device.connect(mock=mock, timeout=timeout),
-                loop=loop,
-            )
-            connections[name] = fut
 
-        connection_errors = {}
-        for name, connection_future in connections.items():
-            try:
-                connection_future.result()
-                connected[name] = self.devices[name]
-            except Exception as e:
-                connection_errors[name] = e
+class DeviceBuildResult(_DeviceBuildResultFields):
+    """Wrapper around the results of building devices."""
+
+    _build_times: Mapping[str, float]
+
+    def __new__(
+        cls,
+        devices: dict[str, AnyDevice],
+        errors: dict[str, Exception],
+        connection_specs: dict[str, ConnectionSpec],
+        build_times: Mapping[str, float] | None = None,
+    ):
+        result = super().__new__(cls, devices, errors, connection_specs)
+        # Kept out of the tuple so that its fields are unchanged
+        result._build_times = MappingProxyType(dict(build_times or {}))
+        return result
 
-        return ConnectionResult(connected, self.errors, connection_errors)
+    @property
+    def build_times(self) -> Mapping[str, float]:
+        """Time in seconds taken by each device's factory."""
+        return self.__dict__.get("_build_times", MappingProxyType({}))
+
+    def connect(self, timeout: float | None = None) -> ConnectionResult:
+        """Connect all devices that didn't fail to build."""
+        return _Connector(timeout).collect(self)
 
     def or_raise(self) -> Self:
         """Re-raise any build errors."""
@@ -338,17 +389,88 @@ class DeviceBuildResult(NamedTuple):
         return self
 
 
+BuildCallback = Callable[[str, AnyDevice, ConnectionSpec], None]
+"""Called with the name, device and connection spec of each device once it is built."""
+
+
+class _Connector:
+    """Connect ophyd-async devices on the bluesky event loop.
+
+    Connections can be started as devices are built so that a device does not have
+    to wait for unrelated devices to be built before it starts connecting.
+    """
+
+    def __init__(self, timeout: float | None):
+        self._timeout = timeout
+        self._loop: asyncio.EventLoop = get_bluesky_event_loop()  # type: ignore
+        self._connections: dict[str, Future[float]] = {}
+
+    def start(self, name: str, device: AnyDevice, spec: ConnectionSpec):
+        """Start connecting a device if it is an ophyd-async device."""
+        if not isinstance(device, OphydV2Device):
+            # TODO: Remove when ophyd v1 support is no longer required - see #1718
+            # V1 devices are connected at creation time assuming wait is not set to False
+            return
+        mock, dev_timeout = spec
+        self._connections[name] = asyncio.run_coroutine_threadsafe(
+            _timed_connect(
+                device,
+                mock=mock,
+                timeout=self._timeout or dev_timeout or DEFAULT_TIMEOUT,
+            ),
+            loop=self._loop,
+        )
+
+    def collect(self, build: DeviceBuildResult) -> ConnectionResult:
+        """Wait for all devices in the build result to connect, starting any
+        connections that have not already been started.
+        """
+        for name, device in build.devices.items():
+            if name not in self._connections and isinstance(device, OphydV2Device):
+                self.start(name, device, build.connection_specs[name])
+
+        connected = {}
+        connection_errors = {}
+        connect_times = {}
+        for name, device in build.devices.items():
+            if (connection_future := self._connections.get(name)) is None:
+                connected[name] = device
+                continue
+            try:
+                connect_times[name] = connection_future.result()
+                connected[name] = device
+            except Exception as e:
+                connection_errors[name] = e
+
+        return ConnectionResult(
+            connected, build.errors, connection_errors, connect_times
+        )
+
+
+async def _timed_connect(device: OphydV2Device, mock: bool, timeout: float) -> float:
+    start = time.monotonic()
+    await device.connect(mock=mock, timeout=timeout)
+    return time.monotonic() - start
+
+
 class DeviceManager:
-    """Manager to handle building and connecting interdependent devices."""
+    """Manager to handle building and connecting interdependent devices.
+
+    If a graph cache is given (or the DODAL_DEVICE_GRAPH_CACHE environment variable
+    is set), the resolved dependencies and build order of devices are saved to disk
+    and reused while the source of the beamline modules is unchanged.
+    """
 
     _factories: dict[str, DeviceFactory]
     _fixtures: dict[str, Callable[[], Any]]
     _v1_factories: dict[str, V1DeviceFactory]
+    graph_cache: DeviceGraphCache | None
 
-    def __init__(self):
+    def __init__(self, graph_cache: DeviceGraphCache | None = None):
         self._factories = {}
         self._v1_factories = {}
         self._fixtures = {}
+        self.graph_cache = graph_cache or DeviceGraphCache.from_environment()
 
     def get_all_factories(self) -> dict[str, V1DeviceFactory | DeviceFactory]:
         return self._factories | self._v1_factories
@@ -470,14 +592,28 @@ class DeviceManager:
         fixtures: dict[str, Any] | None = None,
         mock: bool = False,
         timeout: float | None = None,
+        max_workers: int | None = None,
     ) -> ConnectionResult:
-        return self.build_all(fixtures=fixtures, mock=mock).connect(timeout=timeout)
+        """Build all devices and connect them, starting each device's connection
+        as soon as that device has been built.
+        """
+        connector = _Connector(timeout)
+        return connector.collect(
+            self.build_all(
+                fixtures=fixtures,
+                mock=mock,
+                max_workers=max_workers,
+                on_build=connector.start,
+            )
+        )
 
     def build_all(
         self,
         include_skipped=False,
         fixtures: dict[str, Any] | None = None,
         mock: bool = False,
+        max_workers: int | None = None,
+        on_build: BuildCallback | None = None,
     ) -> DeviceBuildResult:
         # exclude all skipped devices and those that have been overridden by fixtures
 
@@ -490,6 +626,8 @@ class DeviceManager:
             ),
             fixtures=fixtures,
             mock=mock,
+            max_workers=max_workers,
+            on_build=on_build,
         )
 
     def build_devices(
@@ -497,52 +635,72 @@ class DeviceManager:
         *factories: DeviceFactory | V1DeviceFactory,
         fixtures: Mapping[str, Any] | None = None,
         mock: bool = False,
+        max_workers: int | None = None,
+        on_build: BuildCallback | None = None,
     ) -> DeviceBuildResult:
         """Build the devices from the given factories, ensuring that any
         dependencies are built first and passed to later factories as required.
+
+        Factories are grouped into levels where every factory only depends on
+        factories in earlier levels. All factories within a level are built
+        concurrently using a pool of up to max_workers threads (the
+        ThreadPoolExecutor default if None). If given, on_build is called from
+        the calling thread as soon as each device has been built.
         """
         fixtures = LazyFixtures(provided=fixtures, factories=self._fixtures)
         if common := fixtures.keys() & {f.name for f in factories}:
             factories = tuple(f for f in factories if f.name not in common)
-        build_list = self._expand_dependencies(factories, fixtures)
-        order = self._build_order(
-            {dep: self[dep] for dep in build_list}, fixtures=fixtures
-        )
+        levels = self._resolve_build_levels(factories, fixtures)
         built: dict[str, AnyDevice] = {
             override: fixtures[override] for override in common
         }
         connection_specs: dict[str, ConnectionSpec] = {}
+        build_times: dict[str, float] = {}
         errors = {}
-        for device in order:
-            factory = self[device]
-            deps = factory.dependencies
-            if dep_errs := deps & errors.keys():
-                errors[device] = ValueError(f"Errors building dependencies: {dep_errs}")
-            else:
-                # If we've made it this far, any devices that aren't available must have default
-                # values so ignore anything that's missing
-                params = {
-                    dep: value
-                    for dep in deps
-                    # get from built if it's there, from fixtures otherwise...
-                    if (value := (built.get(dep, fixtures.get(dep, _EMPTY))))
-                    # ...and skip if in neither
-                    is not _EMPTY
-                }
-                try:
-                    if isinstance(factory, V1DeviceFactory):
-                        # TODO: Remove when ophyd v1 support is no longer required - see #1718
-                        factory = factory.mock_if_needed(mock)
-                    built_device = factory.create(**params)
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="dodal_build"
+        ) as pool:
+            for level in levels:
+                in_progress: dict[Future[tuple[AnyDevice, float]], str] = {}
+                for device in level:
+                    factory = self[device]
+                    deps = factory.dependencies
+                    if dep_errs := deps & errors.keys():
+                        errors[device] = ValueError(
+                            f"Errors building dependencies: {dep_errs}"
+                        )
+                        continue
+                    # If we've made it this far, any devices that aren't available must have default
+                    # values so ignore anything that's missing
+                    params = {
+                        dep: value
+                        for dep in deps
+                        # get from built if it's there, from fixtures otherwise...
+                        if (value := (built.get(dep, fixtures.get(dep, _EMPTY))))
+                        # ...and skip if in neither
+                        is not _EMPTY
+                    }
+                    in_progress[pool.submit(_timed_create, factory, mock, params)] = (
+                        device
+                    )
+
+                for future in as_completed(in_progress):
+                    device = in_progress[future]
+                    try:
+                        built_device, build_times[device] = future.result()
+                    except Exception as e:
+                        errors[device] = e
+                        continue
                     built[device] = built_device
-                    connection_specs[device] = ConnectionSpec(
+                    factory = self[device]
+                    connection_specs[device] = spec = ConnectionSpec(
                         mock=mock or factory.mock,
                         timeout=factory.timeout,
                     )
-                except Exception as e:
-                    errors[device] = e
+                    if on_build:
+                        on_build(device, built_device, spec)
 
-        return DeviceBuildResult(built, errors, connection_specs)
+        return DeviceBuildResult(built, errors, connection_specs, build_times)
 
     def __contains__(self, name):
         return name in self._factories or name in self._v1_factories
@@ -550,6 +708,27 @@ class DeviceManager:
     def __getitem__(self, name):
         return self._factories.get(name) or self._v1_factories[name]
 
+    def _resolve_build_levels(
+        self,
+        factories: Iterable[DeviceFactory | V1DeviceFactory],
+        fixtures: Mapping[str, Any],
+    ) -> list[list[str]]:
+        """Determine the build levels for the given devices, using the graph cache
+        if available.
+        """
+        graph, key = None, build_key((f.name for f in factories), fixtures.keys())
+        if self.graph_cache is not None:
+            graph = self.graph_cache.load(self)
+            if graph and (levels := graph.build_levels.get(key)) is not None:
+                return levels
+        build_list = self._expand_dependencies(factories, fixtures)
+        levels = self._build_levels(
+            {dep: self[dep] for dep in build_list}, fixtures=fixtures
+        )
+        if self.graph_cache is not None:
+            self.graph_cache.save(self, key, levels, graph)
+        return levels
+
     def _expand_dependencies(
         self,
         factories: Iterable[DeviceFactory[..., V2] | V1DeviceFactory[..., V1]],
@@ -592,33 +771,48 @@ class DeviceManager:
         Assumes that all required devices and fixtures are included in the
         given factory list.
         """
-        # This is not an efficient way of doing this, however, for realistic use
-        # cases, it is fast enough for now
-        order = []
-        available = set(fixtures.keys())
-        pending = factories
-        while pending:
-            buffer = {}
-            for name, factory in pending.items():
-                buildable_deps = factory.dependencies & factories.keys()
-                # We should only have been called with a resolvable set of things to build
-                # but just to double check
-                assert buildable_deps.issubset(
-                    factory.dependencies - factory.optional_dependencies
-                )
-                if all(dep in available for dep in buildable_deps):
-                    order.append(name)
-                    available.add(name)
-                else:
-                    buffer[name] = factory
-            if len(pending) == len(buffer):
-                # This should only be reachable if we have circular dependencies
-                raise ValueError(
-                    f"Cannot determine build order - possibly circular dependencies ({', '.join(pending.keys())})"
-                )
-            buffer, pending = [], buffer
+        return [
+            name for level in self._build_levels(factories, fixtures) for name in level
+        ]
 
-        return order
+    def _build_levels(
+        self,
+        factories: dict[str, DeviceFactory[..., V2] | V1DeviceFactory[..., V1]],
+        fixtures: Mapping[str, Any],
+    ) -> list[list[str]]:
+        """Group devices into levels so that every device only depends on devices
+        in earlier levels. Devices within a level are independent of each other
+        and can be built in any order.
+
+        Assumes that all required devices and fixtures are included in the
+        given factory list.
+        """
+        dependants: dict[str, list[str]] = {name: [] for name in factories}
+        waiting_on: dict[str, int] = {}
+        for name, factory in factories.items():
+            buildable_deps = (factory.dependencies & factories.keys()) - fixtures.keys()
+            waiting_on[name] = len(buildable_deps)
+            for dep in buildable_deps:
+                dependants[dep].append(name)
+
+        levels = []
+        level = [name for name, count in waiting_on.items() if count == 0]
+        while level:
+            levels.append(level)
+            next_level = []
+            for name in level:
+                for dependant in dependants[name]:
+                    waiting_on[dependant] -= 1
+                    if waiting_on[dependant] == 0:
+                        next_level.append(dependant)
+            level = next_level
+
+        if unresolved := [name for name, count in waiting_on.items() if count]:
+            # This should only be reachable if we have circular dependencies
+            raise ValueError(
+                f"Cannot determine build order - possibly circular dependencies ({', '.join(unresolved)})"
+            )
+        return levels
 
     def __len__(self) -> int:
         return len(self._factories) + len(self._v1_factories)
@@ -627,15 +821,50 @@ class DeviceManager:
         return f"<DeviceManager: {len(self)} devices>"
 
 
-def _format_doc(
-    factory: DeviceFactory | V1DeviceFactory, return_type: type[V1 | V2] | None
-) -> str | None:
+def _timed_create(
+    factory: DeviceFactory | V1DeviceFactory, mock: bool, params: dict[str, Any]
+) -> tuple[AnyDevice, float]:
+    start = time.monotonic()
+    if isinstance(factory, V1DeviceFactory):
+        # TODO: Remove when ophyd v1 support is no longer required - see #1718
+        factory = factory.mock_if_needed(mock)
+    device = factory.create(**params)
+    return device, time.monotonic() - start
+
+
+def _check_factory_arguments(factory: Callable):
+    """Raise a ValueError if the factory has positional only or variadic arguments.
+
+    Plain functions are checked from their code object, as inspect.signature is slow
+    and this is done for every factory when a beamline module is imported.
+    """
+    function = inspect.unwrap(factory)
+    if not inspect.isfunction(function) or hasattr(factory, "__signature__"):
+        for name, param in inspect.signature(factory).parameters.items():
+            if param.kind == Parameter.POSITIONAL_ONLY:
+                raise ValueError(
+                    f"{factory.__name__} has positional only argument '{name}'"
+                )
+            elif param.kind == Parameter.VAR_POSITIONAL:
+                raise ValueError(f"{factory.__name__} has variadic argument '{name}'")
+        return
+    code = function.__code__
+    if code.co_posonlyargcount:
+        raise ValueError(
+            f"{factory.__name__} has positional only argument '{code.co_varnames[0]}'"
+        )
+    if code.co_flags & inspect.CO_VARARGS:
+        name = code.co_varnames[code.co_argcount + code.co_kwonlyargcount]
+        raise ValueError(f"{factory.__name__} has variadic argument '{name}'")
+
+
+def _format_doc(existing: str | None, return_type: type[V1 | V2] | None) -> str | None:
     """Helper function to combine the doc strings of our factory instance and the
     return type of the function we wrap.
     """
     if not return_type:
-        return factory.__doc__
-    if existing := factory.__doc__:
+        return existing
+    if existing:
         return f"{existing}\n\n{_type_docs(return_type)}"
     return _type_docs(return_type)
 
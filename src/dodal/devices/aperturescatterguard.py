@@ -1,19 +1,27 @@
 from __future__ import annotations
 
 import asyncio
+from collections import Counter
+from collections.abc import Mapping
+from functools import lru_cache, partial
 from math import inf
 from typing import Any
 
 from bluesky.protocols import Preparable
 from ophyd_async.core import (
+    DEFAULT_TIMEOUT,
     AsyncStatus,
+    Callback,
+    LazyMock,
+    SignalR,
     StandardReadable,
     StandardReadableFormat,
     StrictEnum,
     derived_signal_r,
     derived_signal_rw,
 )
-from pydantic import BaseModel, Field
+from ophyd_async.epics.motor import Motor
+from pydantic import BaseModel, ConfigDict, Field
 
 from dodal.devices.aperture import Aperture
 from dodal.devices.motors import XYStage
@@ -46,6 +54,9 @@ class AperturePosition(BaseModel):
             Load position, the diameter is defined to be 0.
     """
 
+    # Positions are shared between devices, see load_positions_from_beamline_parameters
+    model_config = ConfigDict(frozen=True)
+
     aperture_x: float
     aperture_y: float
     aperture_z: float
@@ -67,19 +78,13 @@ class AperturePosition(BaseModel):
     def tolerances_from_gda_params(
         params: dict[str, Any],
     ) -> AperturePosition:
-        return AperturePosition(
-            aperture_x=params["miniap_x_tolerance"],
-            aperture_y=params["miniap_y_tolerance"],
-            aperture_z=params["miniap_z_tolerance"],
-            scatterguard_x=params["sg_x_tolerance"],
-            scatterguard_y=params["sg_y_tolerance"],
-        )
+        return _tolerances_from_gda_params(_aperture_params(params))
 
     @staticmethod
     def from_gda_params(
         name: _GDAParamApertureValue,
         diameter: float,
-        params: dict[str, Any],
+        params: Mapping[str, Any],
     ) -> AperturePosition:
         return AperturePosition(
             aperture_x=params[f"miniap_x_{name.value}"],
@@ -108,9 +113,38 @@ class ApertureValue(StrictEnum):
         return self.name.capitalize()
 
 
-def load_positions_from_beamline_parameters(
-    params: dict[str, Any],
+def _aperture_params(params: Mapping[str, Any]) -> tuple[tuple[str, Any], ...]:
+    """The beamline parameters that the aperture positions are made from, as a
+    hashable key for the caches below.
+    """
+    return tuple(
+        sorted(
+            (key, value)
+            for key, value in params.items()
+            if key.startswith(("miniap_", "sg_"))
+        )
+    )
+
+
+@lru_cache(maxsize=8)
+def _tolerances_from_gda_params(
+    aperture_params: tuple[tuple[str, Any], ...],
+) -> AperturePosition:
+    params = dict(aperture_params)
+    return AperturePosition(
+        aperture_x=params["miniap_x_tolerance"],
+        aperture_y=params["miniap_y_tolerance"],
+        aperture_z=params["miniap_z_tolerance"],
+        scatterguard_x=params["sg_x_tolerance"],
+        scatterguard_y=params["sg_y_tolerance"],
+    )
+
+
+@lru_cache(maxsize=8)
+def _load_positions(
+    aperture_params: tuple[tuple[str, Any], ...],
 ) -> dict[ApertureValue, AperturePosition]:
+    params = dict(aperture_params)
     return {
         ApertureValue.OUT_OF_BEAM: AperturePosition.from_gda_params(
             _GDAParamApertureValue.ROBOT_LOAD, inf, params
@@ -130,6 +164,83 @@ def load_positions_from_beamline_parameters(
     }
 
 
+def load_positions_from_beamline_parameters(
+    params: dict[str, Any],
+) -> dict[ApertureValue, AperturePosition]:
+    """Make the aperture positions from the beamline parameters.
+
+    The positions are cached against the aperture and scatterguard parameters, so
+    are only made again if those parameters change. The positions are frozen as they
+    are shared between callers.
+    """
+    return dict(_load_positions(_aperture_params(params)))
+
+
+class _AxisStateCache:
+    """The latest readback and done move values of a set of motors, kept up to date
+    by monitors so that they can be checked without a round trip to the IOC.
+
+    Moves made through move are also counted as in progress until they complete,
+    whether or not the done move monitor has updated yet.
+
+    Monitoring is stopped with stop, which must be done before the motors are
+    connected again.
+    """
+
+    def __init__(self, *axes: Motor):
+        self._axes = axes
+        self._values: dict[SignalR, Any] = {}
+        self._subscriptions: list[tuple[SignalR, Callback]] = []
+        self._moves_in_progress: Counter[Motor] = Counter()
+        self._start_lock = asyncio.Lock()
+        self._started = False
+
+    def _update(self, signal: SignalR, reading: dict[str, Any]):
+        (value,) = reading.values()
+        self._values[signal] = value["value"]
+
+    async def start(self):
+        """Read all the signals and start monitoring them, if not already started."""
+        async with self._start_lock:
+            if self._started:
+                return
+            signals = [
+                signal
+                for axis in self._axes
+                for signal in (axis.user_readback, axis.motor_done_move)
+            ]
+            values = await asyncio.gather(*[signal.get_value() for signal in signals])
+            self._values.update(zip(signals, values, strict=True))
+            for signal in signals:
+                callback = partial(self._update, signal)
+                signal.subscribe_reading(callback)
+                self._subscriptions.append((signal, callback))
+            self._started = True
+
+    def stop(self):
+        """Stop monitoring the signals, they will be read again on the next start."""
+        for signal, callback in self._subscriptions:
+            signal.clear_sub(callback)
+        self._subscriptions.clear()
+        self._values.clear()
+        self._started = False
+
+    def readback(self, axis: Motor) -> float:
+        return self._values[axis.user_readback]
+
+    def is_stationary(self, axis: Motor) -> bool:
+        return not self._moves_in_progress[axis] and bool(
+            self._values[axis.motor_done_move]
+        )
+
+    async def move(self, axis: Motor, value: float):
+        self._moves_in_progress[axis] += 1
+        try:
+            await axis.set(value)
+        finally:
+            self._moves_in_progress[axis] -= 1
+
+
 class ApertureScatterguard(StandardReadable, Preparable):
     """Move the aperture and scatterguard assembly in a safe way. There are two ways to
     interact with the device depending on if you want simplicity or move flexibility.
@@ -174,6 +285,13 @@ class ApertureScatterguard(StandardReadable, Preparable):
         self.scatterguard = XYStage(scatterguard_prefix)
         self._loaded_positions = loaded_positions
         self._tolerances = tolerances
+        self._axis_states = _AxisStateCache(
+            self.aperture.x,
+            self.aperture.y,
+            self.aperture.z,
+            self.scatterguard.x,
+            self.scatterguard.y,
+        )
         with self.add_children_as_readables(StandardReadableFormat.HINTED_SIGNAL):
             self.selected_aperture = derived_signal_rw(
                 self._get_current_aperture_position,
@@ -204,12 +322,21 @@ class ApertureScatterguard(StandardReadable, Preparable):
 
         super().__init__(name)
 
+    async def connect(
+        self,
+        mock: bool | LazyMock = False,
+        timeout: float = DEFAULT_TIMEOUT,
+        force_reconnect: bool = False,
+    ):
+        self._axis_states.stop()
+        await super().connect(mock, timeout, force_reconnect)
+
     async def _unpark(self, position_to_move_to: ApertureValue):
         """When the aperture is parked it is under the collimation table. It needs to be
         moved out from under the table before it is moved up to beam height.
         """
         position = self._loaded_positions[position_to_move_to]
-        await self.aperture.z.set(position.aperture_z)
+        await self._axis_states.move(self.aperture.z, position.aperture_z)
 
     async def _set_current_aperture_position(self, value: ApertureValue) -> None:
         if value == ApertureValue.PARKED:
@@ -219,15 +346,16 @@ class ApertureScatterguard(StandardReadable, Preparable):
 
         position = self._loaded_positions[value]
 
-        current_ap_y = await self.aperture.y.user_readback.get_value()
-        current_ap_z = await self.aperture.z.user_readback.get_value()
+        await self._axis_states.start()
+        current_ap_y = self._axis_states.readback(self.aperture.y)
+        current_ap_z = self._axis_states.readback(self.aperture.z)
         if self._is_in_position(ApertureValue.PARKED, current_ap_y, current_ap_z):
             await self._unpark(value)
 
         await self._check_safe_to_move(position.aperture_z)
 
         if value == ApertureValue.OUT_OF_BEAM:
-            await self.aperture.y.set(position.aperture_y)
+            await self._axis_states.move(self.aperture.y, position.aperture_y)
         else:
             await self._safe_move_whilst_in_beam(position)
 
@@ -238,6 +366,9 @@ class ApertureScatterguard(StandardReadable, Preparable):
 
         Additionally, because there are so many collision possibilities in the device we
         throw an error if any of the axes are already moving.
+
+        Whether the axes are moving is checked against the monitored axis states,
+        which must have been started.
         """
         current_ap_z = await self.aperture.z.user_readback.get_value()
         diff_on_z = abs(current_ap_z - expected_z_position)
@@ -255,8 +386,7 @@ class ApertureScatterguard(StandardReadable, Preparable):
             self.scatterguard.y,
         ]
         for axis in all_axes:
-            axis_stationary = await axis.motor_done_move.get_value()
-            if not axis_stationary:
+            if not self._axis_states.is_stationary(axis):
                 raise InvalidApertureMoveError(
                     f"{axis.name} is still moving. Wait for it to finish before"
                     "triggering another move."
@@ -305,7 +435,8 @@ class ApertureScatterguard(StandardReadable, Preparable):
         for why this is required. TLDR is that we have a collision at the top of y so we
         need to make sure we move the assembly down before we move the scatterguard up.
         """
-        current_ap_y = await self.aperture.y.user_readback.get_value()
+        await self._axis_states.start()
+        current_ap_y = self._axis_states.readback(self.aperture.y)
 
         aperture_x, aperture_y, aperture_z, scatterguard_x, scatterguard_y = (
             position.values
@@ -314,24 +445,24 @@ class ApertureScatterguard(StandardReadable, Preparable):
         if aperture_y > current_ap_y:
             # Assembly needs to move up so move the scatterguard down first
             await asyncio.gather(
-                self.scatterguard.x.set(scatterguard_x),
-                self.scatterguard.y.set(scatterguard_y),
+                self._axis_states.move(self.scatterguard.x, scatterguard_x),
+                self._axis_states.move(self.scatterguard.y, scatterguard_y),
             )
             await asyncio.gather(
-                self.aperture.x.set(aperture_x),
-                self.aperture.y.set(aperture_y),
-                self.aperture.z.set(aperture_z),
+                self._axis_states.move(self.aperture.x, aperture_x),
+                self._axis_states.move(self.aperture.y, aperture_y),
+                self._axis_states.move(self.aperture.z, aperture_z),
             )
         else:
             await asyncio.gather(
-                self.aperture.x.set(aperture_x),
-                self.aperture.y.set(aperture_y),
-                self.aperture.z.set(aperture_z),
+                self._axis_states.move(self.aperture.x, aperture_x),
+                self._axis_states.move(self.aperture.y, aperture_y),
+                self._axis_states.move(self.aperture.z, aperture_z),
             )
 
             await asyncio.gather(
-                self.scatterguard.x.set(scatterguard_x),
-                self.scatterguard.y.set(scatterguard_y),
+                self._axis_states.move(self.scatterguard.x, scatterguard_x),
+                self._axis_states.move(self.scatterguard.y, scatterguard_y),
             )
 
     @AsyncStatus.wrap
@@ -342,11 +473,11 @@ class ApertureScatterguard(StandardReadable, Preparable):
         )
 
         await asyncio.gather(
-            self.aperture.x.set(aperture_x),
-            self.aperture.y.set(aperture_y),
-            self.aperture.z.set(aperture_z),
-            self.scatterguard.x.set(scatterguard_x),
-            self.scatterguard.y.set(scatterguard_y),
+            self._axis_states.move(self.aperture.x, aperture_x),
+            self._axis_states.move(self.aperture.y, aperture_y),
+            self._axis_states.move(self.aperture.z, aperture_z),
+            self._axis_states.move(self.scatterguard.x, scatterguard_x),
+            self._axis_states.move(self.scatterguard.y, scatterguard_y),
         )
 
     @AsyncStatus.wrap
@@ -357,18 +488,19 @@ class ApertureScatterguard(StandardReadable, Preparable):
         Moving the assembly whilst out of the beam has no collision risk so we can just
         move all the motors together.
         """
-        current_y = await self.aperture.y.user_readback.get_value()
-        current_z = await self.aperture.z.user_readback.get_value()
+        await self._axis_states.start()
+        current_y = self._axis_states.readback(self.aperture.y)
+        current_z = self._axis_states.readback(self.aperture.z)
         if self._is_in_position(ApertureValue.OUT_OF_BEAM, current_y, current_z):
             aperture_x, _, aperture_z, scatterguard_x, scatterguard_y = (
                 self._loaded_positions[value].values
             )
 
             await asyncio.gather(
-                self.aperture.x.set(aperture_x),
-                self.aperture.z.set(aperture_z),
-                self.scatterguard.x.set(scatterguard_x),
-                self.scatterguard.y.set(scatterguard_y),
+                self._axis_states.move(self.aperture.x, aperture_x),
+                self._axis_states.move(self.aperture.z, aperture_z),
+                self._axis_states.move(self.scatterguard.x, scatterguard_x),
+                self._axis_states.move(self.scatterguard.y, scatterguard_y),
             )
         else:
             await self.selected_aperture.set(value)
@@ -1,24 +1,143 @@
+import asyncio
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass, field
 from io import BytesIO
 from pathlib import Path
 
 import aiofiles
-from aiohttp import ClientSession
 from bluesky.protocols import Triggerable
-from ophyd_async.core import AsyncStatus, StandardReadable, soft_signal_rw
+from ophyd_async.core import AsyncStatus, StandardReadable, StrictEnum, soft_signal_rw
 from ophyd_async.epics.core import epics_signal_r, epics_signal_rw
 from PIL import Image
 
+from dodal.devices.util.http_session import PersistentSession
 from dodal.log import LOGGER
+from dodal.utils import lazy_import
 
-IMG_FORMAT = "png"
+aiohttp = lazy_import("aiohttp")
 
+JPEG_START_BYTES = b"\xff\xd8"
+JPEG_END_BYTES = b"\xff\xd9"
 
-async def asyncio_save_image(image: Image.Image, path: str):
+
+class ImageFormat(StrictEnum):
+    """Formats images can be saved in, the value is the file extension."""
+
+    PNG = "png"
+    JPEG = "jpg"
+    WEBP = "webp"
+
+
+def encode_image(
+    image: Image.Image,
+    image_format: ImageFormat = ImageFormat.PNG,
+    png_compress_level: int = 6,
+    quality: int = 90,
+) -> bytes:
+    """Encode an image, png_compress_level (0-9) applies to PNG and quality (1-100) to
+    JPEG and WebP.
+    """
     buffer = BytesIO()
-    image.save(buffer, format=IMG_FORMAT)
+    if image_format == ImageFormat.PNG:
+        image.save(buffer, format="PNG", compress_level=png_compress_level)
+    else:
+        image.save(buffer, format=image_format.name, quality=quality)
+    return buffer.getvalue()
+
+
+async def asyncio_save_bytes(data: bytes, path: str):
     async with aiofiles.open(path, "wb") as fh:
-        await fh.write(buffer.getbuffer())
+        await fh.write(data)
+
+
+async def asyncio_save_image(
+    image: Image.Image,
+    path: str,
+    image_format: ImageFormat = ImageFormat.PNG,
+    png_compress_level: int = 6,
+    quality: int = 90,
+):
+    """Encode an image in a worker thread, so as not to block the event loop, then
+    save it. The image must not be modified until this has finished.
+    """
+    data = await asyncio.to_thread(
+        encode_image, image, image_format, png_compress_level, quality
+    )
+    await asyncio_save_bytes(data, path)
+
+
+class MJPGStreamReader:
+    """Splits the JPEG frames out of an MJPG stream.
+
+    The stream is read in whatever chunks are available into a buffer that is reused
+    between frames and searched for the JPEG start and end markers, so the multipart
+    headers never need to be parsed line by line. Only the bytes added since the last
+    search are searched again.
+    """
+
+    def __init__(self, response: "aiohttp.ClientResponse"):
+        self._content = response.content
+        self._buffer = bytearray()
+        self._in_frame = False
+        self._search_from = 0
+
+    async def next_jpeg(self) -> bytes:
+        """Get the next complete JPEG from the stream.
+
+        Raises:
+            ConnectionError: If the stream ends before a complete JPEG is received.
+        """
+        while True:
+            if not self._in_frame:
+                start = self._buffer.find(JPEG_START_BYTES)
+                if start >= 0:
+                    del self._buffer[:start]
+                    self._in_frame = True
+                    self._search_from = len(JPEG_START_BYTES)
+                else:
+                    # Keep the last byte in case it is the first half of the marker
+                    del self._buffer[: len(self._buffer) - 1]
+            if self._in_frame:
+                end = self._buffer.find(JPEG_END_BYTES, self._search_from)
+                if end >= 0:
+                    end += len(JPEG_END_BYTES)
+                    with memoryview(self._buffer) as view, view[:end] as frame:
+                        jpeg = bytes(frame)
+                    del self._buffer[:end]
+                    self._in_frame = False
+                    return jpeg
+                self._search_from = max(len(self._buffer) - 1, len(JPEG_START_BYTES))
+            chunk = await self._content.readany()
+            if not chunk:
+                raise ConnectionError("MJPG stream ended")
+            self._buffer += chunk
+
+
+async def get_next_jpeg(response: "aiohttp.ClientResponse") -> bytes:
+    """Get a single JPEG from an MJPG stream. Use an MJPGStreamReader to read more
+    than one frame from the same stream.
+    """
+    return await MJPGStreamReader(response).next_jpeg()
+
+
+@dataclass
+class MJPGFrame:
+    """A JPEG frame taken from an MJPG stream, decoded on first use."""
+
+    jpeg: bytes
+    timestamp: float = field(default_factory=time.monotonic)
+    _image: Image.Image | None = field(default=None, init=False, repr=False)
+
+    def image(self) -> Image.Image:
+        """Get a copy of the decoded frame, which the caller is free to modify."""
+        if self._image is None:
+            with Image.open(BytesIO(self.jpeg)) as image:
+                image.load()
+                self._image = image
+        return self._image.copy()
 
 
 class MJPG(StandardReadable, Triggerable, ABC):
@@ -27,14 +146,33 @@ class MJPG(StandardReadable, Triggerable, ABC):
     This devices uses that stream to grab images. When it is triggered it will send the
     latest image from the stream to the `post_processing` method for child classes to
     handle.
+
+    HTTP connections to the camera are kept open between triggers. If the frame
+    grabber has been started with `start_frame_grabber` the video stream is read
+    continuously into a ring buffer of the last `frame_buffer_size` frames and
+    triggers use the first frame captured after the trigger started rather than
+    requesting a new image. If no such frame arrives within `FRAME_WAIT_TIMEOUT`
+    seconds a new image is requested instead.
+
+    Whoever starts the frame grabber owns it until the device is unstaged, which
+    stops the frame grabber and closes the connections to the camera. Call `close`
+    to do the same for a device that is not staged.
+
+    Images are encoded off the event loop in the format given by `image_format`. If
+    `save_raw_jpeg` is set, images saved without modification are written as the
+    JPEG received from the camera instead.
     """
 
+    FRAME_WAIT_TIMEOUT = 1.0
+    GRABBER_RETRY_INTERVAL = 1.0
+
     def __init__(
         self,
         prefix: str,
         name: str = "",
         x_size_pv: str = "ArraySize1_RBV",
         y_size_pv: str = "ArraySize2_RBV",
+        frame_buffer_size: int = 5,
     ) -> None:
         self.url = epics_signal_rw(str, prefix + "JPG_URL_RBV")
         self.video_url = epics_signal_rw(str, prefix + "MJPG_URL_RBV")
@@ -47,29 +185,130 @@ class MJPG(StandardReadable, Triggerable, ABC):
             self.directory = soft_signal_rw(str)
             self.last_saved_path = soft_signal_rw(str)
 
+        self.image_format = soft_signal_rw(ImageFormat, ImageFormat.PNG)
+        self.png_compress_level = soft_signal_rw(int, 6)
+        self.quality = soft_signal_rw(int, 90)
+        self.save_raw_jpeg = soft_signal_rw(bool, False)
+
         self.KICKOFF_TIMEOUT = 30.0
 
+        self._session = PersistentSession(raise_for_status=True)
+        self._frames: deque[MJPGFrame] = deque(maxlen=frame_buffer_size)
+        self._grabber_task: asyncio.Task | None = None
+        self._frame_added = asyncio.Event()
+        self._last_jpeg: bytes | None = None
+
         super().__init__(name)
 
-    async def _save_image(self, image: Image.Image):
-        """A helper function to save a given image to the path supplied by the
-        directory and filename signals. The full resultant path is put on the
-        last_saved_path signal.
+    @property
+    def frames(self) -> list[MJPGFrame]:
+        """The frames currently held by the frame grabber, oldest first."""
+        return list(self._frames)
+
+    async def next_frame(self, captured_after: float) -> MJPGFrame | None:
+        """Wait for the frame grabber to capture a frame after the given time, in
+        time.monotonic() seconds.
+
+        Returns:
+            MJPGFrame | None: The frame, or None if the frame grabber is not running
+                or no frame is captured within FRAME_WAIT_TIMEOUT seconds.
         """
+        if self._grabber_task is None or self._grabber_task.done():
+            return None
+        with suppress(TimeoutError):
+            async with asyncio.timeout(self.FRAME_WAIT_TIMEOUT):
+                while not (
+                    self._frames and self._frames[-1].timestamp >= captured_after
+                ):
+                    await self._frame_added.wait()
+                return self._frames[-1]
+        return None
+
+    async def start_frame_grabber(self):
+        """Start continuously reading frames from the MJPG video stream."""
+        if self._grabber_task is None or self._grabber_task.done():
+            self._grabber_task = asyncio.create_task(self._grab_frames())
+
+    async def stop_frame_grabber(self):
+        """Stop reading the MJPG video stream and drop the frames read from it."""
+        if self._grabber_task is not None:
+            self._grabber_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._grabber_task
+            self._grabber_task = None
+        self._frames.clear()
+
+    async def close(self):
+        """Stop the frame grabber and close any open connections to the camera."""
+        await self.stop_frame_grabber()
+        await self._session.close()
+
+    async def _grab_frames(self):
+        while True:
+            video_url = await self.video_url.get_value()
+            try:
+                async with self._session.get().get(video_url) as response:
+                    LOGGER.info(f"Grabbing frames from {video_url}")
+                    reader = MJPGStreamReader(response)
+                    while True:
+                        self._frames.append(MJPGFrame(await reader.next_jpeg()))
+                        self._frame_added.set()
+                        self._frame_added.clear()
+            except Exception as e:
+                LOGGER.warning(f"Lost MJPG stream from {video_url}, will retry: {e}")
+            await asyncio.sleep(self.GRABBER_RETRY_INTERVAL)
+
+    async def _image_path(self, suffix: str, extension: str) -> str:
         filename_str = await self.filename.get_value()
         directory_str = await self.directory.get_value()
 
-        path = Path(f"{directory_str}/{filename_str}.{IMG_FORMAT}").as_posix()
+        path = Path(f"{directory_str}/{filename_str}{suffix}.{extension}").as_posix()
         if not Path(directory_str).is_dir():
             LOGGER.info(f"Snapshot folder {directory_str} does not exist, creating...")
-            Path(directory_str).mkdir(parents=True)
+            Path(directory_str).mkdir(parents=True, exist_ok=True)
+        return path
 
+    async def _save_image_to(self, image: Image.Image, suffix: str = "") -> str:
+        """Save an image to the path given by the directory and filename signals plus
+        a suffix, in the configured format. Returns the path saved to.
+        """
+        image_format, png_compress_level, quality = await asyncio.gather(
+            self.image_format.get_value(),
+            self.png_compress_level.get_value(),
+            self.quality.get_value(),
+        )
+        path = await self._image_path(suffix, image_format.value)
         LOGGER.info(f"Saving image to {path}")
+        await asyncio_save_image(image, path, image_format, png_compress_level, quality)
+        return path
 
-        await asyncio_save_image(image, path)
+    async def _save_image(self, image: Image.Image):
+        """A helper function to save a given image to the path supplied by the
+        directory and filename signals. The full resultant path is put on the
+        last_saved_path signal.
+        """
+        path = await self._save_image_to(image)
+        await self.last_saved_path.set(path)
+
+    async def _save_unmodified_image(self, image: Image.Image):
+        """As _save_image, for an image that is exactly as received from the camera.
 
+        If save_raw_jpeg is set, the JPEG from the camera is written as it is rather
+        than re-encoding the image.
+        """
+        if self._last_jpeg is None or not await self.save_raw_jpeg.get_value():
+            await self._save_image(image)
+            return
+        path = await self._image_path("", ImageFormat.JPEG.value)
+        LOGGER.info(f"Saving camera JPEG to {path}")
+        await asyncio_save_bytes(self._last_jpeg, path)
         await self.last_saved_path.set(path)
 
+    @AsyncStatus.wrap
+    async def unstage(self):
+        await super().unstage()
+        await self.close()
+
     @AsyncStatus.wrap
     async def trigger(self):
         """This takes a snapshot image from the MJPG stream and send it to the
@@ -78,13 +317,18 @@ class MJPG(StandardReadable, Triggerable, ABC):
         It is the responsibility of the child class to save any resulting images by
         calling _save_image.
         """
+        if frame := await self.next_frame(time.monotonic()):
+            self._last_jpeg = frame.jpeg
+            await self.post_processing(frame.image())
+            return
+
         url_str = await self.url.get_value()
 
-        async with ClientSession(raise_for_status=True) as session:
-            async with session.get(url_str) as response:
-                data = await response.read()
-                with Image.open(BytesIO(data)) as image:
-                    await self.post_processing(image)
+        async with self._session.get().get(url_str) as response:
+            data = await response.read()
+            self._last_jpeg = data if data.startswith(JPEG_START_BYTES) else None
+            with Image.open(BytesIO(data)) as image:
+                await self.post_processing(image)
 
     @abstractmethod
     async def post_processing(self, image: Image.Image):
@@ -1,5 +1,7 @@
 import asyncio
 import string
+from collections.abc import Iterable
+from typing import TypeVar
 
 from bluesky.protocols import Movable
 from ophyd_async.core import (
@@ -9,6 +11,7 @@ from ophyd_async.core import (
     StandardReadable,
     StrictEnum,
     SubsetEnum,
+    observe_signals_value,
     wait_for_value,
 )
 from ophyd_async.epics.core import epics_signal_r, epics_signal_rw, epics_signal_x
@@ -18,6 +21,8 @@ from dodal.log import LOGGER
 
 DEFAULT_TIMEOUT = 60
 
+T = TypeVar("T")
+
 
 class ReadOnlyAttenuator(StandardReadable):
     """A read-only attenuator class with a minimum set of PVs for reading.
@@ -50,11 +55,8 @@ class BinaryFilterAttenuator(ReadOnlyAttenuator, Movable[float]):
     def __init__(self, prefix: str, num_filters: int, name: str = ""):
         self._calculated_filter_states: DeviceVector[SignalR[int]] = DeviceVector(
             {
-                int(digit, num_filters): epics_signal_r(
-                    int, f"{prefix}DEC_TO_BIN.B{digit}"
-                )
-                for digit in string.hexdigits
-                if not digit.islower()
+                i: epics_signal_r(int, f"{prefix}DEC_TO_BIN.B{digit}")
+                for i, digit in enumerate(string.hexdigits.upper()[:num_filters])
             }
         )
         self._filters_in_position: DeviceVector[SignalR[bool]] = DeviceVector(
@@ -85,16 +87,42 @@ class BinaryFilterAttenuator(ReadOnlyAttenuator, Movable[float]):
         LOGGER.debug("Sending change filter command")
         await self._change.trigger()
 
-        await asyncio.gather(
-            *[
-                wait_for_value(
-                    self._filters_in_position[i],
-                    bool(await self._calculated_filter_states[i].get_value()),
-                    DEFAULT_TIMEOUT,
-                )
-                for i in range(16)
-            ]
+        calculated_states, in_position = await asyncio.gather(
+            _get_values(self._calculated_filter_states.values()),
+            _get_values(self._filters_in_position.values()),
+        )
+        changing = {
+            self._filters_in_position[i]: bool(calculated_states[i])
+            for i in self._filters_in_position
+            if bool(calculated_states[i]) != in_position[i]
+        }
+        LOGGER.debug(f"Waiting for {len(changing)} filters to move")
+        await _wait_for_values(changing, DEFAULT_TIMEOUT)
+
+
+async def _get_values(signals: Iterable[SignalR[T]]) -> list[T]:
+    return list(await asyncio.gather(*[signal.get_value() for signal in signals]))
+
+
+async def _wait_for_values(expected: dict[SignalR[bool], bool], timeout: float):
+    """Wait until every signal has its expected value, watching them all at once."""
+    pending = dict(expected)
+    if not pending:
+        return
+    try:
+        async with asyncio.timeout(timeout):
+            async for signal, value in observe_signals_value(*pending):
+                if pending.get(signal) == value:
+                    del pending[signal]
+                    if not pending:
+                        return
+    except TimeoutError as e:
+        still_moving = ", ".join(
+            f"{signal.name} (expected {value})" for signal, value in pending.items()
         )
+        raise TimeoutError(
+            f"Filters did not reach their positions within {timeout}s: {still_moving}"
+        ) from e
 
 
 # Replace with ophyd async enum after https://github.com/bluesky/ophyd-async/pull/1067
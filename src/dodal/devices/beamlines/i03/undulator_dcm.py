@@ -8,6 +8,7 @@ from daq_config_server.models.lookup_tables.mx_lut_models import (
 )
 from ophyd_async.core import AsyncStatus, Reference, StandardReadable
 
+from dodal.common.beamlines.config_cache import get_config_cache
 from dodal.devices.beamlines.i03.dcm import DCM
 from dodal.devices.undulator import UndulatorInKeV
 from dodal.log import LOGGER
@@ -43,21 +44,26 @@ class UndulatorDCM(StandardReadable, Movable[float]):
         self.undulator_ref = Reference(undulator)
         self.dcm_ref = Reference(dcm)
 
-        self.pitch_energy_table = config_client.get_file_contents(
-            daq_configuration_path + "/lookup/BeamLineEnergy_DCM_Pitch_converter.txt",
-            desired_return_type=BeamlinePitchLookupTable,
+        config_cache = get_config_cache(config_client)
+        pitch_path = (
+            daq_configuration_path + "/lookup/BeamLineEnergy_DCM_Pitch_converter.txt"
         )
-        self.roll_energy_table = config_client.get_file_contents(
-            daq_configuration_path + "/lookup/BeamLineEnergy_DCM_Roll_converter.txt",
-            desired_return_type=BeamlineRollLookupTable,
+        roll_path = (
+            daq_configuration_path + "/lookup/BeamLineEnergy_DCM_Roll_converter.txt"
         )
-
         # I03 configures the DCM Perp as a side effect of applying this fixed value to the DCM Offset after an energy change
         # Nb this parameter is misleadingly named to confuse you
         beamline_params_path = daq_configuration_path + "/domain/beamlineParameters"
-        self.dcm_fixed_offset_mm = config_client.get_file_contents(
-            beamline_params_path, dict
-        )["DCM_Perp_Offset_FIXED"]
+
+        # Fetch all the files at once rather than waiting for each in turn
+        config_cache.prefetch(pitch_path, BeamlinePitchLookupTable)
+        config_cache.prefetch(roll_path, BeamlineRollLookupTable)
+        config_cache.prefetch(beamline_params_path, dict)
+        self.pitch_energy_table = config_cache.get(pitch_path, BeamlinePitchLookupTable)
+        self.roll_energy_table = config_cache.get(roll_path, BeamlineRollLookupTable)
+        self.dcm_fixed_offset_mm = config_cache.get(beamline_params_path, dict)[
+            "DCM_Perp_Offset_FIXED"
+        ]
 
         super().__init__(name)
 
@@ -1,25 +1,30 @@
+import asyncio
 import json
 import pickle
 import time
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from enum import Enum
-from typing import TypedDict
+from typing import Any, TypedDict
 
 import numpy as np
 from bluesky.protocols import Stageable, Triggerable
+from numpy.typing import ArrayLike
 from ophyd_async.core import (
     AsyncStatus,
     StandardReadable,
     soft_signal_r_and_setter,
     soft_signal_rw,
 )
-from redis.asyncio import ConnectionError, StrictRedis
 
 from dodal.devices.beamlines.i04.constants import RedisConstants
 from dodal.devices.oav.oav_calculations import (
     calculate_beam_distance,
 )
 from dodal.log import LOGGER
+from dodal.utils import lazy_import
+
+redis = lazy_import("redis")
 
 NO_MURKO_RESULT = (-1, -1)
 RESULTS_COMPLETE_MESSAGE = "murko_results_complete"
@@ -53,10 +58,34 @@ class MurkoResult:
     metadata: MurkoMetadata
 
 
+MURKO_RESULT_DTYPE = np.dtype(
+    [
+        ("x_px", np.float64),
+        ("x_dist_mm", np.float64),
+        ("y_dist_mm", np.float64),
+        ("omega", np.float64),
+    ]
+)
+"""Columns of a MurkoResult used when filtering and fitting."""
+
+
+def results_to_array(results: Sequence[MurkoResult]) -> np.ndarray:
+    """Convert results to a structured array with MURKO_RESULT_DTYPE, in the same order."""
+    return np.fromiter(
+        ((r.chosen_point_px[0], r.x_dist_mm, r.y_dist_mm, r.omega) for r in results),
+        dtype=MURKO_RESULT_DTYPE,
+        count=len(results),
+    )
+
+
 class NoResultsFoundError(ValueError):
     pass
 
 
+MurkoDeserializer = Callable[[bytes], Any]
+"""Decodes the data of a message published by Murko."""
+
+
 class MurkoResultsDevice(StandardReadable, Triggerable, Stageable):
     """Device that takes crystal centre values from Murko and uses them to set the
     x, y, z coordinate of the sample to be in line with the beam centre.
@@ -71,6 +100,20 @@ class MurkoResultsDevice(StandardReadable, Triggerable, Stageable):
 
     A value for x can be found by averaging all most_likely_click[1] values, and
     solutions for y and z can be calculated using numpy's linear algebra library.
+
+    Messages are read from redis and decoded in the background while earlier batches
+    are being processed. Decoding runs in a worker thread using {deserializer}, which
+    defaults to pickle to match Murko but can be replaced (eg with msgpack.unpackb)
+    if Murko is configured to publish another format. The metadata for each batch is
+    fetched with a single HMGET and all metadata is written back with a single HSET.
+    The number of decoded batches waiting to be processed and the time taken to
+    process the last batch are available from {message_backlog} and
+    {batch_latency}.
+
+    If {streaming_tolerance_mm} is set above 0, y and z are also fitted as each batch
+    arrives and the trigger finishes early, ignoring the rest of the rotation, once
+    results span at least STREAMING_MIN_OMEGA_RANGE_DEG and the fit moves by less
+    than the tolerance between batches.
     """
 
     GET_MESSAGE_TIMEOUT_S = 2
@@ -78,21 +121,32 @@ class MurkoResultsDevice(StandardReadable, Triggerable, Stageable):
     PERCENTAGE_TO_USE = 25
     LEFTMOST_PIXEL_TO_USE = 10
     NUMBER_OF_WRONG_RESULTS_TO_LOG = 5
+    STREAMING_MIN_OMEGA_RANGE_DEG = 90
 
     def __init__(
         self,
         redis_host=RedisConstants.REDIS_HOST,
         redis_password=RedisConstants.REDIS_PASSWORD,
         redis_db=RedisConstants.MURKO_REDIS_DB,
+        deserializer: MurkoDeserializer = pickle.loads,
         name="",
     ):
-        self.redis_client = StrictRedis(
+        self.redis_client = redis.asyncio.StrictRedis(
             host=redis_host,
             password=redis_password,
             db=redis_db,
         )
         self.pubsub = self.redis_client.pubsub()
         self.sample_id = soft_signal_rw(str)  # Should get from redis
+        self._deserializer = deserializer
+
+        self.batch_latency, self._batch_latency_setter = soft_signal_r_and_setter(
+            float, units="ms"
+        )
+        self.message_backlog, self._message_backlog_setter = soft_signal_r_and_setter(
+            int
+        )
+        self.streaming_tolerance_mm = soft_signal_rw(float, 0.0, units="mm")
 
         self._reset()
 
@@ -107,7 +161,7 @@ class MurkoResultsDevice(StandardReadable, Triggerable, Stageable):
         try:
             await self.redis_client.ping()  # type: ignore
             return True
-        except ConnectionError:
+        except redis.asyncio.ConnectionError:
             LOGGER.warning(
                 f"Failed to connect to redis: {self.redis_client}. Murko results device will not trigger"
             )
@@ -125,6 +179,7 @@ class MurkoResultsDevice(StandardReadable, Triggerable, Stageable):
         self._x_mm_setter(0)
         self._y_mm_setter(0)
         self._z_mm_setter(0)
+        self._message_backlog_setter(0)
 
     @AsyncStatus.wrap
     async def unstage(self):
@@ -137,26 +192,32 @@ class MurkoResultsDevice(StandardReadable, Triggerable, Stageable):
         if not self.redis_connected:
             return
         sample_id = await self.sample_id.get_value()
-        t_last_result = time.time()
-        while True:
-            if time.time() - t_last_result > self.RESULTS_COMPLETE_TIMEOUT_S:
-                LOGGER.warning(
-                    f"Time since last result > {self.RESULTS_COMPLETE_TIMEOUT_S}, expected to receive {RESULTS_COMPLETE_MESSAGE}"
-                )
-                break
-            # waits here for next batch to be received
-            message = await self.pubsub.get_message(timeout=self.GET_MESSAGE_TIMEOUT_S)
-            if message and message["type"] == "message":
-                t_last_result = time.time()
-                data = pickle.loads(message["data"])
-
-                if data == RESULTS_COMPLETE_MESSAGE:
-                    LOGGER.info(
-                        f"Received results complete message: {RESULTS_COMPLETE_MESSAGE}"
-                    )
-                    break
-
+        streaming_tolerance_mm = await self.streaming_tolerance_mm.get_value()
+        streaming_fit = StreamingYZFit()
+        batches: asyncio.Queue[tuple[float, list[tuple[str, dict]]] | None] = (
+            asyncio.Queue()
+        )
+        reader = asyncio.create_task(self._read_batches(batches))
+        try:
+            while batch := await batches.get():
+                self._message_backlog_setter(batches.qsize())
+                received_at, data = batch
+                results_before = len(self._results)
                 await self.process_batch(data, sample_id)
+                self._batch_latency_setter((time.time() - received_at) * 1000.0)
+                if streaming_tolerance_mm > 0 and self._update_streaming_fit(
+                    streaming_fit,
+                    self._results[results_before:],
+                    streaming_tolerance_mm,
+                ):
+                    # Don't wait for the rest of the rotation
+                    reader.cancel()
+                    break
+            else:
+                # Raise any error from reading messages
+                await reader
+        finally:
+            reader.cancel()
 
         if not self._results:
             raise NoResultsFoundError("No results retrieved from Murko")
@@ -164,34 +225,102 @@ class MurkoResultsDevice(StandardReadable, Triggerable, Stageable):
         for result in self._results:
             LOGGER.debug(result)
 
-        filtered_results = self.filter_outliers()
+        filtered_results = results_to_array(self.filter_outliers())
+        x_dists_mm = filtered_results["x_dist_mm"]
+        y_dists_mm = filtered_results["y_dist_mm"]
 
-        x_dists_mm = [result.x_dist_mm for result in filtered_results]
-        y_dists_mm = [result.y_dist_mm for result in filtered_results]
-        omegas = [result.omega for result in filtered_results]
-
-        LOGGER.info(f"Using average of x beam distances: {x_dists_mm}")
+        LOGGER.info(f"Using average of x beam distances: {x_dists_mm.tolist()}")
         avg_x = float(np.mean(x_dists_mm))
-        LOGGER.info(f"Finding least square y and z from y distances: {y_dists_mm}")
-        best_y, best_z = get_yz_least_squares(y_dists_mm, omegas)
+        LOGGER.info(
+            f"Finding least square y and z from y distances: {y_dists_mm.tolist()}"
+        )
+        best_y, best_z = get_yz_least_squares(y_dists_mm, filtered_results["omega"])
         # x, y, z are relative to beam centre. Need to move negative these values to get centred.
         self._x_mm_setter(-avg_x)
         self._y_mm_setter(-best_y)
         self._z_mm_setter(-best_z)
 
-        for result in self._results:
-            await self.redis_client.hset(  # type: ignore
-                f"murko:{sample_id}:metadata", result.uuid, json.dumps(result.metadata)
+        await self.redis_client.hset(  # type: ignore
+            f"murko:{sample_id}:metadata",
+            mapping={
+                result.uuid: json.dumps(result.metadata) for result in self._results
+            },
+        )
+
+    def _update_streaming_fit(
+        self,
+        streaming_fit: "StreamingYZFit",
+        new_results: list[MurkoResult],
+        tolerance_mm: float,
+    ) -> bool:
+        """Add new results to the streaming fit and return True once it has converged."""
+        columns = results_to_array(new_results)
+        columns = columns[columns["x_px"] >= self.LEFTMOST_PIXEL_TO_USE]
+        previous = streaming_fit.solve()
+        streaming_fit.add(columns["y_dist_mm"], columns["omega"])
+        current = streaming_fit.solve()
+        LOGGER.debug(f"Streaming y, z estimate is {current}")
+        if (
+            previous is None
+            or current is None
+            or streaming_fit.omega_range < self.STREAMING_MIN_OMEGA_RANGE_DEG
+        ):
+            return False
+        if np.hypot(current[0] - previous[0], current[1] - previous[1]) < tolerance_mm:
+            LOGGER.info(
+                f"Streaming fit converged to within {tolerance_mm}mm after "
+                f"{streaming_fit.count} results, not waiting for remaining results"
             )
+            return True
+        return False
+
+    async def _read_batches(
+        self, batches: "asyncio.Queue[tuple[float, list[tuple[str, dict]]] | None]"
+    ):
+        """Read and decode messages from Murko, adding each batch of results to the
+        queue along with the time it was received. None is added once Murko has
+        finished or no message has been received for RESULTS_COMPLETE_TIMEOUT_S.
+        """
+        t_last_result = time.time()
+        try:
+            while True:
+                if time.time() - t_last_result > self.RESULTS_COMPLETE_TIMEOUT_S:
+                    LOGGER.warning(
+                        f"Time since last result > {self.RESULTS_COMPLETE_TIMEOUT_S}, expected to receive {RESULTS_COMPLETE_MESSAGE}"
+                    )
+                    break
+                # waits here for next batch to be received
+                message = await self.pubsub.get_message(
+                    timeout=self.GET_MESSAGE_TIMEOUT_S
+                )
+                if message and message["type"] == "message":
+                    t_last_result = time.time()
+                    data = await asyncio.to_thread(self._deserializer, message["data"])
+
+                    if data == RESULTS_COMPLETE_MESSAGE:
+                        LOGGER.info(
+                            f"Received results complete message: {RESULTS_COMPLETE_MESSAGE}"
+                        )
+                        break
+
+                    batches.put_nowait((t_last_result, data))
+                    self._message_backlog_setter(batches.qsize())
+        finally:
+            batches.put_nowait(None)
 
     async def process_batch(
         self, batch_results: list[tuple[str, dict]], sample_id: str
     ):
-        for result_with_uuid in batch_results:
-            uuid, result = result_with_uuid
-            if metadata_str := await self.redis_client.hget(  # type: ignore
-                f"murko:{sample_id}:metadata", uuid
-            ):
+        if not batch_results:
+            return
+        uuids = [uuid for uuid, _ in batch_results]
+        metadata_strs = await self.redis_client.hmget(  # type: ignore
+            f"murko:{sample_id}:metadata", uuids
+        )
+        for (uuid, result), metadata_str in zip(
+            batch_results, metadata_strs, strict=True
+        ):
+            if metadata_str:
                 LOGGER.info(f"Found metadata for uuid {uuid}, processing result")
                 self.process_result(result, MurkoMetadata(json.loads(metadata_str)))
             else:
@@ -239,58 +368,99 @@ class MurkoResultsDevice(StandardReadable, Triggerable, Stageable):
         left corner, which can be removed by filtering results with a small x pixel.
         """
         LOGGER.info(f"Number of results before filtering: {len(self._results)}")
-        sorted_results = sorted(self._results, key=lambda item: item.chosen_point_px[0])
-
-        results_without_tiny_x = [
-            result
-            for result in sorted_results
-            if result.chosen_point_px[0] >= self.LEFTMOST_PIXEL_TO_USE
-        ]
-        result_uuids_with_tiny_x = [
-            result.uuid
-            for result in sorted_results
-            if result not in results_without_tiny_x
-        ]
+        x_px = results_to_array(self._results)["x_px"]
+        sorted_indices = np.argsort(x_px, kind="stable")
+        is_tiny_x = x_px[sorted_indices] < self.LEFTMOST_PIXEL_TO_USE
+        indices_without_tiny_x = sorted_indices[~is_tiny_x]
 
         LOGGER.info(
-            f"Results with tiny x have been removed: {result_uuids_with_tiny_x}"
+            "Results with tiny x have been removed: "
+            f"{[self._results[i].uuid for i in sorted_indices[is_tiny_x]]}"
         )
 
         worst_results = [
-            r.uuid for r in sorted_results[-self.NUMBER_OF_WRONG_RESULTS_TO_LOG :]
+            self._results[i].uuid
+            for i in sorted_indices[-self.NUMBER_OF_WRONG_RESULTS_TO_LOG :]
         ]
 
         LOGGER.info(
             f"Worst {self.NUMBER_OF_WRONG_RESULTS_TO_LOG} murko results were {worst_results}"
         )
 
-        cutoff = max(1, int(len(sorted_results) * self.PERCENTAGE_TO_USE / 100))
-        cutoff = min(cutoff, len(results_without_tiny_x))
+        cutoff = max(1, int(len(sorted_indices) * self.PERCENTAGE_TO_USE / 100))
+        best_x_indices = indices_without_tiny_x[:cutoff]
 
-        best_x = results_without_tiny_x[:cutoff]
+        used_for_centring = np.zeros(len(self._results), dtype=bool)
+        used_for_centring[best_x_indices] = True
+        for result, used in zip(self._results, used_for_centring, strict=True):
+            result.metadata["used_for_centring"] = bool(used)
 
-        for result in sorted_results:
-            result.metadata["used_for_centring"] = result in best_x
+        LOGGER.info(f"Number of results after filtering: {len(best_x_indices)}")
+        return [self._results[i] for i in best_x_indices]
 
-        LOGGER.info(f"Number of results after filtering: {len(best_x)}")
-        return best_x
 
+def _yz_matrix(omegas: ArrayLike) -> np.ndarray:
+    thetas = np.radians(np.asarray(omegas, dtype=np.float64))
+    return np.column_stack([np.cos(thetas), -np.sin(thetas)])
 
-def get_yz_least_squares(vertical_dists: list, omegas: list) -> tuple[float, float]:
+
+def get_yz_least_squares(
+    vertical_dists: ArrayLike, omegas: ArrayLike
+) -> tuple[float, float]:
     """Get the least squares solution for y and z from the vertical distances and omega
     angles.
 
     Args:
-        vertical_dists (list): List of vertical distances from beam centre. Any units.
-        omegas (list): List of omega angles in degrees.
+        vertical_dists (ArrayLike): Vertical distances from beam centre. Any units.
+        omegas (ArrayLike): Omega angles in degrees.
 
     Returns:
         tuple[float, float]: y, z distances from centre, in whichever units
             v_dists came as.
     """
-    thetas = np.radians(omegas)
-    matrix = np.column_stack([np.cos(thetas), -np.sin(thetas)])
-
-    yz, residuals, rank, s = np.linalg.lstsq(matrix, vertical_dists, rcond=None)
+    yz, residuals, rank, s = np.linalg.lstsq(
+        _yz_matrix(omegas), np.asarray(vertical_dists, dtype=np.float64), rcond=None
+    )
     y, z = yz
     return y, z
+
+
+class StreamingYZFit:
+    """Least squares fit of y and z that is updated as vertical distances arrive.
+
+    Only the normal equations of the fit are kept so adding results and solving do
+    not depend on how many results have already been added. Solving gives the same
+    answer as get_yz_least_squares on all the results added so far.
+    """
+
+    def __init__(self):
+        self._normal_matrix = np.zeros((2, 2))
+        self._normal_vector = np.zeros(2)
+        self._min_omega = np.inf
+        self._max_omega = -np.inf
+        self.count = 0
+
+    def add(self, vertical_dists: ArrayLike, omegas: ArrayLike):
+        omegas_array = np.asarray(omegas, dtype=np.float64)
+        if not omegas_array.size:
+            return
+        matrix = _yz_matrix(omegas_array)
+        self._normal_matrix += matrix.T @ matrix
+        self._normal_vector += matrix.T @ np.asarray(vertical_dists, dtype=np.float64)
+        self._min_omega = min(self._min_omega, omegas_array.min())
+        self._max_omega = max(self._max_omega, omegas_array.max())
+        self.count += omegas_array.size
+
+    @property
+    def omega_range(self) -> float:
+        """Range of omega angles added so far, in degrees."""
+        return float(max(self._max_omega - self._min_omega, 0))
+
+    def solve(self) -> tuple[float, float] | None:
+        """Get the current y and z, or None if they can't be determined yet because
+        all results so far were taken at the same (or opposite) omega.
+        """
+        if np.linalg.matrix_rank(self._normal_matrix) < 2:
+            return None
+        y, z = np.linalg.solve(self._normal_matrix, self._normal_vector)
+        return float(y), float(z)
@@ -2,10 +2,12 @@ from .hard_energy import HardEnergy, HardInsertionDeviceEnergy
 from .hard_undulator_functions import (
     calculate_energy_i09_hu,
     calculate_gap_i09_hu,
+    calculate_gaps_i09_hu,
 )
 
 __all__ = [
     "calculate_gap_i09_hu",
+    "calculate_gaps_i09_hu",
     "calculate_energy_i09_hu",
     "HardInsertionDeviceEnergy",
     "HardEnergy",
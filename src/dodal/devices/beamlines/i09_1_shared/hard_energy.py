@@ -13,6 +13,7 @@ from ophyd_async.core import (
     soft_signal_rw,
 )
 
+from dodal.common.beamlines.config_cache import get_config_cache
 from dodal.devices.common_dcm import DoubleCrystalMonochromatorBase
 from dodal.devices.undulator import UndulatorInMm, UndulatorOrder
 
@@ -89,10 +90,8 @@ class HardInsertionDeviceEnergy(StandardReadable, Movable[float]):
         await self._undulator_ref().set(target_gap)
 
     def get_look_up_table(self) -> GenericLookupTable:
-        self._lut: GenericLookupTable = self._config_server.get_file_contents(
-            self._filepath,
-            desired_return_type=GenericLookupTable,
-            reset_cached_result=True,
+        self._lut: GenericLookupTable = get_config_cache(self._config_server).get(
+            self._filepath, GenericLookupTable
         )
         return self._lut
 
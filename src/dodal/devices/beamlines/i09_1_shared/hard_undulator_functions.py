@@ -38,19 +38,23 @@ def _validate_order(look_up_table: GenericLookupTable, order: int) -> None:
 
 def _validate_energy_in_range(
     look_up_table: GenericLookupTable,
-    energy: float,
+    energy: float | np.ndarray,
     order: int,
 ) -> None:
-    """Check if the requested energy is within the allowed range for the current harmonic order."""
+    """Check if the requested energy, or every energy in an array, is within the
+    allowed range for the current harmonic order.
+    """
     min_energy = look_up_table.get_value(
         HARMONICS_COLUMN_NAME, order, MIN_ENERGY_COLUMN_NAME
     )
     max_energy = look_up_table.get_value(
         HARMONICS_COLUMN_NAME, order, MAX_ENERGY_COLUMN_NAME
     )
-    if not (min_energy <= energy <= max_energy):
+    out_of_range = (energy < min_energy) | (energy > max_energy)
+    if np.any(out_of_range):
+        bad_energy = energy if np.ndim(energy) == 0 else energy[out_of_range]
         raise ValueError(
-            f"Requested energy {energy} keV is out of range for harmonic {order}: "
+            f"Requested energy {bad_energy} keV is out of range for harmonic {order}: "
             f"[{min_energy}, {max_energy}] keV"
         )
 
@@ -98,6 +102,37 @@ def calculate_gap_i09_hu(
     Returns:
         float: Calculated undulator gap in millimeters.
     """
+    gap = float(_calculate_gaps(look_up_table, value, order))
+    LOGGER.debug(f"Calculated gap is {gap}mm for energy {value}keV at order {order}")
+    return gap
+
+
+def calculate_gaps_i09_hu(
+    look_up_table: GenericLookupTable,
+    values: np.ndarray,
+    order: int = 1,
+) -> np.ndarray:
+    """Calculate the undulator gaps for many energies at once, eg to precompute the
+    gaps of an energy scan. See calculate_gap_i09_hu.
+
+    Args:
+        look_up_table (GenericLookupTable): Lookup table with beamline parameters for each harmonic order.
+        values (np.ndarray): Requested photon energies in keV.
+        order (int, optional): Harmonic order for which to calculate the gaps. Defaults to 1.
+
+    Returns:
+        np.ndarray: Calculated undulator gaps in millimeters.
+    """
+    return np.asarray(
+        _calculate_gaps(look_up_table, np.asarray(values, dtype=np.float64), order)
+    )
+
+
+def _calculate_gaps(
+    look_up_table: GenericLookupTable,
+    value: float | np.ndarray,
+    order: int,
+) -> float | np.ndarray:
     gap_offset: float = 0.0
     undulator_period_mm: int = 27
 
@@ -116,7 +151,7 @@ def calculate_gap_i09_hu(
     undulator_parameter_sqr = (
         4.959368e-6 * (order * gamma * gamma / (undulator_period_mm * value)) - 2
     )
-    if undulator_parameter_sqr < 0:
+    if np.any(undulator_parameter_sqr < 0):
         raise ValueError(
             f"Diffraction parameter squared must be positive! Calculated value {undulator_parameter_sqr}."
         )
@@ -141,8 +176,6 @@ def calculate_gap_i09_hu(
         + look_up_table.get_value(HARMONICS_COLUMN_NAME, order, GAP_OFFSET_COLUMN_NAME)
         + gap_offset
     )
-    LOGGER.debug(f"Calculated gap is {gap}mm for energy {value}keV at order {order}")
-
     return gap
 
 
@@ -1,6 +1,5 @@
 import json
 
-from aiohttp import ClientSession
 from ophyd_async.core import (
     AsyncStatus,
     DeviceVector,
@@ -10,6 +9,10 @@ from ophyd_async.core import (
     soft_signal_r_and_setter,
 )
 
+from dodal.utils import lazy_import
+
+aiohttp = lazy_import("aiohttp")
+
 
 class PuckState(StrictEnum):
     NO_PUCK = "None"
@@ -55,7 +58,7 @@ class PuckDetect(StandardReadable):
 
     @AsyncStatus.wrap
     async def trigger(self):
-        async with ClientSession(raise_for_status=True) as session:
+        async with aiohttp.ClientSession(raise_for_status=True) as session:
             async with session.get(self.url) as response:
                 raw_data = await response.read()
                 data = json.loads(raw_data)
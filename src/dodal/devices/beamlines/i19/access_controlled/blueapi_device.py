@@ -3,11 +3,13 @@ import json
 from enum import StrEnum
 from typing import TypeVar
 
-from aiohttp import ClientSession
 from bluesky.protocols import Movable
 from ophyd_async.core import AsyncStatus, StandardReadable
 
 from dodal.log import LOGGER
+from dodal.utils import lazy_import
+
+aiohttp = lazy_import("aiohttp")
 
 OPTICS_BLUEAPI_URL = "https://i19-blueapi.diamond.ac.uk"
 HEADERS = {"Accept": "application/json", "Content-Type": "application/json"}
@@ -65,7 +67,9 @@ class OpticsBlueAPIDevice(StandardReadable, Movable[D]):
         # Value here vould be request params dictionary.
         request_params = json.dumps(value)
 
-        async with ClientSession(base_url=self.url, raise_for_status=True) as session:
+        async with aiohttp.ClientSession(
+            base_url=self.url, raise_for_status=True
+        ) as session:
             # First submit the plan to the worker
             async with session.post(
                 "/tasks", data=request_params, headers=HEADERS
@@ -6,6 +6,7 @@ from .femto import (
     Femto3xxRaiseTime,
     FemtoDDPCA,
 )
+from .gain_controller import PredictiveGainController
 from .sr570 import (
     SR570,
     SR570FineGainTable,
@@ -24,6 +25,7 @@ __all__ = [
     "Femto3xxGainToCurrentTable",
     "CurrentAmpCounter",
     "CurrentAmpDet",
+    "PredictiveGainController",
     "SR570",
     "SR570GainTable",
     "SR570FineGainTable",
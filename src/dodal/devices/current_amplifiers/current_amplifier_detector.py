@@ -14,6 +14,7 @@ from dodal.devices.current_amplifiers.current_amplifier import (
     CurrentAmp,
     CurrentAmpCounter,
 )
+from dodal.devices.current_amplifiers.gain_controller import PredictiveGainController
 from dodal.log import LOGGER
 
 
@@ -28,6 +29,9 @@ class CurrentAmpDet(StandardReadable, Preparable):
         counter (CurrentAmpCounter): Counter that capture the current amplifier output.
         current (SignalRW([float]): Soft signal to store the corrected current.
         auto_mode (signalR([bool])): Soft signal to store the flag for auto gain.
+        gain_controller (PredictiveGainController, optional): If given, auto gain
+            moves straight to the predicted best gain rather than stepping the gain
+            one setting at a time.
         name (str): Name of the device.
     """
 
@@ -35,10 +39,12 @@ class CurrentAmpDet(StandardReadable, Preparable):
         self,
         current_amp: CurrentAmp,
         counter: CurrentAmpCounter,
+        gain_controller: PredictiveGainController | None = None,
         name: str = "",
     ) -> None:
         self.current_amp = Reference(current_amp)
         self.counter = Reference(counter)
+        self.gain_controller = gain_controller
         with self.add_children_as_readables():
             self.current, self._set_current = soft_signal_r_and_setter(
                 float, initial_value=None, units="Amp"
@@ -69,6 +75,9 @@ class CurrentAmpDet(StandardReadable, Preparable):
 
     @AsyncStatus.wrap
     async def auto_gain(self) -> None:
+        if self.gain_controller is not None:
+            await self.gain_controller.auto_gain(self.current_amp(), self.counter())
+            return
         within_limits = False
         while not within_limits:
             reading = abs(await self.counter().get_voltage_per_sec())
@@ -97,10 +106,14 @@ class CurrentAmpDet(StandardReadable, Preparable):
 
     @AsyncStatus.wrap
     async def stage(self) -> None:
+        if self.gain_controller is not None:
+            self.gain_controller.start_scan()
         await self.counter().stage()
 
     @AsyncStatus.wrap
     async def unstage(self) -> None:
+        if self.gain_controller is not None:
+            self.gain_controller.end_scan()
         await self.counter().unstage()
 
     @AsyncStatus.wrap
@@ -0,0 +1,124 @@
+import asyncio
+from enum import Enum
+
+from dodal.devices.current_amplifiers.current_amplifier import (
+    CurrentAmp,
+    CurrentAmpCounter,
+)
+from dodal.log import LOGGER
+
+
+def _gain_value(gain: Enum) -> float:
+    return gain.value
+
+
+class PredictiveGainController:
+    """Sets the gain of a CurrentAmp in one move, rather than a step at a time.
+
+    The voltage measured at the current gain is scaled by the ratio of gains in the
+    gain_conversion_table to predict the voltage at every other gain, and the highest
+    gain whose predicted voltage is within the target band is set. As every gain
+    change waits for the amplifier to settle this normally costs at most one rise
+    time per reading. If the amplifier was saturated the prediction is too low, so
+    the voltage is measured again and the gain corrected up to max_retries times.
+
+    The gain is kept while the voltage is within the amplifier limits. New gains are
+    chosen so the predicted voltage is below the upper limit lowered by the
+    hysteresis fraction, so that a small rise in signal after a gain change does not
+    cause another one.
+
+    Attributes:
+        hysteresis (float): Fraction the upper limit is lowered by when choosing a
+            new gain.
+        max_retries (int): Number of extra gain changes allowed for each reading.
+        lock_per_scan (bool): If true, the gain found for the first reading of a scan
+            is kept for the rest of the scan.
+    """
+
+    def __init__(
+        self,
+        hysteresis: float = 0.1,
+        max_retries: int = 3,
+        lock_per_scan: bool = False,
+    ) -> None:
+        if not 0 <= hysteresis < 0.5:
+            raise ValueError(f"Hysteresis {hysteresis} must be between 0 and 0.5")
+        self.hysteresis = hysteresis
+        self.max_retries = max_retries
+        self.lock_per_scan = lock_per_scan
+        self._in_scan = False
+        self._locked = False
+
+    def start_scan(self) -> None:
+        self._in_scan = True
+        self._locked = False
+
+    def end_scan(self) -> None:
+        self._in_scan = False
+        self._locked = False
+
+    def best_gain(
+        self,
+        gain_conversion_table: type[Enum],
+        current_gain: Enum,
+        voltage: float,
+        upper_limit: float,
+        lower_limit: float,
+    ) -> Enum:
+        """The highest gain that voltage, measured at current_gain, is predicted to
+        stay below the lowered upper limit at, or current_gain if voltage is within
+        the limits.
+        """
+        voltage = abs(voltage)
+        if lower_limit <= voltage <= upper_limit:
+            return current_gain
+        gains = sorted(gain_conversion_table, key=_gain_value)
+        target_upper = upper_limit * (1 - self.hysteresis)
+        best = gains[0]
+        for gain in gains:
+            if voltage * gain.value / current_gain.value <= target_upper:
+                best = gain
+        return best
+
+    async def auto_gain(self, current_amp: CurrentAmp, counter: CurrentAmpCounter):
+        """Set the gain of current_amp for the voltage measured by counter.
+
+        Raises:
+            ValueError: If the voltage is outside the limits at the lowest or highest
+                gain, or after max_retries changes of gain.
+        """
+        if self._locked:
+            return
+        upper_limit, lower_limit = await asyncio.gather(
+            current_amp.get_upperlimit(), current_amp.get_lowerlimit()
+        )
+        for _ in range(self.max_retries + 1):
+            voltage, gain = await asyncio.gather(
+                counter.get_voltage_per_sec(), current_amp.get_gain()
+            )
+            new_gain = self.best_gain(
+                current_amp.gain_conversion_table,
+                gain,
+                voltage,
+                upper_limit,
+                lower_limit,
+            )
+            if new_gain is gain:
+                gains = sorted(current_amp.gain_conversion_table, key=_gain_value)
+                if abs(voltage) < lower_limit and gain is gains[-1]:
+                    raise ValueError("Gain at max value")
+                if abs(voltage) > upper_limit and gain is gains[0]:
+                    raise ValueError("Gain at min value")
+                # Otherwise this is the best gain, even if the gains are too far
+                # apart for any of them to be within the limits
+                self._locked = self.lock_per_scan and self._in_scan
+                return
+            LOGGER.debug(
+                f"{current_amp.name} {voltage}V at gain {gain.name}, predicting "
+                f"gain {new_gain.name}"
+            )
+            await current_amp.set(new_gain)
+        raise ValueError(
+            f"{current_amp.name} voltage still outside limits after "
+            f"{self.max_retries + 1} gain changes"
+        )
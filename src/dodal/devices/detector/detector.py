@@ -5,6 +5,7 @@ from pathlib import Path
 from pydantic import BaseModel, Field, field_serializer, field_validator
 
 from dodal.common.beamlines.beamline_utils import get_config_client
+from dodal.common.run_numbers import RunNumberAllocator
 from dodal.devices.detector.det_dim_constants import (
     EIGER2_X_16M_SIZE,
     DetectorSize,
@@ -61,12 +62,26 @@ class DetectorParams(BaseModel):
 
     @property
     def run_number(self) -> int:
+        """The run number given in the parameters or allocated when arming. Until
+        then this is the next run number found by listing the directory.
+        """
         return (
             get_run_number(self.directory, self.prefix)
             if self.override_run_number is None
             else self.override_run_number
         )
 
+    def allocate_run_number(self) -> int:
+        """Allocate a run number for the directory, unless one was given in the
+        parameters, and keep it so that it is also kept if these parameters are
+        serialised. This is done by the detector when it is armed.
+        """
+        if self.override_run_number is None:
+            self.override_run_number = RunNumberAllocator(
+                self.directory, self.prefix
+            ).allocate()
+        return self.override_run_number
+
     @field_serializer("detector_size_constants")
     def serialize_detector_size_constants(self, size: DetectorSizeConstants):
         return size.det_type_string
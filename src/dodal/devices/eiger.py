@@ -286,6 +286,7 @@ class EigerDetector(Device, Stageable):
     def set_odin_pvs(self) -> StatusBase:
         LOGGER.info("Eiger arming: Setting odin PVs...")
         assert self.detector_params is not None
+        self.detector_params.allocate_run_number()
         file_prefix = self.detector_params.full_filename
         status = self.odin.file_writer.file_path.set(
             self.detector_params.directory, timeout=self.timeouts.general_status_timeout
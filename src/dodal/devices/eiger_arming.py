@@ -0,0 +1,264 @@
+"""Concurrent arming of the ophyd-async (FastCS) Eiger and Odin.
+
+The ophyd Eiger in dodal.devices.eiger arms with a strictly ordered chain, where each
+step makes several PV writes one after another. Here arming is instead described as
+ArmingStages that only depend on the stages that must finish before them. Every
+stage starts as soon as its dependencies have finished and the PV writes within a
+stage are made at the same time, so independent writes are not serialised. Writes are
+skipped if the PV already holds the requested value, so re-arming with unchanged
+parameters only costs reads.
+"""
+
+import asyncio
+import math
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from ophyd_async.core import DEFAULT_TIMEOUT, SignalRW, TriggerInfo
+from ophyd_async.fastcs.eiger import EigerDetector
+
+from dodal.devices.detector import DetectorParams
+from dodal.log import LOGGER
+
+
+@dataclass(frozen=True)
+class ArmingWrite:
+    """A PV write made while arming.
+
+    Attributes:
+        signal (SignalRW): The signal to write to.
+        value (Any): The value to write.
+        tolerance (float): For numeric values, the write is skipped if the signal is
+            already within this tolerance of the value.
+    """
+
+    signal: SignalRW
+    value: Any
+    tolerance: float = 0.0
+
+    def is_already_set(self, current_value: Any) -> bool:
+        if isinstance(self.value, float) and isinstance(current_value, int | float):
+            return math.isclose(current_value, self.value, abs_tol=self.tolerance)
+        return current_value == self.value
+
+
+@dataclass(frozen=True)
+class ArmingStage:
+    """A named step of arming.
+
+    The writes of a stage are all made concurrently, then its action (if any) is
+    awaited. The stage does not start until every stage in depends_on has finished.
+    """
+
+    name: str
+    writes: Sequence[ArmingWrite] = ()
+    action: Callable[[], Awaitable[Any]] | None = None
+    depends_on: Sequence[str] = ()
+
+
+@dataclass
+class ArmingReport:
+    """What happened while arming.
+
+    Attributes:
+        stage_timings_s (dict[str, float]): Time taken by each stage, in the order
+            the stages finished.
+        skipped_writes (list[str]): Names of the signals that were not written to as
+            they already held the requested value.
+        total_s (float): Time taken to run all stages.
+    """
+
+    stage_timings_s: dict[str, float] = field(default_factory=dict)
+    skipped_writes: list[str] = field(default_factory=list)
+    total_s: float = 0.0
+
+
+def _check_stage_order(stages: Sequence[ArmingStage]):
+    """Raise a ValueError if the stages do not form a directed acyclic graph."""
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Arming stage names must be unique, got {names}")
+    remaining = {stage.name: set(stage.depends_on) for stage in stages}
+    for name, dependencies in remaining.items():
+        if unknown := dependencies - remaining.keys():
+            raise ValueError(f"Arming stage {name} depends on unknown {unknown}")
+    while remaining:
+        ready = [name for name, dependencies in remaining.items() if not dependencies]
+        if not ready:
+            raise ValueError(f"Arming stages {set(remaining)} have a dependency cycle")
+        for name in ready:
+            del remaining[name]
+        for dependencies in remaining.values():
+            dependencies.difference_update(ready)
+
+
+async def _write_if_changed(
+    write: ArmingWrite, timeout: float, report: ArmingReport
+) -> None:
+    if write.is_already_set(await write.signal.get_value()):
+        report.skipped_writes.append(write.signal.name)
+        return
+    await write.signal.set(write.value, timeout=timeout)
+
+
+async def run_arming_stages(
+    stages: Sequence[ArmingStage], timeout: float = DEFAULT_TIMEOUT
+) -> ArmingReport:
+    """Run the stages, each starting as soon as the stages it depends on are done.
+
+    Args:
+        stages (Sequence[ArmingStage]): The stages to run.
+        timeout (float): Timeout for each PV write.
+
+    Returns:
+        ArmingReport: Timings of each stage and the writes that were skipped.
+
+    Raises:
+        ValueError: If the stages have unknown or cyclic dependencies.
+    """
+    _check_stage_order(stages)
+    report = ArmingReport()
+    start = time.monotonic()
+    tasks: dict[str, asyncio.Task] = {}
+
+    async def run_stage(stage: ArmingStage):
+        await asyncio.gather(*(tasks[name] for name in stage.depends_on))
+        stage_start = time.monotonic()
+        await asyncio.gather(
+            *(_write_if_changed(write, timeout, report) for write in stage.writes)
+        )
+        if stage.action is not None:
+            await stage.action()
+        report.stage_timings_s[stage.name] = time.monotonic() - stage_start
+        LOGGER.debug(
+            f"Arming stage {stage.name} took {report.stage_timings_s[stage.name]}s"
+        )
+
+    for stage in stages:
+        tasks[stage.name] = asyncio.create_task(run_stage(stage))
+    try:
+        await asyncio.gather(*tasks.values())
+    finally:
+        for task in tasks.values():
+            task.cancel()
+    report.total_s = time.monotonic() - start
+    return report
+
+
+def eiger_configuration_stages(
+    eiger: EigerDetector, detector_params: DetectorParams
+) -> list[ArmingStage]:
+    """The stages that write the collection parameters to a FastCS Eiger.
+
+    These are independent of each other so have no dependencies. The exposure time is
+    not written here as prepare sets it from the TriggerInfo.
+    """
+    assert detector_params.expected_energy_ev
+    detector_dimensions = (
+        detector_params.detector_size_constants.roi_size_pixels
+        if detector_params.use_roi_mode
+        else detector_params.detector_size_constants.det_size_pixels
+    )
+    beam_x_pixels, beam_y_pixels = detector_params.get_beam_position_pixels(
+        detector_params.detector_distance
+    )
+    detector, fp = eiger.detector, eiger.od.fp
+    return [
+        ArmingStage("cam", writes=[ArmingWrite(detector.ntrigger, 1)]),
+        ArmingStage(
+            "roi",
+            writes=[
+                ArmingWrite(
+                    detector.roi_mode,
+                    "4M" if detector_params.use_roi_mode else "disabled",
+                ),
+                ArmingWrite(fp.data_dims_0, detector_dimensions.height),
+                ArmingWrite(fp.data_dims_1, detector_dimensions.width),
+                ArmingWrite(fp.data_chunks_0, 1),
+                ArmingWrite(fp.data_chunks_1, detector_dimensions.height),
+                ArmingWrite(fp.data_chunks_2, detector_dimensions.width),
+            ],
+        ),
+        ArmingStage(
+            "mx_settings",
+            writes=[
+                ArmingWrite(detector.beam_center_x, beam_x_pixels),
+                ArmingWrite(detector.beam_center_y, beam_y_pixels),
+                ArmingWrite(
+                    detector.detector_distance, detector_params.detector_distance
+                ),
+                ArmingWrite(detector.omega_start, detector_params.omega_start),
+                ArmingWrite(detector.omega_increment, detector_params.omega_increment),
+                ArmingWrite(
+                    detector.photon_energy,
+                    float(detector_params.expected_energy_ev),
+                    tolerance=0.1,
+                ),
+            ],
+        ),
+    ]
+
+
+def eiger_arming_stages(
+    eiger: EigerDetector, detector_params: DetectorParams, trigger_info: TriggerInfo
+) -> list[ArmingStage]:
+    """The stages to configure, prepare and arm a FastCS Eiger for a collection."""
+    configuration = eiger_configuration_stages(eiger, detector_params)
+    return [
+        # If the previous collection did not finish cleanly the detector may still
+        # be armed, so make sure it is stopped before changing anything
+        ArmingStage("stop", action=eiger.unstage),
+        *(replace(stage, depends_on=["stop"]) for stage in configuration),
+        ArmingStage(
+            "prepare",
+            action=lambda: eiger.prepare(trigger_info),
+            depends_on=[stage.name for stage in configuration],
+        ),
+        ArmingStage("arm", action=eiger.kickoff, depends_on=["prepare"]),
+    ]
+
+
+async def configure_eiger(
+    eiger: EigerDetector,
+    detector_params: DetectorParams,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> ArmingReport:
+    """Write the collection parameters to a FastCS Eiger, all at once.
+
+    The detector should already be stopped and still needs preparing and kicking off
+    afterwards.
+
+    Returns:
+        ArmingReport: Timings of each stage and the writes that were skipped.
+    """
+    report = await run_arming_stages(
+        eiger_configuration_stages(eiger, detector_params), timeout
+    )
+    LOGGER.info(
+        f"Configured Eiger in {report.total_s}s, "
+        f"skipped {len(report.skipped_writes)} writes already set"
+    )
+    return report
+
+
+async def arm_eiger(
+    eiger: EigerDetector,
+    detector_params: DetectorParams,
+    trigger_info: TriggerInfo,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> ArmingReport:
+    """Configure, prepare and arm a FastCS Eiger, making independent writes at once.
+
+    Returns:
+        ArmingReport: Timings of each arming stage and the writes that were skipped.
+    """
+    report = await run_arming_stages(
+        eiger_arming_stages(eiger, detector_params, trigger_info), timeout
+    )
+    LOGGER.info(
+        f"Armed Eiger in {report.total_s}s, stage timings {report.stage_timings_s}, "
+        f"skipped {len(report.skipped_writes)} writes already set"
+    )
+    return report
@@ -1,5 +1,10 @@
 # type: ignore # Eiger will soon be ophyd-async https://github.com/DiamondLightSource/dodal/issues/700
-from functools import partial, reduce
+import threading
+import warnings
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import reduce
+from typing import Any
 
 from ophyd import Component, Device, EpicsSignal, EpicsSignalRO, EpicsSignalWithRBV
 from ophyd.areadetector.plugins import HDF5Plugin_V22
@@ -62,34 +67,42 @@ class OdinNodesStatus(Device):
 
     @property
     def nodes(self) -> list[OdinNode]:
-        return [self.node_0, self.node_1, self.node_2, self.node_3]
+        """Every OdinNode component, so larger deployments (eg 8 nodes for a 16M
+        detector) only need to subclass this with more nodes.
+        """
+        return [
+            component
+            for name in self.component_names
+            if isinstance(component := getattr(self, name), OdinNode)
+        ]
 
-    def _check_node_frames_from_attr(
-        self, node_get_func, error_message_verb: str
-    ) -> tuple[bool, str]:
-        nodes_frames_values = [0] * len(self.nodes)
-        frames_details = []
-        for node_number, node_pv in enumerate(self.nodes):
-            node_state = node_get_func(node_pv)
-            nodes_frames_values[node_number] = node_state
-            if node_state != 0:
-                error_message = f"Filewriter {node_number} {error_message_verb} \
-                        {nodes_frames_values[node_number]} frames"
-                frames_details.append(error_message)
-        bad_frames = any(v != 0 for v in nodes_frames_values)
-        return bad_frames, "\n".join(frames_details)
-
-    def check_frames_timed_out(self) -> tuple[bool, str]:
-        return self._check_node_frames_from_attr(
-            lambda node: node.frames_timed_out.get(), "timed out"
+    def _warn_deprecated(self, method: str, replacement: str):
+        warnings.warn(
+            f"OdinNodesStatus.{method} is deprecated, use {replacement} instead",
+            DeprecationWarning,
+            stacklevel=3,
         )
 
     def check_frames_dropped(self) -> tuple[bool, str]:
-        return self._check_node_frames_from_attr(
-            lambda node: node.frames_dropped.get(), "dropped"
+        """Deprecated, use EigerOdin.health_monitor.health.frames_dropped()."""
+        self._warn_deprecated(
+            "check_frames_dropped", "EigerOdin.health_monitor.health.frames_dropped"
+        )
+        return self.parent.health_monitor.health.frames_dropped()
+
+    def check_frames_timed_out(self) -> tuple[bool, str]:
+        """Deprecated, use EigerOdin.health_monitor.health.frames_timed_out()."""
+        self._warn_deprecated(
+            "check_frames_timed_out",
+            "EigerOdin.health_monitor.health.frames_timed_out",
         )
+        return self.parent.health_monitor.health.frames_timed_out()
 
     def wait_for_no_errors(self, timeout) -> dict[SubscriptionStatus, str]:
+        """Deprecated, use EigerOdin.wait_for_odin_initialised()."""
+        self._warn_deprecated(
+            "wait_for_no_errors", "EigerOdin.wait_for_odin_initialised"
+        )
         errors = {}
         for node_number, node_pv in enumerate(self.nodes):
             errors[await_value(node_pv.error_status, False, timeout)] = (
@@ -100,6 +113,8 @@ class OdinNodesStatus(Device):
         return errors
 
     def get_init_state(self, timeout) -> SubscriptionStatus:
+        """Deprecated, use EigerOdin.wait_for_odin_initialised()."""
+        self._warn_deprecated("get_init_state", "EigerOdin.wait_for_odin_initialised")
         is_initialised = []
         for node_pv in self.nodes:
             is_initialised.append(await_value(node_pv.fr_initialised, True, timeout))
@@ -116,12 +131,160 @@ class OdinNodesStatus(Device):
         clearing_status.wait(10)
 
 
+@dataclass(frozen=True)
+class OdinNodeHealth:
+    error: bool
+    error_message: str
+    initialised: bool
+    writing: bool
+    frames_dropped: int
+    frames_timed_out: int
+
+
+@dataclass(frozen=True)
+class OdinHealth:
+    """A snapshot of the state of every part of Odin."""
+
+    fan_connected: bool
+    fan_on: bool
+    meta_initialised: bool
+    nodes: tuple[OdinNodeHealth, ...]
+
+    @property
+    def initialisation_errors(self) -> list[str]:
+        errors = [
+            f"Filewriter {node_number} is in an error state with error message\
+                     - {node.error_message}"
+            for node_number, node in enumerate(self.nodes)
+            if node.error
+        ]
+        if not self.fan_connected:
+            errors.append("EigerFan is not connected")
+        if not self.fan_on:
+            errors.append("EigerFan is not initialised")
+        if not self.meta_initialised:
+            errors.append("MetaListener is not initialised")
+        if not all(node.initialised for node in self.nodes):
+            errors.append("One or more filewriters is not initialised")
+        return errors
+
+    @property
+    def is_initialised(self) -> bool:
+        return not self.initialisation_errors
+
+    def _frames_details(self, attr: str, verb: str) -> tuple[bool, str]:
+        details = [
+            f"Filewriter {node_number} {verb} {getattr(node, attr)} frames"
+            for node_number, node in enumerate(self.nodes)
+            if getattr(node, attr) != 0
+        ]
+        return bool(details), "\n".join(details)
+
+    def frames_dropped(self) -> tuple[bool, str]:
+        return self._frames_details("frames_dropped", "dropped")
+
+    def frames_timed_out(self) -> tuple[bool, str]:
+        return self._frames_details("frames_timed_out", "timed out")
+
+
+class OdinHealthMonitor:
+    """Keeps an OdinHealth up to date from monitors on every Odin status signal.
+
+    The monitors are started on first use and kept, so checking the state of Odin
+    is a single wait on the cached values however many nodes there are, rather than
+    a read or wait for each signal in turn.
+    """
+
+    def __init__(self, odin: "EigerOdin"):
+        self._odin = odin
+        self._values: dict[Any, Any] = {}
+        self._condition = threading.Condition()
+        self._started = False
+
+    def _signals(self) -> list:
+        signals = [
+            self._odin.fan.consumers_connected,
+            self._odin.fan.on,
+            self._odin.meta.initialised,
+        ]
+        for node in self._odin.nodes.nodes:
+            signals += [
+                node.error_status,
+                node.error_message,
+                node.fp_initialised,
+                node.fr_initialised,
+                node.writing,
+                node.frames_dropped,
+                node.frames_timed_out,
+            ]
+        return signals
+
+    def start(self):
+        with self._condition:
+            if self._started:
+                return
+            self._started = True
+        for signal in self._signals():
+            signal.subscribe(self._update, run=True)
+
+    def _update(self, *_, value=None, obj=None, **__):
+        with self._condition:
+            self._values[obj] = value
+            self._condition.notify_all()
+
+    def _health(self) -> OdinHealth:
+        # Must be called with the condition held. Signals that have not reported
+        # yet are treated as unhealthy, as await_value would have done
+        values = self._values
+        return OdinHealth(
+            fan_connected=values.get(self._odin.fan.consumers_connected) == 1,
+            fan_on=values.get(self._odin.fan.on) == 1,
+            meta_initialised=values.get(self._odin.meta.initialised) == 1,
+            nodes=tuple(
+                OdinNodeHealth(
+                    error=values.get(node.error_status) != 0,
+                    error_message=values.get(node.error_message) or "",
+                    initialised=values.get(node.fp_initialised) == 1
+                    and values.get(node.fr_initialised) == 1,
+                    writing=values.get(node.writing) == 1,
+                    frames_dropped=values.get(node.frames_dropped) or 0,
+                    frames_timed_out=values.get(node.frames_timed_out) or 0,
+                )
+                for node in self._odin.nodes.nodes
+            ),
+        )
+
+    @property
+    def health(self) -> OdinHealth:
+        self.start()
+        with self._condition:
+            return self._health()
+
+    def wait_until(
+        self, predicate: Callable[[OdinHealth], bool], timeout: float | None
+    ) -> OdinHealth:
+        """Wait for the health of Odin to satisfy predicate.
+
+        Returns:
+            OdinHealth: The health when predicate was satisfied or the timeout
+                expired, whichever was first.
+        """
+        self.start()
+        with self._condition:
+            self._condition.wait_for(lambda: predicate(self._health()), timeout)
+            return self._health()
+
+
 class EigerOdin(Device):
     fan = Component(EigerFan, "OD:FAN:")
     file_writer = Component(OdinFileWriter, "OD:")
     meta = Component(OdinMetaListener, "OD:META:")
     nodes = Component(OdinNodesStatus, "")
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_monitor = OdinHealthMonitor(self)
+
     def create_finished_status(self) -> StatusBase:
         writing_finished = await_value(self.meta.ready, 0)
         for node_pv in self.nodes.nodes:
@@ -129,42 +292,26 @@ class EigerOdin(Device):
         return writing_finished
 
     def check_and_wait_for_odin_state(self, timeout) -> bool:
-        is_initialised, error_message = self.wait_for_odin_initialised(timeout)
-        frames_dropped, frames_dropped_details = self.nodes.check_frames_dropped()
-        frames_timed_out, frames_timed_out_details = self.nodes.check_frames_timed_out()
+        health = self.health_monitor.wait_until(
+            lambda health: health.is_initialised, timeout
+        )
+        frames_dropped, frames_dropped_details = health.frames_dropped()
+        frames_timed_out, frames_timed_out_details = health.frames_timed_out()
 
-        if not is_initialised:
-            raise RuntimeError(error_message)
+        if not health.is_initialised:
+            raise RuntimeError("\n".join(health.initialisation_errors))
         if frames_dropped:
             self.log.error(f"Frames dropped: {frames_dropped_details}")
         if frames_timed_out:
             self.log.error(f"Frames timed out: {frames_timed_out_details}")
 
-        return is_initialised and not frames_dropped and not frames_timed_out
+        return not frames_dropped and not frames_timed_out
 
     def wait_for_odin_initialised(self, timeout) -> tuple[bool, str]:
-        errors = self.nodes.wait_for_no_errors(timeout)
-        await_true = partial(await_value, expected_value=True, timeout=timeout)
-        errors[
-            await_value(
-                self.fan.consumers_connected, expected_value=True, timeout=timeout
-            )
-        ] = "EigerFan is not connected"
-        errors[await_true(self.fan.on)] = "EigerFan is not initialised"
-        errors[await_true(self.meta.initialised)] = "MetaListener is not initialised"
-        errors[self.nodes.get_init_state(timeout)] = (
-            "One or more filewriters is not initialised"
+        health = self.health_monitor.wait_until(
+            lambda health: health.is_initialised, timeout
         )
-
-        error_strings = []
-
-        for error_status, string in errors.items():
-            try:
-                error_status.wait(timeout=timeout)
-            except Exception:
-                error_strings.append(string)
-
-        return not error_strings, "\n".join(error_strings)
+        return health.is_initialised, "\n".join(health.initialisation_errors)
 
     def stop(self) -> StatusBase:
         """Stop odin manually."""
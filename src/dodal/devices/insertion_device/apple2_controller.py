@@ -4,6 +4,8 @@ from math import isclose
 from typing import Generic, Protocol, TypeVar
 
 from ophyd_async.core import (
+    DEFAULT_TIMEOUT,
+    DeviceMock,
     Reference,
     StandardReadable,
     StandardReadableFormat,
@@ -160,6 +162,24 @@ class Apple2Controller(abc.ABC, StandardReadable, Generic[Apple2Type]):
 
         super().__init__(name)
 
+    async def connect(
+        self,
+        mock: bool | DeviceMock = False,
+        timeout: float = DEFAULT_TIMEOUT,
+        force_reconnect: bool = False,
+    ) -> None:
+        # Fetch the lookup tables behind the converters while the signals connect
+        if not mock:
+            for converter in (
+                self.gap_energy_motor_converter,
+                self.phase_energy_motor_converter,
+                self.inverse_gap_energy_motor_converter,
+            ):
+                lookup = getattr(converter, "__self__", None)
+                if isinstance(lookup, EnergyMotorLookup):
+                    lookup.prefetch()
+        await super().connect(mock, timeout, force_reconnect)
+
     @abc.abstractmethod
     def _get_apple2_value(self, gap: float, phase: float, pol: Pol) -> Apple2Val:
         """This method should be implemented by the beamline specific ID class as the
@@ -1,11 +1,13 @@
 import asyncio
 from pathlib import Path
 
+import numpy as np
 from bluesky.protocols import Triggerable
 from daq_config_server.client import ConfigClient
 from ophyd_async.core import AsyncStatus, Device, DeviceMock, DeviceVector
 from ophyd_async.epics.core import epics_signal_rw
 
+from dodal.common.beamlines.config_cache import get_config_cache
 from dodal.device_manager import DEFAULT_TIMEOUT
 from dodal.devices.insertion_device.enum import Pol
 from dodal.devices.insertion_device.lookup_table_models import (
@@ -37,6 +39,12 @@ class EnergyMotorLookup:
         """
         pass
 
+    def prefetch(self) -> None:
+        """Do nothing by default. Sub classes that fetch the lookup table may override
+        this method to start fetching it in the background.
+        """
+        pass
+
     def find_value_in_lookup_table(self, value: float, pol: Pol) -> float:
         """Convert energy and polarisation to a value from the lookup table.
 
@@ -54,6 +62,21 @@ class EnergyMotorLookup:
         poly = self.lut.get_poly(value=value, pol=pol)
         return poly(value)
 
+    def find_values_in_lookup_table(self, values: np.ndarray, pol: Pol) -> np.ndarray:
+        """Convert many energies of one polarisation to values from the lookup table
+        at once, eg to precompute the motor positions of an energy scan.
+
+        Args:
+            values (np.ndarray): Desired energies.
+            pol (Pol): Polarisation mode.
+
+        Returns:
+            np.ndarray: gap / phase motor positions with the same shape as values.
+        """
+        if not self.lut.root:
+            self.update_lookup_table()
+        return self.lut.energy_to_motor(values, pol)
+
 
 class ConfigServerEnergyMotorLookup(EnergyMotorLookup):
     """Fetches and parses lookup table (csv) from a config server, supports dynamic
@@ -78,10 +101,11 @@ class ConfigServerEnergyMotorLookup(EnergyMotorLookup):
         self.lut_config = lut_config
         super().__init__()
 
+    def prefetch(self) -> None:
+        get_config_cache(self.config_client).prefetch(self.path)
+
     def read_lut(self) -> LookupTable:
-        file_contents = self.config_client.get_file_contents(
-            self.path, reset_cached_result=True
-        )
+        file_contents = get_config_cache(self.config_client).get(self.path)
         return convert_csv_to_lookup(file_contents, lut_config=self.lut_config)
 
     def update_lookup_table(self) -> None:
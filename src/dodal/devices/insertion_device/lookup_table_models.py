@@ -21,15 +21,22 @@ structure::
     },
     ...
     }
+
+For evaluating many energies at once (eg to precompute the setpoints of an energy
+scan), LookupTable.energy_to_motor uses a CompiledEnergyCoverage for each polarisation,
+which holds the coefficients of every entry in one array.
 """
 
 import csv
 import io
 from collections.abc import Generator
+from dataclasses import dataclass
+from functools import cached_property
 from typing import Annotated as A
 from typing import Any, NamedTuple, Self
 
 import numpy as np
+from numpy.typing import ArrayLike
 from pydantic import (
     BaseModel,
     ConfigDict,
@@ -128,6 +135,92 @@ class EnergyCoverageEntry(BaseModel):
         return value.coefficients.tolist()
 
 
+@dataclass(frozen=True)
+class CompiledEnergyCoverage:
+    """The entries of an EnergyCoverage stacked into arrays so that many energies can
+    be evaluated at once.
+
+    Attributes:
+        min_energies (np.ndarray): Minimum energy of each entry, ascending.
+        max_energies (np.ndarray): Maximum energy of each entry.
+        coefficients (np.ndarray): Polynomial coefficients of each entry, highest power
+            first as in numpy.poly1d, padded with leading zeros to the highest order.
+    """
+
+    min_energies: np.ndarray
+    max_energies: np.ndarray
+    coefficients: np.ndarray
+
+    @classmethod
+    def from_entries(cls, entries: tuple[EnergyCoverageEntry, ...]) -> Self:
+        order = max(entry.poly.order for entry in entries)
+        coefficients = np.zeros((len(entries), order + 1))
+        for row, entry in zip(coefficients, entries, strict=True):
+            entry_coefficients = entry.poly.coefficients
+            row[order + 1 - len(entry_coefficients) :] = entry_coefficients
+        arrays = (
+            np.array([entry.min_energy for entry in entries], dtype=np.float64),
+            np.array([entry.max_energy for entry in entries], dtype=np.float64),
+            coefficients,
+        )
+        for array in arrays:
+            array.flags.writeable = False
+        return cls(*arrays)
+
+    def entry_indices(self, energies: np.ndarray) -> np.ndarray:
+        """Index of the entry covering each energy, -1 where no entry covers it.
+
+        This is the binary search of EnergyCoverage.get_energy_index run for all
+        energies at once, so an energy on the boundary between two entries is given
+        the same entry as a single energy would be.
+        """
+        indices = np.full(energies.shape, -1)
+        low = np.zeros(energies.shape, dtype=int)
+        high = np.full(energies.shape, len(self.min_energies) - 1)
+        searching = low <= high
+        while np.any(searching):
+            middle = (low + high) // 2
+            below = energies < self.min_energies[middle]
+            found = searching & ~below & (energies <= self.max_energies[middle])
+            indices[found] = middle[found]
+            searching &= ~found
+            high = np.where(searching & below, middle - 1, high)
+            low = np.where(searching & ~below, middle + 1, low)
+            searching &= low <= high
+        return indices
+
+    def evaluate(self, energies: ArrayLike) -> np.ndarray:
+        """Evaluate the polynomial covering each energy.
+
+        Raises:
+            ValueError: If any energy is outside the range of the coverage or falls in
+                a gap between entries.
+        """
+        energies = np.asarray(energies, dtype=np.float64)
+        if energies.size and (
+            energies.min() < self.min_energies[0]
+            or energies.max() > self.max_energies.max()
+        ):
+            raise ValueError(
+                f"Demanding energy must lie between {self.min_energies[0]} and "
+                f"{self.max_energies.max()}!"
+            )
+        indices = self.entry_indices(energies)
+        if np.any(indices < 0):
+            raise ValueError(
+                "Cannot find polynomial coefficients for energies "
+                f"{energies[indices < 0]}. There might be gap in the calibration "
+                "lookup table."
+            )
+        # Horner's method, one step per power for all energies at once
+        coefficients = self.coefficients[indices]
+        result = coefficients[..., 0].copy()
+        for power in range(1, self.coefficients.shape[1]):
+            result *= energies
+            result += coefficients[..., power]
+        return result
+
+
 class EnergyCoverage(BaseModel):
     model_config = ConfigDict(frozen=True)
     energy_entries: tuple[EnergyCoverageEntry, ...]
@@ -159,6 +252,11 @@ class EnergyCoverage(BaseModel):
         )
         return cls(energy_entries=energy_entries)
 
+    @cached_property
+    def compiled(self) -> CompiledEnergyCoverage:
+        """The entries stacked into arrays, see CompiledEnergyCoverage."""
+        return CompiledEnergyCoverage.from_entries(self.energy_entries)
+
     @property
     def min_energy(self) -> float:
         return self.energy_entries[0].min_energy
@@ -242,6 +340,19 @@ class LookupTable(RootModel[dict[Pol, EnergyCoverage]]):
         """
         return self.root[pol].get_poly(value)
 
+    def energy_to_motor(self, energies: ArrayLike, pol: Pol) -> np.ndarray:
+        """Evaluate the motor position for many energies of one polarisation at once.
+
+        Args:
+            energies (ArrayLike): Energy values in the same units used to create the
+                lookup table.
+            pol (Pol): Polarisation mode enum.
+
+        Returns:
+            np.ndarray: Motor positions with the same shape as energies.
+        """
+        return self.root[pol].compiled.evaluate(energies)
+
 
 def convert_csv_to_lookup(
     file_contents: str,
@@ -1,6 +1,5 @@
 import math
 
-import cv2
 import numpy as np
 from bluesky.protocols import Triggerable
 from ophyd_async.core import (
@@ -15,6 +14,9 @@ from ophyd_async.epics.core import (
 
 from dodal.devices.oav.utils import convert_to_gray_and_blur
 from dodal.log import LOGGER
+from dodal.utils import lazy_import
+
+cv2 = lazy_import("cv2")
 
 # Constant was chosen from trial and error with test images
 ADDITIONAL_BINARY_THRESH = 20
@@ -116,7 +118,9 @@ class CentreEllipseMethod(StandardReadable, Triggerable):
 
         super().__init__(name)
 
-    def _fit_ellipse(self, binary_img: cv2.typing.MatLike) -> cv2.typing.RotatedRect:
+    def _fit_ellipse(
+        self, binary_img: "cv2.typing.MatLike"
+    ) -> "cv2.typing.RotatedRect":
         contours, _ = cv2.findContours(
             binary_img, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE
         )
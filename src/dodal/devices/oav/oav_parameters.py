@@ -7,6 +7,8 @@ from xml.etree.ElementTree import Element
 from daq_config_server.client import ConfigClient
 from daq_config_server.models import DisplayConfig
 
+from dodal.common.beamlines.config_cache import get_config_cache
+
 # GDA currently assumes this aspect ratio for the OAV window size.
 # For some beamline this doesn't affect anything as the actual OAV aspect ratio
 # matches. Others need to take it into account to rescale the values stored in
@@ -52,7 +54,7 @@ class OAVParameters:
         """Loads the specified file from the config server, and returns a dict with all the
         individual top-level k-v pairs, and one with all the subdicts.
         """
-        raw_params: dict[str, Any] = config_client.get_file_contents(filename, dict)
+        raw_params: dict[str, Any] = get_config_cache(config_client).get(filename, dict)
         global_params = {
             k: raw_params.pop(k)
             for k, v in list(raw_params.items())
@@ -124,7 +126,7 @@ ParamType = TypeVar("ParamType", bound="ZoomParams")
 
 class OAVConfigBase(Generic[ParamType]):
     def __init__(self, zoom_params_file: str, config_client: ConfigClient):
-        self.zoom_params = config_client.get_file_contents(zoom_params_file, dict)[
+        self.zoom_params = get_config_cache(config_client).get(zoom_params_file, dict)[
             "JCameraManSettings"
         ]
 
@@ -165,9 +167,10 @@ class OAVConfigBeamCentre(OAVConfigBase[ZoomParamsCrosshair]):
         display_config_file: str,
         config_client: ConfigClient,
     ):
-        self.display_config = config_client.get_file_contents(
-            display_config_file, DisplayConfig
-        )
+        config_cache = get_config_cache(config_client)
+        # Fetch both files at once rather than waiting for each in turn
+        config_cache.prefetch(zoom_params_file, dict)
+        self.display_config = config_cache.get(display_config_file, DisplayConfig)
         super().__init__(zoom_params_file, config_client)
 
     def _read_display_config(self) -> dict:
@@ -1,10 +1,12 @@
 import asyncio
+import time
+from collections import deque
 from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
 from datetime import timedelta
 from enum import IntEnum
 from uuid import uuid4
 
-from aiohttp import ClientResponse, ClientSession
 from bluesky.protocols import Flyable, Stoppable
 from ophyd_async.core import (
     AsyncStatus,
@@ -16,19 +18,15 @@ from ophyd_async.core import (
     soft_signal_rw,
 )
 from ophyd_async.epics.core import epics_signal_r
-from redis.asyncio import StrictRedis
 
+from dodal.devices.areadetector.plugins.mjpg import MJPGStreamReader
 from dodal.devices.oav.oav_detector import OAV
+from dodal.devices.util.http_session import PersistentSession
 from dodal.log import LOGGER
+from dodal.utils import lazy_import
 
-
-async def get_next_jpeg(response: ClientResponse) -> bytes:
-    jpeg_start_byte = b"\xff\xd8"
-    jpeg_stop_byte = b"\xff\xd9"
-    while True:
-        line = await response.content.readline()
-        if line.startswith(jpeg_start_byte):
-            return line + await response.content.readuntil(jpeg_stop_byte)
+aiohttp = lazy_import("aiohttp")
+redis = lazy_import("redis")
 
 
 class Source(IntEnum):
@@ -36,6 +34,13 @@ class Source(IntEnum):
     ROI = 1
 
 
+@dataclass
+class _Frame:
+    redis_uuid: str
+    jpeg: bytes
+    received_at: float = field(default_factory=time.monotonic)
+
+
 class OAVSource(StandardReadable):
     def __init__(self, oav: OAV, label: str):
         self.url_ref = Reference(oav.snapshot.video_url)
@@ -56,6 +61,12 @@ class OAVToRedisForwarder(StandardReadable, Flyable, Stoppable):
     Reads image data from the MJPEG stream on an OAV and forwards it into a
     redis database. This is currently only used for murko integration.
 
+    Frames are read from the stream into a queue of at most MAX_QUEUED_FRAMES and
+    written to redis in the background, with all queued frames written in a single
+    pipeline. If redis cannot keep up the oldest queued frames are dropped. The
+    number of frames dropped since kickoff and the time between the last frame being
+    read and it being in redis are available from {dropped_frames} and {lag}.
+
     Args:
         prefix (str): The PV prefix of the OAV.
         redis_host (str): The host where the redis database is running.
@@ -69,6 +80,8 @@ class OAVToRedisForwarder(StandardReadable, Flyable, Stoppable):
     # This timeout is the maximum time that the forwarder can be streaming for
     TIMEOUT = 30
 
+    MAX_QUEUED_FRAMES = 16
+
     def __init__(
         self,
         prefix: str,
@@ -90,7 +103,8 @@ class OAVToRedisForwarder(StandardReadable, Flyable, Stoppable):
         self.selected_source = soft_signal_rw(int)
 
         self.forwarding_task = None
-        self.redis_client = StrictRedis(
+        self._session = PersistentSession()
+        self.redis_client = redis.asyncio.StrictRedis(
             host=redis_host, password=redis_password, db=redis_db
         )
 
@@ -98,6 +112,12 @@ class OAVToRedisForwarder(StandardReadable, Flyable, Stoppable):
 
         self.sample_id = soft_signal_rw(int, initial_value=0)
 
+        self.dropped_frames, self._dropped_frames_setter = soft_signal_r_and_setter(int)
+        self.lag, self._lag_setter = soft_signal_r_and_setter(float, units="ms")
+        self._queued_frames: deque[_Frame] = deque()
+        self._frames_available = asyncio.Event()
+        self._dropped_frame_count = 0
+
         with self.add_children_as_readables():
             # The uuid that images are being saved under, this should be monitored for
             # callbacks to correlate the data
@@ -105,23 +125,51 @@ class OAVToRedisForwarder(StandardReadable, Flyable, Stoppable):
 
         super().__init__(name=name)
 
-    async def _get_frame_and_put_to_redis(
-        self, redis_uuid: str, response: ClientResponse
-    ):
-        """Stores the raw bytes of the jpeg image in redis. Murko ultimately wants a
+    def _queue_frame(self, frame: _Frame):
+        if len(self._queued_frames) >= self.MAX_QUEUED_FRAMES:
+            dropped = self._queued_frames.popleft()
+            self._dropped_frame_count += 1
+            self._dropped_frames_setter(self._dropped_frame_count)
+            LOGGER.debug(f"Dropped frame {dropped.redis_uuid}, redis is not keeping up")
+        self._queued_frames.append(frame)
+        self._frames_available.set()
+
+    async def _put_frames_to_redis(self, frames: list[_Frame]):
+        """Stores the raw bytes of the jpeg images in redis. Murko ultimately wants a
         pickled numpy array of pixel values but raw byes are more space efficient. There
         may be better ways of doing this, see
         https://github.com/DiamondLightSource/mx-bluesky/issues/592.
         """
-        jpeg_bytes = await get_next_jpeg(response)
         sample_id = await self.sample_id.get_value()
         redis_key = f"murko:{sample_id}:raw"
-        await self.redis_client.hset(redis_key, redis_uuid, jpeg_bytes)  # type: ignore
-        await self.redis_client.expire(redis_key, timedelta(days=self.DATA_EXPIRY_DAYS))
-        self.uuid_setter(redis_uuid)
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.hset(
+            redis_key, mapping={frame.redis_uuid: frame.jpeg for frame in frames}
+        )
+        pipeline.expire(redis_key, timedelta(days=self.DATA_EXPIRY_DAYS))
+        await pipeline.execute()
+        self._lag_setter((time.monotonic() - frames[-1].received_at) * 1000.0)
+        for frame in frames:
+            self.uuid_setter(frame.redis_uuid)
+
+    async def _write_queued_frames(self, reading_done: asyncio.Event):
+        """Write frames to redis as they are queued until reading_done is set and
+        the queue is empty.
+        """
+        while self._queued_frames or not reading_done.is_set():
+            if not self._queued_frames:
+                await self._frames_available.wait()
+                self._frames_available.clear()
+                continue
+            frames = list(self._queued_frames)
+            self._queued_frames.clear()
+            try:
+                await self._put_frames_to_redis(frames)
+            except Exception as e:
+                LOGGER.warning(f"Failed to put {len(frames)} frames in redis: {e}")
 
     async def _open_connection_and_do_function(
-        self, function_to_do: Callable[[ClientResponse, OAVSource], Awaitable]
+        self, function_to_do: "Callable[[aiohttp.ClientResponse, OAVSource], Awaitable]"
     ):
         source_idx = await self.selected_source.get_value()
         source = self.sources[source_idx]
@@ -129,11 +177,12 @@ class OAVToRedisForwarder(StandardReadable, Flyable, Stoppable):
         LOGGER.info(
             f"Forwarding data from sample {await self.sample_id.get_value()} and OAV {source_idx} from URL {stream_url}"
         )
-        async with ClientSession() as session:
-            async with session.get(stream_url) as response:
-                await function_to_do(response, source)
+        async with self._session.get().get(stream_url) as response:
+            await function_to_do(response, source)
 
-    async def _stream_to_redis(self, response: ClientResponse, source: OAVSource):
+    async def _stream_to_redis(
+        self, response: "aiohttp.ClientResponse", source: OAVSource
+    ):
         """Uses the update of the frame counter as a trigger to pull an image off the
         OAV and into redis.
 
@@ -145,11 +194,23 @@ class OAVToRedisForwarder(StandardReadable, Flyable, Stoppable):
         done_status = AsyncStatus(
             asyncio.wait_for(self._stop_flag.wait(), timeout=self.TIMEOUT)
         )
-        async for frame_count in observe_value(self.counter, done_status=done_status):
-            redis_uuid = f"{source.label}-{frame_count}-{uuid4()}"
-            await self._get_frame_and_put_to_redis(redis_uuid, response)
-
-    async def _confirm_mjpg_stream(self, response: ClientResponse, source: OAVSource):
+        reader = MJPGStreamReader(response)
+        reading_done = asyncio.Event()
+        writer = asyncio.create_task(self._write_queued_frames(reading_done))
+        try:
+            async for frame_count in observe_value(
+                self.counter, done_status=done_status
+            ):
+                redis_uuid = f"{source.label}-{frame_count}-{uuid4()}"
+                self._queue_frame(_Frame(redis_uuid, await reader.next_jpeg()))
+        finally:
+            reading_done.set()
+            self._frames_available.set()
+            await writer
+
+    async def _confirm_mjpg_stream(
+        self, response: "aiohttp.ClientResponse", source: OAVSource
+    ):
         if response.content_type != "multipart/x-mixed-replace":
             raise ValueError(
                 f"{await source.url_ref().get_value()} is not an MJPG stream"
@@ -158,6 +219,8 @@ class OAVToRedisForwarder(StandardReadable, Flyable, Stoppable):
     @AsyncStatus.wrap
     async def kickoff(self):
         self._stop_flag.clear()
+        self._dropped_frame_count = 0
+        self._dropped_frames_setter(0)
         await self._open_connection_and_do_function(self._confirm_mjpg_stream)
         self.forwarding_task = asyncio.create_task(
             self._open_connection_and_do_function(self._stream_to_redis)
@@ -176,3 +239,8 @@ class OAVToRedisForwarder(StandardReadable, Flyable, Stoppable):
             )
             self._stop_flag.set()
             await self.forwarding_task
+
+    async def close(self):
+        """Stop forwarding and close any open connections to the OAV."""
+        await self.stop()
+        await self._session.close()
@@ -1,7 +1,11 @@
+import asyncio
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
 
 import numpy as np
 from ophyd_async.core import (
+    DEFAULT_TIMEOUT,
     Array1D,
     AsyncStatus,
     StandardReadable,
@@ -19,6 +23,7 @@ from dodal.devices.oav.pin_image_recognition.utils import (
     ScanDirections,
     identity,
 )
+from dodal.devices.util.async_util import latest_values
 from dodal.log import LOGGER
 
 # Tip position in x, y pixel coordinates
@@ -43,6 +48,14 @@ class PinTipDetection(StandardReadable):
     this device, which will attempt to find a pin within {validity_timeout} seconds if
     no tip is found after this time it will not error but instead return
     {INVALID_POSITION}.
+
+    Image processing runs in a worker thread so that it does not block the event
+    loop. Frames that arrive while a frame is being processed are dropped so that
+    each attempt uses the newest frame. The time taken to process the last frame
+    is available from {processing_time}.
+
+    The detection pipeline is built from the tuning signals on first use and reused
+    for following frames until one of the tuning signals changes.
     """
 
     INVALID_POSITION = np.array([np.iinfo(np.int32).min, np.iinfo(np.int32).min])
@@ -77,6 +90,29 @@ class PinTipDetection(StandardReadable):
         self.min_tip_height = soft_signal_rw(int, 5, name="min_tip_height")
         self.validity_timeout = soft_signal_rw(float, 5.0, name="validity_timeout")
 
+        self.processing_time, self._processing_time_setter = soft_signal_r_and_setter(
+            float, units="ms"
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="pin_tip_detection"
+        )
+        self._tuning_signals = [
+            self.preprocess_operation,
+            self.preprocess_ksize,
+            self.preprocess_iterations,
+            self.canny_upper_threshold,
+            self.canny_lower_threshold,
+            self.open_ksize,
+            self.open_iterations,
+            self.close_ksize,
+            self.close_iterations,
+            self.scan_direction,
+            self.min_tip_height,
+        ]
+        self._sample_detection: MxSampleDetect | None = None
+        self._tuning_generation = 0
+        self._subscribed_to_tuning = False
+
         self.add_readables(
             [
                 self.triggered_tip,
@@ -97,11 +133,42 @@ class PinTipDetection(StandardReadable):
         self._top_edge_setter(results.edge_top)
         self._bottom_edge_setter(results.edge_bottom)
 
-    async def _get_tip_and_edge_data(self, array_data: np.ndarray) -> SampleLocation:
-        """Gets the location of the pin tip and the top and bottom edges."""
-        preprocess_key = await self.preprocess_operation.get_value()
-        preprocess_iter = await self.preprocess_iterations.get_value()
-        preprocess_ksize = await self.preprocess_ksize.get_value()
+    async def connect(
+        self,
+        mock=False,
+        timeout: float = DEFAULT_TIMEOUT,
+        force_reconnect: bool = False,
+    ):
+        await super().connect(mock, timeout, force_reconnect)
+        # Subscriptions are kept when signals reconnect so only need adding once
+        if not self._subscribed_to_tuning:
+            for signal in self._tuning_signals:
+                signal.subscribe(self._invalidate_sample_detection)
+            self._subscribed_to_tuning = True
+
+    def _invalidate_sample_detection(self, *_):
+        self._sample_detection = None
+        self._tuning_generation += 1
+
+    async def _get_sample_detection(self) -> MxSampleDetect:
+        """Get the detection pipeline for the current tuning, building it if needed."""
+        if self._sample_detection is not None:
+            return self._sample_detection
+
+        generation = self._tuning_generation
+        (
+            preprocess_key,
+            preprocess_ksize,
+            preprocess_iter,
+            canny_upper,
+            canny_lower,
+            open_ksize,
+            open_iterations,
+            close_ksize,
+            close_iterations,
+            scan_direction,
+            min_tip_height,
+        ) = await asyncio.gather(*(s.get_value() for s in self._tuning_signals))
 
         try:
             preprocess_func = ARRAY_PROCESSING_FUNCTIONS_MAP[preprocess_key](
@@ -113,22 +180,31 @@ class PinTipDetection(StandardReadable):
 
         sample_detection = MxSampleDetect(
             preprocess=preprocess_func,
-            canny_lower=await self.canny_lower_threshold.get_value(),
-            canny_upper=await self.canny_upper_threshold.get_value(),
-            open_ksize=await self.open_ksize.get_value(),
-            open_iterations=await self.open_iterations.get_value(),
-            close_ksize=await self.close_ksize.get_value(),
-            close_iterations=await self.close_iterations.get_value(),
-            scan_direction=await self.scan_direction.get_value(),
-            min_tip_height=await self.min_tip_height.get_value(),
+            canny_lower=canny_lower,
+            canny_upper=canny_upper,
+            open_ksize=open_ksize,
+            open_iterations=open_iterations,
+            close_ksize=close_ksize,
+            close_iterations=close_iterations,
+            scan_direction=scan_direction,
+            min_tip_height=min_tip_height,
         )
+        # Don't cache if the tuning changed while the values were being read
+        if generation == self._tuning_generation:
+            self._sample_detection = sample_detection
+        return sample_detection
+
+    async def _get_tip_and_edge_data(self, array_data: np.ndarray) -> SampleLocation:
+        """Gets the location of the pin tip and the top and bottom edges."""
+        sample_detection = await self._get_sample_detection()
 
         start_time = time.time()
-        location = sample_detection.process_array(array_data)
-        end_time = time.time()
-        LOGGER.debug(
-            f"Sample location detection took {(end_time - start_time) * 1000.0}ms"
+        location = await asyncio.get_running_loop().run_in_executor(
+            self._executor, sample_detection.process_array, array_data
         )
+        processing_time_ms = (time.time() - start_time) * 1000.0
+        self._processing_time_setter(processing_time_ms)
+        LOGGER.debug(f"Sample location detection took {processing_time_ms}ms")
         return location
 
     @AsyncStatus.wrap
@@ -139,19 +215,21 @@ class PinTipDetection(StandardReadable):
         * If no tip is found it will retry with the next monitored value, if this
             continues for {validity_timeout} seconds it will timeout.
         """
+        frames = observe_value(
+            self.array_data, done_timeout=await self.validity_timeout.get_value()
+        )
         try:
-            async for value in observe_value(
-                self.array_data, done_timeout=await self.validity_timeout.get_value()
-            ):
-                try:
-                    location = await self._get_tip_and_edge_data(value)
-                    self._set_triggered_values(location)
-                except Exception as e:
-                    LOGGER.warning(
-                        f"Failed to detect pin-tip location, will retry with next image: {e}"
-                    )
-                else:
-                    break
+            async with aclosing(latest_values(frames)) as latest_frames:
+                async for value in latest_frames:
+                    try:
+                        location = await self._get_tip_and_edge_data(value)
+                        self._set_triggered_values(location)
+                    except Exception as e:
+                        LOGGER.warning(
+                            f"Failed to detect pin-tip location, will retry with next image: {e}"
+                        )
+                    else:
+                        break
         except TimeoutError:
             LOGGER.error(
                 f"No tip found in {await self.validity_timeout.get_value()} seconds."
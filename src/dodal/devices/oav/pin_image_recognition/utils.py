@@ -1,13 +1,16 @@
 from collections.abc import Callable
 from dataclasses import dataclass
 from enum import auto
+from functools import lru_cache
 from typing import Final
 
-import cv2
 import numpy as np
 from ophyd_async.core import StrictEnum
 
 from dodal.log import LOGGER
+from dodal.utils import lazy_import
+
+cv2 = lazy_import("cv2")
 
 
 class ScanDirections(StrictEnum):
@@ -21,44 +24,59 @@ for description of functions below.
 """
 
 
+ArrayOperation = Callable[..., np.ndarray]
+"""Takes an array (and optionally a dst array to write the output to) and returns
+the processed array."""
+
+
+@lru_cache
+def _rect_kernel(ksize: int) -> np.ndarray:
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (ksize, ksize))
+    # Kernels are shared between callers so must not be modified
+    kernel.flags.writeable = False
+    return kernel
+
+
 def identity(*args, **kwargs) -> Callable[[np.ndarray], np.ndarray]:
     return lambda arr: arr
 
 
-def erode(ksize: int, iterations: int) -> Callable[[np.ndarray], np.ndarray]:
-    element = cv2.getStructuringElement(cv2.MORPH_RECT, (ksize, ksize))
-    return lambda arr: cv2.erode(arr, element, iterations=iterations)
+def erode(ksize: int, iterations: int) -> ArrayOperation:
+    element = _rect_kernel(ksize)
+    return lambda arr, dst=None: cv2.erode(arr, element, dst=dst, iterations=iterations)
 
 
-def dilate(ksize: int, iterations: int) -> Callable[[np.ndarray], np.ndarray]:
-    element = cv2.getStructuringElement(cv2.MORPH_RECT, (ksize, ksize))
-    return lambda arr: cv2.dilate(arr, element, iterations=iterations)
+def dilate(ksize: int, iterations: int) -> ArrayOperation:
+    element = _rect_kernel(ksize)
+    return lambda arr, dst=None: cv2.dilate(
+        arr, element, dst=dst, iterations=iterations
+    )
 
 
-def _morph(
-    ksize: int, iterations: int, morph_type: int
-) -> Callable[[np.ndarray], np.ndarray]:
-    element = cv2.getStructuringElement(cv2.MORPH_RECT, (ksize, ksize))
-    return lambda arr: cv2.morphologyEx(arr, morph_type, element, iterations=iterations)
+def _morph(ksize: int, iterations: int, morph_type: int) -> ArrayOperation:
+    element = _rect_kernel(ksize)
+    return lambda arr, dst=None: cv2.morphologyEx(
+        arr, morph_type, element, dst=dst, iterations=iterations
+    )
 
 
-def open_morph(ksize: int, iterations: int) -> Callable[[np.ndarray], np.ndarray]:
+def open_morph(ksize: int, iterations: int) -> ArrayOperation:
     return _morph(ksize=ksize, iterations=iterations, morph_type=cv2.MORPH_OPEN)
 
 
-def close(ksize: int, iterations: int) -> Callable[[np.ndarray], np.ndarray]:
+def close(ksize: int, iterations: int) -> ArrayOperation:
     return _morph(ksize=ksize, iterations=iterations, morph_type=cv2.MORPH_CLOSE)
 
 
-def gradient(ksize: int, iterations: int) -> Callable[[np.ndarray], np.ndarray]:
+def gradient(ksize: int, iterations: int) -> ArrayOperation:
     return _morph(ksize=ksize, iterations=iterations, morph_type=cv2.MORPH_GRADIENT)
 
 
-def top_hat(ksize: int, iterations: int) -> Callable[[np.ndarray], np.ndarray]:
+def top_hat(ksize: int, iterations: int) -> ArrayOperation:
     return _morph(ksize=ksize, iterations=iterations, morph_type=cv2.MORPH_TOPHAT)
 
 
-def black_hat(ksize: int, iterations: int) -> Callable[[np.ndarray], np.ndarray]:
+def black_hat(ksize: int, iterations: int) -> ArrayOperation:
     return _morph(ksize=ksize, iterations=iterations, morph_type=cv2.MORPH_BLACKHAT)
 
 
@@ -109,9 +127,69 @@ class SampleLocation:
     edge_bottom: np.ndarray
 
 
+@dataclass
+class SampleLocations:
+    """Holder type for results from sample detection on a stack of N frames.
+
+    tip_x and tip_y have shape (N,) and are NONE_VALUE for frames where no tip was
+    found. edge_top and edge_bottom have shape (N, width).
+    """
+
+    tip_x: np.ndarray
+    tip_y: np.ndarray
+    edge_top: np.ndarray
+    edge_bottom: np.ndarray
+
+    @property
+    def found(self) -> np.ndarray:
+        """Mask of the frames in which a tip was found."""
+        return self.tip_x != NONE_VALUE
+
+    def __len__(self) -> int:
+        return len(self.tip_x)
+
+    def __getitem__(self, index: int) -> SampleLocation:
+        found = bool(self.found[index])
+        return SampleLocation(
+            tip_x=int(self.tip_x[index]) if found else None,
+            tip_y=int(self.tip_y[index]) if found else None,
+            edge_top=self.edge_top[index],
+            edge_bottom=self.edge_bottom[index],
+        )
+
+
+STACK_CHUNK_SIZE: Final[int] = 32
+"""Number of frames of a stack whose edges are held in memory at once."""
+
+
+@dataclass
+class _FrameBuffers:
+    """Intermediate arrays reused between frames of the same shape and type."""
+
+    gray: np.ndarray
+    opened: np.ndarray
+    edges: np.ndarray
+    closed: np.ndarray
+
+    @classmethod
+    def for_frame(cls, arr: np.ndarray) -> "_FrameBuffers":
+        shape = arr.shape[:2]
+        return cls(
+            gray=np.empty(shape, dtype=arr.dtype),
+            opened=np.empty(shape, dtype=arr.dtype),
+            edges=np.empty(shape, dtype=np.uint8),
+            closed=np.empty(shape, dtype=np.uint8),
+        )
+
+
 class MxSampleDetect:
     """Configures sample detection parameters.
 
+    The morphological operations are compiled on the first frame and intermediate
+    arrays are reused for following frames of the same shape, so an instance should
+    be reused for as long as its parameters are unchanged. As the intermediate
+    arrays are shared, an instance must not process more than one frame at a time.
+
     Args:
         preprocess (Callable): A preprocessing function applied to the array after
             conversion to grayscale. See implementations of common functions above
@@ -156,36 +234,91 @@ class MxSampleDetect:
 
         self.min_tip_height = min_tip_height
 
-    def process_array(self, arr: np.ndarray) -> SampleLocation:
+        self._open: ArrayOperation | None = None
+        self._close: ArrayOperation | None = None
+        self._buffers: _FrameBuffers | None = None
+
+    def _compile(self, arr: np.ndarray) -> _FrameBuffers:
+        """Create the morphological operations if needed and buffers for the frame."""
+        if self._close is None:
+            if self.open_ksize != 0:
+                self._open = open_morph(self.open_ksize, self.open_iterations)
+            self._close = close(self.close_ksize, self.close_iterations)
+        if (
+            self._buffers is None
+            or self._buffers.gray.shape != arr.shape[:2]
+            or self._buffers.gray.dtype != arr.dtype
+        ):
+            self._buffers = _FrameBuffers.for_frame(arr)
+        return self._buffers
+
+    def _detect_edges(self, arr: np.ndarray, dst: np.ndarray | None = None):
+        buffers = self._compile(arr)
+        assert self._close is not None
+
         # Get a greyscale version of the input.
         if arr.ndim == 3:
-            gray_arr = cv2.cvtColor(arr, cv2.COLOR_BGR2GRAY)
+            gray_arr = cv2.cvtColor(arr, cv2.COLOR_BGR2GRAY, dst=buffers.gray)
         else:
             assert arr.ndim == 2
             gray_arr = arr
 
         # Remove Noises if open set to non-zero
-        if self.open_ksize == 0:
+        if self._open is None:
             open_arr = gray_arr
         else:
-            open_arr = open_morph(self.open_ksize, self.open_iterations)(gray_arr)
+            open_arr = self._open(gray_arr, dst=buffers.opened)
 
         # Preprocess the array. (Use the greyscale one.)
         pp_arr = self.preprocess(open_arr)
 
         # Find some edges.
-        edge_arr = cv2.Canny(pp_arr, self.canny_upper, self.canny_lower)
+        edge_arr = cv2.Canny(
+            pp_arr, self.canny_upper, self.canny_lower, edges=buffers.edges
+        )
 
-        closed_arr = close(self.close_ksize, self.close_iterations)(edge_arr)
+        return self._close(edge_arr, dst=buffers.closed if dst is None else dst)
 
+    def process_array(self, arr: np.ndarray) -> SampleLocation:
         # Find the sample.
-        return self._locate_sample(closed_arr)
+        return self._locate_sample(self._detect_edges(arr))
+
+    def process_stack(self, stack: np.ndarray) -> SampleLocations:
+        """Locate the sample in each frame of an (N, height, width) stack.
+
+        The stack may be memory-mapped, frames are read STACK_CHUNK_SIZE at a time.
+        Edge detection is done frame by frame but the sample is located in all
+        frames of a chunk at once.
+        """
+        if stack.ndim != 3:
+            raise ValueError(
+                f"Expected a stack of 2D frames but got array of shape {stack.shape}"
+            )
+        frames, height, width = stack.shape
+        edges = np.empty((min(frames, STACK_CHUNK_SIZE), height, width), np.uint8)
+        chunks = []
+        for start in range(0, frames, STACK_CHUNK_SIZE):
+            chunk = edges[: min(STACK_CHUNK_SIZE, frames - start)]
+            for i, frame in enumerate(stack[start : start + len(chunk)]):
+                self._detect_edges(np.ascontiguousarray(frame), dst=chunk[i])
+            chunks.append(self._locate_samples(chunk))
+        if len(chunks) == 1:
+            return chunks[0]
+        if not chunks:
+            return self._locate_samples(edges)
+        return SampleLocations(
+            tip_x=np.concatenate([c.tip_x for c in chunks]),
+            tip_y=np.concatenate([c.tip_y for c in chunks]),
+            edge_top=np.concatenate([c.edge_top for c in chunks]),
+            edge_bottom=np.concatenate([c.edge_bottom for c in chunks]),
+        )
 
     @staticmethod
     def _first_and_last_nonzero_by_columns(
         arr: np.ndarray,
     ) -> tuple[np.ndarray, np.ndarray]:
-        """Finds the indexes of the first & last non-zero values by column in a 2d array.
+        """Finds the indexes of the first & last non-zero values by column in a 2d array,
+        or in each frame of a stack of 2d arrays.
 
         Outputs will contain NONE_VALUE if no non-zero values exist in a column.
 
@@ -200,75 +333,91 @@ class MxSampleDetect:
         last_nonzero will be [1, 2, NONE_VALUE, 2]
         """
         nonzero = arr.astype(dtype=bool, copy=False)
-        any_nonzero_in_column = nonzero.any(axis=0)
+        any_nonzero_in_column = nonzero.any(axis=-2)
 
         first_nonzero = np.where(
-            any_nonzero_in_column, nonzero.argmax(axis=0), NONE_VALUE
+            any_nonzero_in_column, nonzero.argmax(axis=-2), NONE_VALUE
         )
 
-        flipped = nonzero.shape[0] - np.flip(nonzero, axis=0).argmax(axis=0) - 1
+        flipped = nonzero.shape[-2] - np.flip(nonzero, axis=-2).argmax(axis=-2) - 1
         last_nonzero = np.where(any_nonzero_in_column, flipped, NONE_VALUE)
 
         return first_nonzero, last_nonzero
 
     def _locate_sample(self, edge_arr: np.ndarray) -> SampleLocation:
-        edge_height, edge_width = edge_arr.shape
+        return self._locate_samples(edge_arr[np.newaxis])[0]
+
+    def _locate_samples(self, edge_stack: np.ndarray) -> SampleLocations:
+        frames, _, edge_width = edge_stack.shape
+        columns = np.arange(edge_width)
 
-        top, bottom = MxSampleDetect._first_and_last_nonzero_by_columns(edge_arr)
+        top, bottom = MxSampleDetect._first_and_last_nonzero_by_columns(edge_stack)
 
         # Calculate widths. In general if bottom == top this has width 1.
         # special case for bottom == top == NONE_VALUE (i.e. no edge at all), that has width 0.
-        widths = np.where(top != NONE_VALUE, bottom - top + 1, 0)
+        no_edge = top == NONE_VALUE
+        widths = np.where(no_edge, 0, bottom - top + 1)
 
-        # Generate the indices of columns with widths larger than the specified min tip height.
+        # Find the columns with widths larger than the specified min tip height.
         non_narrow_widths = widths >= self.min_tip_height
-        column_indices_with_non_narrow_widths = np.flatnonzero(non_narrow_widths)
+        found = non_narrow_widths.any(axis=1)
 
-        if column_indices_with_non_narrow_widths.shape[0] == 0:
+        if not found.all():
             # No non-narrow locations - sample not in picture?
             # Or wrong parameters for edge-finding, ...
             LOGGER.warning(
-                "pin-tip detection: No non-narrow edges found - cannot locate pin tip"
-            )
-            return SampleLocation(
-                tip_x=None, tip_y=None, edge_bottom=bottom, edge_top=top
+                f"pin-tip detection: No non-narrow edges found in {np.count_nonzero(~found)} of "
+                f"{frames} frame(s) - cannot locate pin tip"
             )
 
-        # Choose our starting point - i.e. first column with non-narrow width for positive scan, last one for negative scan.
+        # Choose our starting point - i.e. first column with non-narrow width for
+        # positive scan, last one for negative scan. Then move backwards to where
+        # there were no edges at all and forward one step, this is the tip.
         if self.scan_direction == ScanDirections.FORWARD:
-            x_step = -1
-            start_column = int(column_indices_with_non_narrow_widths[0])
+            start_column = non_narrow_widths.argmax(axis=1)
+            behind = no_edge & (columns < start_column[:, np.newaxis])
+            off_edge = ~behind.any(axis=1)
+            last_behind = edge_width - 1 - np.flip(behind, axis=1).argmax(axis=1)
+            tip_x = np.where(off_edge, 0, last_behind + 1)
+            past_tip = columns < tip_x[:, np.newaxis]
         else:
-            x_step = 1
-            start_column = int(column_indices_with_non_narrow_widths[-1])
-
-        x = start_column
-
-        # Move backwards to where there were no edges at all...
-        while top[x] != NONE_VALUE:
-            x += x_step
-            if (x_step < 0 and x < 0) or (x_step > 0 and x >= edge_width):
-                # (In this case the sample is off the edge of the picture.)
-                LOGGER.warning(
-                    "pin-tip detection: Pin tip may be outside image area - assuming at edge."
-                )
-                break
-        x -= x_step  # ...and forward one step. x is now at the tip.
+            start_column = edge_width - 1 - np.flip(non_narrow_widths, axis=1).argmax(1)
+            behind = no_edge & (columns > start_column[:, np.newaxis])
+            off_edge = ~behind.any(axis=1)
+            tip_x = np.where(off_edge, edge_width - 1, behind.argmax(axis=1) - 1)
+            past_tip = columns > tip_x[:, np.newaxis]
+
+        if (off_edge & found).any():
+            # (In this case the sample is off the edge of the picture.)
+            LOGGER.warning(
+                f"pin-tip detection: Pin tip may be outside image area in "
+                f"{np.count_nonzero(off_edge & found)} frame(s) - assuming at edge."
+            )
 
-        tip_x = x
-        tip_y = int(round(0.5 * (top[x] + bottom[x])))
+        frame_indices = np.arange(frames)
+        tip_y = np.rint(
+            0.5 * (top[frame_indices, tip_x] + bottom[frame_indices, tip_x])
+        ).astype(int)
 
         # clear edges to the left (right) of the tip.
-        if self.scan_direction == ScanDirections.FORWARD:
-            top[:x] = NONE_VALUE
-            bottom[:x] = NONE_VALUE
-        else:
-            top[x + 1 :] = NONE_VALUE
-            bottom[x + 1 :] = NONE_VALUE
-
-        LOGGER.info(
-            f"pin-tip detection: Successfully located pin tip at (x={tip_x}, y={tip_y})"
-        )
-        return SampleLocation(
-            tip_x=tip_x, tip_y=tip_y, edge_bottom=bottom, edge_top=top
+        past_tip &= found[:, np.newaxis]
+        top[past_tip] = NONE_VALUE
+        bottom[past_tip] = NONE_VALUE
+
+        locations = SampleLocations(
+            tip_x=np.where(found, tip_x, NONE_VALUE),
+            tip_y=np.where(found, tip_y, NONE_VALUE),
+            edge_top=top,
+            edge_bottom=bottom,
         )
+        if frames == 1 and found[0]:
+            LOGGER.info(
+                f"pin-tip detection: Successfully located pin tip at "
+                f"(x={locations.tip_x[0]}, y={locations.tip_y[0]})"
+            )
+        elif found.any():
+            LOGGER.info(
+                f"pin-tip detection: Successfully located pin tip in "
+                f"{np.count_nonzero(found)} of {frames} frames"
+            )
+        return locations
@@ -18,4 +18,4 @@ class Snapshot(MJPG):
         super().__init__(prefix, name)
 
     async def post_processing(self, image: Image.Image):
-        await self._save_image(image)
+        await self._save_unmodified_image(image)
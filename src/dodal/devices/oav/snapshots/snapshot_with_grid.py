@@ -1,9 +1,9 @@
-from os.path import join as path_join
+import asyncio
 
 from ophyd_async.core import soft_signal_rw
 from PIL.Image import Image
 
-from dodal.devices.areadetector.plugins.mjpg import IMG_FORMAT, MJPG, asyncio_save_image
+from dodal.devices.areadetector.plugins.mjpg import MJPG
 from dodal.devices.oav.snapshots.grid_overlay import (
     add_grid_border_overlay_to_image,
     add_grid_overlay_to_image,
@@ -32,33 +32,50 @@ class SnapshotWithGrid(MJPG):
         super().__init__(prefix, name, x_size_pv, y_size_pv)
 
     async def post_processing(self, image: Image):
-        # Save an unmodified image with no suffix
-        await self._save_image(image)
-
-        top_left_x = await self.top_left_x.get_value()
-        top_left_y = await self.top_left_y.get_value()
-        box_width = await self.box_width.get_value()
-        num_boxes_x = await self.num_boxes_x.get_value()
-        num_boxes_y = await self.num_boxes_y.get_value()
-        filename_str = await self.filename.get_value()
-        assert isinstance(filename_str, str)
-        directory_str = await self.directory.get_value()
-        assert isinstance(directory_str, str)
-
-        add_grid_border_overlay_to_image(
-            image, int(top_left_x), int(top_left_y), box_width, num_boxes_x, num_boxes_y
+        (
+            top_left_x,
+            top_left_y,
+            box_width,
+            num_boxes_x,
+            num_boxes_y,
+        ) = await asyncio.gather(
+            self.top_left_x.get_value(),
+            self.top_left_y.get_value(),
+            self.box_width.get_value(),
+            self.num_boxes_x.get_value(),
+            self.num_boxes_y.get_value(),
         )
 
-        path = path_join(directory_str, f"{filename_str}_outer_overlay.{IMG_FORMAT}")
-        await self.last_path_outer.set(path)
-        LOGGER.info(f"Saving grid outer edge at {path}")
-        await asyncio_save_image(image, path)
+        def draw_overlays() -> tuple[Image, Image]:
+            outer_overlay = image.copy()
+            add_grid_border_overlay_to_image(
+                outer_overlay,
+                int(top_left_x),
+                int(top_left_y),
+                box_width,
+                num_boxes_x,
+                num_boxes_y,
+            )
+            grid_overlay = outer_overlay.copy()
+            add_grid_overlay_to_image(
+                grid_overlay,
+                int(top_left_x),
+                int(top_left_y),
+                box_width,
+                num_boxes_x,
+                num_boxes_y,
+            )
+            return outer_overlay, grid_overlay
 
-        add_grid_overlay_to_image(
-            image, int(top_left_x), int(top_left_y), box_width, num_boxes_x, num_boxes_y
-        )
+        outer_overlay, grid_overlay = await asyncio.to_thread(draw_overlays)
 
-        path = path_join(directory_str, f"{filename_str}_grid_overlay.{IMG_FORMAT}")
-        await self.last_path_full_overlay.set(path)
-        LOGGER.info(f"Saving full grid overlay at {path}")
-        await asyncio_save_image(image, path)
+        # Save an unmodified image with no suffix, and the overlays, in parallel
+        _, outer_path, grid_path = await asyncio.gather(
+            self._save_unmodified_image(image),
+            self._save_image_to(outer_overlay, "_outer_overlay"),
+            self._save_image_to(grid_overlay, "_grid_overlay"),
+        )
+        LOGGER.info(f"Saved grid outer edge at {outer_path}")
+        await self.last_path_outer.set(outer_path)
+        LOGGER.info(f"Saved full grid overlay at {grid_path}")
+        await self.last_path_full_overlay.set(grid_path)
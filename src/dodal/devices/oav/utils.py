@@ -2,7 +2,6 @@ from collections.abc import Generator
 from enum import IntEnum
 
 import bluesky.plan_stubs as bps
-import cv2
 import numpy as np
 from bluesky.utils import Msg
 
@@ -13,6 +12,9 @@ from dodal.devices.oav.oav_calculations import (
 )
 from dodal.devices.oav.oav_detector import OAV
 from dodal.devices.oav.pin_image_recognition import PinTipDetection
+from dodal.utils import lazy_import
+
+cv2 = lazy_import("cv2")
 
 Pixel = tuple[int, int]
 
@@ -121,7 +123,7 @@ def wait_for_tip_to_be_found(
     return Pixel((int(found_tip[0]), int(found_tip[1])))
 
 
-def convert_to_gray_and_blur(data: cv2.typing.MatLike) -> cv2.typing.MatLike:
+def convert_to_gray_and_blur(data: "cv2.typing.MatLike") -> "cv2.typing.MatLike":
     """Preprocess the image array data (convert to grayscale and apply a gaussian blur)
     Image is converted to grayscale (using a weighted mean as green contributes more to
     brightness) as we aren't interested in data relating to colour. A blur is then
@@ -9,7 +9,9 @@ from daq_config_server.models.lookup_tables.insertion_device import (
 )
 from numpy import ndarray
 from ophyd_async.core import (
+    DEFAULT_TIMEOUT,
     AsyncStatus,
+    DeviceMock,
     Reference,
     StandardReadable,
     StandardReadableFormat,
@@ -19,6 +21,7 @@ from ophyd_async.core import (
 from ophyd_async.epics.core import epics_signal_r
 from ophyd_async.epics.motor import Motor
 
+from dodal.common.beamlines.config_cache import get_config_cache
 from dodal.common.enums import EnabledDisabledUpper
 from dodal.log import LOGGER
 
@@ -195,6 +198,19 @@ class UndulatorInKeV(BaseUndulator):
             name=name,
         )
 
+    async def connect(
+        self,
+        mock: bool | DeviceMock = False,
+        timeout: float = DEFAULT_TIMEOUT,
+        force_reconnect: bool = False,
+    ) -> None:
+        # Fetch the lookup table while the signals connect
+        if not mock and self.id_gap_lookup_table_path != os.devnull:
+            get_config_cache(self.config_server).prefetch(
+                self.id_gap_lookup_table_path, UndulatorEnergyGapLookupTable
+            )
+        await super().connect(mock, timeout, force_reconnect)
+
     @AsyncStatus.wrap
     async def set(self, value: float):
         """Check conditions and Set undulator gap to a given energy in keV.
@@ -213,10 +229,8 @@ class UndulatorInKeV(BaseUndulator):
         """Get a 2d np.array from lookup table that converts energies to undulator gap
         distance.
         """
-        energy_to_distance_table = self.config_server.get_file_contents(
-            self.id_gap_lookup_table_path,
-            UndulatorEnergyGapLookupTable,
-            reset_cached_result=True,
+        energy_to_distance_table = await get_config_cache(self.config_server).get_async(
+            self.id_gap_lookup_table_path, UndulatorEnergyGapLookupTable
         )
 
         # Use the lookup table to get the undulator gap associated with this dcm energy
@@ -0,0 +1,54 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import TypeVar
+
+from dodal.log import LOGGER
+
+T = TypeVar("T")
+
+
+async def latest_values(source: AsyncIterator[T]) -> AsyncIterator[T]:
+    """Iterate over an async iterator, skipping any values that arrive while the
+    consumer is still busy with a previous value.
+
+    The source is consumed in a background task so that a slow consumer always
+    receives the newest value rather than working through a backlog. Values that
+    arrive while the consumer is idle are passed on in order. Exceptions from the
+    source are raised once any pending value has been consumed.
+
+    Use with contextlib.aclosing so the background task is cancelled when the
+    consumer stops early.
+    """
+    pending: deque[T] = deque(maxlen=1)
+    available = asyncio.Event()
+    dropped = 0
+
+    async def pump():
+        nonlocal dropped
+        try:
+            async for value in source:
+                if pending:
+                    dropped += 1
+                pending.append(value)
+                available.set()
+                # Let an idle consumer take this value before fetching the next
+                await asyncio.sleep(0)
+        finally:
+            available.set()
+
+    pump_task = asyncio.create_task(pump())
+    try:
+        while True:
+            available.clear()
+            if pending:
+                yield pending.popleft()
+            elif pump_task.done():
+                pump_task.result()
+                return
+            else:
+                await available.wait()
+    finally:
+        pump_task.cancel()
+        if dropped:
+            LOGGER.debug(f"Skipped {dropped} stale values from {source}")
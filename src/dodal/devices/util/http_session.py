@@ -0,0 +1,37 @@
+import asyncio
+from typing import Any
+
+from dodal.utils import lazy_import
+
+aiohttp = lazy_import("aiohttp")
+
+
+class PersistentSession:
+    """An aiohttp session that is kept open between requests so that connections to
+    a server are pooled and reused (HTTP keep-alive) rather than opened per request.
+
+    The session is created on first use and recreated if it has been closed or is
+    used from a different event loop. Call close() when the owner is finished with it.
+
+    Args:
+        **session_kwargs: Passed to aiohttp.ClientSession when it is created.
+    """
+
+    def __init__(self, **session_kwargs: Any):
+        self._session_kwargs = session_kwargs
+        self._session: aiohttp.ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def get(self) -> "aiohttp.ClientSession":
+        """Get the open session, must be called from within the event loop."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = aiohttp.ClientSession(**self._session_kwargs)
+            self._loop = loop
+        return self._session
+
+    async def close(self):
+        if self._session is not None and self._loop is asyncio.get_running_loop():
+            await self._session.close()
+        self._session = None
+        self._loop = None
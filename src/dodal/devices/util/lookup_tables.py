@@ -53,6 +53,7 @@ def linear_interpolation_lut(
     values.
 
     If the value falls outside the lookup table then the closest value will be used.
+    The callable also accepts an array of values, returning an array.
     """
     # numpy interp expects x-values to be increasing
     if not np.all(np.diff(s_values) > 0):
@@ -66,8 +67,12 @@ def linear_interpolation_lut(
                 "Configuration lookup table does not monotonically increase or decrease."
             )
 
+    s_array = np.asarray(s_values, dtype=np.float64)
+    t_array = np.asarray(t_values, dtype=np.float64)
+
     def s_to_t2(s: float) -> float:
-        return float(interp(s, s_values, t_values))
+        t = interp(s, s_array, t_array)
+        return float(t) if np.ndim(t) == 0 else t
 
     return s_to_t2
 
@@ -78,6 +83,7 @@ def linear_extrapolation_lut(
     """Return a callable that implements f(s) = t according to the conversion table data
     supplied, with linear extrapolation outside that range. Inside the range of the
     table, the function is equivalent to that returned by linear_interpolation_lut.
+    The callable also accepts an array of values, returning an array.
 
     Args:
         s_values (Sequence[float]): Values of the independent axis.
@@ -95,6 +101,22 @@ def linear_extrapolation_lut(
     s_max = s_values[-1]
 
     def s_to_t(s: float) -> float:
+        if np.ndim(s) != 0:
+            s_array = np.asarray(s, dtype=np.float64)
+            return np.select(
+                [s_array < s_min, s_array > s_max],
+                [
+                    t_values[0]
+                    + (s_array - s_min)
+                    * (t_values[1] - t_values[0])
+                    / (s_values[1] - s_values[0]),
+                    t_values[-1]
+                    + (s_array - s_max)
+                    * (t_values[-1] - t_values[-2])
+                    / (s_values[-1] - s_values[-2]),
+                ],
+                interp(s_array),
+            )
         if s < s_min:
             return t_values[0] + (s - s_min) * (t_values[1] - t_values[0]) / (
                 s_values[1] - s_values[0]
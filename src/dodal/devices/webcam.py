@@ -3,7 +3,6 @@ from io import BytesIO
 from pathlib import Path
 
 import aiofiles
-from aiohttp import ClientSession
 from bluesky.protocols import Triggerable
 from ophyd_async.core import (
     AsyncStatus,
@@ -15,6 +14,9 @@ from PIL import Image
 from yarl import URL
 
 from dodal.log import LOGGER
+from dodal.utils import lazy_import
+
+aiohttp = lazy_import("aiohttp")
 
 PLACEHOLDER_IMAGE_SIZE = (1024, 768)
 IMAGE_FORMAT = "png"
@@ -43,7 +45,7 @@ class Webcam(StandardReadable, Triggerable):
             await file.write(image)
 
     async def _get_and_write_image(self, file_path: str):
-        async with ClientSession() as session:
+        async with aiohttp.ClientSession() as session:
             async with session.get(self.url) as response:
                 if not response.ok:
                     LOGGER.warning(
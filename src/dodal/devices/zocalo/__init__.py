@@ -1,4 +1,8 @@
-from dodal.devices.zocalo.zocalo_interaction import ZocaloStartInfo, ZocaloTrigger
+from dodal.devices.zocalo.zocalo_interaction import (
+    ZocaloStartInfo,
+    ZocaloTransport,
+    ZocaloTrigger,
+)
 from dodal.devices.zocalo.zocalo_results import (
     NoResultsFromZocaloError,
     NoZocaloSubscriptionError,
@@ -12,6 +16,7 @@ __all__ = [
     "ZocaloResults",
     "XrcResult",
     "ZocaloTrigger",
+    "ZocaloTransport",
     "get_full_processing_results",
     "NoResultsFromZocaloError",
     "NoZocaloSubscriptionError",
@@ -1,21 +1,34 @@
+from __future__ import annotations
+
 import dataclasses
 import getpass
 import os
 import socket
+import threading
+import time
+from collections.abc import Callable
 from dataclasses import dataclass
-
-import zocalo.configuration
-from workflows.transport import lookup
+from functools import partial
+from queue import Queue
+from typing import TYPE_CHECKING
 
 from dodal.devices.zocalo.zocalo_constants import ZOCALO_ENV
 from dodal.log import LOGGER
+from dodal.utils import lazy_import
+
+if TYPE_CHECKING:
+    from workflows.transport.common_transport import CommonTransport
+
+workflows = lazy_import("workflows")
+workflows_transport = lazy_import("workflows.transport")
+zocalo_configuration = lazy_import("zocalo.configuration")
 
 
 def _get_zocalo_connection(environment):
-    zc = zocalo.configuration.from_file()
+    zc = zocalo_configuration.from_file()
     zc.activate_environment(environment)
 
-    transport = lookup("PikaTransport")()
+    transport = workflows_transport.lookup("PikaTransport")()
     transport.connect()
     return transport
 
@@ -50,34 +63,187 @@ def _get_zocalo_headers() -> tuple[str, str]:
     return user, hostname
 
 
+@dataclass
+class ZocaloSendStats:
+    """Latency of messages sent to zocalo, in seconds."""
+
+    count: int = 0
+    last_s: float = 0.0
+    max_s: float = 0.0
+    total_s: float = 0.0
+
+    @property
+    def mean_s(self) -> float:
+        return self.total_s / self.count if self.count else 0.0
+
+    def record(self, latency_s: float):
+        self.count += 1
+        self.last_s = latency_s
+        self.max_s = max(self.max_s, latency_s)
+        self.total_s += latency_s
+
+
+class ZocaloTransport:
+    """A long-lived connection to zocalo which is made on first use and remade if it
+    drops, rather than connecting for every message. Sending is serialised as
+    transports are not thread safe.
+
+    Args:
+        environment (str): The zocalo environment to connect to.
+        transport_factory (Callable, optional): Returns a connected transport,
+            defaults to connecting to the environment's PikaTransport.
+    """
+
+    def __init__(
+        self,
+        environment: str = ZOCALO_ENV,
+        transport_factory: Callable[[], CommonTransport] | None = None,
+    ):
+        self.environment = environment
+        self._transport_factory = transport_factory or partial(
+            _get_zocalo_connection, environment
+        )
+        self._transport: CommonTransport | None = None
+        self._lock = threading.Lock()
+        self.stats = ZocaloSendStats()
+
+    def _connected_transport(self) -> CommonTransport:
+        if self._transport is None or not self._transport.is_connected():
+            LOGGER.info(f"Connecting to zocalo environment {self.environment}")
+            self._transport = self._transport_factory()
+        return self._transport
+
+    def send(self, destination: str, message: dict, headers: dict):
+        """Send a message, reconnecting and retrying once if the connection has
+        dropped. Other errors are raised without retrying as the message may already
+        have been sent. A message zocalo received just before the connection dropped
+        will still be sent twice.
+        """
+        with self._lock:
+            start = time.monotonic()
+            try:
+                self._connected_transport().send(destination, message, headers=headers)
+            except workflows.Disconnected as e:
+                LOGGER.warning(f"Failed to send to zocalo, reconnecting: {e}")
+                self._disconnect()
+                self._connected_transport().send(destination, message, headers=headers)
+            latency_s = time.monotonic() - start
+            self.stats.record(latency_s)
+            LOGGER.debug(f"Sent message to zocalo in {latency_s * 1000:.1f}ms")
+
+    def _disconnect(self):
+        transport, self._transport = self._transport, None
+        if transport is not None:
+            try:
+                transport.disconnect()
+            except Exception as e:
+                LOGGER.warning(f"Error disconnecting from zocalo: {e}")
+
+    def disconnect(self):
+        with self._lock:
+            self._disconnect()
+
+
+_shared_transports: dict[str, ZocaloTransport] = {}
+_shared_transports_lock = threading.Lock()
+
+
+def get_shared_transport(environment: str = ZOCALO_ENV) -> ZocaloTransport:
+    """Get the ZocaloTransport shared by all ZocaloTriggers for an environment."""
+    with _shared_transports_lock:
+        if environment not in _shared_transports:
+            _shared_transports[environment] = ZocaloTransport(environment)
+        return _shared_transports[environment]
+
+
+def disconnect_shared_transports():
+    with _shared_transports_lock:
+        transports = list(_shared_transports.values())
+        _shared_transports.clear()
+    for transport in transports:
+        transport.disconnect()
+
+
 class ZocaloTrigger:
     """This class just sends 'run_start' and 'run_end' messages to zocalo, it is
     intended to be used in bluesky callback classes. To get results from zocalo back
     into a plan, use the ZocaloResults ophyd device.
 
+    Messages are sent over a connection shared by all triggers for the same
+    environment. If background is set, messages are queued and sent from a worker
+    thread so that run_start and run_end return immediately; errors sending are then
+    logged rather than raised. Use flush to wait for queued messages to be sent.
+
     see https://diamondlightsource.github.io/dodal/main/how-to/zocalo.html for
     more information about zocalo.
+
+    Args:
+        environment (str, optional): The zocalo environment to send to.
+        transport (ZocaloTransport, optional): The connection to send messages over,
+            defaults to the shared connection for the environment.
+        background (bool, optional): Send messages from a worker thread.
     """
 
-    def __init__(self, environment: str = ZOCALO_ENV):
+    def __init__(
+        self,
+        environment: str = ZOCALO_ENV,
+        transport: ZocaloTransport | None = None,
+        background: bool = False,
+    ):
         self.zocalo_environment: str = environment
+        self.transport = transport or get_shared_transport(environment)
+        self._outbound: Queue[dict | None] | None = None
+        self._sender: threading.Thread | None = None
+        if background:
+            self._outbound = Queue()
+            self._sender = threading.Thread(
+                target=self._send_queued, name="zocalo_trigger", daemon=True
+            )
+            self._sender.start()
+
+    def _send_now(self, parameters: dict):
+        message = {
+            "recipes": ["mimas"],
+            "parameters": parameters,
+        }
+        user, hostname = _get_zocalo_headers()
+        header = {
+            "zocalo.go.user": user,
+            "zocalo.go.host": hostname,
+        }
+        self.transport.send("processing_recipe", message, headers=header)
+
+    def _send_queued(self):
+        assert self._outbound is not None
+        while True:
+            parameters = self._outbound.get()
+            try:
+                if parameters is None:
+                    return
+                self._send_now(parameters)
+            except Exception as e:
+                LOGGER.error(f"Failed to send {parameters} to zocalo: {e}")
+            finally:
+                self._outbound.task_done()
 
     def _send_to_zocalo(self, parameters: dict):
-        transport = _get_zocalo_connection(self.zocalo_environment)
+        if self._outbound is None:
+            self._send_now(parameters)
+        else:
+            self._outbound.put(parameters)
 
-        try:
-            message = {
-                "recipes": ["mimas"],
-                "parameters": parameters,
-            }
-            user, hostname = _get_zocalo_headers()
-            header = {
-                "zocalo.go.user": user,
-                "zocalo.go.host": hostname,
-            }
-            transport.send("processing_recipe", message, headers=header)
-        finally:
-            transport.disconnect()
+    def flush(self):
+        """Wait until all queued messages have been sent."""
+        if self._outbound is not None:
+            self._outbound.join()
+
+    def close(self):
+        """Send any queued messages then stop the worker thread, if there is one."""
+        if self._outbound is not None and self._sender is not None:
+            self._outbound.put(None)
+            self._sender.join()
+            self._outbound = None
+            self._sender = None
 
     def run_start(
         self,
@@ -1,13 +1,12 @@
+from __future__ import annotations
+
 import asyncio
 from collections.abc import Generator, Sequence
 from enum import StrEnum
-from queue import Empty, Queue
-from typing import Any, TypedDict
+from typing import TYPE_CHECKING, Any, TypedDict
 
 import bluesky.plan_stubs as bps
 import numpy as np
-import workflows.recipe
-import workflows.transport
 from bluesky.protocols import Triggerable
 from bluesky.utils import Msg
 from ophyd_async.core import (
@@ -17,11 +16,16 @@ from ophyd_async.core import (
     StandardReadableFormat,
     soft_signal_r_and_setter,
 )
-from workflows.transport.common_transport import CommonTransport
 
 from dodal.devices.zocalo.zocalo_constants import ZOCALO_ENV
 from dodal.devices.zocalo.zocalo_interaction import _get_zocalo_connection
 from dodal.log import LOGGER
+from dodal.utils import lazy_import
+
+if TYPE_CHECKING:
+    from workflows.transport.common_transport import CommonTransport
+
+workflows_recipe = lazy_import("workflows.recipe")
 
 
 class NoResultsFromZocaloError(Exception):
@@ -119,6 +123,11 @@ class ZocaloResults(StandardReadable, Triggerable):
         prefix (str): EPICS PV prefix for the device.
         results_source (ZocaloSource, optional): Where to get results from, GPU or CPU
             analysis.
+
+    Results are handed from the Zocalo consumer thread to the event loop the device
+    was staged in and queued separately for each source, so waiting for results does
+    not block the event loop. Results from the source that is not used by trigger are
+    kept and can be awaited with wait_for_raw_results.
     """
 
     def __init__(
@@ -134,7 +143,10 @@ class ZocaloResults(StandardReadable, Triggerable):
         self.sort_key = SortKeys[sort_key]
         self.channel = channel
         self.timeout_s = timeout_s
-        self._raw_results_received: Queue = Queue()
+        self._raw_results_received: dict[ZocaloSource, asyncio.Queue[dict]] = {
+            source: asyncio.Queue() for source in ZocaloSource
+        }
+        self._loop: asyncio.AbstractEventLoop | None = None
         self.transport: CommonTransport | None = None
         self.results_source = results_source
 
@@ -196,7 +208,35 @@ class ZocaloResults(StandardReadable, Triggerable):
 
     def _clear_old_results(self):
         LOGGER.info("Clearing queue")
-        self._raw_results_received = Queue()
+        self._raw_results_received = {
+            source: asyncio.Queue() for source in ZocaloSource
+        }
+
+    def _put_raw_results(self, raw_results: dict):
+        """Queue results by their source, must be called from the device's loop."""
+        source = ZocaloSource(source_from_results(raw_results))
+        if source != self.results_source:
+            LOGGER.info(
+                f"Received {source} results, this device is configured to use "
+                f"{self.results_source} results so they will not be used by trigger"
+            )
+        self._raw_results_received[source].put_nowait(raw_results)
+
+    async def wait_for_raw_results(self, source: ZocaloSource | None = None) -> dict:
+        """Wait up to timeout_s for the next results from a source, by default the
+        results_source of this device.
+        """
+        queue = self._raw_results_received[source or self.results_source]
+        LOGGER.info(f"waiting for results in queue - currently {queue.qsize()} items")
+        if not queue.empty():
+            return queue.get_nowait()
+        try:
+            return await asyncio.wait_for(queue.get(), timeout=self.timeout_s)
+        except TimeoutError as timeout_exception:
+            LOGGER.warning("Timed out waiting for zocalo results!")
+            raise NoResultsFromZocaloError(
+                "Timed out waiting for Zocalo results"
+            ) from timeout_exception
 
     @AsyncStatus.wrap
     async def stage(self):
@@ -206,6 +246,7 @@ class ZocaloResults(StandardReadable, Triggerable):
         before triggering processing for the experiment.
         """
         LOGGER.info("Subscribing to results queue")
+        self._loop = asyncio.get_running_loop()
         try:
             self._subscribe_to_results()
         except Exception as e:
@@ -235,21 +276,7 @@ class ZocaloResults(StandardReadable, Triggerable):
             raise NoZocaloSubscriptionError(msg)
 
         try:
-            LOGGER.info(
-                f"waiting for results in queue - currently {self._raw_results_received.qsize()} items"
-            )
-
-            while True:
-                raw_results = self._raw_results_received.get(timeout=self.timeout_s)
-                source_of_results = source_from_results(raw_results)
-
-                if source_of_results != self.results_source:
-                    LOGGER.warning(
-                        f"Configured to use {self.results_source} results but {source_of_results} came first, waiting for further results."
-                    )
-                else:
-                    break
-
+            raw_results = await self.wait_for_raw_results()
             LOGGER.info(
                 f"Zocalo results: found {len(raw_results['results'])} crystals."
             )
@@ -262,11 +289,6 @@ class ZocaloResults(StandardReadable, Triggerable):
                 ),
                 raw_results["recipe_parameters"],
             )
-        except Empty as timeout_exception:
-            LOGGER.warning("Timed out waiting for zocalo results!")
-            raise NoResultsFromZocaloError(
-                "Timed out waiting for Zocalo results"
-            ) from timeout_exception
         finally:
             self._kickoff_run = False
 
@@ -274,7 +296,7 @@ class ZocaloResults(StandardReadable, Triggerable):
         self.transport = _get_zocalo_connection(self.zocalo_environment)
 
         def _receive_result(
-            rw: workflows.recipe.RecipeWrapper, header: dict, message: dict
+            rw: workflows_recipe.RecipeWrapper, header: dict, message: dict
         ) -> None:
             LOGGER.info(f"Received {message}")
             recipe_parameters = rw.recipe_step["parameters"]  # type: ignore # this rw is initialised with a message so recipe step is not None
@@ -283,11 +305,13 @@ class ZocaloResults(StandardReadable, Triggerable):
 
             results = message.get("results", [])
 
-            self._raw_results_received.put(
-                {"results": results, "recipe_parameters": recipe_parameters}
+            assert self._loop, "Results received before device was staged"
+            self._loop.call_soon_threadsafe(
+                self._put_raw_results,
+                {"results": results, "recipe_parameters": recipe_parameters},
             )
 
-        subscription = workflows.recipe.wrap_subscribe(
+        subscription = workflows_recipe.wrap_subscribe(
             self.transport,
             self.channel,
             _receive_result,
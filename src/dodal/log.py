@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import copy
 import logging
 from collections import deque
+from dataclasses import dataclass
+from enum import Enum
 from logging import Logger, StreamHandler
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from os import environ
 from pathlib import Path
-from typing import TypedDict
+from queue import Empty, Full, Queue
+from typing import TypedDict, TypeVar
 
 from bluesky.log import logger as bluesky_logger
 from graypy import GELFTCPHandler
@@ -22,6 +26,7 @@ ERROR_LOG_BUFFER_LINES = 20000
 INFO_LOG_DAYS = 30
 DEBUG_LOG_FILES_TO_KEEP = 7
 DEFAULT_GRAYLOG_PORT = 12231
+DEFAULT_LOG_QUEUE_SIZE = 50000
 
 # Temporarily duplicated https://github.com/bluesky/ophyd-async/issues/550
 DEFAULT_FORMAT = (
@@ -93,6 +98,138 @@ class CircularMemoryHandler(logging.Handler):
             self.release()
 
 
+class QueueFullPolicy(Enum):
+    """What a NonBlockingHandler does with a record when its queue is full."""
+
+    DROP_OLDEST = "drop_oldest"
+    """Discard the oldest queued record to make room, so the newest records (eg the
+    error that caused the backlog) are kept."""
+    DROP_NEWEST = "drop_newest"
+    """Discard the incoming record."""
+    BLOCK = "block"
+    """Wait up to the block timeout for space before discarding the incoming record,
+    slowing down the logging thread rather than losing records."""
+
+
+@dataclass(frozen=True)
+class LogQueueConfig:
+    size: int = DEFAULT_LOG_QUEUE_SIZE
+    policy: QueueFullPolicy = QueueFullPolicy.DROP_OLDEST
+    block_timeout_s: float = 0.1
+
+
+@dataclass
+class LogQueueMetrics:
+    """Counts of how a NonBlockingHandler's queue has coped with the records logged.
+
+    Attributes:
+        enqueued (int): Records added to the queue.
+        dropped (int): Records discarded because the queue was full.
+        blocked (int): Records that had to wait for space in the queue.
+        high_water_mark (int): The most records that have been queued at once.
+    """
+
+    enqueued: int = 0
+    dropped: int = 0
+    blocked: int = 0
+    high_water_mark: int = 0
+
+
+class _LogQueueListener(QueueListener):
+    def enqueue_sentinel(self):
+        # Wait for space rather than fail to stop when the queue is full
+        self.queue.put(self._sentinel)
+
+
+class NonBlockingHandler(QueueHandler):
+    """Passes records to a target handler on a background thread, so that a slow
+    target (eg graylog over the network, or a CircularMemoryHandler writing its
+    buffer to file) does not hold up the thread that logged them.
+
+    Records are queued with their arguments merged into the message, but are not
+    formatted, the target formats them on the background thread. The queue is bounded
+    and the `policy` attribute decides what happens when it is full, with counts of
+    what happened kept in the `metrics` attribute. Records below the level of the
+    target are not queued.
+
+    The NonBlockingHandler becomes the owner of the target handler which will be
+    closed on close of this handler.
+    """
+
+    def __init__(self, target: logging.Handler, config: LogQueueConfig | None = None):
+        config = config or LogQueueConfig()
+        super().__init__(Queue(maxsize=config.size))
+        self.target = target
+        self.policy = config.policy
+        self.block_timeout_s = config.block_timeout_s
+        self.metrics = LogQueueMetrics()
+        self.setLevel(target.level)
+        self._listener = _LogQueueListener(
+            self.queue, target, respect_handler_level=True
+        )
+        self._listener.start()
+        self._listening = True
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The arguments may change before the target handles the record, so merge
+        # them into the message now, but leave the formatting to the target
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        # Called with this handler's lock held, which protects the metrics
+        queue: Queue = self.queue  # type: ignore
+        try:
+            queue.put_nowait(record)
+        except Full:
+            self._enqueue_when_full(queue, record)
+        else:
+            self.metrics.enqueued += 1
+        self.metrics.high_water_mark = max(self.metrics.high_water_mark, queue.qsize())
+
+    def _enqueue_when_full(self, queue: Queue, record: logging.LogRecord):
+        match self.policy:
+            case QueueFullPolicy.DROP_OLDEST:
+                try:
+                    queue.get_nowait()
+                    queue.task_done()
+                    self.metrics.dropped += 1
+                except Empty:
+                    pass
+                queue.put_nowait(record)
+                self.metrics.enqueued += 1
+            case QueueFullPolicy.DROP_NEWEST:
+                self.metrics.dropped += 1
+            case QueueFullPolicy.BLOCK:
+                self.metrics.blocked += 1
+                try:
+                    queue.put(record, timeout=self.block_timeout_s)
+                    self.metrics.enqueued += 1
+                except Full:
+                    self.metrics.dropped += 1
+
+    @property
+    def queue_depth(self) -> int:
+        return self.queue.qsize()  # type: ignore
+
+    def flush(self):
+        """Wait for every queued record to be passed to the target."""
+        self.queue.join()  # type: ignore
+
+    def close(self):
+        self.acquire()
+        try:
+            if self._listening:
+                self._listener.stop()
+                self._listening = False
+            self.target.close()
+            logging.Handler.close(self)
+        finally:
+            self.release()
+
+
 class BeamlineFilter(logging.Filter):
     beamline: str | None = environ.get("BEAMLINE")
 
@@ -117,31 +254,52 @@ def set_beamline(beamline_name: str):
 
 class DodalLogHandlers(TypedDict):
     stream_handler: StreamHandler
-    graylog_handler: GELFTCPHandler
-    info_file_handler: TimedRotatingFileHandler
-    debug_memory_handler: CircularMemoryHandler
+    graylog_handler: GELFTCPHandler | NonBlockingHandler
+    info_file_handler: TimedRotatingFileHandler | NonBlockingHandler
+    debug_memory_handler: CircularMemoryHandler | NonBlockingHandler
 
 
-def _add_handler(logger: logging.Logger, handler: logging.Handler):
+_HandlerT = TypeVar("_HandlerT", bound=logging.Handler)
+
+
+def _add_handler(
+    logger: logging.Logger,
+    handler: _HandlerT,
+    log_queue: LogQueueConfig | None = None,
+) -> _HandlerT | NonBlockingHandler:
+    """Add handler to logger, behind a NonBlockingHandler if log_queue is given.
+
+    Returns:
+        The handler added to the logger, which is the one to remove from it and close.
+    """
     print(f"adding handler {handler} to logger {logger}, at level: {handler.level}")
     handler.setFormatter(DEFAULT_FORMATTER)
-    logger.addHandler(handler)
+    added = handler if log_queue is None else NonBlockingHandler(handler, log_queue)
+    logger.addHandler(added)
+    return added
 
 
-def set_up_graylog_handler(logger: Logger, host: str, port: int):
+def set_up_graylog_handler(
+    logger: Logger, host: str, port: int, log_queue: LogQueueConfig | None = None
+):
     """Set up a graylog handler for the logger, at "INFO" level, with the at the
     specified address and host. get_graylog_configuration() can provide these values
-    for prod and dev respectively.
+    for prod and dev respectively. If log_queue is given, records are sent from a
+    background thread through a queue with that configuration, and the
+    NonBlockingHandler that does so is returned.
     """
     graylog_handler = GELFTCPHandler(host, port)
     graylog_handler.setLevel(logging.INFO)
-    _add_handler(logger, graylog_handler)
-    return graylog_handler
+    return _add_handler(logger, graylog_handler, log_queue)
 
 
-def set_up_info_file_handler(logger, path: Path, filename: str):
+def set_up_info_file_handler(
+    logger, path: Path, filename: str, log_queue: LogQueueConfig | None = None
+):
     """Set up a file handler for the logger, at INFO level, which will keep 30 days
-    of logs, rotating once per day. Creates the directory if necessary.
+    of logs, rotating once per day. Creates the directory if necessary. If log_queue
+    is given, records are written from a background thread, and the
+    NonBlockingHandler that does so is returned.
     """
     print(f"Logging to INFO file handler {path / filename}")
     path.mkdir(parents=True, exist_ok=True)
@@ -149,16 +307,20 @@ def set_up_info_file_handler(logger, path: Path, filename: str):
         filename=path / filename, when="MIDNIGHT", backupCount=INFO_LOG_DAYS
     )
     file_handler.setLevel(logging.INFO)
-    _add_handler(logger, file_handler)
-    return file_handler
+    return _add_handler(logger, file_handler, log_queue)
 
 
 def set_up_debug_memory_handler(
-    logger: Logger, path: Path, filename: str, capacity: int
+    logger: Logger,
+    path: Path,
+    filename: str,
+    capacity: int,
+    log_queue: LogQueueConfig | None = None,
 ):
     """Set up a Memory handler which holds 200k lines, and writes them to an hourly
     log file when it sees a message of severity ERROR. Creates the directory if
-    necessary.
+    necessary. If log_queue is given, records are buffered and written from a
+    background thread, and the NonBlockingHandler that does so is returned.
     """
     debug_path = path / "debug"
     print(f"Logging to DEBUG handler {debug_path / filename}")
@@ -175,8 +337,7 @@ def set_up_debug_memory_handler(
     )
     memory_handler.setLevel(logging.DEBUG)
     memory_handler.addFilter(beamline_filter)
-    _add_handler(logger, memory_handler)
-    return memory_handler
+    return _add_handler(logger, memory_handler, log_queue)
 
 
 def set_up_stream_handler(logger: Logger):
@@ -194,9 +355,14 @@ def set_up_all_logging_handlers(
     error_log_buffer_lines: int,
     graylog_port: int | None = None,
     debug_logging_path: Path | None = None,
+    log_queue: LogQueueConfig | None = None,
 ) -> DodalLogHandlers:
     """Set up the default logging environment.
 
+    If log_queue is given then, apart from the stream handler, the handlers are added
+    to the logger behind NonBlockingHandlers, each with its own queue and background
+    thread, so that logging never waits for graylog or for log files to be written.
+
     Args:
         logger (Logger): The logging.Logger object to apply all the handlers to.
         logging_path (Path): The location to store log files.
@@ -209,18 +375,29 @@ def set_up_all_logging_handlers(
             the default dodal port
         debug_logging_path (Path, optional): The location to store debug log files, if
             None uses `logging_path`
+        log_queue (LogQueueConfig, optional): The size and full queue policy of the
+            queues, if None (the default) the handlers are called on the logging
+            thread
 
     Returns:
-        A DodaLogHandlers TypedDict with the created handlers.
+        A DodaLogHandlers TypedDict with the handlers added to the logger. If
+        log_queue is given, the handlers that are queued are returned as their
+        NonBlockingHandler, with the handler itself as its target.
     """
     handlers: DodalLogHandlers = {
         "stream_handler": set_up_stream_handler(logger),
         "graylog_handler": set_up_graylog_handler(
-            logger, *get_graylog_configuration(dev_mode, graylog_port)
+            logger, *get_graylog_configuration(dev_mode, graylog_port), log_queue
+        ),
+        "info_file_handler": set_up_info_file_handler(
+            logger, logging_path, filename, log_queue
         ),
-        "info_file_handler": set_up_info_file_handler(logger, logging_path, filename),
         "debug_memory_handler": set_up_debug_memory_handler(
-            logger, debug_logging_path or logging_path, filename, error_log_buffer_lines
+            logger,
+            debug_logging_path or logging_path,
+            filename,
+            error_log_buffer_lines,
+            log_queue,
         ),
     }
 
@@ -241,6 +418,8 @@ def do_default_logging_setup(dev_mode=False, graylog_port: int | None = None):
     """Function to set up default logging including graylog and bluesky and ophyd logs.
     Only required if dodal is NOT managed by BlueAPI.
 
+    Graylog and the log files are written to from background threads, see
+    NonBlockingHandler.
     """
     logging_path, debug_logging_path = get_logging_file_paths()
     set_up_all_logging_handlers(
@@ -251,6 +430,7 @@ def do_default_logging_setup(dev_mode=False, graylog_port: int | None = None):
         ERROR_LOG_BUFFER_LINES,
         graylog_port,
         debug_logging_path,
+        LogQueueConfig(),
     )
     integrate_bluesky_and_ophyd_logging(LOGGER)
 
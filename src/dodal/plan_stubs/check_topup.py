@@ -1,6 +1,14 @@
+import asyncio
+import contextlib
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from functools import partial
 from typing import Any
 
 import bluesky.plan_stubs as bps
+from bluesky.protocols import Stageable
+from ophyd_async.core import AsyncStatus, Device, Reference, SignalR
 
 from dodal.common.beamlines.beamline_parameters import (
     get_beamline_parameters,
@@ -43,10 +51,14 @@ def _gating_permitted(machine_mode: SynchrotronMode):
     return False
 
 
+def _gating_enabled(machine_mode: SynchrotronMode, time_to_topup_s: float) -> bool:
+    return not _in_decay_mode(time_to_topup_s) and _gating_permitted(machine_mode)
+
+
 def _delay_to_avoid_topup(
     total_run_time_s: float,
     time_to_topup_s: float,
-    topup_configuration: dict,
+    thresholds: "TopupThresholds",
     total_exposure_time_s: float,
 ) -> bool:
     """Determine whether we should delay collection until after a topup. Generally
@@ -58,13 +70,11 @@ def _delay_to_avoid_topup(
     Args:
         total_run_time_s (float): Anticipated time until end of the collection in seconds.
         time_to_topup_s (float): Time to the start of the topup as measured from the PV.
-        topup_configuration (dict): Configuration dictionary.
+        thresholds (TopupThresholds): Thresholds from the top-up configuration.
         total_exposure_time_s (float): Total exposure time of the sample in s.
     """
     if total_run_time_s > time_to_topup_s:
-        limit_s = topup_configuration.get(
-            TopupConfig.THRESHOLD_EXPOSURE_S, DEFAULT_THRESHOLD_EXPOSURE_S
-        )
+        limit_s = thresholds.threshold_exposure_s
         gate = total_exposure_time_s < limit_s
         if gate:
             LOGGER.info(f"""
@@ -83,6 +93,20 @@ def _delay_to_avoid_topup(
     return False
 
 
+def _time_to_wait_s(
+    total_run_time_s: float,
+    time_to_topup_s: float,
+    time_to_topup_end_s: float,
+    thresholds: "TopupThresholds",
+    total_exposure_time_s: float,
+) -> float:
+    """Time to wait before starting a collection, when gating is enabled."""
+    should_wait = _delay_to_avoid_topup(
+        total_run_time_s, time_to_topup_s, thresholds, total_exposure_time_s
+    )
+    return time_to_topup_end_s + thresholds.gate_delay_s if should_wait else 0.0
+
+
 def wait_for_topup_complete(synchrotron: Synchrotron):
     LOGGER.info("Waiting for topup to complete")
     start = yield from bps.rd(synchrotron.top_up_start_countdown)
@@ -95,6 +119,7 @@ def check_topup_and_wait_if_necessary(
     synchrotron: Synchrotron,
     total_exposure_time: float,
     ops_time: float,  # Account for xray centering, rotation speed, etc
+    topup_gate: "TopupGate | None" = None,
 ):  # See https://github.com/DiamondLightSource/hyperion/issues/932
     """A small plan to check if topup gating is permitted and sleep until the topup
         is over if it starts before the end of collection.
@@ -105,26 +130,28 @@ def check_topup_and_wait_if_necessary(
             seconds.
         ops_time (float): Additional time to account for various operations, eg. x-ray
             centering, in seconds. Defaults to 30.0.
+        topup_gate (TopupGate, optional): If given, the synchrotron state and top-up
+            configuration are taken from the gate rather than read on each call.
     """
+    if topup_gate is not None:
+        yield from wait_for_safe_collection_window(
+            topup_gate, total_exposure_time, ops_time
+        )
+        return
     machine_mode = yield from bps.rd(synchrotron.synchrotron_mode)
     assert isinstance(machine_mode, SynchrotronMode)
     time_to_topup = yield from bps.rd(synchrotron.top_up_start_countdown)
-    if _in_decay_mode(time_to_topup) or not _gating_permitted(machine_mode):
+    if not _gating_enabled(machine_mode, time_to_topup):
         yield from bps.null()
         return
-    tot_run_time = total_exposure_time + ops_time
     end_topup = yield from bps.rd(synchrotron.top_up_end_countdown)
-    topup_configuration = _load_topup_configuration_from_properties_file()
-    should_wait = _delay_to_avoid_topup(
-        tot_run_time,
+    time_to_wait = _time_to_wait_s(
+        total_exposure_time + ops_time,
         time_to_topup,
-        topup_configuration,
+        end_topup,
+        _load_topup_thresholds(),
         total_exposure_time,
     )
-    topup_gate_delay = topup_configuration.get(
-        TopupConfig.TOPUP_GATE_DELAY_S, DEFAULT_TOPUP_GATE_DELAY_S
-    )
-    time_to_wait = end_topup + topup_gate_delay if should_wait else 0.0
 
     yield from bps.sleep(time_to_wait)
 
@@ -136,3 +163,233 @@ def check_topup_and_wait_if_necessary(
 def _load_topup_configuration_from_properties_file() -> dict[str, Any]:
     params = get_beamline_parameters(get_beamline_name("i03"))
     return params
+
+
+@dataclass(frozen=True)
+class TopupThresholds:
+    threshold_exposure_s: float = DEFAULT_THRESHOLD_EXPOSURE_S
+    gate_delay_s: float = DEFAULT_TOPUP_GATE_DELAY_S
+
+    @classmethod
+    def from_configuration(cls, topup_configuration: dict) -> "TopupThresholds":
+        return cls(
+            threshold_exposure_s=topup_configuration.get(
+                TopupConfig.THRESHOLD_EXPOSURE_S, DEFAULT_THRESHOLD_EXPOSURE_S
+            ),
+            gate_delay_s=topup_configuration.get(
+                TopupConfig.TOPUP_GATE_DELAY_S, DEFAULT_TOPUP_GATE_DELAY_S
+            ),
+        )
+
+
+def _load_topup_thresholds() -> TopupThresholds:
+    return TopupThresholds.from_configuration(
+        _load_topup_configuration_from_properties_file()
+    )
+
+
+@dataclass(frozen=True)
+class SafeCollectionWindow:
+    """The synchrotron state that top-up gating depends on, as last reported.
+
+    Attributes:
+        machine_mode (SynchrotronMode): The mode of the synchrotron.
+        time_to_topup_s (float): The top-up start countdown.
+        time_to_topup_end_s (float): The top-up end countdown.
+        topup_updated_at (float): time.time() at which the start countdown was last
+            updated.
+        topup_end_updated_at (float): time.time() at which the end countdown was last
+            updated.
+    """
+
+    machine_mode: SynchrotronMode = SynchrotronMode.UNKNOWN
+    time_to_topup_s: float = DECAY_MODE_COUNTDOWN
+    time_to_topup_end_s: float = 0.0
+    topup_updated_at: float = 0.0
+    topup_end_updated_at: float = 0.0
+
+    @property
+    def gating_enabled(self) -> bool:
+        return _gating_enabled(self.machine_mode, self.time_to_topup_s)
+
+    @property
+    def topup_in_progress(self) -> bool:
+        return self.time_to_topup_s == COUNTDOWN_DURING_TOPUP
+
+    def predict(self, now: float) -> tuple[float, float]:
+        """The top-up start and end countdowns at time now, assuming each has kept
+        counting down since it was last updated.
+        """
+        time_to_topup = self.time_to_topup_s
+        if time_to_topup > COUNTDOWN_DURING_TOPUP:
+            elapsed = max(now - self.topup_updated_at, 0)
+            time_to_topup = max(time_to_topup - elapsed, COUNTDOWN_DURING_TOPUP)
+        end_elapsed = max(now - self.topup_end_updated_at, 0)
+        return time_to_topup, max(self.time_to_topup_end_s - end_elapsed, 0.0)
+
+    def wait_s(
+        self,
+        total_run_time_s: float,
+        total_exposure_time_s: float,
+        thresholds: TopupThresholds,
+        now: float | None = None,
+    ) -> float:
+        """Time to wait before starting a collection so that it avoids the next
+        top-up, following the same rules as check_topup_and_wait_if_necessary.
+        """
+        if not self.gating_enabled:
+            return 0.0
+        time_to_topup, time_to_topup_end = self.predict(
+            time.time() if now is None else now
+        )
+        return _time_to_wait_s(
+            total_run_time_s,
+            time_to_topup,
+            time_to_topup_end,
+            thresholds,
+            total_exposure_time_s,
+        )
+
+
+class TopupGate(Device, Stageable):
+    """Keeps track of when collections may start without overlapping a top-up.
+
+    Rather than reading the synchrotron and loading the top-up configuration each
+    time a collection is checked, the gate monitors the machine mode and top-up
+    countdowns and keeps the latest values as a SafeCollectionWindow. The thresholds
+    are loaded once and reloaded every refresh_period_s in the background, keeping
+    the previous thresholds if a reload fails.
+
+    Monitoring starts when the gate is staged, or when it is first waited on, and
+    stops when it is unstaged. Pass the gate to check_topup_and_wait_if_necessary or
+    wait_for_safe_collection_window to use it.
+
+    Args:
+        synchrotron (Synchrotron): Synchrotron device.
+        load_thresholds (Callable[[], TopupThresholds]): Loads the thresholds, this
+            may block and is run in a thread. Defaults to reading the beamline
+            parameters.
+        refresh_period_s (float): Time between reloads of the thresholds.
+        name (str): Name of the device.
+    """
+
+    def __init__(
+        self,
+        synchrotron: Synchrotron,
+        load_thresholds: Callable[[], TopupThresholds] = _load_topup_thresholds,
+        refresh_period_s: float = 300.0,
+        name: str = "",
+    ):
+        self.synchrotron = Reference(synchrotron)
+        self.load_thresholds = load_thresholds
+        self.refresh_period_s = refresh_period_s
+        self.window = SafeCollectionWindow()
+        self.thresholds: TopupThresholds | None = None
+        self._changed = asyncio.Event()
+        self._thresholds_loaded = asyncio.Event()
+        self._subscriptions: list[tuple[SignalR, Callable]] = []
+        self._refresh_task: asyncio.Task | None = None
+        super().__init__(name=name)
+
+    def _update(
+        self, field: str, updated_at_field: str | None, reading: dict[str, Any]
+    ):
+        (value,) = reading.values()
+        changes = {field: value["value"]}
+        if updated_at_field is not None:
+            changes[updated_at_field] = value["timestamp"]
+        self.window = replace(self.window, **changes)
+        self._changed.set()
+        self._changed.clear()
+
+    async def _refresh_thresholds(self):
+        while True:
+            try:
+                self.thresholds = await asyncio.to_thread(self.load_thresholds)
+                self._thresholds_loaded.set()
+            except Exception as e:
+                LOGGER.warning(f"Failed to load top-up thresholds: {e}")
+                if self.thresholds is None:
+                    # Gate with the defaults rather than not at all
+                    self.thresholds = TopupThresholds()
+                    self._thresholds_loaded.set()
+            await asyncio.sleep(self.refresh_period_s)
+
+    async def start(self):
+        """Start monitoring the synchrotron, if not already started."""
+        if self._refresh_task is not None:
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_thresholds())
+        synchrotron = self.synchrotron()
+        for signal, field, updated_at_field in (
+            (synchrotron.synchrotron_mode, "machine_mode", None),
+            (synchrotron.top_up_start_countdown, "time_to_topup_s", "topup_updated_at"),
+            (
+                synchrotron.top_up_end_countdown,
+                "time_to_topup_end_s",
+                "topup_end_updated_at",
+            ),
+        ):
+            self._update(field, updated_at_field, await signal.read())
+            callback = partial(self._update, field, updated_at_field)
+            signal.subscribe_reading(callback)
+            self._subscriptions.append((signal, callback))
+
+    async def stop(self):
+        """Stop monitoring the synchrotron and reloading the thresholds."""
+        for signal, callback in self._subscriptions:
+            signal.clear_sub(callback)
+        self._subscriptions.clear()
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresh_task
+            self._refresh_task = None
+
+    @AsyncStatus.wrap
+    async def stage(self):
+        await self.start()
+
+    @AsyncStatus.wrap
+    async def unstage(self):
+        await self.stop()
+
+    async def _wait_for_topup_complete(self):
+        while self.window.topup_in_progress:
+            await self._changed.wait()
+
+    async def wait_until_safe(self, total_exposure_time: float, ops_time: float):
+        """Wait until a collection of this length can start without being disturbed
+        by a top-up. See check_topup_and_wait_if_necessary.
+        """
+        await self.start()
+        await self._thresholds_loaded.wait()
+        assert self.thresholds is not None
+        window = self.window
+        if not window.gating_enabled:
+            return
+        time_to_topup, time_to_topup_end = window.predict(time.time())
+        time_to_wait = _time_to_wait_s(
+            total_exposure_time + ops_time,
+            time_to_topup,
+            time_to_topup_end,
+            self.thresholds,
+            total_exposure_time,
+        )
+        if time_to_wait:
+            LOGGER.info(f"Waiting {time_to_wait}s for top-up to finish")
+            await asyncio.sleep(time_to_wait)
+        if self.window.topup_in_progress:
+            LOGGER.info("Waiting for topup to complete")
+            await self._wait_for_topup_complete()
+
+
+def wait_for_safe_collection_window(
+    gate: TopupGate, total_exposure_time: float, ops_time: float
+):
+    """Event driven equivalent of check_topup_and_wait_if_necessary, using the
+    synchrotron state and thresholds kept up to date by a TopupGate.
+    """
+    yield from bps.wait_for(
+        [partial(gate.wait_until_safe, total_exposure_time, ops_time)]
+    )
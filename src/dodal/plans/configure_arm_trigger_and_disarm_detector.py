@@ -1,4 +1,6 @@
 import time
+import warnings
+from functools import partial
 from pathlib import PurePath
 
 import bluesky.plan_stubs as bps
@@ -14,6 +16,7 @@ from ophyd_async.fastcs.eiger import EigerDetector
 
 from dodal.beamlines.i03 import fastcs_eiger
 from dodal.devices.detector import DetectorParams
+from dodal.devices.eiger_arming import configure_eiger
 from dodal.log import LOGGER, do_default_logging_setup
 
 
@@ -28,25 +31,8 @@ def configure_arm_trigger_and_disarm_detector(
     yield from bps.unstage(eiger, wait=True)
     LOGGER.info(f"Stopping Eiger-Odin: {time.time() - start}s")
     start = time.time()
-    yield from set_cam_pvs(eiger, detector_params, wait=True)
-    LOGGER.info(f"Setting CAM PVs: {time.time() - start}s")
-    start = time.time()
-    yield from change_roi_mode(eiger, detector_params, wait=True)
-    LOGGER.info(f"Changing ROI Mode: {time.time() - start}s")
-    start = time.time()
-    yield from bps.abs_set(eiger.od.fp.data_chunks_0, 1, wait=True)
-    LOGGER.info(f"Setting # of Frame Chunks: {time.time() - start}s")
-    start = time.time()
-    yield from bps.abs_set(
-        eiger.detector.photon_energy, detector_params.expected_energy_ev, wait=True
-    )
-    LOGGER.info(f"Setting Photon Energy: {time.time() - start}s")
-    start = time.time()
-    yield from bps.abs_set(eiger.detector.ntrigger, 1, wait=True)
-    LOGGER.info(f"Setting Number of Triggers: {time.time() - start}s")
-    start = time.time()
-    yield from set_mx_settings_pvs(eiger, detector_params, wait=True)
-    LOGGER.info(f"Setting MX PVs: {time.time() - start}s")
+    yield from bps.wait_for([partial(configure_eiger, eiger, detector_params)])
+    LOGGER.info(f"Setting Eiger PVs: {time.time() - start}s")
     start = time.time()
     yield from bps.prepare(eiger, trigger_info, wait=True)
     LOGGER.info(f"Preparing Eiger: {time.time() - start}s")
@@ -64,12 +50,21 @@ def configure_arm_trigger_and_disarm_detector(
     LOGGER.info(f"Disarming Eiger: {time.time() - start}s")
 
 
+def _warn_deprecated(name: str):
+    warnings.warn(
+        f"{name} is deprecated, use dodal.devices.eiger_arming.configure_eiger instead",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+
+
 def set_cam_pvs(
     eiger: EigerDetector,
     detector_params: DetectorParams,
     wait: bool,
     group="cam_pvs",
 ):
+    _warn_deprecated("set_cam_pvs")
     yield from bps.abs_set(
         eiger.detector.count_time, detector_params.exposure_time_s, group=group
     )
@@ -87,6 +82,7 @@ def change_roi_mode(
     wait: bool,
     group="roi_mode",
 ):
+    _warn_deprecated("change_roi_mode")
     detector_dimensions = (
         detector_params.detector_size_constants.roi_size_pixels
         if detector_params.use_roi_mode
@@ -129,6 +125,7 @@ def set_mx_settings_pvs(
     wait: bool,
     group="mx_settings",
 ):
+    _warn_deprecated("set_mx_settings_pvs")
     beam_x_pixels, beam_y_pixels = detector_params.get_beam_position_pixels(
         detector_params.detector_distance
     )
@@ -1,10 +1,11 @@
 import functools
-import importlib
+import importlib.util
 import inspect
 import os
 import re
 import socket
 import string
+import sys
 from collections.abc import Callable, Iterable, Mapping
 from dataclasses import dataclass
 from functools import update_wrapper, wraps
@@ -81,6 +82,56 @@ def get_hostname() -> str:
     return socket.gethostname().split(".")[0]
 
 
+class _LazyModule(ModuleType):
+    """Stands in for a module until one of its attributes is used, then imports it.
+
+    importlib.util.LazyLoader is not thread safe before Python 3.12, and devices are
+    built in several threads at once. import_module waits for an import in progress
+    in another thread to finish, so the first attribute lookup goes through it and
+    the imported module is kept for later lookups. Setting or deleting an attribute
+    changes the module itself, so that patching one importer's name for the module
+    patches it for all of them.
+    """
+
+    def _module(self) -> ModuleType:
+        # Stored in __dict__ directly as __setattr__ forwards to the module
+        if (module := self.__dict__.get("_lazy_module")) is None:
+            module = self.__dict__["_lazy_module"] = importlib.import_module(
+                self.__name__
+            )
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._module(), attr)
+
+    def __setattr__(self, attr: str, value: Any):
+        setattr(self._module(), attr, value)
+
+    def __delattr__(self, attr: str):
+        delattr(self._module(), attr)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Import a module but only execute it when one of its attributes is first used.
+
+    This is for heavy third-party dependencies (eg cv2, redis, aiohttp) that are
+    only needed once a device is built or used, so that importing a beamline
+    module does not pay for every dependency of every device it references.
+    Annotations using the module must not be evaluated at import time, eg by using
+    ``from __future__ import annotations``.
+
+    Only the top-level package is checked for up front, as finding a submodule
+    imports its parent packages. A missing submodule raises ModuleNotFoundError
+    when it is first used.
+    """
+    if module := sys.modules.get(name):
+        return module
+    top_level = name.partition(".")[0]
+    if top_level not in sys.modules and importlib.util.find_spec(top_level) is None:
+        raise ModuleNotFoundError(f"No module named '{top_level}'", name=top_level)
+    return _LazyModule(name)
+
+
 @dataclass
 class BeamlinePrefix:
     ixx: str
@@ -0,0 +1,70 @@
+"""Benchmark the time taken to import every beamline module.
+
+Each module is imported in a fresh interpreter so that modules shared between
+beamlines are not already cached. Run with::
+
+    python -m tests.benchmarks.import_time [beamline ...]
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+
+from dodal.beamlines import all_beamline_names, module_name_for_beamline
+
+HEAVY_MODULES = ("cv2", "redis", "aiohttp", "zocalo.configuration")
+"""Dependencies that should only be imported once a device needing them is used."""
+
+_IMPORT_TIME = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|(\s*)(\S+)")
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    seconds: float
+    heavy_modules: list[str]
+
+
+def measure_import_time(module: str) -> ImportTiming:
+    """Import a module in a new interpreter and report how long it took along with
+    which heavy dependencies it pulled in.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative_us: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if match := _IMPORT_TIME.match(line):
+            cumulative_us[match[3]] = int(match[1])
+    return ImportTiming(
+        module=module,
+        seconds=cumulative_us[module] / 1e6,
+        heavy_modules=[name for name in HEAVY_MODULES if name in cumulative_us],
+    )
+
+
+def beamline_modules(beamlines: list[str] | None = None) -> list[str]:
+    names = beamlines or sorted(set(all_beamline_names()))
+    return sorted(
+        {f"dodal.beamlines.{module_name_for_beamline(name)}" for name in names}
+    )
+
+
+def main(args: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("beamlines", nargs="*", help="Defaults to all beamlines")
+    options = parser.parse_args(args)
+
+    for module in beamline_modules(options.beamlines):
+        timing = measure_import_time(module)
+        heavy = ", ".join(timing.heavy_modules) or "-"
+        print(f"{module:40} {timing.seconds:8.3f}s  heavy: {heavy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark converting energies with lookup tables one at a time against all at once.
+
+Run with::
+
+    python -m tests.benchmarks.lookup_tables [--points N]
+"""
+
+import argparse
+import json
+import timeit
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+from daq_config_server.models.lookup_tables.insertion_device import (
+    parse_i09_hu_undulator_energy_gap_lut,
+)
+
+from dodal.devices.beamlines.i09_1_shared import (
+    calculate_gap_i09_hu,
+    calculate_gaps_i09_hu,
+)
+from dodal.devices.insertion_device import LookupTable, Pol
+from dodal.devices.util.lookup_tables import (
+    linear_extrapolation_lut,
+    linear_interpolation_lut,
+    parse_lookup_table,
+)
+from tests.devices.beamlines.i09_1_shared.test_data import TEST_HARD_UNDULATOR_LUT
+from tests.devices.beamlines.i10.test_data import (
+    EXPECTED_ID_ENERGY_2_GAP_CALIBRATIONS_IDU_JSON,
+)
+from tests.devices.util.test_data import TEST_BEAMLINE_DCM_ROLL_CONVERTER_TXT
+
+
+@dataclass
+class LookupTiming:
+    name: str
+    points: int
+    scalar_seconds: float
+    batch_seconds: float
+
+    @property
+    def speedup(self) -> float:
+        return self.scalar_seconds / self.batch_seconds
+
+
+def _best_time(func: Callable[[], object], repeat: int = 5) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def compare(
+    name: str,
+    energies: np.ndarray,
+    scalar: Callable[[float], object],
+    batch: Callable[[np.ndarray], np.ndarray],
+) -> LookupTiming:
+    """Time converting energies one at a time with scalar and at once with batch,
+    checking that both give the same positions.
+    """
+    np.testing.assert_allclose(batch(energies), [scalar(e) for e in energies])
+    return LookupTiming(
+        name=name,
+        points=len(energies),
+        scalar_seconds=_best_time(lambda: [scalar(e) for e in energies]),
+        batch_seconds=_best_time(lambda: batch(energies)),
+    )
+
+
+def apple2_timing(points: int) -> LookupTiming:
+    with open(EXPECTED_ID_ENERGY_2_GAP_CALIBRATIONS_IDU_JSON) as f:
+        lut = LookupTable(json.load(f))
+    coverage = lut.root[Pol.LH]
+    energies = np.linspace(coverage.min_energy, coverage.max_energy, points)
+    return compare(
+        "Apple2 polynomial",
+        energies,
+        lambda energy: lut.get_poly(energy, Pol.LH)(energy),
+        lambda energies: lut.energy_to_motor(energies, Pol.LH),
+    )
+
+
+def i09_timing(points: int) -> LookupTiming:
+    with open(TEST_HARD_UNDULATOR_LUT) as f:
+        lut = parse_i09_hu_undulator_energy_gap_lut(f.read())
+    energies = np.linspace(2.13, 3.0, points)
+    return compare(
+        "I09 hard undulator",
+        energies,
+        lambda energy: calculate_gap_i09_hu(lut, energy, 1),
+        lambda energies: calculate_gaps_i09_hu(lut, energies, 1),
+    )
+
+
+def linear_interpolation_timings(points: int) -> list[LookupTiming]:
+    s, t = parse_lookup_table(TEST_BEAMLINE_DCM_ROLL_CONVERTER_TXT)
+    energies = np.linspace(0.5, 6.0, points)
+    return [
+        compare(name, energies, converter, converter)
+        for name, converter in (
+            ("Linear interpolation", linear_interpolation_lut(s, t)),
+            ("Linear extrapolation", linear_extrapolation_lut(s, t)),
+        )
+    ]
+
+
+def main(args: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=1000)
+    options = parser.parse_args(args)
+
+    timings = [
+        apple2_timing(options.points),
+        i09_timing(options.points),
+        *linear_interpolation_timings(options.points),
+    ]
+    for timing in timings:
+        print(
+            f"{timing.name:25} {timing.points:6} points  "
+            f"scalar {timing.scalar_seconds * 1e3:8.3f}ms  "
+            f"batch {timing.batch_seconds * 1e3:8.3f}ms  "
+            f"x{timing.speedup:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark finding run numbers in directories with many nexus files.
+
+Compares listing the directory with get_run_number against allocating with a
+RunNumberAllocator, in synthetic directories of increasing size. Run with::
+
+    python -m tests.benchmarks.run_numbers [--files N ...]
+"""
+
+import argparse
+import tempfile
+import timeit
+from dataclasses import dataclass
+from pathlib import Path
+
+from dodal.common.run_numbers import RunNumberAllocator
+from dodal.utils import get_run_number
+
+PREFIX = "sample"
+
+
+@dataclass
+class RunNumberTiming:
+    files: int
+    listing_seconds: float
+    allocating_seconds: float
+
+
+def make_visit_directory(directory: Path, files: int):
+    """Fill directory with nexus files and the data files written alongside them."""
+    for run_number in range(1, files // 2 + 1):
+        (directory / f"{PREFIX}_{run_number}.nxs").touch()
+        (directory / f"{PREFIX}_{run_number}_000001.h5").touch()
+
+
+def measure(files: int, repeat: int = 20) -> RunNumberTiming:
+    with tempfile.TemporaryDirectory() as directory:
+        make_visit_directory(Path(directory), files)
+        allocator = RunNumberAllocator(directory, PREFIX)
+        # The first allocation lists the directory, as get_run_number does
+        allocator.allocate()
+        return RunNumberTiming(
+            files=files,
+            listing_seconds=min(
+                timeit.repeat(
+                    lambda: get_run_number(directory, PREFIX), number=1, repeat=repeat
+                )
+            ),
+            allocating_seconds=min(
+                timeit.repeat(allocator.allocate, number=1, repeat=repeat)
+            ),
+        )
+
+
+def main(args: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    options = parser.parse_args(args)
+
+    for files in options.files:
+        timing = measure(files)
+        print(
+            f"{timing.files:8} files  "
+            f"listing {timing.listing_seconds * 1e3:8.3f}ms  "
+            f"allocating {timing.allocating_seconds * 1e3:8.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+"""Run the dodal benchmarks and compare the results against a saved baseline.
+
+Everything runs offline, devices are built with mock signal backends and lookup
+tables are read from the test data. Run with::
+
+    python -m tests.benchmarks.suite run [--output results.json] [--only GROUP ...]
+    python -m tests.benchmarks.suite compare results.json [--tolerance 0.5]
+
+Each benchmark is run several times and the spread of its timings is saved as its
+noise. compare exits with an error if any benchmark is slower than the baseline by
+more than the tolerance and by more than its noise allows for, or if any benchmark
+in the baseline is missing from the results. To update the baseline run with
+``--output tests/benchmarks/baseline.json``.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import timeit
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+BASELINE = Path(__file__).parent / "baseline.json"
+
+Timings = dict[str, float]
+
+
+def _best_time(func: Callable[[], object], repeat: int = 5) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def _skip(name: str, error: Exception):
+    print(f"Skipping {name}: {error!r}", file=sys.stderr)
+
+
+def import_timings() -> Timings:
+    from tests.benchmarks.import_time import beamline_modules, measure_import_time
+
+    timings = {}
+    for module in beamline_modules():
+        try:
+            timings[f"import/{module}"] = measure_import_time(module).seconds
+        except Exception as e:
+            _skip(module, e)
+    return timings
+
+
+def build_and_connect_timings(repeat: int = 3) -> Timings:
+    """Time building and connecting every device of each beamline in mock mode."""
+    from bluesky.run_engine import RunEngine
+    from daq_config_server.client import ConfigClient
+    from daq_config_server.testing import MockServerResponse
+
+    from dodal.beamlines import all_beamline_modules
+    from dodal.device_manager import DeviceManager
+    from tests.conftest import mock_beamline_module_filepaths, patch_all_config_clients
+
+    # Devices are connected in the bluesky event loop
+    RunEngine({}, call_returns_result=True)
+    config_client = ConfigClient(server_response=MockServerResponse({}))
+    timings = {}
+    for beamline in sorted(set(all_beamline_modules())):
+        with (
+            patch_all_config_clients(config_client),
+            patch.object(
+                ConfigClient, "get_file_contents", config_client.get_file_contents
+            ),
+            patch.dict(os.environ, {"BEAMLINE": beamline}),
+        ):
+            try:
+                module = importlib.import_module(f"dodal.beamlines.{beamline}")
+            except Exception as e:
+                _skip(beamline, e)
+                continue
+            mock_beamline_module_filepaths(beamline, module)
+            devices = getattr(module, "devices", None)
+            if not isinstance(devices, DeviceManager):
+                continue
+            timings[f"build_and_connect/{beamline}"] = _best_time(
+                lambda devices=devices: devices.build_and_connect(mock=True), repeat
+            )
+    return timings
+
+
+def _pin_frames(frames: int, height: int = 768, width: int = 1024) -> np.ndarray:
+    """Noisy frames of a pin coming in from the right, with the tip moving left."""
+    rng = np.random.default_rng(0)
+    stack = rng.integers(0, 8, size=(frames, height, width), dtype=np.uint8)
+    for i, frame in enumerate(stack):
+        tip_x = width // 4 + i * width // (2 * frames)
+        frame[height // 2 - 40 : height // 2 + 40, tip_x:] = 220
+    return stack
+
+
+def sample_detection_timings(frames: int = 20) -> Timings:
+    from dodal.devices.oav.pin_image_recognition.utils import MxSampleDetect
+
+    stack = _pin_frames(frames)
+    detector = MxSampleDetect()
+    return {
+        "sample_detection/process_array": _best_time(
+            lambda: [detector.process_array(frame) for frame in stack]
+        )
+        / frames,
+        "sample_detection/process_stack": _best_time(
+            lambda: detector.process_stack(stack)
+        )
+        / frames,
+    }
+
+
+def lookup_table_timings(points: int = 1000) -> Timings:
+    from tests.benchmarks import lookup_tables
+
+    timings = {}
+    for measure in (
+        lookup_tables.apple2_timing,
+        lookup_tables.i09_timing,
+        lookup_tables.linear_interpolation_timings,
+    ):
+        try:
+            results = measure(points)
+        except Exception as e:
+            _skip(measure.__name__, e)
+            continue
+        for timing in results if isinstance(results, list) else [results]:
+            name = timing.name.lower().replace(" ", "_")
+            timings[f"lookup_tables/{name}/scalar"] = timing.scalar_seconds
+            timings[f"lookup_tables/{name}/batch"] = timing.batch_seconds
+    return timings
+
+
+def absorption_timings(points: int = 1000) -> Timings:
+    from dodal.common.general_maths.absorber_geometry import FoilGeometry
+    from dodal.common.general_maths.absorbers import (
+        FoilAbsorber,
+        absorber_stack_absorptions_bn,
+    )
+    from dodal.common.general_maths.interval import ClosedInterval
+    from dodal.common.general_maths.material_absorption_maths import (
+        AbsorptionSpectrumSegment,
+        MaterialAbsorptionSpectrum,
+        SingleRollOffAbsorptionCalculator,
+    )
+
+    spectrum = MaterialAbsorptionSpectrum(
+        intervals=(
+            AbsorptionSpectrumSegment(
+                kev_energy_interval=ClosedInterval(lower=5.0, upper=12.3),
+                absorption_calculator=SingleRollOffAbsorptionCalculator(
+                    material_factor_per_cm=3145.8, roll_off=-2.94
+                ),
+            ),
+            AbsorptionSpectrumSegment(
+                kev_energy_interval=ClosedInterval(lower=12.3, upper=50.0),
+                absorption_calculator=SingleRollOffAbsorptionCalculator(
+                    material_factor_per_cm=1145.1, roll_off=-3.27
+                ),
+            ),
+        )
+    )
+    energies = [float(e) for e in np.linspace(5.0, 50.0, points)]
+    foils = [
+        FoilAbsorber(
+            spectrum=spectrum,
+            geometry_model=FoilGeometry(unit="um", numerical_value=10.0 * 2**i),
+        )
+        for i in range(16)
+    ]
+    return {
+        "absorption/material_spectrum": _best_time(
+            lambda: [
+                spectrum.absorption_coefficient_per_cm(energy_kev=e) for e in energies
+            ]
+        ),
+        "absorption/material_spectrum_batch": _best_time(
+            lambda: spectrum.absorption_coefficients_per_cm(energies_kev=energies)
+        ),
+        "absorption/16_filter_states": _best_time(
+            lambda: absorber_stack_absorptions_bn(foils, energies[:: points // 10])
+        ),
+    }
+
+
+def attenuator_timings(read_latency_s: float = 0.001) -> Timings:
+    """Time setting a mock attenuator where every readback takes read_latency_s."""
+    import asyncio
+
+    from ophyd_async.core import init_devices, set_mock_attr
+
+    from dodal.devices.attenuator.attenuator import BinaryFilterAttenuator
+
+    async def time_set(num_filters: int) -> float:
+        async with init_devices(mock=True):
+            attenuator = BinaryFilterAttenuator(prefix="", num_filters=num_filters)
+        for signal in (
+            *attenuator._calculated_filter_states.values(),
+            *attenuator._filters_in_position.values(),
+        ):
+
+            async def slow_get_value(get_value=signal.get_value):
+                await asyncio.sleep(read_latency_s)
+                return await get_value()
+
+            set_mock_attr(signal, "get_value", slow_get_value)
+        best = float("inf")
+        for _ in range(5):
+            start = timeit.default_timer()
+            await attenuator.set(0.5)
+            best = min(best, timeit.default_timer() - start)
+        return best
+
+    return {
+        f"attenuator/set_{num_filters}_filters": asyncio.run(time_set(num_filters))
+        for num_filters in (4, 8, 16)
+    }
+
+
+def run_number_timings(files: int = 10_000) -> Timings:
+    from tests.benchmarks.run_numbers import measure
+
+    timing = measure(files)
+    return {
+        "run_numbers/listing": timing.listing_seconds,
+        "run_numbers/allocating": timing.allocating_seconds,
+    }
+
+
+BENCHMARKS: dict[str, Callable[[], Timings]] = {
+    "import": import_timings,
+    "build_and_connect": build_and_connect_timings,
+    "sample_detection": sample_detection_timings,
+    "lookup_tables": lookup_table_timings,
+    "absorption": absorption_timings,
+    "attenuator": attenuator_timings,
+    "run_numbers": run_number_timings,
+}
+
+
+def run_benchmarks(
+    groups: list[str] | None = None, runs: int = 3
+) -> tuple[Timings, Timings]:
+    """Run the benchmarks in each group runs times.
+
+    Returns:
+        tuple[Timings, Timings]: The fastest time of each benchmark and its noise,
+            the difference between its slowest and fastest runs.
+    """
+    all_runs: dict[str, list[float]] = {}
+    for group in groups or BENCHMARKS:
+        for run in range(runs):
+            print(f"Running {group} benchmarks ({run + 1}/{runs})", file=sys.stderr)
+            try:
+                timings = BENCHMARKS[group]()
+            except Exception as e:
+                _skip(group, e)
+                break
+            for name, seconds in timings.items():
+                all_runs.setdefault(name, []).append(seconds)
+    return (
+        {name: min(times) for name, times in all_runs.items()},
+        {name: max(times) - min(times) for name, times in all_runs.items()},
+    )
+
+
+@dataclass
+class Regression:
+    name: str
+    baseline_s: float
+    result_s: float
+
+    @property
+    def slowdown(self) -> float:
+        return self.result_s / self.baseline_s
+
+
+def find_regressions(
+    baseline: Timings,
+    results: Timings,
+    tolerance: float,
+    min_difference_s: float = 0.0,
+    noise: Timings | None = None,
+    noise_multiplier: float = 3.0,
+) -> list[Regression]:
+    """Find the benchmarks that are more than tolerance (as a fraction) slower than
+    the baseline.
+
+    Differences under noise_multiplier times the noise of a benchmark, or under
+    min_difference_s, are ignored. Benchmarks only in one of baseline and results
+    are not compared, see missing_benchmarks.
+    """
+    noise = noise or {}
+    return [
+        Regression(name, baseline[name], result)
+        for name, result in results.items()
+        if name in baseline
+        and result > baseline[name] * (1 + tolerance)
+        and result - baseline[name]
+        > max(min_difference_s, noise_multiplier * noise.get(name, 0.0))
+    ]
+
+
+def missing_benchmarks(baseline: Timings, results: Timings) -> list[str]:
+    """The benchmarks in the baseline that have no result."""
+    return sorted(baseline.keys() - results.keys())
+
+
+def load_timings(path: Path) -> Timings:
+    with open(path) as f:
+        return json.load(f)["timings"]
+
+
+def load_noise(path: Path) -> Timings:
+    with open(path) as f:
+        return json.load(f).get("noise") or {}
+
+
+def save_timings(path: Path, timings: Timings, noise: Timings | None = None):
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "timings": timings,
+                "noise": noise or {},
+            },
+            f,
+            indent=4,
+            sort_keys=True,
+        )
+        f.write("\n")
+
+
+def main(args: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Run the benchmarks")
+    run.add_argument("--output", type=Path, help="JSON file to save the timings to")
+    run.add_argument("--only", nargs="+", choices=list(BENCHMARKS), dest="groups")
+    run.add_argument(
+        "--runs", type=int, default=3, help="Number of times to run each benchmark"
+    )
+    compare = commands.add_parser("compare", help="Compare timings to the baseline")
+    compare.add_argument("results", type=Path)
+    compare.add_argument("--baseline", type=Path, default=BASELINE)
+    compare.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="Fraction a benchmark may be slower than the baseline",
+    )
+    compare.add_argument(
+        "--noise-multiplier",
+        type=float,
+        default=3.0,
+        help="Slowdowns of less than this many times a benchmark's noise are ignored",
+    )
+    compare.add_argument(
+        "--min-difference-s",
+        type=float,
+        default=0.0,
+        help="Slowdowns of less than this many seconds are always ignored",
+    )
+    compare.add_argument(
+        "--allow-missing",
+        action="store_true",
+        help="Only report benchmarks in the baseline that are missing from results",
+    )
+    options = parser.parse_args(args)
+
+    if options.command == "run":
+        timings, noise = run_benchmarks(options.groups, options.runs)
+        for name, seconds in timings.items():
+            print(f"{name:60} {seconds * 1e3:10.3f}ms ±{noise[name] * 1e3:.3f}ms")
+        if options.output:
+            save_timings(options.output, timings, noise)
+        return
+
+    baseline, results = load_timings(options.baseline), load_timings(options.results)
+    baseline_noise, results_noise = (
+        load_noise(options.baseline),
+        load_noise(options.results),
+    )
+    regressions = find_regressions(
+        baseline,
+        results,
+        options.tolerance,
+        options.min_difference_s,
+        noise={
+            name: max(baseline_noise.get(name, 0.0), results_noise.get(name, 0.0))
+            for name in baseline
+        },
+        noise_multiplier=options.noise_multiplier,
+    )
+    for regression in regressions:
+        print(
+            f"{regression.name:60} {regression.baseline_s * 1e3:10.3f}ms -> "
+            f"{regression.result_s * 1e3:10.3f}ms  x{regression.slowdown:.2f}"
+        )
+    missing = missing_benchmarks(baseline, results)
+    for name in missing:
+        print(f"{name:60} missing from results")
+    if regressions or (missing and not options.allow_missing):
+        parser.exit(
+            1,
+            f"{len(regressions)} benchmarks regressed, "
+            f"{len(missing)} benchmarks missing\n",
+        )
+    print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
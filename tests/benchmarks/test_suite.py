@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+
+from tests.benchmarks.suite import (
+    BASELINE,
+    Regression,
+    find_regressions,
+    load_noise,
+    load_timings,
+    main,
+    missing_benchmarks,
+    save_timings,
+)
+
+
+@pytest.mark.parametrize(
+    "result, expected",
+    [
+        (1.0, []),
+        (1.4, []),
+        (1.6, [Regression("a", 1.0, 1.6)]),
+    ],
+)
+def test_find_regressions_applies_tolerance(result: float, expected: list[Regression]):
+    assert find_regressions({"a": 1.0}, {"a": result}, tolerance=0.5) == expected
+
+
+def test_find_regressions_ignores_small_differences():
+    assert find_regressions({"a": 1e-6}, {"a": 1e-3}, 0.5, min_difference_s=1e-2) == []
+
+
+def test_find_regressions_ignores_differences_within_each_benchmarks_noise():
+    baseline, results = {"quiet": 1.0, "noisy": 1.0}, {"quiet": 2.0, "noisy": 2.0}
+    noise = {"quiet": 0.01, "noisy": 0.5}
+    assert find_regressions(baseline, results, 0.5, noise=noise) == [
+        Regression("quiet", 1.0, 2.0)
+    ]
+
+
+def test_find_regressions_ignores_benchmarks_not_in_both():
+    assert find_regressions({"a": 1.0}, {"b": 10.0}, tolerance=0.5) == []
+
+
+def test_baseline_can_be_loaded():
+    assert all(seconds > 0 for seconds in load_timings(BASELINE).values())
+
+
+def test_compare_fails_on_regression(tmp_path: Path):
+    baseline, results = tmp_path / "baseline.json", tmp_path / "results.json"
+    save_timings(baseline, {"a": 1.0, "b": 1.0})
+    save_timings(results, {"a": 1.1, "b": 3.0})
+
+    with pytest.raises(SystemExit) as exit_info:
+        main(["compare", str(results), "--baseline", str(baseline)])
+    assert exit_info.value.code == 1
+
+    main(["compare", str(results), "--baseline", str(baseline), "--tolerance", "3"])
+
+
+def test_compare_fails_on_missing_benchmark(tmp_path: Path):
+    baseline, results = tmp_path / "baseline.json", tmp_path / "results.json"
+    save_timings(baseline, {"a": 1.0, "b": 1.0})
+    save_timings(results, {"a": 1.0})
+
+    with pytest.raises(SystemExit) as exit_info:
+        main(["compare", str(results), "--baseline", str(baseline)])
+    assert exit_info.value.code == 1
+    assert missing_benchmarks(load_timings(baseline), load_timings(results)) == ["b"]
+
+    main(["compare", str(results), "--baseline", str(baseline), "--allow-missing"])
+
+
+def test_baseline_records_noise_for_each_benchmark():
+    assert load_noise(BASELINE).keys() == load_timings(BASELINE).keys()
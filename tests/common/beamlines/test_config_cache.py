@@ -0,0 +1,171 @@
+import asyncio
+import threading
+from concurrent.futures import wait
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from daq_config_server.client import ConfigClient
+
+from dodal.common.beamlines.config_cache import ConfigCache, get_config_cache
+
+
+@pytest.fixture
+def config_file(tmp_path: Path) -> Path:
+    path = tmp_path / "config.json"
+    path.write_text('{"a": 1}')
+    return path
+
+
+@pytest.fixture
+def config_cache(mock_config_client: ConfigClient) -> ConfigCache:
+    return ConfigCache(mock_config_client)
+
+
+def wait_for_fetches(config_cache: ConfigCache):
+    wait(list(config_cache._in_flight.values()), timeout=0.5)
+
+
+def spy_on_fetches(config_client: ConfigClient):
+    return patch.object(
+        config_client, "get_file_contents", wraps=config_client.get_file_contents
+    )
+
+
+def test_file_only_fetched_once_while_fresh(
+    config_cache: ConfigCache, mock_config_client: ConfigClient, config_file: Path
+):
+    with spy_on_fetches(mock_config_client) as fetches:
+        assert config_cache.get(config_file, dict) == {"a": 1}
+        assert config_cache.get(config_file, dict) == {"a": 1}
+    fetches.assert_called_once_with(str(config_file), dict, reset_cached_result=True)
+
+
+def test_returned_dicts_can_be_modified_without_changing_cache(
+    config_cache: ConfigCache, config_file: Path
+):
+    config_cache.get(config_file, dict)["a"] = 2
+    assert config_cache.get(config_file, dict) == {"a": 1}
+
+
+def test_expired_file_fetched_again_before_being_served(
+    config_cache: ConfigCache, config_file: Path
+):
+    config_cache.ttl_s = 0
+    assert config_cache.get(config_file, dict) == {"a": 1}
+    config_file.write_text('{"a": 2}')
+
+    assert config_cache.get(config_file, dict) == {"a": 2}
+
+
+async def test_expired_file_fetched_again_before_being_served_async(
+    config_cache: ConfigCache, config_file: Path
+):
+    config_cache.ttl_s = 0
+    assert await config_cache.get_async(config_file, dict) == {"a": 1}
+    config_file.write_text('{"a": 2}')
+
+    assert await config_cache.get_async(config_file, dict) == {"a": 2}
+
+
+def test_expired_file_served_if_fetching_it_again_fails(
+    config_cache: ConfigCache, config_file: Path
+):
+    config_cache.ttl_s = 0
+    assert config_cache.get(config_file, dict) == {"a": 1}
+    config_file.unlink()
+
+    assert config_cache.get(config_file, dict) == {"a": 1}
+
+
+def test_prefetch_shares_fetch_with_get(
+    config_cache: ConfigCache, mock_config_client: ConfigClient, config_file: Path
+):
+    with spy_on_fetches(mock_config_client) as fetches:
+        config_cache.prefetch(config_file, dict)
+        assert config_cache.get(config_file, dict) == {"a": 1}
+    fetches.assert_called_once()
+
+
+async def test_get_async_fetches_without_blocking_event_loop(
+    config_cache: ConfigCache, mock_config_client: ConfigClient, config_file: Path
+):
+    fetch_threads = []
+
+    def get_file_contents(*args, **kwargs):
+        fetch_threads.append(threading.current_thread())
+        return {"a": 1}
+
+    with patch.object(mock_config_client, "get_file_contents", get_file_contents):
+        assert await config_cache.get_async(config_file, dict) == {"a": 1}
+    assert fetch_threads
+    assert threading.current_thread() not in fetch_threads
+
+
+def test_failed_fetch_raises_and_is_retried(config_cache: ConfigCache, tmp_path: Path):
+    missing_file = tmp_path / "missing.json"
+    with pytest.raises(FileNotFoundError):
+        config_cache.get(missing_file, dict)
+    missing_file.write_text('{"b": 1}')
+    assert config_cache.get(missing_file, dict) == {"b": 1}
+
+
+def test_subscribers_called_only_when_contents_change(
+    config_cache: ConfigCache, config_file: Path
+):
+    config_cache.ttl_s = 0
+    callback = MagicMock()
+    config_cache.subscribe(config_file, dict, callback)
+    config_cache.get(config_file, dict)
+
+    config_cache.get(config_file, dict)
+    wait_for_fetches(config_cache)
+    callback.assert_not_called()
+
+    config_file.write_text('{"a": 3}')
+    config_cache.get(config_file, dict)
+    wait_for_fetches(config_cache)
+    callback.assert_called_once_with({"a": 3})
+
+
+def test_unsubscribed_callbacks_not_called(
+    config_cache: ConfigCache, config_file: Path
+):
+    config_cache.ttl_s = 0
+    callback = MagicMock()
+    unsubscribe = config_cache.subscribe(config_file, dict, callback)
+    config_cache.get(config_file, dict)
+    unsubscribe()
+
+    config_file.write_text('{"a": 3}')
+    config_cache.get(config_file, dict)
+    wait_for_fetches(config_cache)
+    callback.assert_not_called()
+
+
+async def test_subscribers_from_event_loop_called_in_that_loop(
+    config_cache: ConfigCache, config_file: Path
+):
+    config_cache.ttl_s = 0
+    called = asyncio.Event()
+    values = []
+
+    def callback(value):
+        asyncio.get_running_loop()
+        values.append(value)
+        called.set()
+
+    config_cache.subscribe(config_file, dict, callback)
+    await config_cache.get_async(config_file, dict)
+    config_file.write_text('{"a": 4}')
+    await config_cache.get_async(config_file, dict)
+
+    await asyncio.wait_for(called.wait(), timeout=0.5)
+    assert values == [{"a": 4}]
+
+
+def test_same_cache_shared_for_a_client(mock_config_client: ConfigClient):
+    assert get_config_cache(mock_config_client) is get_config_cache(mock_config_client)
+    assert get_config_cache(mock_config_client) is not get_config_cache(
+        ConfigClient.from_url("http://other")
+    )
@@ -0,0 +1,108 @@
+import os
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from dodal.common.beamlines.device_graph_cache import (
+    DODAL_DEVICE_GRAPH_CACHE,
+    DeviceGraphCache,
+)
+from dodal.device_manager import DeviceManager
+
+
+def _make_manager(cache_dir: Path) -> DeviceManager:
+    dm = DeviceManager(graph_cache=DeviceGraphCache(cache_dir))
+
+    @dm.factory
+    def foo():
+        return Mock()
+
+    @dm.factory
+    def bar(foo, baz=None):
+        return Mock()
+
+    return dm
+
+
+def test_graph_is_saved_on_first_build(tmp_path: Path):
+    dm = _make_manager(tmp_path)
+    result = dm.build_all()
+    assert result.errors == {}
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+def test_new_process_skips_graph_resolution(tmp_path: Path):
+    _make_manager(tmp_path).build_all()
+
+    # A fresh manager and cache stand in for a restarted worker
+    dm = _make_manager(tmp_path)
+    with (
+        patch.object(dm, "_expand_dependencies") as expand,
+        patch.object(dm, "_build_levels") as levels,
+        patch("dodal.device_manager.inspect.signature") as signature,
+    ):
+        result = dm.build_all()
+    expand.assert_not_called()
+    levels.assert_not_called()
+    signature.assert_not_called()
+    assert result.devices.keys() == {"foo", "bar"}
+    assert dm["bar"].optional_dependencies == {"baz"}
+
+
+def test_different_requests_are_cached_separately(tmp_path: Path):
+    dm = _make_manager(tmp_path)
+    dm.build_all()
+    result = dm.build_devices(dm["foo"])
+    assert result.devices.keys() == {"foo"}
+
+
+def test_cache_is_ignored_when_source_changes(tmp_path: Path):
+    _make_manager(tmp_path).build_all()
+
+    dm = _make_manager(tmp_path)
+    with (
+        patch(
+            "dodal.common.beamlines.device_graph_cache.DeviceGraphCache._source_hash",
+            return_value="changed",
+        ),
+        patch.object(
+            dm, "_expand_dependencies", wraps=dm._expand_dependencies
+        ) as expand,
+    ):
+        dm.build_all()
+    expand.assert_called_once()
+
+
+def test_cache_is_ignored_when_factories_change(tmp_path: Path):
+    _make_manager(tmp_path).build_all()
+
+    dm = _make_manager(tmp_path)
+
+    @dm.factory
+    def qux(bar):
+        return Mock()
+
+    assert dm.build_all().devices.keys() == {"foo", "bar", "qux"}
+
+
+def test_unreadable_cache_is_ignored(tmp_path: Path):
+    _make_manager(tmp_path).build_all()
+    for graph in tmp_path.glob("*.json"):
+        graph.write_text("not json")
+
+    assert _make_manager(tmp_path).build_all().errors == {}
+
+
+def test_unwritable_cache_does_not_stop_build(tmp_path: Path):
+    blocked = tmp_path / "file"
+    blocked.touch()
+    dm = _make_manager(blocked / "cache")
+    assert dm.build_all().errors == {}
+
+
+@pytest.mark.parametrize("value, expected", [(None, False), ("/tmp/graphs", True)])
+def test_cache_from_environment(value: str | None, expected: bool):
+    env = {DODAL_DEVICE_GRAPH_CACHE: value} if value else {}
+    with patch.dict(os.environ, env, clear=True):
+        assert (DeviceManager().graph_cache is not None) == expected
@@ -1,14 +1,22 @@
 import math
 from unittest.mock import MagicMock
 
+import numpy as np
 import pytest
 from pydantic import ValidationError
 
 from dodal.common.general_maths.absorber_geometry import (
+    FoilGeometry,
     TaperedGeometryProvider,
     ThicknessProvider,
+    WedgeGeometry,
+)
+from dodal.common.general_maths.absorbers import (
+    FoilAbsorber,
+    WedgeAbsorber,
+    absorber_stack_absorptions_bn,
+    all_absorber_states,
 )
-from dodal.common.general_maths.absorbers import FoilAbsorber, WedgeAbsorber
 from dodal.common.general_maths.interval import ClosedInterval
 from dodal.common.general_maths.material_absorption_maths import (
     AbsorptionSpectrumSegment,
@@ -267,3 +275,98 @@ def test_that_wedge_absorber_reports_raises_error_when_motor_position_is_invalid
             xray_energy_kev=21.7,
             motor_position_mm=_invalid_motor_position,  # energy, motor position irrelevant
         )
+
+
+# array api
+
+
+def _aluminium_spectrum() -> MaterialAbsorptionSpectrum:
+    return MaterialAbsorptionSpectrum(
+        intervals=(
+            AbsorptionSpectrumSegment(
+                kev_energy_interval=ClosedInterval(lower=4.5, upper=30.0),
+                absorption_calculator=SingleRollOffAbsorptionCalculator(
+                    material_factor_per_cm=2.5e4, roll_off=-2.8
+                ),
+            ),
+        )
+    )
+
+
+def _foil(thickness_um: float) -> FoilAbsorber:
+    return FoilAbsorber(
+        spectrum=_aluminium_spectrum(),
+        geometry_model=FoilGeometry(unit="um", numerical_value=thickness_um),
+    )
+
+
+def test_foil_absorber_array_matches_single_energies() -> None:
+    foil_absorber = _foil(25.0)
+    energies_kev = np.linspace(5.0, 25.0, 10)
+    np.testing.assert_allclose(
+        foil_absorber.calculate_absorptions_bn(xray_energies_kev=energies_kev),
+        [
+            foil_absorber.calculate_absorption_bn(xray_energy_kev=float(e))
+            for e in energies_kev
+        ],
+    )
+
+
+def test_wedge_absorber_array_matches_single_energies() -> None:
+    wedge_absorber = WedgeAbsorber(
+        spectrum=_aluminium_spectrum(),
+        geometry_model=WedgeGeometry(tip_mm=-1.0, taper_cotangent=20.0),
+    )
+    energies_kev = np.linspace(5.0, 25.0, 10)
+    np.testing.assert_allclose(
+        wedge_absorber.calculate_absorptions_bn(
+            xray_energies_kev=energies_kev, motor_position_mm=3.0
+        ),
+        [
+            wedge_absorber.calculate_absorption_bn(
+                xray_energy_kev=float(e), motor_position_mm=3.0
+            )
+            for e in energies_kev
+        ],
+    )
+
+
+def test_all_absorber_states() -> None:
+    np.testing.assert_array_equal(
+        all_absorber_states(2),
+        [[False, False], [True, False], [False, True], [True, True]],
+    )
+
+
+def test_absorber_stack_absorption_is_sum_of_absorbers_in_beam() -> None:
+    foils = [_foil(thickness_um) for thickness_um in (10.0, 20.0, 40.0)]
+    energies_kev = [8.0, 12.0]
+    absorptions_bn = absorber_stack_absorptions_bn(foils, energies_kev)
+
+    assert absorptions_bn.shape == (8, 2)
+    for state, in_beam in enumerate(all_absorber_states(len(foils))):
+        for i, energy_kev in enumerate(energies_kev):
+            assert absorptions_bn[state, i] == pytest.approx(
+                sum(
+                    foil.calculate_absorption_bn(xray_energy_kev=energy_kev)
+                    for foil, used in zip(foils, in_beam, strict=True)
+                    if used
+                )
+            )
+
+
+def test_absorber_stack_absorption_for_given_states() -> None:
+    foils = [_foil(10.0), _foil(20.0)]
+    absorptions_bn = absorber_stack_absorptions_bn(
+        foils, 10.0, states=[[True, True], [False, False]]
+    )
+    assert absorptions_bn.shape == (2, 1)
+    assert absorptions_bn[1, 0] == 0
+    assert absorptions_bn[0, 0] == pytest.approx(
+        sum(foil.calculate_absorption_bn(xray_energy_kev=10.0) for foil in foils)
+    )
+
+
+def test_absorber_stack_absorption_rejects_states_of_wrong_shape() -> None:
+    with pytest.raises(ValueError, match="states"):
+        absorber_stack_absorptions_bn([_foil(10.0)], 10.0, states=[[True, False]])
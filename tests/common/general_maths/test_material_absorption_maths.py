@@ -2,6 +2,7 @@ import math
 from typing import Any, Final, cast
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 from pydantic import ValidationError
 
@@ -15,7 +16,9 @@ from dodal.common.general_maths.material_absorption_maths import (
     MaterialAbsorptionSpectrum,
     PolynomialAbsorptionCorrection,
     SingleRollOffAbsorptionCalculator,
+    absorption_coefficients_per_cm,
     attenuation_at_depth_cm,
+    attenuations_at_depths_cm,
     photon_mass_attenuation_per_unit_length,
     thickness_cm_required_to_attenuate,
 )
@@ -294,6 +297,18 @@ def test_photon_mass_attenuation_per_unit_length_errors_with_invalid_factor(
         )
 
 
+@pytest.mark.parametrize(
+    "_material_factor, _roll_off", [(0.0, -2.5), (-3.2, -2.5), (3.2, 0.0), (3.2, 1.7)]
+)
+def test_simple_absorption_calculator_rejects_unphysical_parameters(
+    _material_factor, _roll_off
+) -> None:
+    with pytest.raises(ValidationError):
+        SingleRollOffAbsorptionCalculator(
+            material_factor_per_cm=_material_factor, roll_off=_roll_off
+        )
+
+
 @pytest.mark.parametrize("_invalid_roll_off", INVALID_TRIAL_VALUES)
 def test_photon_mass_attenuation_per_unit_length_errors_with_invalid_exponent(
     _invalid_roll_off,
@@ -458,3 +473,122 @@ def test_multi_band_material_absorption_spectrum_rejects_out_of_band_calculation
     _spectrum_calculator = MaterialAbsorptionSpectrum(intervals=_multi_interval)
     with pytest.raises(ValueError):
         _spectrum_calculator.absorption_coefficient_per_cm(energy_kev=_out_of_band_kev)
+
+
+# array api
+
+
+def _spectrum(*bands: tuple[float, float]) -> MaterialAbsorptionSpectrum:
+    return MaterialAbsorptionSpectrum(
+        intervals=tuple(
+            AbsorptionSpectrumSegment(
+                kev_energy_interval=ClosedInterval(lower=lower, upper=upper),
+                absorption_calculator=SingleRollOffAbsorptionCalculator(
+                    material_factor_per_cm=1000.0 * (i + 1), roll_off=-2.5 - i
+                ),
+            )
+            for i, (lower, upper) in enumerate(bands)
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "_bands",
+    [
+        [(5.0, 12.3), (12.3, 50.0)],  # touching, shared edge is in the first band
+        [(12.3, 50.0), (5.0, 12.3)],  # out of order
+        [(5.0, 30.0), (12.3, 50.0)],  # overlapping, first band wins
+        [(5.0, 10.0), (11.0, 50.0)],
+    ],
+)
+def test_material_absorption_spectrum_array_matches_single_energies(
+    _bands: list[tuple[float, float]],
+) -> None:
+    _spectrum_calculator = _spectrum(*_bands)
+    _energies_kev = np.concatenate(
+        [np.linspace(5.0, 10.0, 50), np.linspace(11.0, 50.0, 50), [12.3, 30.0]]
+    )
+    np.testing.assert_allclose(
+        _spectrum_calculator.absorption_coefficients_per_cm(energies_kev=_energies_kev),
+        [
+            _spectrum_calculator.absorption_coefficient_per_cm(energy_kev=float(e))
+            for e in _energies_kev
+        ],
+    )
+
+
+@pytest.mark.parametrize("_energies_kev", [[6.0, 10.5], [6.0, 4.9], [-1.0], [np.nan]])
+def test_material_absorption_spectrum_array_rejects_energies_out_of_band(
+    _energies_kev: list[float],
+) -> None:
+    with pytest.raises(ValueError):
+        _spectrum((5.0, 10.0), (11.0, 50.0)).absorption_coefficients_per_cm(
+            energies_kev=_energies_kev
+        )
+
+
+def test_material_absorption_spectrum_array_keeps_shape() -> None:
+    _energies_kev = np.full((3, 4), 8.0)
+    assert _spectrum((5.0, 10.0)).absorption_coefficients_per_cm(
+        energies_kev=_energies_kev
+    ).shape == (3, 4)
+
+
+def test_compound_absorption_calculator_array_matches_single_energies() -> None:
+    _scalar_only = MagicMock(spec=AbsorptionCalculator)
+    _scalar_only.absorption_coefficient_per_cm.return_value = 0.5
+    compound_calculator = CompoundAbsorptionCalculator(
+        contributions=[
+            SingleRollOffAbsorptionCalculator(
+                material_factor_per_cm=3145.8, roll_off=-2.94
+            ),
+            PolynomialAbsorptionCorrection(coefficients_per_cm=[1.2, -0.1, 0.004]),
+            cast(AbsorptionCalculator, _scalar_only),
+        ]
+    )
+    _energies_kev = np.linspace(5.0, 25.0, 20)
+    np.testing.assert_allclose(
+        compound_calculator.absorption_coefficients_per_cm(energies_kev=_energies_kev),
+        [
+            compound_calculator.absorption_coefficient_per_cm(energy_kev=float(e))
+            for e in _energies_kev
+        ],
+    )
+
+
+def test_absorption_coefficients_per_cm_calls_scalar_only_calculators_per_energy() -> (
+    None
+):
+    _scalar_only = MagicMock(spec=AbsorptionCalculator)
+    _scalar_only.absorption_coefficient_per_cm.side_effect = lambda energy_kev: (
+        2 * energy_kev
+    )
+    np.testing.assert_allclose(
+        absorption_coefficients_per_cm(
+            cast(AbsorptionCalculator, _scalar_only), [1.0, 2.0]
+        ),
+        [2.0, 4.0],
+    )
+
+
+@pytest.mark.parametrize("_depth_cm, _coefficient_per_cm", [(-0.1, 1.0), (0.1, 0.0)])
+def test_attenuations_at_depths_cm_rejects_unphysical_values(
+    _depth_cm: float, _coefficient_per_cm: float
+) -> None:
+    with pytest.raises(ValueError):
+        attenuations_at_depths_cm([0.1, _depth_cm], _coefficient_per_cm)
+
+
+def test_attenuations_at_depths_cm_broadcasts() -> None:
+    _depths_cm = np.array([[0.0], [0.5], [1.0]])
+    _coefficients_per_cm = np.array([1.0, 2.0])
+    np.testing.assert_allclose(
+        attenuations_at_depths_cm(_depths_cm, _coefficients_per_cm),
+        [
+            [
+                attenuation_at_depth_cm(depth_cm=d, absorption_coefficient_per_cm=c)
+                for c in (1.0, 2.0)
+            ]
+            for d in (0.0, 0.5, 1.0)
+        ],
+    )
@@ -2,14 +2,17 @@ import math
 from collections.abc import Callable
 from typing import Any, Final
 
+import numpy as np
 import pytest
 from pydantic import ValidationError
 
 from dodal.common.general_maths.transmission_interconversion import (
     attenuation_from_natural_log_of_transmission,
     attenuation_from_transmission,
+    attenuations_from_natural_log_of_transmission,
     natural_log_of_transmission_from_attenuation,
     transmission_from_attenutation,
+    transmissions_from_attenuations,
 )
 
 from .operator_inversion_pairing import OperatorInversionPairing
@@ -189,3 +192,24 @@ def test_attenuation_from_transmission_raises_error(bad_input) -> None:
 def test_attenuation_from_natural_log_of_transmission_raises_error(bad_input) -> None:
     with pytest.raises(ValidationError):
         attenuation_from_natural_log_of_transmission(bad_input)
+
+
+def test_transmissions_from_attenuations_matches_single_values():
+    attenuations_bn = np.array([[0.0, 145.1], [1e3, 2e3]])
+    np.testing.assert_allclose(
+        transmissions_from_attenuations(attenuations_bn),
+        [[transmission_from_attenutation(a) for a in row] for row in attenuations_bn],
+    )
+
+
+def test_transmissions_from_attenuations_rejects_negative_attenuation():
+    with pytest.raises(ValueError):
+        transmissions_from_attenuations([10.0, -1.0])
+
+
+def test_attenuations_from_natural_log_of_transmission_matches_single_values():
+    ln_t = [0.0, -0.5, -3.0]
+    np.testing.assert_allclose(
+        attenuations_from_natural_log_of_transmission(ln_t),
+        [attenuation_from_natural_log_of_transmission(x) for x in ln_t],
+    )
@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from dodal.common.run_numbers import RunNumberAllocator
+
+
+def make_nexus_files(directory: Path, prefix: str, run_numbers: range):
+    for run_number in run_numbers:
+        (directory / f"{prefix}_{run_number}.nxs").touch()
+
+
+def test_first_allocation_follows_existing_files(tmp_path: Path):
+    make_nexus_files(tmp_path, "foo", range(1, 4))
+    allocator = RunNumberAllocator(tmp_path, "foo")
+    assert [allocator.allocate() for _ in range(3)] == [4, 5, 6]
+
+
+def test_first_allocation_in_empty_directory_is_one(tmp_path: Path):
+    assert RunNumberAllocator(tmp_path, "foo").allocate() == 1
+
+
+@patch("dodal.utils.os.listdir", return_value=[])
+def test_directory_only_listed_for_first_allocation(
+    mock_listdir: MagicMock, tmp_path: Path
+):
+    allocator = RunNumberAllocator(tmp_path, "foo")
+    for _ in range(3):
+        allocator.allocate()
+    RunNumberAllocator(tmp_path, "foo").allocate()
+    mock_listdir.assert_called_once()
+
+
+def test_files_written_without_allocator_are_skipped(tmp_path: Path):
+    allocator = RunNumberAllocator(tmp_path, "foo")
+    assert allocator.allocate() == 1
+    make_nexus_files(tmp_path, "foo", range(2, 4))
+    assert allocator.allocate() == 4
+
+
+def test_prefixes_are_allocated_independently(tmp_path: Path):
+    make_nexus_files(tmp_path, "bar", range(1, 8))
+    assert RunNumberAllocator(tmp_path, "foo").allocate() == 1
+    assert RunNumberAllocator(tmp_path, "bar").allocate() == 8
+    assert RunNumberAllocator(tmp_path, "foo").allocate() == 2
+
+
+def test_empty_prefix_only_follows_files_with_empty_prefix(tmp_path: Path):
+    make_nexus_files(tmp_path, "foo", range(1, 8))
+    make_nexus_files(tmp_path, "", range(1, 3))
+    allocator = RunNumberAllocator(tmp_path)
+    assert allocator.allocate() == 3
+    make_nexus_files(tmp_path, "foo", range(8, 10))
+    make_nexus_files(tmp_path, "", range(4, 5))
+    assert allocator.allocate() == 5
+
+
+def test_concurrent_allocations_are_unique(tmp_path: Path):
+    # Each allocation opens and locks the counter file separately, so this is
+    # equivalent to allocating from separate processes
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        run_numbers = list(
+            executor.map(
+                lambda _: RunNumberAllocator(tmp_path, "foo").allocate(), range(200)
+            )
+        )
+    assert sorted(run_numbers) == list(range(1, 201))
+
+
+@patch("dodal.common.run_numbers.LOGGER")
+def test_invalid_counter_file_is_replaced(mock_logger: MagicMock, tmp_path: Path):
+    make_nexus_files(tmp_path, "foo", range(1, 3))
+    allocator = RunNumberAllocator(tmp_path, "foo")
+    allocator.counter_file.write_text("not a number")
+    assert allocator.allocate() == 3
+    mock_logger.warning.assert_called_once()
+    assert allocator.allocate() == 4
+
+
+@patch("dodal.common.run_numbers.LOGGER")
+def test_falls_back_to_listing_directory_if_counter_cannot_be_used(
+    mock_logger: MagicMock, tmp_path: Path
+):
+    make_nexus_files(tmp_path, "foo", range(1, 3))
+    with patch("dodal.common.run_numbers.os.open", side_effect=PermissionError):
+        assert RunNumberAllocator(tmp_path, "foo").allocate() == 3
+    mock_logger.warning.assert_called_once()
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 import pickle
@@ -16,12 +17,14 @@ from dodal.devices.beamlines.i04.murko_results import (
     MurkoResult,
     MurkoResultsDevice,
     NoResultsFoundError,
+    StreamingYZFit,
     get_yz_least_squares,
+    results_to_array,
 )
 
 
 @pytest.fixture
-@patch("dodal.devices.beamlines.i04.murko_results.StrictRedis")
+@patch("dodal.devices.beamlines.i04.murko_results.redis.asyncio.StrictRedis")
 async def murko_results(mock_strict_redis: MagicMock) -> MurkoResultsDevice:
     with init_devices(mock=True):
         murko_results = MurkoResultsDevice(name="murko_results")
@@ -66,14 +69,14 @@ def mock_redis_calls(mock_strict_redis, messages: list, metadata: dict):
         new_callable=AsyncMock,
         side_effect=lambda *args, **kwargs: next(iter_messages),
     ).start()
-    mock_hget = patch.object(
+    mock_hmget = patch.object(
         mock_strict_redis,
-        "hget",
+        "hmget",
         new_callable=AsyncMock,
-        side_effect=lambda _, uuid: metadata[uuid],
+        side_effect=lambda _, uuids: [metadata.get(uuid) for uuid in uuids],
     ).start()
     mock_hset = AsyncMock()
-    return mock_get_message, mock_hget, mock_hset
+    return mock_get_message, mock_hmget, mock_hset
 
 
 def mock_get_beam_centre(murko_results, x, y):
@@ -258,13 +261,15 @@ async def test_process_batch_makes_correct_calls(
         beam_centre_i=50,
         beam_centre_j=50,
     )
-    _, murko_results.redis_client.hget, _ = mock_redis_calls(
+    _, murko_results.redis_client.hmget, _ = mock_redis_calls(
         murko_results.redis_client, [], metadata
     )
-    mock_hget = murko_results.redis_client.hget
+    mock_hmget = murko_results.redis_client.hmget
 
     await murko_results.process_batch(batch, sample_id="0")
-    assert mock_hget.call_count == 6  # type: ignore
+    mock_hmget.assert_awaited_once_with(  # type: ignore
+        "murko:0:metadata", ["0", "1", "2", "3", "4", "5"]
+    )
     assert mock_process_result.call_count == 6
     assert mock_process_result.call_args_list[-1] == call(
         {"most_likely_click": (0.5, 0.5), "original_shape": (100, 100)},
@@ -302,11 +307,11 @@ async def test_process_batch_doesnt_process_result_if_no_metadata_for_certain_uu
         ),
     ]
 
-    murko_results.redis_client.hget = patch.object(
+    murko_results.redis_client.hmget = patch.object(
         murko_results.redis_client,
-        "hget",
+        "hmget",
         new_callable=AsyncMock,
-        side_effect=lambda *_: None,
+        return_value=[None, None],
     ).start()
 
     with caplog.at_level("INFO"):
@@ -327,7 +332,7 @@ async def test_no_movement_given_sample_centre_matches_beam_centre(
     )  # Crystal aligned with beam centre
     (
         murko_results.pubsub.get_message,
-        murko_results.redis_client.hget,
+        murko_results.redis_client.hmget,
         murko_results.redis_client.hset,
     ) = mock_redis_calls(murko_results.redis_client, messages, metadata)
     await murko_results.trigger()
@@ -356,7 +361,7 @@ async def test_correct_movement_given_90_180_degrees(
     )
     (
         murko_results.pubsub.get_message,
-        murko_results.redis_client.hget,
+        murko_results.redis_client.hmget,
         murko_results.redis_client.hset,
     ) = mock_redis_calls(murko_results.redis_client, messages, metadata)
     await murko_results.trigger()
@@ -381,7 +386,7 @@ async def test_correct_movement_given_45_and_135_angles(
     )
     (
         murko_results.pubsub.get_message,
-        murko_results.redis_client.hget,
+        murko_results.redis_client.hmget,
         murko_results.redis_client.hset,
     ) = mock_redis_calls(murko_results.redis_client, messages, metadata)
     await murko_results.trigger()
@@ -413,7 +418,7 @@ async def test_correct_movement_given_multiple_angles_and_x_drift(
     )
     (
         murko_results.pubsub.get_message,
-        murko_results.redis_client.hget,
+        murko_results.redis_client.hmget,
         murko_results.redis_client.hset,
     ) = mock_redis_calls(murko_results.redis_client, messages, metadata)
     await murko_results.trigger()
@@ -422,25 +427,28 @@ async def test_correct_movement_given_multiple_angles_and_x_drift(
     assert mock_z_setter.call_args[0][0] == approx(z), "wrong z"
 
 
-async def test_trigger_calls_get_message_and_hget(
+async def test_trigger_calls_get_message_and_hmget_once_per_batch(
     murko_results: MurkoResultsDevice,
 ):
     messages, metadata = get_messages(batches=4, results_per_batch=6, omega_step=5)
 
     (
         murko_results.pubsub.get_message,
-        murko_results.redis_client.hget,
+        murko_results.redis_client.hmget,
         murko_results.redis_client.hset,
     ) = mock_redis_calls(murko_results.redis_client, messages, metadata)
     await murko_results.trigger()
 
     mock_get_message = murko_results.pubsub.get_message
-    mock_hget = murko_results.redis_client.hget
+    mock_hmget = murko_results.redis_client.hmget
+    mock_hset = murko_results.redis_client.hset
 
     # 4 results + 1 RESULTS_COMPLETE_MESSAGE to find
     assert mock_get_message.call_count == 5  # type: ignore
-    # 4 * 3 * 2 metadata messages
-    assert mock_hget.call_count == 24  # type: ignore
+    # 1 metadata request per batch
+    assert mock_hmget.call_count == 4  # type: ignore
+    # All results written back at once
+    mock_hset.assert_awaited_once()  # type: ignore
 
 
 async def test_assert_subscribes_to_queue_and_clears_results_on_stage(
@@ -597,16 +605,16 @@ async def test_none_result_does_not_stop_results_device(
 
     (
         murko_results.pubsub.get_message,
-        murko_results.redis_client.hget,
+        murko_results.redis_client.hmget,
         murko_results.redis_client.hset,
     ) = mock_redis_calls(murko_results.redis_client, messages, metadata)
     mock_get_message = murko_results.pubsub.get_message
-    mock_hget = murko_results.redis_client.hget
+    mock_hmget = murko_results.redis_client.hmget
 
     await murko_results.trigger()
 
     assert mock_get_message.call_count == 5  # type: ignore
-    assert mock_hget.call_count == 2  # 2 non None results  # type: ignore
+    assert mock_hmget.call_count == 2  # 2 non None results  # type: ignore
 
 
 def test_when_results_filtered_then_used_for_centring_field_is_correct(
@@ -675,7 +683,7 @@ async def test_correct_hset_calls_are_made_for_used_and_unused_results(
 
     (
         murko_results.pubsub.get_message,
-        murko_results.redis_client.hget,
+        murko_results.redis_client.hmget,
         murko_results.redis_client.hset,
     ) = mock_redis_calls(murko_results.redis_client, messages, metadata)
     murko_results.PERCENTAGE_TO_USE = 50  # type:ignore
@@ -683,14 +691,13 @@ async def test_correct_hset_calls_are_made_for_used_and_unused_results(
 
     mock_hset = murko_results.redis_client.hset
 
-    expected_calls = []
-    for result in murko_results._results:
-        expected_calls.append(
-            call.mock_hset("murko::metadata", result.uuid, json.dumps(result.metadata))
-        )
-
-    assert mock_hset.call_count == 24
-    mock_hset.assert_has_calls(expected_calls, any_order=True)
+    mock_hset.assert_awaited_once_with(  # type: ignore
+        "murko::metadata",
+        mapping={
+            result.uuid: json.dumps(result.metadata)
+            for result in murko_results._results
+        },
+    )
 
 
 def test_results_with_tiny_x_pixel_value_are_filtered_out(
@@ -764,7 +771,7 @@ async def test_trigger_stops_once_results_complete_message_received(
 
     (
         murko_results.pubsub.get_message,
-        murko_results.redis_client.hget,
+        murko_results.redis_client.hmget,
         murko_results.redis_client.hset,
     ) = mock_redis_calls(murko_results.redis_client, messages, metadata)
 
@@ -774,7 +781,8 @@ async def test_trigger_stops_once_results_complete_message_received(
     # Second message is RESULTS_COMPLETE_MESSAGE
     assert murko_results.pubsub.get_message.call_count == 2
     # One batch of 10 results is retrieved
-    assert murko_results.redis_client.hget.call_count == 10
+    assert murko_results.redis_client.hmget.call_count == 1
+    assert len(murko_results.redis_client.hmget.call_args.args[1]) == 10
 
     assert any(
         record.message
@@ -795,7 +803,7 @@ async def test_trigger_stops_if_no_message_in_5_seconds_and_raises_warning(
 
     (
         murko_results.pubsub.get_message,
-        murko_results.redis_client.hget,
+        murko_results.redis_client.hmget,
         murko_results.redis_client.hset,
     ) = mock_redis_calls(murko_results.redis_client, messages, metadata)
 
@@ -847,3 +855,194 @@ async def test_if_redis_connects_then_pubsub_is_subscribed_to(
     murko_results.redis_client.ping = AsyncMock()
     await murko_results.stage()
     murko_results.pubsub.subscribe.assert_called_once()  # type: ignore
+
+
+class InMemoryPubSub:
+    def __init__(self, messages: list):
+        self._messages = list(messages)
+
+    async def get_message(self, timeout: float):
+        return self._messages.pop(0) if self._messages else None
+
+
+class EndlessPubSub(InMemoryPubSub):
+    """Gives the messages and then waits forever, as if Murko was still running."""
+
+    async def get_message(self, timeout: float):
+        if self._messages:
+            return self._messages.pop(0)
+        await asyncio.Event().wait()
+
+
+class InMemoryRedis:
+    """Stand-in for the parts of an async redis client used by the results device."""
+
+    def __init__(self, hashes: dict[str, dict[str, Any]]):
+        self.hashes = hashes
+        self.round_trips = 0
+
+    async def hmget(self, key: str, fields: list[str]) -> list:
+        self.round_trips += 1
+        return [self.hashes.get(key, {}).get(field) for field in fields]
+
+    async def hset(self, key: str, mapping: dict[str, Any]) -> int:
+        self.round_trips += 1
+        self.hashes.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+
+async def test_trigger_against_in_memory_redis_writes_back_used_for_centring(
+    murko_results: MurkoResultsDevice,
+):
+    messages, metadata = get_messages(batches=3, results_per_batch=4, omega_step=30)
+    metadata = {
+        uuid: json.dumps(json.loads(value) | {"uuid": uuid})
+        for uuid, value in metadata.items()
+    }
+    murko_results.redis_client = InMemoryRedis({"murko::metadata": metadata})  # type: ignore
+    murko_results.pubsub = InMemoryPubSub(messages)  # type: ignore
+
+    await murko_results.trigger()
+
+    # One HMGET per batch and a single HSET
+    assert murko_results.redis_client.round_trips == 4  # type: ignore
+    written = {
+        uuid: json.loads(value)
+        for uuid, value in murko_results.redis_client.hashes["murko::metadata"].items()  # type: ignore
+    }
+    assert len(written) == 12
+    assert sum(m["used_for_centring"] for m in written.values()) == 3
+
+
+async def test_custom_deserializer_is_used_for_messages(
+    murko_results: MurkoResultsDevice,
+):
+    messages, metadata = get_messages(batches=2)
+    # Re-encode the pickled messages as json to check the device doesn't assume pickle
+    messages = [
+        {"type": "message", "data": json.dumps(pickle.loads(m["data"])).encode()}
+        for m in messages
+    ]
+    murko_results._deserializer = json.loads
+    (
+        murko_results.pubsub.get_message,
+        murko_results.redis_client.hmget,
+        murko_results.redis_client.hset,
+    ) = mock_redis_calls(murko_results.redis_client, messages, metadata)
+
+    await murko_results.trigger()
+
+    assert len(murko_results._results) == 2
+
+
+async def test_batch_latency_and_backlog_signals_updated_on_trigger(
+    murko_results: MurkoResultsDevice,
+):
+    messages, metadata = get_messages(batches=3)
+    (
+        murko_results.pubsub.get_message,
+        murko_results.redis_client.hmget,
+        murko_results.redis_client.hset,
+    ) = mock_redis_calls(murko_results.redis_client, messages, metadata)
+    backlogs = []
+    murko_results.message_backlog.subscribe(
+        lambda reading: backlogs.extend(r["value"] for r in reading.values())
+    )
+
+    await murko_results.trigger()
+
+    assert await murko_results.batch_latency.get_value() >= 0
+    assert max(backlogs) >= 1
+    assert await murko_results.message_backlog.get_value() == 0
+
+
+def test_results_to_array_keeps_order_and_values(default_metadata: MurkoMetadata):
+    results = [
+        MurkoResult((30, 5), 0.1, 0.2, 10, "a", default_metadata),
+        MurkoResult((20, 6), 0.3, 0.4, 20, "b", default_metadata),
+    ]
+    columns = results_to_array(results)
+    assert columns["x_px"].tolist() == [30, 20]
+    assert columns["x_dist_mm"].tolist() == [0.1, 0.3]
+    assert columns["y_dist_mm"].tolist() == [0.2, 0.4]
+    assert columns["omega"].tolist() == [10, 20]
+
+
+def test_streaming_fit_matches_least_squares_on_all_results():
+    rng = np.random.default_rng(0)
+    omegas = np.arange(0, 360, 7.5)
+    vertical_dists = 0.3 * np.cos(np.radians(omegas)) - 0.2 * np.sin(np.radians(omegas))
+    vertical_dists += rng.normal(scale=0.01, size=omegas.size)
+
+    fit = StreamingYZFit()
+    for start in range(0, omegas.size, 6):
+        fit.add(vertical_dists[start : start + 6], omegas[start : start + 6])
+
+    assert fit.count == omegas.size
+    assert fit.omega_range == approx(352.5)
+    assert fit.solve() == approx(get_yz_least_squares(vertical_dists, omegas))
+
+
+def test_streaming_fit_cannot_solve_from_opposite_angles_only():
+    fit = StreamingYZFit()
+    assert fit.solve() is None
+    fit.add([0.1, -0.1], [30, 210])
+    assert fit.solve() is None
+    fit.add([0.2], [120])
+    assert fit.solve() is not None
+
+
+async def test_trigger_finishes_early_once_streaming_fit_converges(
+    murko_results: MurkoResultsDevice,
+):
+    messages, metadata = get_messages(
+        batches=12, results_per_batch=3, xyz=(0.6, 0.55, 0.1), omega_step=10
+    )
+    (
+        murko_results.pubsub.get_message,
+        murko_results.redis_client.hmget,
+        murko_results.redis_client.hset,
+    ) = mock_redis_calls(murko_results.redis_client, messages, metadata)
+    await murko_results.streaming_tolerance_mm.set(0.001)
+
+    await murko_results.trigger()
+
+    # Noise free results converge as soon as they span 90 degrees
+    assert len(murko_results._results) == 12
+    assert murko_results.redis_client.hmget.call_count == 4  # type: ignore
+
+
+async def test_trigger_returns_before_murko_stream_ends_once_streaming_fit_converges(
+    murko_results: MurkoResultsDevice,
+):
+    messages, metadata = get_messages(
+        batches=12, results_per_batch=3, xyz=(0.6, 0.55, 0.1), omega_step=10
+    )
+    # Murko never sends the results complete message
+    murko_results.pubsub = EndlessPubSub(messages[:-1])  # type: ignore
+    (_, murko_results.redis_client.hmget, murko_results.redis_client.hset) = (
+        mock_redis_calls(murko_results.redis_client, [], metadata)
+    )
+    await murko_results.streaming_tolerance_mm.set(0.001)
+
+    await asyncio.wait_for(murko_results.trigger(), timeout=1)
+
+    assert len(murko_results._results) == 12
+    assert await murko_results.y_mm.get_value() == approx(0.05, abs=1e-3)
+
+
+async def test_trigger_reads_every_batch_when_streaming_fit_disabled(
+    murko_results: MurkoResultsDevice,
+):
+    messages, metadata = get_messages(
+        batches=12, results_per_batch=3, xyz=(0.6, 0.55, 0.1), omega_step=10
+    )
+    (
+        murko_results.pubsub.get_message,
+        murko_results.redis_client.hmget,
+        murko_results.redis_client.hset,
+    ) = mock_redis_calls(murko_results.redis_client, messages, metadata)
+
+    await murko_results.trigger()
+
+    assert len(murko_results._results) == 36
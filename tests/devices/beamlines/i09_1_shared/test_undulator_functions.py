@@ -1,6 +1,7 @@
 import re
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 from daq_config_server.client import ConfigClient
 from daq_config_server.models.lookup_tables import GenericLookupTable
@@ -8,6 +9,7 @@ from daq_config_server.models.lookup_tables import GenericLookupTable
 from dodal.devices.beamlines.i09_1_shared import (
     calculate_energy_i09_hu,
     calculate_gap_i09_hu,
+    calculate_gaps_i09_hu,
 )
 from tests.devices.beamlines.i09_1_shared.test_data import TEST_HARD_UNDULATOR_LUT
 
@@ -97,3 +99,15 @@ async def test_calculate_gap_from_energy_wrong_k(
         ),
     ):
         calculate_gap_i09_hu(lut, 30, 1)
+
+
+async def test_calculate_gaps_matches_scalar_calculation(lut: GenericLookupTable):
+    energies = np.linspace(2.13, 3.0, 50)
+    gaps = calculate_gaps_i09_hu(lut, energies, 1)
+    assert gaps.shape == energies.shape
+    assert gaps == pytest.approx([calculate_gap_i09_hu(lut, e, 1) for e in energies])
+
+
+async def test_calculate_gaps_reports_energies_out_of_range(lut: GenericLookupTable):
+    with pytest.raises(ValueError, match=re.escape("Requested energy [30.]")):
+        calculate_gaps_i09_hu(lut, np.array([2.5, 30]), 1)
@@ -72,7 +72,8 @@ async def puck_detect(
         return test_client.session
 
     with patch(
-        "dodal.devices.beamlines.i15_1.puck_detector.ClientSession", new=get_session
+        "dodal.devices.beamlines.i15_1.puck_detector.aiohttp.ClientSession",
+        new=get_session,
     ):
         async with init_devices(mock=True):
             puck_detect = PuckDetect(url, 1)
@@ -150,7 +151,8 @@ async def test_given_full_test_json_when_triggered_then_positions_set_as_expecte
         return test_client.session
 
     with patch(
-        "dodal.devices.beamlines.i15_1.puck_detector.ClientSession", new=get_session
+        "dodal.devices.beamlines.i15_1.puck_detector.aiohttp.ClientSession",
+        new=get_session,
     ):
         async with init_devices(mock=True):
             puck_detect = PuckDetect(url, 20)
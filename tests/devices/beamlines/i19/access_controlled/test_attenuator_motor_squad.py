@@ -99,7 +99,7 @@ async def test_that_set_raises_error_if_post_not_successful(
     )
     with pytest.raises(ClientConnectionError):
         with patch(
-            "dodal.devices.beamlines.i19.access_controlled.blueapi_device.ClientSession.post"
+            "dodal.devices.beamlines.i19.access_controlled.blueapi_device.aiohttp.ClientSession.post"
         ) as mock_post:
             mock_post.return_value.__aenter__.return_value = (
                 given_an_unhappy_restful_response()
@@ -110,9 +110,11 @@ async def test_that_set_raises_error_if_post_not_successful(
 
 @pytest.mark.parametrize("invoking_hutch", [HutchState.EH1, HutchState.EH2])
 @patch("dodal.devices.beamlines.i19.access_controlled.blueapi_device.LOGGER")
-@patch("dodal.devices.beamlines.i19.access_controlled.blueapi_device.ClientSession.put")
 @patch(
-    "dodal.devices.beamlines.i19.access_controlled.blueapi_device.ClientSession.post"
+    "dodal.devices.beamlines.i19.access_controlled.blueapi_device.aiohttp.ClientSession.put"
+)
+@patch(
+    "dodal.devices.beamlines.i19.access_controlled.blueapi_device.aiohttp.ClientSession.post"
 )
 async def test_that_error_is_logged_when_response_to_position_demand_set_indicates_failure(
     restful_post, restful_put, logger, invoking_hutch
@@ -71,7 +71,7 @@ async def test_set_raises_error_if_post_not_successful(
 ):
     with pytest.raises(ClientConnectionError):
         with patch(
-            "dodal.devices.beamlines.i19.access_controlled.blueapi_device.ClientSession.post"
+            "dodal.devices.beamlines.i19.access_controlled.blueapi_device.aiohttp.ClientSession.post"
         ) as mock_post:
             mock_post.return_value.__aenter__.return_value = (
                 mock_response := AsyncMock()
@@ -89,7 +89,7 @@ async def test_no_task_id_returned_from_post(
     with pytest.raises(KeyError):
         with (
             patch(
-                "dodal.devices.beamlines.i19.access_controlled.blueapi_device.ClientSession.post"
+                "dodal.devices.beamlines.i19.access_controlled.blueapi_device.aiohttp.ClientSession.post"
             ) as mock_post,
         ):
             mock_post.return_value.__aenter__.return_value = (
@@ -119,13 +119,13 @@ async def test_set_corrently_makes_rest_calls(
     test_request_json = json.dumps(test_request)
     with (
         patch(
-            "dodal.devices.beamlines.i19.access_controlled.blueapi_device.ClientSession.post"
+            "dodal.devices.beamlines.i19.access_controlled.blueapi_device.aiohttp.ClientSession.post"
         ) as mock_post,
         patch(
-            "dodal.devices.beamlines.i19.access_controlled.blueapi_device.ClientSession.put"
+            "dodal.devices.beamlines.i19.access_controlled.blueapi_device.aiohttp.ClientSession.put"
         ) as mock_put,
         patch(
-            "dodal.devices.beamlines.i19.access_controlled.blueapi_device.ClientSession.get"
+            "dodal.devices.beamlines.i19.access_controlled.blueapi_device.aiohttp.ClientSession.get"
         ) as mock_get,
     ):
         mock_post.return_value.__aenter__.return_value = (mock_response := AsyncMock())
@@ -154,10 +154,10 @@ async def test_if_put_fails_log_error_and_return(
 ):
     with (
         patch(
-            "dodal.devices.beamlines.i19.access_controlled.blueapi_device.ClientSession.post"
+            "dodal.devices.beamlines.i19.access_controlled.blueapi_device.aiohttp.ClientSession.post"
         ) as mock_post,
         patch(
-            "dodal.devices.beamlines.i19.access_controlled.blueapi_device.ClientSession.put"
+            "dodal.devices.beamlines.i19.access_controlled.blueapi_device.aiohttp.ClientSession.put"
         ) as mock_put,
     ):
         mock_post.return_value.__aenter__.return_value = (mock_response := AsyncMock())
@@ -181,13 +181,13 @@ async def test_if_plan_fails_raise_error_with_message(
     with pytest.raises(RuntimeError):
         with (
             patch(
-                "dodal.devices.beamlines.i19.access_controlled.blueapi_device.ClientSession.post"
+                "dodal.devices.beamlines.i19.access_controlled.blueapi_device.aiohttp.ClientSession.post"
             ) as mock_post,
             patch(
-                "dodal.devices.beamlines.i19.access_controlled.blueapi_device.ClientSession.put"
+                "dodal.devices.beamlines.i19.access_controlled.blueapi_device.aiohttp.ClientSession.put"
             ) as mock_put,
             patch(
-                "dodal.devices.beamlines.i19.access_controlled.blueapi_device.ClientSession.get"
+                "dodal.devices.beamlines.i19.access_controlled.blueapi_device.aiohttp.ClientSession.get"
             ) as mock_get,
         ):
             mock_post.return_value.__aenter__.return_value = (
@@ -0,0 +1,272 @@
+from enum import Enum
+
+import pytest
+from ophyd_async.core import (
+    callback_on_mock_put,
+    get_mock_put,
+    init_devices,
+    set_mock_value,
+)
+
+from dodal.devices.current_amplifiers import (
+    CurrentAmpDet,
+    Femto3xxGainTable,
+    Femto3xxGainToCurrentTable,
+    Femto3xxRaiseTime,
+    FemtoDDPCA,
+    PredictiveGainController,
+    SR570GainToCurrentTable,
+    StruckScaler,
+)
+from dodal.devices.current_amplifiers.struck_scaler_counter import CountState
+
+SATURATION_V = 10.0
+
+ZeroRaiseTime = Enum(
+    "ZeroRaiseTime", dict.fromkeys(Femto3xxRaiseTime.__members__, 0.0), type=float
+)
+
+
+class SimulatedDetector:
+    """Sets the scaler readout to the voltage the femto would output for a detector
+    current, at whatever gain the femto is set to, each time the scaler counts.
+    """
+
+    def __init__(self, femto: FemtoDDPCA, scaler: StruckScaler, current: float):
+        self.femto = femto
+        self.scaler = scaler
+        self.current = current
+        callback_on_mock_put(scaler.trigger_start, self._count)
+
+    async def _count(self, *args, **kwargs):
+        gain = Femto3xxGainToCurrentTable[(await self.femto.gain.get_value()).name]
+        voltage = max(-SATURATION_V, min(SATURATION_V, self.current * gain.value))
+        count_time = await self.scaler.count_time.get_value()
+        set_mock_value(
+            self.scaler.readout, voltage * count_time * self.scaler.count_per_volt
+        )
+        set_mock_value(self.scaler.trigger_start, CountState.DONE)
+
+
+@pytest.fixture
+async def femto() -> FemtoDDPCA:
+    async with init_devices(mock=True):
+        femto = FemtoDDPCA(
+            prefix="BLXX-EA-DET-007:",
+            suffix="Gain",
+            gain_table=Femto3xxGainTable,
+            gain_to_current_table=Femto3xxGainToCurrentTable,
+            raise_timetable=ZeroRaiseTime,
+        )
+    return femto
+
+
+@pytest.fixture
+async def scaler() -> StruckScaler:
+    async with init_devices(mock=True):
+        scaler = StruckScaler(prefix="BLXX-EA-DET-007:", suffix=".s17")
+    set_mock_value(scaler.count_time, 1)
+    return scaler
+
+
+@pytest.fixture
+def gain_controller() -> PredictiveGainController:
+    return PredictiveGainController()
+
+
+@pytest.fixture
+async def detector(
+    femto: FemtoDDPCA, scaler: StruckScaler, gain_controller: PredictiveGainController
+) -> CurrentAmpDet:
+    async with init_devices(mock=True):
+        detector = CurrentAmpDet(femto, scaler, gain_controller=gain_controller)
+    return detector
+
+
+def _gain_changes(femto: FemtoDDPCA) -> int:
+    return get_mock_put(femto.gain).call_count
+
+
+@pytest.mark.parametrize(
+    "starting_gain, current, expected_gain",
+    [
+        ("SEN_1", 1e-9, "SEN_6"),
+        ("SEN_3", 9.5e-6, "SEN_2"),
+        ("SEN_9", -2e-13, "SEN_10"),
+        ("SEN_2", 3e-12, "SEN_9"),
+    ],
+)
+async def test_predictive_auto_gain_changes_gain_once(
+    femto: FemtoDDPCA,
+    scaler: StruckScaler,
+    detector: CurrentAmpDet,
+    starting_gain: str,
+    current: float,
+    expected_gain: str,
+):
+    set_mock_value(femto.gain, Femto3xxGainTable[starting_gain])
+    SimulatedDetector(femto, scaler, current)
+
+    reading = await detector.read()
+
+    assert _gain_changes(femto) == 1
+    assert await femto.gain.get_value() == Femto3xxGainTable[expected_gain]
+    assert reading[detector.current.name]["value"] == pytest.approx(current)
+
+
+@pytest.mark.parametrize("current", [0.7e-6, 8.7e-6])
+async def test_predictive_auto_gain_keeps_gain_within_limits(
+    femto: FemtoDDPCA, scaler: StruckScaler, detector: CurrentAmpDet, current: float
+):
+    set_mock_value(femto.gain, Femto3xxGainTable.SEN_3)
+    SimulatedDetector(femto, scaler, current)
+
+    await detector.read()
+
+    assert _gain_changes(femto) == 0
+
+
+async def test_predictive_auto_gain_leaves_headroom_below_upper_limit(
+    femto: FemtoDDPCA, scaler: StruckScaler, detector: CurrentAmpDet
+):
+    # 8.5V would be within limits at SEN_4, but a 4% rise would then be out of them
+    set_mock_value(femto.gain, Femto3xxGainTable.SEN_1)
+    simulation = SimulatedDetector(femto, scaler, 8.5e-7)
+
+    await detector.read()
+    assert await femto.gain.get_value() == Femto3xxGainTable.SEN_3
+
+    simulation.current *= 1.04
+    await detector.read()
+    assert _gain_changes(femto) == 1
+
+
+@pytest.mark.parametrize("max_retries, gain_changes", [(3, 3), (10, 3)])
+async def test_predictive_auto_gain_retries_when_saturated(
+    femto: FemtoDDPCA,
+    scaler: StruckScaler,
+    detector: CurrentAmpDet,
+    gain_controller: PredictiveGainController,
+    max_retries: int,
+    gain_changes: int,
+):
+    gain_controller.max_retries = max_retries
+    set_mock_value(femto.gain, Femto3xxGainTable.SEN_6)
+    SimulatedDetector(femto, scaler, 1e-6)
+
+    await detector.auto_gain()
+
+    assert _gain_changes(femto) == gain_changes
+    assert await femto.gain.get_value() == Femto3xxGainTable.SEN_3
+
+
+async def test_predictive_auto_gain_gives_up_after_max_retries(
+    femto: FemtoDDPCA,
+    scaler: StruckScaler,
+    detector: CurrentAmpDet,
+    gain_controller: PredictiveGainController,
+):
+    gain_controller.max_retries = 1
+    set_mock_value(femto.gain, Femto3xxGainTable.SEN_6)
+    SimulatedDetector(femto, scaler, 1e-6)
+
+    with pytest.raises(ValueError, match="after 2 gain changes"):
+        await detector.auto_gain()
+    assert _gain_changes(femto) == 2
+
+
+@pytest.mark.parametrize(
+    "starting_gain, current, message",
+    [("SEN_5", 0.0, "Gain at max value"), ("SEN_5", 1e-2, "Gain at min value")],
+)
+async def test_predictive_auto_gain_raises_at_end_of_gain_table(
+    femto: FemtoDDPCA,
+    scaler: StruckScaler,
+    detector: CurrentAmpDet,
+    gain_controller: PredictiveGainController,
+    starting_gain: str,
+    current: float,
+    message: str,
+):
+    gain_controller.max_retries = 10
+    set_mock_value(femto.gain, Femto3xxGainTable[starting_gain])
+    SimulatedDetector(femto, scaler, current)
+
+    with pytest.raises(ValueError, match=message):
+        await detector.auto_gain()
+
+
+async def test_predictive_auto_gain_locks_gain_for_a_scan(
+    femto: FemtoDDPCA,
+    scaler: StruckScaler,
+    detector: CurrentAmpDet,
+    gain_controller: PredictiveGainController,
+):
+    gain_controller.lock_per_scan = True
+    set_mock_value(femto.gain, Femto3xxGainTable.SEN_1)
+    simulation = SimulatedDetector(femto, scaler, 1e-9)
+
+    await detector.stage()
+    await detector.read()
+    simulation.current = 1e-7
+    await detector.read()
+    assert _gain_changes(femto) == 1
+    await detector.unstage()
+
+    await detector.read()
+    assert _gain_changes(femto) > 1
+
+
+async def test_predictive_auto_gain_changes_gain_at_most_once_per_unsaturated_point(
+    femto: FemtoDDPCA, scaler: StruckScaler, detector: CurrentAmpDet
+):
+    async with init_devices(mock=True):
+        stepping_detector = CurrentAmpDet(femto, scaler)
+    set_mock_value(femto.gain, Femto3xxGainTable.SEN_1)
+    simulation = SimulatedDetector(femto, scaler, 0)
+    points = [3e-5, 5e-6, 2e-9, 7e-11, 1e-12]
+
+    stepping_changes = 0
+    for current in points:
+        simulation.current = current
+        before = _gain_changes(femto)
+        await stepping_detector.read()
+        stepping_changes += _gain_changes(femto) - before
+
+    set_mock_value(femto.gain, Femto3xxGainTable.SEN_1)
+    get_mock_put(femto.gain).reset_mock()
+    for current in points:
+        simulation.current = current
+        before = _gain_changes(femto)
+        reading = await detector.read()
+        assert _gain_changes(femto) - before <= 1
+        assert reading[detector.current.name]["value"] == pytest.approx(current)
+
+    assert _gain_changes(femto) < stepping_changes
+
+
+@pytest.mark.parametrize(
+    "current_gain, voltage, expected_gain",
+    [
+        ("SEN_10", 2.0, "SEN_10"),
+        ("SEN_10", 0.2, "SEN_14"),
+        ("SEN_10", 0.01, "SEN_17"),
+        ("SEN_10", 9.0, "SEN_8"),
+        ("SEN_28", 0.0, "SEN_28"),
+        ("SEN_1", 50.0, "SEN_1"),
+    ],
+)
+def test_best_gain_for_sr570(current_gain: str, voltage: float, expected_gain: str):
+    best = PredictiveGainController().best_gain(
+        SR570GainToCurrentTable,
+        SR570GainToCurrentTable[current_gain],
+        voltage,
+        upper_limit=4.8,
+        lower_limit=0.4,
+    )
+    assert best is SR570GainToCurrentTable[expected_gain]
+
+
+def test_hysteresis_must_leave_a_band_within_the_limits():
+    with pytest.raises(ValueError):
+        PredictiveGainController(hysteresis=0.5)
@@ -172,3 +172,32 @@ def test_prefix_is_used_to_determine_run_number(
     assert create_det_params_with_dir_and_prefix(tmp_path, "bar").run_number == 7
     assert create_det_params_with_dir_and_prefix(tmp_path, "baz").run_number == 29
     assert create_det_params_with_dir_and_prefix(tmp_path, "qux").run_number == 1
+
+
+def test_run_number_allocated_once_and_kept_when_serialised(tmp_path: Path):
+    params = create_det_params_with_dir_and_prefix(tmp_path, "foo")
+    assert params.allocate_run_number() == 1
+    assert params.allocate_run_number() == 1
+    assert params.full_filename == "foo_1"
+
+    new_params = DetectorParams.model_validate_json(
+        params.model_dump_json(by_alias=True)
+    )
+    assert new_params.run_number == 1
+    assert new_params.allocate_run_number() == 1
+
+
+def test_run_numbers_not_reused_by_params_for_same_directory(tmp_path: Path):
+    run_numbers = [
+        create_det_params_with_dir_and_prefix(tmp_path, "foo").allocate_run_number()
+        for _ in range(3)
+    ]
+    assert run_numbers == [1, 2, 3]
+
+
+def test_reading_run_number_does_not_allocate_one(tmp_path: Path):
+    params = create_det_params_with_dir_and_prefix(tmp_path, "foo")
+    assert params.run_number == 1
+    assert params.run_number == 1
+    assert params.override_run_number is None
+    assert not list(tmp_path.iterdir())
@@ -1,7 +1,8 @@
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from ophyd_async.core import (
+    Device,
     init_devices,
     set_mock_attr,
     set_mock_value,
@@ -14,6 +15,7 @@ from dodal.devices.insertion_device import (
     Apple2Val,
     EnabledDisabledUpper,
     EnergyMotorConvertor,
+    EnergyMotorLookup,
     Pol,
     UndulatorGateStatus,
     UndulatorLockedPhaseAxes,
@@ -203,3 +205,26 @@ async def test_id_controller_energy_read_correct_values_using_readback(
     configured_energy: float,
 ):
     assert await mock_energy_readback_controller.energy.get_value() == configured_energy
+
+
+@pytest.mark.parametrize("mock, expect_prefetch", [(False, True), (True, False)])
+async def test_lookup_tables_behind_converters_prefetched_on_connect_unless_mocked(
+    mock_locked_apple2: Apple2[UndulatorLockedPhaseAxes],
+    mock: bool,
+    expect_prefetch: bool,
+):
+    gap_lookup = EnergyMotorLookup()
+    phase_lookup = EnergyMotorLookup()
+    gap_lookup.prefetch = MagicMock()
+    phase_lookup.prefetch = MagicMock()
+    controller = DummyLockedApple2Controller(
+        apple2=mock_locked_apple2,
+        gap_energy_motor_converter=gap_lookup.find_value_in_lookup_table,
+        phase_energy_motor_converter=phase_lookup.find_value_in_lookup_table,
+    )
+
+    with patch.object(Device, "connect", new_callable=AsyncMock):
+        await controller.connect(mock=mock)
+
+    assert gap_lookup.prefetch.called == expect_prefetch
+    assert phase_lookup.prefetch.called == expect_prefetch
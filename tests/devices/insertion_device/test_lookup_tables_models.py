@@ -122,3 +122,68 @@ def test_energy_coverage_get_energy_index_gap_returns_none() -> None:
         poly1d_params=[[1.0], [2.0]],
     )
     assert ec.get_energy_index(155.0) is None
+
+
+def test_lookup_table_energy_to_motor_matches_get_poly(
+    lut: LookupTable, generate_config_lut: GenerateConfigLookupTable
+) -> None:
+    for pol, coverage in zip(
+        generate_config_lut.polarisations,
+        generate_config_lut.energy_coverage,
+        strict=True,
+    ):
+        energies = np.linspace(coverage.min_energy, coverage.max_energy, 101)
+        expected = [coverage.get_poly(energy)(energy) for energy in energies]
+        assert lut.energy_to_motor(energies, pol) == pytest.approx(expected)
+
+
+def test_energy_coverage_compiled_pads_lower_order_polynomials() -> None:
+    ec = EnergyCoverage.generate(
+        min_energies=[100.0, 200.0],
+        max_energies=[200.0, 300.0],
+        poly1d_params=[[2.0, -1.0, 0.5], [1.0, 0.0]],
+    )
+    np.testing.assert_array_equal(
+        ec.compiled.coefficients, [[2.0, -1.0, 0.5], [0.0, 1.0, 0.0]]
+    )
+    assert ec.compiled.evaluate([150.0, 250.0]) == pytest.approx(
+        [2.0 * 150.0**2 - 150.0 + 0.5, 250.0]
+    )
+
+
+@pytest.mark.parametrize("n_entries", [1, 2, 3, 4, 5, 8, 13])
+def test_energy_coverage_compiled_agrees_with_get_energy_index_at_boundaries(
+    n_entries: int,
+) -> None:
+    boundaries = [100.0 * i for i in range(n_entries + 1)]
+    ec = EnergyCoverage.generate(
+        min_energies=boundaries[:-1],
+        max_energies=boundaries[1:],
+        poly1d_params=[[float(i)] for i in range(n_entries)],
+    )
+    energies = np.array(boundaries)
+    np.testing.assert_array_equal(
+        ec.compiled.entry_indices(energies),
+        [ec.get_energy_index(energy) for energy in boundaries],
+    )
+    assert ec.compiled.evaluate(energies) == pytest.approx(
+        [ec.get_poly(energy)(energy) for energy in boundaries]
+    )
+
+
+def test_energy_coverage_compiled_evaluate_raises_out_of_range() -> None:
+    ec = EnergyCoverage.generate(
+        min_energies=[100.0], max_energies=[200.0], poly1d_params=[[1.0]]
+    )
+    with pytest.raises(ValueError, match="Demanding energy must lie between"):
+        ec.compiled.evaluate([150.0, 250.0])
+
+
+def test_energy_coverage_compiled_evaluate_raises_in_gap() -> None:
+    ec = EnergyCoverage.generate(
+        min_energies=[100.0, 160.0],
+        max_energies=[150.0, 250.0],
+        poly1d_params=[[1.0], [2.0]],
+    )
+    with pytest.raises(ValueError, match=r"energies \[155\.\]"):
+        ec.compiled.evaluate([120.0, 155.0])
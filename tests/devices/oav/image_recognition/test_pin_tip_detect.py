@@ -1,3 +1,4 @@
+import threading
 from unittest.mock import MagicMock, patch
 
 import numpy as np
@@ -198,3 +199,53 @@ async def test_given_tip_invalid_then_loop_keeps_retrying_until_valid(
     ):
         await device.trigger()
         mock_logger.assert_called_once()
+
+
+async def test_processing_runs_off_event_loop_and_publishes_processing_time():
+    device = await _get_pin_tip_detection_device()
+    set_mock_value(device.array_data, np.array([1, 2, 3]))
+    processing_threads = []
+
+    def process_array(_, arr):
+        processing_threads.append(threading.current_thread())
+        return SampleLocation(100, 200, np.array([]), np.array([]))
+
+    with (
+        patch.object(MxSampleDetect, "__init__", return_value=None),
+        patch.object(MxSampleDetect, "process_array", process_array),
+    ):
+        await device.trigger()
+
+    assert processing_threads
+    assert threading.current_thread() not in processing_threads
+    assert await device.processing_time.get_value() > 0
+
+
+async def test_detection_pipeline_is_reused_until_tuning_changes():
+    device = await _get_pin_tip_detection_device()
+    array = np.zeros((5, 5), dtype=np.uint8)
+
+    with patch.object(
+        MxSampleDetect, "__init__", return_value=None, autospec=True
+    ) as mock_init:
+        with patch.object(MxSampleDetect, "process_array"):
+            await device._get_tip_and_edge_data(array)
+            await device._get_tip_and_edge_data(array)
+            assert mock_init.call_count == 1
+
+            await device.close_ksize.set(7)
+            await device._get_tip_and_edge_data(array)
+            assert mock_init.call_count == 2
+            assert mock_init.call_args.kwargs["close_ksize"] == 7
+
+
+async def test_detection_pipeline_is_rebuilt_after_reconnect_and_tuning_change():
+    device = await _get_pin_tip_detection_device()
+    first = await device._get_sample_detection()
+    await device.connect(mock=True, force_reconnect=True)
+    assert await device._get_sample_detection() is first
+
+    set_mock_value(device.canny_upper_threshold, 80)
+    second = await device._get_sample_detection()
+    assert second is not first
+    assert second.canny_upper == 80
@@ -1,12 +1,16 @@
+from pathlib import Path
 from unittest.mock import patch
 
+import cv2
 import numpy as np
 import pytest
 
 from dodal.devices.oav.pin_image_recognition.utils import (
     NONE_VALUE,
     MxSampleDetect,
+    SampleLocations,
     ScanDirections,
+    _rect_kernel,
     blur,
     close,
     gaussian_blur,
@@ -301,7 +305,7 @@ def test_process_array_if_open_ksize_is_not_zero():
 
     with patch(
         "dodal.devices.oav.pin_image_recognition.utils.open_morph",
-        return_value=lambda arr: arr,
+        return_value=lambda arr, dst=None: arr,
     ) as mock_open_morph:
         location = detector.process_array(test_arr)
 
@@ -316,3 +320,129 @@ def test_process_array_if_open_ksize_is_not_zero():
         assert isinstance(location.edge_top, np.ndarray)
         assert isinstance(location.edge_bottom, np.ndarray)
         assert location.edge_top.shape == location.edge_bottom.shape
+
+
+def test_structuring_elements_are_shared_between_operations_and_frames(
+    sample_array,
+):
+    _rect_kernel.cache_clear()
+    with patch(
+        "dodal.devices.oav.pin_image_recognition.utils.cv2.getStructuringElement",
+        wraps=cv2.getStructuringElement,
+    ) as get_element:
+        open_morph(ksize=7, iterations=1)
+        close(ksize=7, iterations=2)
+        for _ in range(3):
+            MxSampleDetect(open_ksize=7, close_ksize=7).process_array(
+                sample_array.copy()
+            )
+    get_element.assert_called_once()
+
+
+def test_process_array_reuses_buffers_for_frames_of_same_shape(sample_array):
+    detector = MxSampleDetect(open_ksize=1, close_ksize=1)
+    first = detector.process_array(sample_array)
+    buffers = detector._buffers
+    second = detector.process_array(sample_array.copy())
+
+    assert detector._buffers is buffers
+    assert first.tip_x == second.tip_x and first.tip_y == second.tip_y
+
+    detector.process_array(np.zeros((3, 4), dtype=np.uint8))
+    assert detector._buffers is not buffers
+    assert detector._buffers is not None
+    assert detector._buffers.closed.shape == (3, 4)
+
+
+def test_process_array_converts_colour_frames_into_buffer(sample_array):
+    detector = MxSampleDetect(close_ksize=1)
+    colour = np.stack([sample_array] * 3, axis=-1)
+    colour_location = detector.process_array(colour)
+    assert detector._buffers is not None
+    assert detector._buffers.gray.shape == sample_array.shape
+
+    gray_location = MxSampleDetect(close_ksize=1).process_array(sample_array)
+    assert (colour_location.tip_x, colour_location.tip_y) == (
+        gray_location.tip_x,
+        gray_location.tip_y,
+    )
+
+
+def _pin_frame(tip_x: int, width: int = 40, height: int = 20) -> np.ndarray:
+    frame = np.zeros((height, width), dtype=np.uint8)
+    if tip_x >= 0:
+        frame[6:14, tip_x:] = 255
+    return frame
+
+
+def _pin_detector(**kwargs) -> MxSampleDetect:
+    return MxSampleDetect(close_ksize=3, close_iterations=1, **kwargs)
+
+
+@pytest.fixture
+def pin_stack() -> np.ndarray:
+    # Includes a frame with no pin and one where the pin fills the image
+    return np.stack([_pin_frame(x) for x in (5, 12, -1, 0, 30, 20)])
+
+
+@pytest.mark.parametrize("direction", [ScanDirections.FORWARD, ScanDirections.REVERSE])
+def test_process_stack_matches_process_array_for_each_frame(
+    pin_stack: np.ndarray, direction: ScanDirections
+):
+    locations = _pin_detector(scan_direction=direction).process_stack(pin_stack)
+
+    assert isinstance(locations, SampleLocations)
+    assert len(locations) == len(pin_stack)
+    assert locations.edge_top.shape == (len(pin_stack), pin_stack.shape[2])
+    for i, frame in enumerate(pin_stack):
+        expected = _pin_detector(scan_direction=direction).process_array(frame)
+        assert (locations[i].tip_x, locations[i].tip_y) == (
+            expected.tip_x,
+            expected.tip_y,
+        )
+        np.testing.assert_array_equal(locations.edge_top[i], expected.edge_top)
+        np.testing.assert_array_equal(locations.edge_bottom[i], expected.edge_bottom)
+
+
+def test_process_stack_marks_frames_without_tip(pin_stack: np.ndarray):
+    locations = _pin_detector().process_stack(pin_stack)
+    np.testing.assert_array_equal(
+        locations.found, [True, True, False, True, True, True]
+    )
+    assert locations.tip_x[2] == NONE_VALUE
+    assert locations[2].tip_x is None
+    assert abs(locations.tip_x[0] - 5) <= 1
+
+
+def test_process_stack_in_chunks_matches_single_chunk(pin_stack: np.ndarray):
+    whole = _pin_detector().process_stack(pin_stack)
+    with patch("dodal.devices.oav.pin_image_recognition.utils.STACK_CHUNK_SIZE", 4):
+        chunked = _pin_detector().process_stack(pin_stack)
+    for field in ("tip_x", "tip_y", "edge_top", "edge_bottom"):
+        np.testing.assert_array_equal(getattr(chunked, field), getattr(whole, field))
+
+
+def test_process_stack_reads_memory_mapped_stack(pin_stack: np.ndarray, tmp_path: Path):
+    mapped = np.lib.format.open_memmap(
+        tmp_path / "stack.npy", mode="w+", dtype=np.uint8, shape=pin_stack.shape
+    )
+    mapped[:] = pin_stack
+    mapped.flush()
+
+    locations = _pin_detector().process_stack(
+        np.load(tmp_path / "stack.npy", mmap_mode="r")
+    )
+    expected = _pin_detector().process_stack(pin_stack)
+    np.testing.assert_array_equal(locations.tip_x, expected.tip_x)
+    np.testing.assert_array_equal(locations.tip_y, expected.tip_y)
+
+
+def test_process_stack_of_no_frames():
+    locations = MxSampleDetect().process_stack(np.zeros((0, 5, 6), dtype=np.uint8))
+    assert len(locations) == 0
+    assert locations.edge_top.shape == (0, 6)
+
+
+def test_process_stack_rejects_single_frame(sample_array):
+    with pytest.raises(ValueError):
+        MxSampleDetect().process_stack(sample_array)
@@ -114,7 +114,7 @@ async def test_oav_returns_rescaled_beam_position_and_microns_per_pixel_correctl
 
 
 @patch(
-    "dodal.devices.areadetector.plugins.mjpg.ClientSession.get",
+    "dodal.devices.areadetector.plugins.mjpg.aiohttp.ClientSession.get",
     autospec=True,
 )
 @patch("dodal.devices.areadetector.plugins.mjpg.Image")
@@ -133,6 +133,7 @@ async def test_when_snapshot_triggered_post_processing_called_correctly(
     await oav.snapshot.trigger()
 
     mock_proc.assert_awaited_once()
+    await oav.snapshot.close()
 
 
 async def test_oav_beam_centre_gets_beam_centre_from_pvs_roi(
@@ -1,20 +1,24 @@
 import asyncio
+import itertools
 from datetime import timedelta
 from unittest.mock import ANY, AsyncMock, MagicMock, call, patch
 
 import pytest
 from ophyd_async.core import init_devices, set_mock_value
 
+from dodal.devices.areadetector.plugins.mjpg import MJPGStreamReader, get_next_jpeg
 from dodal.devices.oav.oav_detector import OAV
 from dodal.devices.oav.oav_to_redis_forwarder import (
     OAVToRedisForwarder,
     Source,
-    get_next_jpeg,
+    _Frame,
 )
 
+JPEG_BYTES = b"\xff\xd8\x67\xce\xff\xd9"
+MULTIPART_HEADER = b"--boundary\r\nContent-Type: image/jpeg\r\n\r\n"
+
 
 @pytest.fixture
-@patch("dodal.devices.oav.oav_to_redis_forwarder.StrictRedis", new=AsyncMock)
 async def oav_forwarder(oav_beam_centre_pv_fs: OAV, oav_beam_centre_pv_roi: OAV):
     set_mock_value(
         oav_beam_centre_pv_fs.snapshot.video_url,
@@ -24,28 +28,44 @@ async def oav_forwarder(oav_beam_centre_pv_fs: OAV, oav_beam_centre_pv_roi: OAV)
         oav_beam_centre_pv_roi.snapshot.video_url,
         "test-roi-stream-url",
     )
-    with init_devices(mock=True):
+    with (
+        patch(
+            "dodal.devices.oav.oav_to_redis_forwarder.redis.asyncio.StrictRedis",
+            new=MagicMock,
+        ),
+        init_devices(mock=True),
+    ):
         oav_forwarder = OAVToRedisForwarder(
             "prefix", oav_beam_centre_pv_roi, oav_beam_centre_pv_fs, "host", "password"
         )
 
+    oav_forwarder.redis_client.pipeline.return_value.execute = AsyncMock()
     set_mock_value(oav_forwarder.selected_source, Source.FULL_SCREEN.value)
-    return oav_forwarder
+    yield oav_forwarder
+    await oav_forwarder.close()
 
 
-def get_mock_response(jpeg_bytes: bytes | None = None):
-    if not jpeg_bytes:
-        jpeg_bytes = b"\xff\xd8\x67\xce\xff\xd9"
+def get_mock_response(chunks: list[bytes] | None = None):
+    """A response whose content repeats the given chunks, by default a single
+    multipart frame.
+    """
+    chunks = chunks or [MULTIPART_HEADER + JPEG_BYTES + b"\r\n"]
     mock_response = MagicMock()
-    mock_response.content.readline = AsyncMock(return_value=jpeg_bytes[:3])
-    mock_response.content.readuntil = AsyncMock(return_value=jpeg_bytes[3:])
+    mock_response.content.readany = AsyncMock(
+        side_effect=(chunks[i % len(chunks)] for i in itertools.count())
+    )
     return mock_response
 
 
+def get_pipeline(oav_forwarder: OAVToRedisForwarder) -> MagicMock:
+    return oav_forwarder.redis_client.pipeline.return_value  # type: ignore
+
+
 @pytest.fixture
 def oav_forwarder_with_valid_response(oav_forwarder: OAVToRedisForwarder):
     client_session_patch = patch(
-        "dodal.devices.oav.oav_to_redis_forwarder.ClientSession.get", autospec=True
+        "dodal.devices.oav.oav_to_redis_forwarder.aiohttp.ClientSession.get",
+        autospec=True,
     )
     mock_get = client_session_patch.start()
     mock_get.return_value.__aenter__.return_value = (
@@ -56,14 +76,16 @@ def oav_forwarder_with_valid_response(oav_forwarder: OAVToRedisForwarder):
     client_session_patch.stop()
 
 
-@patch("dodal.devices.oav.oav_to_redis_forwarder.ClientSession.get", autospec=True)
+@patch(
+    "dodal.devices.oav.oav_to_redis_forwarder.aiohttp.ClientSession.get", autospec=True
+)
 async def test_given_response_is_not_mjpeg_when_oav_forwarder_kicked_off_then_exception_raised(
     mock_get, oav_forwarder
 ):
     mock_get.return_value.__aenter__.return_value = (mock_response := AsyncMock())
     mock_response.content_type = "bad_content_type"
 
-    oav_forwarder._get_frame_and_put_to_redis = AsyncMock()
+    oav_forwarder._put_frames_to_redis = AsyncMock()
 
     with pytest.raises(ValueError):
         await oav_forwarder.kickoff()
@@ -73,15 +95,16 @@ async def test_when_oav_forwarder_kicked_off_then_connection_open_and_data_strea
     oav_forwarder_with_valid_response,
 ):
     oav_forwarder, mock_response, _ = oav_forwarder_with_valid_response
-    oav_forwarder._get_frame_and_put_to_redis = AsyncMock()
+    oav_forwarder._put_frames_to_redis = AsyncMock()
 
     await oav_forwarder.kickoff()
     await asyncio.sleep(0.01)
 
-    call_args = oav_forwarder._get_frame_and_put_to_redis.call_args
+    frames = oav_forwarder._put_frames_to_redis.call_args[0][0]
 
-    assert call_args[0][0].startswith("fullscreen-0")
-    assert call_args[0][1] == mock_response
+    assert frames[0].redis_uuid.startswith("fullscreen-0")
+    assert frames[0].jpeg == JPEG_BYTES
+    mock_response.content.readany.assert_awaited()
 
     await oav_forwarder.complete()
 
@@ -107,54 +130,109 @@ async def test_when_oav_forwarder_kicked_off_then_completed_forwarding_is_stoppe
 
 
 async def test_given_byte_stream_when_get_next_jpeg_called_then_jpeg_bytes_returned():
-    expected_bytes = b"\xff\xd8\x67\xce\xff\xd9"
-    mock_response = get_mock_response(expected_bytes)
+    mock_response = get_mock_response()
     bytes = await get_next_jpeg(mock_response)
-    assert bytes == expected_bytes
-    mock_response.content.readuntil.assert_awaited_once_with(b"\xff\xd9")
+    assert bytes == JPEG_BYTES
+    mock_response.content.readany.assert_awaited_once()
+
+
+async def test_given_frames_split_across_chunks_then_stream_reader_returns_each_jpeg():
+    other_jpeg = b"\xff\xd8\x01\xff\x00\x02\xff\xd9"
+    stream = (
+        MULTIPART_HEADER + JPEG_BYTES + b"\r\n" + MULTIPART_HEADER + other_jpeg
+    ) * 2
+    # Split every byte so that markers are split between chunks
+    reader = MJPGStreamReader(
+        get_mock_response([stream[i : i + 1] for i in range(len(stream))])
+    )
+    assert [await reader.next_jpeg() for _ in range(4)] == [
+        JPEG_BYTES,
+        other_jpeg,
+        JPEG_BYTES,
+        other_jpeg,
+    ]
+
+
+async def test_given_many_frames_in_one_chunk_then_stream_reader_returns_each_jpeg():
+    chunk = (MULTIPART_HEADER + JPEG_BYTES + b"\r\n") * 3
+    mock_response = get_mock_response([chunk])
+    reader = MJPGStreamReader(mock_response)
+    assert [await reader.next_jpeg() for _ in range(3)] == [JPEG_BYTES] * 3
+    mock_response.content.readany.assert_awaited_once()
+
+
+async def test_given_stream_ends_mid_frame_then_stream_reader_raises():
+    mock_response = MagicMock()
+    mock_response.content.readany = AsyncMock(
+        side_effect=[MULTIPART_HEADER + JPEG_BYTES[:3], b""]
+    )
+    with pytest.raises(ConnectionError):
+        await MJPGStreamReader(mock_response).next_jpeg()
 
 
-async def test_when_get_frame_and_put_to_redis_called_then_data_put_in_redis_under_sample_id(
+async def test_when_frames_put_to_redis_then_data_put_in_redis_under_sample_id(
     oav_forwarder,
 ):
     sample_id = 100
     await oav_forwarder.sample_id.set(sample_id)
-    await oav_forwarder._get_frame_and_put_to_redis(ANY, get_mock_response())
-    redis_call = oav_forwarder.redis_client.hset.call_args[0]
-    assert redis_call[0] == "murko:100:raw"
+    await oav_forwarder._put_frames_to_redis([_Frame("a", JPEG_BYTES)])
+    redis_call = get_pipeline(oav_forwarder).hset.call_args
+    assert redis_call[0][0] == "murko:100:raw"
 
 
-async def test_when_get_frame_and_put_to_redis_called_then_data_is_jpeg_bytes(
+async def test_when_frames_put_to_redis_then_data_is_jpeg_bytes_in_one_pipeline(
     oav_forwarder,
 ):
-    expected_bytes = b"\xff\xd8\x67\xce\xff\xd9"
-    await oav_forwarder._get_frame_and_put_to_redis(
-        ANY, get_mock_response(expected_bytes)
+    other_jpeg = b"\xff\xd8\x01\xff\xd9"
+    await oav_forwarder._put_frames_to_redis(
+        [_Frame("a", JPEG_BYTES), _Frame("b", other_jpeg)]
     )
-    redis_call = oav_forwarder.redis_client.hset.call_args[0]
-    assert redis_call[2] == expected_bytes
+    pipeline = get_pipeline(oav_forwarder)
+    assert pipeline.hset.call_args.kwargs["mapping"] == {
+        "a": JPEG_BYTES,
+        "b": other_jpeg,
+    }
+    pipeline.execute.assert_awaited_once()
 
 
-async def test_when_get_frame_and_put_to_redis_called_then_data_put_in_redis_with_expiry_time(
+async def test_when_frames_put_to_redis_then_data_put_in_redis_with_expiry_time(
     oav_forwarder,
 ):
     sample_id = 100
     await oav_forwarder.sample_id.set(sample_id)
-    await oav_forwarder._get_frame_and_put_to_redis(ANY, get_mock_response())
-    redis_expire_call = oav_forwarder.redis_client.expire.call_args[0]
+    await oav_forwarder._put_frames_to_redis([_Frame("a", JPEG_BYTES)])
+    redis_expire_call = get_pipeline(oav_forwarder).expire.call_args[0]
     assert redis_expire_call[0] == "murko:100:raw"
     assert redis_expire_call[1] == timedelta(days=oav_forwarder.DATA_EXPIRY_DAYS)
 
 
-async def test_when_get_frame_and_put_to_redis_called_then_data_put_in_redis_before_uuid_set(
+async def test_when_frames_put_to_redis_then_data_put_in_redis_before_uuids_set(
     oav_forwarder,
 ):
     # The uuid being set produces an event that downstream processing relies on to know data is valid
     parent_mock = MagicMock()
-    parent_mock.attach_mock(oav_forwarder.redis_client.hset, "redis")
+    parent_mock.attach_mock(get_pipeline(oav_forwarder).execute, "redis")
     oav_forwarder.uuid_setter = MagicMock(name="uuid", parent=parent_mock)
-    await oav_forwarder._get_frame_and_put_to_redis(ANY, get_mock_response())
-    assert parent_mock.method_calls == [call.redis(ANY, ANY, ANY), call.uuid(ANY)]
+    await oav_forwarder._put_frames_to_redis(
+        [_Frame("a", JPEG_BYTES), _Frame("b", JPEG_BYTES)]
+    )
+    assert parent_mock.method_calls == [call.redis(), call.uuid("a"), call.uuid("b")]
+
+
+async def test_when_frames_put_to_redis_then_lag_is_set(oav_forwarder):
+    await oav_forwarder._put_frames_to_redis([_Frame("a", JPEG_BYTES, received_at=0)])
+    assert await oav_forwarder.lag.get_value() > 0
+
+
+async def test_given_queue_full_when_frame_queued_then_oldest_dropped_and_counted(
+    oav_forwarder,
+):
+    for i in range(oav_forwarder.MAX_QUEUED_FRAMES + 2):
+        oav_forwarder._queue_frame(_Frame(str(i), JPEG_BYTES))
+
+    assert await oav_forwarder.dropped_frames.get_value() == 2
+    assert len(oav_forwarder._queued_frames) == oav_forwarder.MAX_QUEUED_FRAMES
+    assert oav_forwarder._queued_frames[0].redis_uuid == "2"
 
 
 @pytest.mark.parametrize(
@@ -193,8 +271,8 @@ async def test_when_different_sources_selected_then_different_uuids_used(
     await asyncio.sleep(0.01)
     await oav_forwarder.complete()
 
-    redis_call = oav_forwarder.redis_client.hset.call_args[0]
-    assert redis_call[1].startswith(f"{expected_uuid_prefix}-0")
+    mapping = get_pipeline(oav_forwarder).hset.call_args.kwargs["mapping"]
+    assert next(iter(mapping)).startswith(f"{expected_uuid_prefix}-0")
 
 
 @pytest.mark.parametrize(
@@ -211,10 +289,11 @@ async def test_oav_only_forwards_data_when_the_unique_id_updates(
     set_mock_value(oav_forwarder.selected_source, source.value)
     await oav_forwarder.kickoff()
     await asyncio.sleep(0.01)
-    oav_forwarder.redis_client.hset.assert_called_once()
+    pipeline = get_pipeline(oav_forwarder)
+    pipeline.hset.assert_called_once()
     set_mock_value(oav_forwarder.counter, 1)
     await asyncio.sleep(0.01)
-    assert oav_forwarder.redis_client.hset.call_count == 2
-    second_call = oav_forwarder.redis_client.hset.call_args_list[1][0]
-    assert second_call[1].startswith(f"{expected_uuid_prefix}-1")
+    assert pipeline.hset.call_count == 2
+    second_mapping = pipeline.hset.call_args_list[1].kwargs["mapping"]
+    assert next(iter(second_mapping)).startswith(f"{expected_uuid_prefix}-1")
     await oav_forwarder.complete()
@@ -1,3 +1,6 @@
+import asyncio
+import threading
+import time
 from collections.abc import AsyncGenerator
 from io import BytesIO
 from pathlib import Path
@@ -7,11 +10,12 @@ from uuid import uuid4
 import pytest
 from aiohttp.client import ClientSession
 from aiohttp.test_utils import TestClient, TestServer, unused_port
-from aiohttp.web import Response
+from aiohttp.web import Request, Response, StreamResponse
 from aiohttp.web_app import Application
 from ophyd_async.core import init_devices, set_mock_value
 from PIL import Image
 
+from dodal.devices.areadetector.plugins.mjpg import ImageFormat, MJPGFrame
 from dodal.devices.oav.snapshots.snapshot import (
     Snapshot,
 )
@@ -58,7 +62,7 @@ async def snapshot(
         return test_client.session
 
     with patch(
-        "dodal.devices.areadetector.plugins.mjpg.ClientSession", new=get_session
+        "dodal.devices.areadetector.plugins.mjpg.aiohttp.ClientSession", new=get_session
     ):
         async with init_devices(mock=True):
             fake_snapshot = Snapshot("")
@@ -79,7 +83,7 @@ async def grid_snapshot(
         return test_client.session
 
     with patch(
-        "dodal.devices.areadetector.plugins.mjpg.ClientSession", new=get_session
+        "dodal.devices.areadetector.plugins.mjpg.aiohttp.ClientSession", new=get_session
     ):
         async with init_devices(mock=True):
             fake_grid = SnapshotWithGrid("")
@@ -97,12 +101,36 @@ async def grid_snapshot(
         yield fake_grid
 
 
+@pytest.fixture
+def video_frame(image: Image.Image) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, "jpeg")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def video_stream(video_frame: bytes):
+    async def stream(request: Request) -> StreamResponse:
+        response = StreamResponse(
+            headers={"Content-Type": "multipart/x-mixed-replace; boundary=frame"}
+        )
+        await response.prepare(request)
+        while True:
+            await response.write(
+                b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + video_frame + b"\r\n"
+            )
+            await asyncio.sleep(0.01)
+
+    return stream
+
+
 @pytest.fixture
 async def test_client(
-    image_data_coro: AsyncMock, server_port: int
+    image_data_coro: AsyncMock, video_stream, server_port: int
 ) -> AsyncGenerator[TestClient]:
     app = Application()
     app.router.add_get("", handler=image_data_coro)
+    app.router.add_get("/video", handler=video_stream)
     client = TestClient(server=TestServer(app, port=server_port))
     await client.start_server()
     yield client
@@ -176,8 +204,12 @@ async def test_snapshot_with_grid_triggered_saves_image_and_draws_correct_grid(
     await grid_snapshot.trigger()
 
     with Image.open(output_file) as actual:
-        patch_add_border.assert_called_once_with(actual, 100, 100, 50, 15, 10)
-        patch_add_grid.assert_called_once_with(actual, 100, 100, 50, 15, 10)
+        # Overlays are drawn on copies of the image
+        for patch_add_overlay in (patch_add_border, patch_add_grid):
+            patch_add_overlay.assert_called_once()
+            drawn_on, *args = patch_add_overlay.call_args.args
+            assert_images_identical(drawn_on, actual)
+            assert args == [100, 100, 50, 15, 10]
 
     assert (
         await grid_snapshot.last_path_outer.get_value()
@@ -188,3 +220,188 @@ async def test_snapshot_with_grid_triggered_saves_image_and_draws_correct_grid(
         await grid_snapshot.last_path_full_overlay.get_value()
         == f"{tmp_path / f'{output_file_name}_grid_overlay.png'}"
     )
+
+
+async def test_snapshot_triggers_reuse_session(
+    snapshot: Snapshot,
+    test_client: TestClient,
+    image_data_coro: Mock,
+    image_bytes: BytesIO,
+):
+    image_data_coro.side_effect = lambda _: Response(body=image_bytes.getvalue())
+    with patch(
+        "dodal.devices.areadetector.plugins.mjpg.aiohttp.ClientSession",
+        side_effect=lambda raise_for_status: test_client.session,
+    ) as session_type:
+        await snapshot.trigger()
+        await snapshot.trigger()
+    session_type.assert_called_once()
+    assert image_data_coro.call_count == 2
+
+
+async def test_frame_grabber_keeps_latest_frames(snapshot: Snapshot, server_port: int):
+    set_mock_value(snapshot.video_url, f"http://127.0.0.1:{server_port}/video")
+    await snapshot.start_frame_grabber()
+    try:
+        while len(snapshot.frames) < 2:
+            await asyncio.sleep(0.01)
+    finally:
+        await snapshot.stop_frame_grabber()
+
+    assert snapshot.frames == []
+
+
+async def test_snapshot_uses_grabbed_frame_when_available(
+    snapshot: Snapshot,
+    server_port: int,
+    output_file: Path,
+    image: Image.Image,
+    image_data_coro: Mock,
+):
+    set_mock_value(snapshot.video_url, f"http://127.0.0.1:{server_port}/video")
+    await snapshot.start_frame_grabber()
+    try:
+        await snapshot.trigger()
+    finally:
+        await snapshot.stop_frame_grabber()
+
+    image_data_coro.assert_not_called()
+    with Image.open(output_file) as actual:
+        assert actual.size == image.size
+
+
+async def test_snapshot_requests_image_when_no_frame_grabbed_after_trigger(
+    snapshot: Snapshot, image_data_coro: Mock, video_frame: bytes
+):
+    # A frame grabber whose stream has stalled, after buffering a frame
+    snapshot._grabber_task = asyncio.create_task(asyncio.Event().wait())
+    snapshot._frames.append(MJPGFrame(video_frame, timestamp=time.monotonic()))
+    snapshot.FRAME_WAIT_TIMEOUT = 0.05
+    try:
+        await snapshot.trigger()
+    finally:
+        await snapshot.stop_frame_grabber()
+    image_data_coro.assert_called_once()
+
+
+async def test_next_frame_is_captured_after_the_given_time(
+    snapshot: Snapshot, server_port: int
+):
+    set_mock_value(snapshot.video_url, f"http://127.0.0.1:{server_port}/video")
+    await snapshot.start_frame_grabber()
+    try:
+        while not snapshot.frames:
+            await asyncio.sleep(0.01)
+        start = time.monotonic()
+        frame = await snapshot.next_frame(start)
+    finally:
+        await snapshot.stop_frame_grabber()
+    assert frame is not None
+    assert frame.timestamp >= start
+
+
+async def test_next_frame_is_none_without_frame_grabber(snapshot: Snapshot):
+    assert await snapshot.next_frame(time.monotonic()) is None
+
+
+async def test_unstage_stops_frame_grabber_and_closes_session(
+    snapshot: Snapshot, server_port: int
+):
+    set_mock_value(snapshot.video_url, f"http://127.0.0.1:{server_port}/video")
+    await snapshot.stage()
+    await snapshot.start_frame_grabber()
+    with patch.object(snapshot._session, "close", AsyncMock()) as close:
+        await snapshot.unstage()
+    close.assert_awaited_once()
+    assert snapshot._grabber_task is None
+    assert snapshot.frames == []
+
+
+def test_grabbed_frame_decoded_once_and_copied(video_frame: bytes):
+    frame = MJPGFrame(video_frame)
+    with patch(
+        "dodal.devices.areadetector.plugins.mjpg.Image.open", wraps=Image.open
+    ) as image_open:
+        first = frame.image()
+        second = frame.image()
+    image_open.assert_called_once()
+    assert first is not second
+
+
+@pytest.mark.parametrize(
+    "image_format, expected_format",
+    [(ImageFormat.PNG, "PNG"), (ImageFormat.JPEG, "JPEG"), (ImageFormat.WEBP, "WEBP")],
+)
+async def test_snapshot_saved_in_configured_format(
+    snapshot: Snapshot,
+    tmp_path: Path,
+    output_file_name: str,
+    image_format: ImageFormat,
+    expected_format: str,
+):
+    set_mock_value(snapshot.image_format, image_format)
+    await snapshot.trigger()
+
+    output_file = tmp_path / f"{output_file_name}.{image_format.value}"
+    assert await snapshot.last_saved_path.get_value() == f"{output_file}"
+    with Image.open(output_file) as actual:
+        assert actual.format == expected_format
+
+
+async def test_snapshot_with_grid_saves_all_images_in_configured_format(
+    grid_snapshot: SnapshotWithGrid, tmp_path: Path, output_file_name: str
+):
+    set_mock_value(grid_snapshot.image_format, ImageFormat.JPEG)
+    await grid_snapshot.trigger()
+    for suffix in ("", "_outer_overlay", "_grid_overlay"):
+        assert (tmp_path / f"{output_file_name}{suffix}.jpg").exists()
+
+
+async def test_raw_jpeg_saved_without_reencoding(
+    snapshot: Snapshot,
+    image_data_coro: Mock,
+    video_frame: bytes,
+    tmp_path: Path,
+    output_file_name: str,
+):
+    image_data_coro.return_value = Response(body=video_frame)
+    set_mock_value(snapshot.save_raw_jpeg, True)
+    with patch("dodal.devices.areadetector.plugins.mjpg.encode_image") as encode_image:
+        await snapshot.trigger()
+
+    encode_image.assert_not_called()
+    output_file = tmp_path / f"{output_file_name}.jpg"
+    assert await snapshot.last_saved_path.get_value() == f"{output_file}"
+    assert output_file.read_bytes() == video_frame
+
+
+async def test_raw_jpeg_not_used_for_overlays(
+    grid_snapshot: SnapshotWithGrid,
+    image_data_coro: Mock,
+    video_frame: bytes,
+    tmp_path: Path,
+    output_file_name: str,
+):
+    image_data_coro.return_value = Response(body=video_frame)
+    set_mock_value(grid_snapshot.save_raw_jpeg, True)
+    await grid_snapshot.trigger()
+
+    assert (tmp_path / f"{output_file_name}.jpg").read_bytes() == video_frame
+    assert (tmp_path / f"{output_file_name}_outer_overlay.png").exists()
+    assert (tmp_path / f"{output_file_name}_grid_overlay.png").exists()
+
+
+async def test_image_encoded_off_event_loop(snapshot: Snapshot):
+    encoding_threads = []
+
+    def encode_image(*args):
+        encoding_threads.append(threading.current_thread())
+        return b""
+
+    with patch(
+        "dodal.devices.areadetector.plugins.mjpg.encode_image", side_effect=encode_image
+    ):
+        await snapshot.trigger()
+
+    assert encoding_threads
+    assert threading.current_thread() not in encoding_threads
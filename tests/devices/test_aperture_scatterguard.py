@@ -1,3 +1,4 @@
+import asyncio
 from collections.abc import AsyncGenerator
 from math import inf
 from typing import Any
@@ -10,14 +11,17 @@ from ophyd_async.core import (
     callback_on_mock_put,
     get_mock,
     get_mock_put,
+    set_mock_attr,
     set_mock_value,
 )
+from pydantic import ValidationError
 
 from dodal.devices.aperturescatterguard import (
     AperturePosition,
     ApertureScatterguard,
     ApertureValue,
     InvalidApertureMoveError,
+    load_positions_from_beamline_parameters,
 )
 from tests.devices.conftest import set_to_position
 
@@ -565,3 +569,125 @@ async def test_calling_prepare_then_set_in_quick_succession_throws_an_error(
 
     with pytest.raises(InvalidApertureMoveError):
         await aperture_in_medium_pos.selected_aperture.set(ApertureValue.SMALL)
+
+
+def _count_done_move_reads(ap_sg: ApertureScatterguard) -> list[AsyncMock]:
+    reads = []
+    for motor in get_all_motors(ap_sg):
+        read = AsyncMock(wraps=motor.motor_done_move.get_value)
+        set_mock_attr(motor.motor_done_move, "get_value", read)
+        reads.append(read)
+    return reads
+
+
+async def test_aperture_changes_check_safety_against_monitored_axis_states(
+    aperture_in_medium_pos: ApertureScatterguard,
+):
+    reads = _count_done_move_reads(aperture_in_medium_pos)
+
+    # The first move reads all the axes to start the monitors
+    await aperture_in_medium_pos.selected_aperture.set(ApertureValue.SMALL)
+    assert [read.await_count for read in reads] == [1] * 5
+
+    await aperture_in_medium_pos.selected_aperture.set(ApertureValue.OUT_OF_BEAM)
+    await aperture_in_medium_pos.prepare(ApertureValue.LARGE)
+    await aperture_in_medium_pos.selected_aperture.set(ApertureValue.LARGE)
+    assert [read.await_count for read in reads] == [1] * 5
+
+
+async def test_given_move_in_progress_when_aperture_set_then_raises_before_done_move_updates(
+    aperture_in_medium_pos: ApertureScatterguard,
+):
+    move_can_finish = asyncio.Event()
+
+    async def _slow_move(*args, **kwargs):
+        await move_can_finish.wait()
+
+    await aperture_in_medium_pos._axis_states.start()
+    callback_on_mock_put(aperture_in_medium_pos.aperture.x.user_setpoint, _slow_move)
+    status = aperture_in_medium_pos.selected_aperture.set(ApertureValue.SMALL)
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(InvalidApertureMoveError):
+        await aperture_in_medium_pos.selected_aperture.set(ApertureValue.LARGE)
+
+    move_can_finish.set()
+    await status
+    await aperture_in_medium_pos.selected_aperture.set(ApertureValue.LARGE)
+
+
+async def test_aperture_z_is_read_from_the_motor_for_the_safety_check(
+    aperture_in_medium_pos: ApertureScatterguard,
+):
+    await aperture_in_medium_pos._axis_states.start()
+
+    async def _z_out_of_position():
+        return 0.0
+
+    set_mock_attr(
+        aperture_in_medium_pos.aperture.z.user_readback,
+        "get_value",
+        _z_out_of_position,
+    )
+
+    with pytest.raises(InvalidApertureMoveError, match="Current aperture z"):
+        await aperture_in_medium_pos.selected_aperture.set(ApertureValue.SMALL)
+
+
+async def test_axis_states_stop_being_monitored_when_device_connected_again(
+    aperture_in_medium_pos: ApertureScatterguard,
+):
+    await aperture_in_medium_pos._axis_states.start()
+
+    await aperture_in_medium_pos.connect(mock=True)
+    set_mock_value(aperture_in_medium_pos.aperture.y.user_readback, 12.5)
+
+    assert not aperture_in_medium_pos._axis_states._started
+    assert not aperture_in_medium_pos._axis_states._values
+
+    await aperture_in_medium_pos._axis_states.start()
+    assert (
+        aperture_in_medium_pos._axis_states.readback(aperture_in_medium_pos.aperture.y)
+        == 12.5
+    )
+
+
+def test_aperture_positions_are_only_made_again_when_their_parameters_change(
+    aperture_positions: dict[ApertureValue, AperturePosition],
+):
+    params = {
+        f"{axis}_{position}": value
+        for position, aperture_position in zip(
+            ("ROBOT_LOAD", "SMALL_APERTURE", "MEDIUM_APERTURE", "LARGE_APERTURE"),
+            aperture_positions.values(),
+            strict=False,
+        )
+        for axis, value in zip(
+            ("miniap_x", "miniap_y", "miniap_z", "sg_x", "sg_y"),
+            aperture_position.values,
+            strict=True,
+        )
+    } | {
+        f"{axis}_MANUAL_LOAD": value
+        for axis, value in zip(
+            ("miniap_x", "miniap_y", "miniap_z", "sg_x", "sg_y"),
+            aperture_positions[ApertureValue.PARKED].values,
+            strict=True,
+        )
+    }
+
+    positions = load_positions_from_beamline_parameters(params)
+    assert positions == aperture_positions
+    unrelated_change = load_positions_from_beamline_parameters(
+        params | {"DCM_Perp_Offset_FIXED": 25.6}
+    )
+    assert unrelated_change[ApertureValue.SMALL] is positions[ApertureValue.SMALL]
+
+    moved = load_positions_from_beamline_parameters(
+        params | {"miniap_y_SMALL_APERTURE": 49.0}
+    )
+    assert moved[ApertureValue.SMALL].aperture_y == 49.0
+    assert positions[ApertureValue.SMALL].aperture_y != 49.0
+
+    with pytest.raises(ValidationError):
+        positions[ApertureValue.SMALL].aperture_y = 49.0
@@ -1,4 +1,5 @@
 import asyncio
+from functools import partial
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -114,3 +115,76 @@ async def test_enum_attenuator_set():
     await status
     mock_set.assert_awaited_once_with(YesNo.YES)
     mock_trigger.assert_called_once()
+
+
+class _ReadsInFlight:
+    """Counts the reads of signals that are in progress at the same time."""
+
+    def __init__(self, signals):
+        self.in_flight = 0
+        self.most_in_flight = 0
+        for signal in signals:
+            set_mock_attr(signal, "get_value", partial(self._read, signal.get_value))
+
+    async def _read(self, get_value):
+        self.in_flight += 1
+        self.most_in_flight = max(self.most_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return await get_value()
+
+
+@pytest.mark.parametrize("num_filters", [1, 4, 16])
+async def test_attenuator_set_reads_all_filters_at_once(num_filters: int):
+    async with init_devices(mock=True):
+        attenuator = BinaryFilterAttenuator(prefix="", num_filters=num_filters)
+    reads = _ReadsInFlight(
+        [
+            *attenuator._calculated_filter_states.values(),
+            *attenuator._filters_in_position.values(),
+        ]
+    )
+
+    await attenuator.set(0.5)
+    assert reads.most_in_flight == 2 * num_filters
+
+
+async def test_attenuator_set_only_waits_for_filters_that_change(
+    fake_attenuator: BinaryFilterAttenuator,
+):
+    for i in range(16):
+        set_mock_value(fake_attenuator._filters_in_position[i], i < 8)
+        set_mock_value(fake_attenuator._calculated_filter_states[i], i < 12)
+
+    status = fake_attenuator.set(0.5)
+    await asyncio.sleep(0.01)
+    assert not status.done
+    for i in range(8, 11):
+        set_mock_value(fake_attenuator._filters_in_position[i], True)
+    await asyncio.sleep(0.01)
+    assert not status.done
+    set_mock_value(fake_attenuator._filters_in_position[11], True)
+    await status
+
+
+@patch("dodal.devices.attenuator.attenuator.DEFAULT_TIMEOUT", 0.05)
+async def test_attenuator_set_times_out_if_filter_does_not_move(
+    fake_attenuator: BinaryFilterAttenuator,
+):
+    set_mock_value(fake_attenuator._calculated_filter_states[3], 1)
+    with pytest.raises(asyncio.TimeoutError):
+        await fake_attenuator.set(0.5)
+
+
+@patch("dodal.devices.attenuator.attenuator.DEFAULT_TIMEOUT", 0.05)
+async def test_attenuator_set_timeout_names_filters_still_moving(
+    fake_attenuator: BinaryFilterAttenuator,
+):
+    set_mock_value(fake_attenuator._calculated_filter_states[3], 1)
+    set_mock_value(fake_attenuator._calculated_filter_states[5], 1)
+    set_mock_value(fake_attenuator._filters_in_position[3], True)
+    with pytest.raises(TimeoutError) as e:
+        await fake_attenuator.set(0.5)
+    message = str(e.value)
+    assert fake_attenuator._filters_in_position[5].name in message
+    assert f"{fake_attenuator._filters_in_position[3].name} " not in message
@@ -152,6 +152,22 @@ def test_check_detector_variables(
             raise AssertionError(f"exception was raised {e}") from e
 
 
+def test_set_odin_pvs_allocates_run_number_without_listing_directory_again(
+    fake_eiger: EigerDetector, tmp_path
+):
+    fake_eiger.detector_params.directory = f"{tmp_path}/"
+    fake_eiger.detector_params.override_run_number = None
+    (tmp_path / f"{TEST_PREFIX}_4.nxs").touch()
+
+    with patch("dodal.devices.detector.detector.get_run_number") as get_run_number:
+        fake_eiger.set_odin_pvs()
+        assert fake_eiger.detector_params.full_filename == f"{TEST_PREFIX}_5"
+
+    get_run_number.assert_not_called()
+    assert fake_eiger.odin.file_writer.file_name.get() == f"{TEST_PREFIX}_5"
+    assert fake_eiger.detector_params.run_number == 5
+
+
 # Tests transition from set_odin_pvs_after_file_writer_set to set_mx_settings_pvs
 def test_when_set_odin_pvs_called_then_full_filename_written_and_set_mx_settings_runs(
     fake_eiger: EigerDetector,
@@ -0,0 +1,208 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from daq_config_server.client import ConfigClient
+from ophyd_async.core import (
+    DetectorTrigger,
+    TriggerInfo,
+    callback_on_mock_execute,
+    callback_on_mock_put,
+    get_mock,
+    get_mock_put,
+    init_devices,
+    set_mock_value,
+    soft_signal_rw,
+)
+from ophyd_async.fastcs.eiger import EigerDetector as FastEiger
+
+from dodal.common.beamlines.beamline_utils import set_config_client
+from dodal.devices.detector import DetectorParams
+from dodal.devices.eiger_arming import (
+    ArmingStage,
+    ArmingWrite,
+    arm_eiger,
+    configure_eiger,
+    eiger_arming_stages,
+    run_arming_stages,
+)
+
+PUT_LATENCY_S = 0.05
+
+
+@pytest.fixture
+async def fake_eiger(mock_config_client: ConfigClient) -> FastEiger:
+    set_config_client(mock_config_client)
+    with init_devices(mock=True):
+        fake_eiger = FastEiger("", MagicMock())
+    set_mock_value(fake_eiger.detector.bit_depth_image, 32)
+
+    def set_detector_into_writing_state(*args, **kwargs) -> None:
+        set_mock_value(fake_eiger.od.writing, True)
+        set_mock_value(fake_eiger.od.file_prefix, "filename.h5")
+        set_mock_value(fake_eiger.od.acquisition_id, "filename.h5")
+
+    callback_on_mock_execute(
+        fake_eiger.od.fp.start_writing, set_detector_into_writing_state
+    )
+    return fake_eiger
+
+
+@pytest.fixture
+def trigger_info() -> TriggerInfo:
+    return TriggerInfo(
+        number_of_events=1, trigger=DetectorTrigger.INTERNAL, deadtime=0.0001
+    )
+
+
+def written_signals(stages: list[ArmingStage]):
+    return [write.signal for stage in stages for write in stage.writes]
+
+
+async def test_arm_eiger_sets_pvs_and_arms(
+    fake_eiger: FastEiger, eiger_params: DetectorParams, trigger_info: TriggerInfo
+):
+    report = await arm_eiger(fake_eiger, eiger_params, trigger_info)
+
+    assert await fake_eiger.detector.photon_energy.get_value() == 100
+    assert await fake_eiger.detector.omega_increment.get_value() == 1
+    assert await fake_eiger.od.fp.data_chunks_0.get_value() == 1
+    assert len(get_mock(fake_eiger.detector.disarm).mock_calls) == 1
+    assert len(get_mock(fake_eiger.arm_when_ready).mock_calls) == 1
+    assert set(report.stage_timings_s) == {
+        "stop",
+        "cam",
+        "roi",
+        "mx_settings",
+        "prepare",
+        "arm",
+    }
+    assert list(report.stage_timings_s)[-2:] == ["prepare", "arm"]
+
+
+async def test_rearming_with_same_parameters_skips_writes(
+    fake_eiger: FastEiger, eiger_params: DetectorParams, trigger_info: TriggerInfo
+):
+    await arm_eiger(fake_eiger, eiger_params, trigger_info)
+    signals = written_signals(
+        eiger_arming_stages(fake_eiger, eiger_params, trigger_info)
+    )
+    for signal in signals:
+        get_mock_put(signal).reset_mock()
+
+    report = await arm_eiger(fake_eiger, eiger_params, trigger_info)
+
+    assert len(report.skipped_writes) == len(signals)
+    for signal in signals:
+        get_mock_put(signal).assert_not_called()
+
+
+def test_exposure_times_are_left_to_prepare(
+    fake_eiger: FastEiger, eiger_params: DetectorParams, trigger_info: TriggerInfo
+):
+    signals = written_signals(
+        eiger_arming_stages(fake_eiger, eiger_params, trigger_info)
+    )
+    assert fake_eiger.detector.count_time not in signals
+    assert fake_eiger.detector.frame_time not in signals
+
+
+async def test_configure_eiger_only_writes_pvs(
+    fake_eiger: FastEiger, eiger_params: DetectorParams
+):
+    report = await configure_eiger(fake_eiger, eiger_params)
+
+    assert set(report.stage_timings_s) == {"cam", "roi", "mx_settings"}
+    assert await fake_eiger.detector.omega_increment.get_value() == 1
+    get_mock(fake_eiger.detector.disarm).assert_not_called()
+    get_mock(fake_eiger.arm_when_ready).assert_not_called()
+
+
+async def test_photon_energy_not_set_if_within_tolerance(
+    fake_eiger: FastEiger, eiger_params: DetectorParams, trigger_info: TriggerInfo
+):
+    set_mock_value(fake_eiger.detector.photon_energy, 100.05)
+    await arm_eiger(fake_eiger, eiger_params, trigger_info)
+    get_mock_put(fake_eiger.detector.photon_energy).assert_not_called()
+
+
+async def test_independent_writes_are_made_concurrently(
+    fake_eiger: FastEiger, eiger_params: DetectorParams, trigger_info: TriggerInfo
+):
+    signals = written_signals(
+        eiger_arming_stages(fake_eiger, eiger_params, trigger_info)
+    )
+
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_put(*_):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(PUT_LATENCY_S)
+        in_flight -= 1
+
+    for signal in signals:
+        callback_on_mock_put(signal, slow_put)
+
+    report = await arm_eiger(fake_eiger, eiger_params, trigger_info)
+
+    # All of the configuration writes are independent of each other
+    writes_made = len(signals) - len(report.skipped_writes)
+    assert max_in_flight == writes_made
+    assert report.total_s < writes_made * PUT_LATENCY_S
+
+
+async def test_stages_wait_for_their_dependencies():
+    order = []
+
+    def record(name: str, delay: float = 0):
+        async def action():
+            await asyncio.sleep(delay)
+            order.append(name)
+
+        return action
+
+    await run_arming_stages(
+        [
+            ArmingStage("last", action=record("last"), depends_on=["slow", "fast"]),
+            ArmingStage("slow", action=record("slow", 0.02)),
+            ArmingStage("fast", action=record("fast")),
+        ]
+    )
+    assert order == ["fast", "slow", "last"]
+
+
+async def test_failed_stage_stops_dependent_stages():
+    signal = soft_signal_rw(int, name="signal")
+
+    async def fail():
+        raise RuntimeError("Failed to stop")
+
+    with pytest.raises(RuntimeError, match="Failed to stop"):
+        await run_arming_stages(
+            [
+                ArmingStage("stop", action=fail),
+                ArmingStage(
+                    "set", writes=[ArmingWrite(signal, 1)], depends_on=["stop"]
+                ),
+            ]
+        )
+    assert await signal.get_value() == 0
+
+
+@pytest.mark.parametrize(
+    "stages, message",
+    [
+        ([ArmingStage("a"), ArmingStage("a")], "unique"),
+        ([ArmingStage("a", depends_on=["b"])], "unknown"),
+        (
+            [ArmingStage("a", depends_on=["b"]), ArmingStage("b", depends_on=["a"])],
+            "cycle",
+        ),
+    ],
+)
+async def test_invalid_stages_rejected(stages: list[ArmingStage], message: str):
+    with pytest.raises(ValueError, match=message):
+        await run_arming_stages(stages)
@@ -1,20 +1,13 @@
 # type: ignore # Eiger will soon be ophyd-async https://github.com/DiamondLightSource/dodal/issues/700
-from unittest.mock import MagicMock, Mock, patch
+import threading
+import time
+from unittest.mock import MagicMock
 
 import pytest
+from ophyd import Component
 from ophyd.sim import make_fake_device
-from ophyd.status import Status
 
-from dodal.devices.eiger_odin import EigerOdin
-
-
-def fake_status(in_error: bool):
-    status = Status()
-    if in_error:
-        status.set_exception(Exception)
-    else:
-        status.set_finished()
-    return status
+from dodal.devices.eiger_odin import EigerOdin, OdinNode, OdinNodesStatus
 
 
 @pytest.fixture
@@ -25,6 +18,31 @@ def fake_odin():
     return fake_odin
 
 
+def set_odin_state(
+    fake_odin: EigerOdin,
+    fan_connected: bool = True,
+    fan_on: bool = True,
+    meta_init: bool = True,
+    node_error: bool = False,
+    node_init: bool = True,
+    frames_dropped: int = 0,
+    frames_timed_out: int = 0,
+):
+    fake_odin.fan.consumers_connected.sim_put(fan_connected)
+    fake_odin.fan.on.sim_put(fan_on)
+    fake_odin.meta.initialised.sim_put(meta_init)
+    for node in fake_odin.nodes.nodes:
+        node.error_status.sim_put(False)
+        node.error_message.sim_put("")
+        node.fp_initialised.sim_put(node_init)
+        node.fr_initialised.sim_put(node_init)
+        node.frames_dropped.sim_put(0)
+        node.frames_timed_out.sim_put(0)
+    fake_odin.nodes.node_0.error_status.sim_put(node_error)
+    fake_odin.nodes.node_1.frames_dropped.sim_put(frames_dropped)
+    fake_odin.nodes.node_2.frames_timed_out.sim_put(frames_timed_out)
+
+
 @pytest.mark.parametrize(
     "is_initialised, frames_dropped, frames_timed_out, expected_state",
     [
@@ -32,6 +50,8 @@ def fake_odin():
         (False, True, True, False),
         (False, False, False, False),
         (True, True, True, False),
+        (True, True, False, False),
+        (True, False, True, False),
     ],
 )
 def test_check_and_wait_for_odin_state(
@@ -41,15 +61,19 @@ def test_check_and_wait_for_odin_state(
     frames_timed_out: bool,
     expected_state: bool,
 ):
-    fake_odin.wait_for_odin_initialised = Mock(return_value=[is_initialised, ""])
-    fake_odin.nodes.check_frames_dropped = Mock(return_value=[frames_dropped, ""])
-    fake_odin.nodes.check_frames_timed_out = Mock(return_value=[frames_timed_out, ""])
+    fake_odin.health_monitor.start()
+    set_odin_state(
+        fake_odin,
+        node_init=is_initialised,
+        frames_dropped=int(frames_dropped),
+        frames_timed_out=int(frames_timed_out),
+    )
 
     if is_initialised:
-        assert fake_odin.check_and_wait_for_odin_state(None) == expected_state
+        assert fake_odin.check_and_wait_for_odin_state(0.1) == expected_state
     else:
         with pytest.raises(RuntimeError):
-            fake_odin.check_and_wait_for_odin_state(None)
+            fake_odin.check_and_wait_for_odin_state(0.1)
 
 
 @pytest.mark.parametrize(
@@ -61,9 +85,7 @@ def test_check_and_wait_for_odin_state(
         (True, True, False, False, False, 2, False),
     ],
 )
-@patch("dodal.devices.eiger_odin.await_value")
 def test_wait_for_odin_initialised(
-    patch_await,
     fake_odin: EigerOdin,
     fan_connected: bool,
     fan_on: bool,
@@ -73,22 +95,10 @@ def test_wait_for_odin_initialised(
     expected_error_num: int,
     expected_state: bool,
 ):
-    def _patch_await(signal, *args, **kwargs):
-        signal_and_return = {
-            fake_odin.fan.consumers_connected: fake_status(not fan_connected),
-            fake_odin.fan.on: fake_status(not fan_on),
-            fake_odin.meta.initialised: fake_status(not meta_init),
-        }
-        return signal_and_return[signal]
-
-    patch_await.side_effect = _patch_await
-
-    fake_odin.nodes.wait_for_no_errors = Mock(
-        return_value={fake_status(node_error): "node error" if node_error else ""}
-    )
-    fake_odin.nodes.get_init_state = Mock(return_value=fake_status(not node_init))
+    fake_odin.health_monitor.start()
+    set_odin_state(fake_odin, fan_connected, fan_on, meta_init, node_error, node_init)
 
-    error_state, error_message = fake_odin.wait_for_odin_initialised(0.5)
+    error_state, error_message = fake_odin.wait_for_odin_initialised(0.1)
     assert error_state == expected_state
     assert (len(error_message) == 0) == expected_state
     assert error_message.count("\n") == (
@@ -96,21 +106,49 @@ def test_wait_for_odin_initialised(
     )
 
 
-@patch("dodal.devices.eiger_odin.await_value")
-def test_given_node_in_error_node_error_status_gives_message_and_node_number(
-    patch_await,
+def test_wait_for_odin_initialised_returns_once_odin_becomes_initialised(
     fake_odin: EigerOdin,
 ):
-    error_message = "Help, I'm in error!"
-    patch_await.side_effect = lambda *_: fake_status(True)
-    fake_odin.nodes.node_0.error_message.sim_put(error_message)  # type: ignore
+    fake_odin.health_monitor.start()
+    set_odin_state(fake_odin, node_init=False)
+    timer = threading.Timer(0.05, set_odin_state, args=[fake_odin])
+    timer.start()
+
+    start = time.monotonic()
+    assert fake_odin.wait_for_odin_initialised(0.5) == (True, "")
+    assert time.monotonic() - start < 0.5
+    timer.join()
+
+
+def test_odin_health_reports_node_error_message(fake_odin: EigerOdin):
+    fake_odin.health_monitor.start()
+    set_odin_state(fake_odin)
+    fake_odin.nodes.node_3.error_message.sim_put("Help, I'm in error!")
+    fake_odin.nodes.node_3.error_status.sim_put(True)
+
+    (error,) = fake_odin.health_monitor.health.initialisation_errors
+    assert "Filewriter 3" in error
+    assert "Help, I'm in error!" in error
+
+
+def test_odin_health_covers_every_node_of_larger_deployments():
+    class EightNodeOdinStatus(OdinNodesStatus):
+        node_4 = Component(OdinNode, "OD5:")
+        node_5 = Component(OdinNode, "OD6:")
+        node_6 = Component(OdinNode, "OD7:")
+        node_7 = Component(OdinNode, "OD8:")
 
-    error = fake_odin.nodes.wait_for_no_errors(None)
-    error_messages = list(error.values())
+    class EightNodeOdin(EigerOdin):
+        nodes = Component(EightNodeOdinStatus, "")
 
-    assert any(status.exception for status in error.keys())
-    assert any("0" in message for message in error_messages)
-    assert any(error_message in message for message in error_messages)
+    fake_odin = make_fake_device(EightNodeOdin)(name="fake odin")
+    fake_odin.health_monitor.start()
+    set_odin_state(fake_odin)
+    fake_odin.nodes.node_7.frames_dropped.sim_put(3)
+
+    health = fake_odin.health_monitor.health
+    assert len(health.nodes) == 8
+    assert health.frames_dropped() == (True, "Filewriter 7 dropped 3 frames")
 
 
 @pytest.mark.parametrize(
@@ -158,48 +196,44 @@ def test_given_error_on_node_1_when_clear_odin_errors_called_then_resets_all_err
         node.clear_errors.set.assert_called_once_with(1)
 
 
-@patch("dodal.devices.eiger_odin.await_value")
-def test_given_await_value_returns_done_status_then_init_state_returns_done(
-    patch_await, fake_odin: EigerOdin
-):
-    patch_await.side_effect = lambda *_: fake_status(False)
-    full_status = fake_odin.nodes.get_init_state(None)
-    full_status.wait()
-    assert full_status.done
-
-
-def test_given_frames_time_out_then_check_frames_timed_out_returns_error(
+def test_given_frames_time_out_then_health_reports_frames_timed_out(
     fake_odin: EigerOdin,
 ):
     fake_odin.nodes.nodes[1].frames_timed_out.sim_put(1)
-    error, message = fake_odin.nodes.check_frames_timed_out()
+    error, message = fake_odin.health_monitor.health.frames_timed_out()
     assert error
     assert "timed out" in message
     assert "1" in message
 
 
-def test_given_no_frames_time_out_then_check_frames_timed_out_returns_no_error(
+def test_given_no_frames_time_out_then_health_reports_no_frames_timed_out(
     fake_odin: EigerOdin,
 ):
-    error, message = fake_odin.nodes.check_frames_timed_out()
+    error, message = fake_odin.health_monitor.health.frames_timed_out()
     assert not error
     assert not message
 
 
-def test_given_frames_dropped_then_check_frames_timed_out_returns_error(
-    fake_odin: EigerOdin,
+@pytest.mark.parametrize(
+    "method, args",
+    [
+        ("check_frames_dropped", ()),
+        ("check_frames_timed_out", ()),
+        ("wait_for_no_errors", (1,)),
+        ("get_init_state", (1,)),
+    ],
+)
+def test_node_status_checks_are_deprecated(
+    fake_odin: EigerOdin, method: str, args: tuple
 ):
-    fake_odin.nodes.nodes[2].frames_dropped.sim_put(1)
-    error, message = fake_odin.nodes.check_frames_dropped()
-    assert error
-    assert "dropped" in message
-    assert "2" in message
+    with pytest.deprecated_call(match="health_monitor|wait_for_odin_initialised"):
+        getattr(fake_odin.nodes, method)(*args)
 
 
-def test_given_no_frames_dropped_then_check_frames_timed_out_returns_no_error(
-    fake_odin: EigerOdin,
-):
-    error, message = fake_odin.nodes.check_frames_timed_out()
-    assert not error
-    assert not message
-    pass
+def test_deprecated_frame_checks_use_health_monitor(fake_odin: EigerOdin):
+    fake_odin.nodes.nodes[1].frames_dropped.sim_put(2)
+    with pytest.deprecated_call():
+        assert (
+            fake_odin.nodes.check_frames_dropped()
+            == fake_odin.health_monitor.health.frames_dropped()
+        )
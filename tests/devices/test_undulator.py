@@ -1,4 +1,5 @@
 from collections.abc import Generator
+from unittest.mock import patch
 
 import numpy as np
 import pytest
@@ -156,6 +157,20 @@ async def test_length_not_propagated_if_not_supplied(mock_config_client: ConfigC
     assert "undulator-length" not in (await undulator.read_configuration())
 
 
+async def test_lookup_table_not_prefetched_when_connected_in_mock_mode(
+    mock_config_client: ConfigClient,
+):
+    with patch("dodal.devices.undulator.get_config_cache") as mock_get_config_cache:
+        async with init_devices(mock=True):
+            undulator = UndulatorInKeV(
+                "UND-01",
+                mock_config_client,
+                id_gap_lookup_table_path=TEST_BEAMLINE_UNDULATOR_TO_GAP_LUT,
+            )
+    mock_get_config_cache.return_value.prefetch.assert_not_called()
+    assert undulator.id_gap_lookup_table_path == TEST_BEAMLINE_UNDULATOR_TO_GAP_LUT
+
+
 @pytest.mark.parametrize(
     "energy, expected_output",
     [(0, 10), (5, 55), (20, 160), (36, 100), (39, 250)],
@@ -1,15 +1,25 @@
 import getpass
+import json
 import socket
+import threading
+import time
 from collections.abc import Callable
 from functools import partial
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
+import pytest
 from pytest import mark, raises
+from workflows import Disconnected
+from workflows.transport.offline_transport import OfflineTransport
 
 from dodal.devices.zocalo import (
     ZocaloTrigger,
 )
-from dodal.devices.zocalo.zocalo_interaction import ZocaloStartInfo
+from dodal.devices.zocalo.zocalo_interaction import (
+    ZocaloStartInfo,
+    ZocaloTransport,
+    disconnect_shared_transports,
+)
 
 SIM_ZOCALO_ENV = "dev_bluesky"
 
@@ -29,10 +39,21 @@ EXPECTED_RUN_END_MESSAGE = {
 }
 
 
+@pytest.fixture(autouse=True)
+def clear_shared_transports():
+    yield
+    disconnect_shared_transports()
+
+
 @patch("zocalo.configuration.from_file", autospec=True)
-@patch("dodal.devices.zocalo.zocalo_interaction.lookup", autospec=True)
+@patch(
+    "dodal.devices.zocalo.zocalo_interaction.workflows_transport.lookup", autospec=True
+)
 def _test_zocalo(
-    func_testing: Callable, expected_params: dict, mock_transport_lookup, mock_from_file
+    func_testing: Callable,
+    expected_params: dict,
+    mock_transport_lookup,
+    mock_from_file,
 ):
     mock_zc = MagicMock()
     mock_from_file.return_value = mock_zc
@@ -40,10 +61,14 @@ def _test_zocalo(
     mock_transport_lookup.return_value = MagicMock()
     mock_transport_lookup.return_value.return_value = mock_transport
 
-    func_testing(mock_transport)
+    expected_sends = func_testing(mock_transport)
 
-    mock_zc.activate_environment.assert_called_once_with(SIM_ZOCALO_ENV)
-    mock_transport.connect.assert_called_once()
+    # The connection is kept open after sending
+    assert mock_transport.connect.call_count == expected_sends
+    assert (
+        mock_zc.activate_environment.call_args_list
+        == [call(SIM_ZOCALO_ENV)] * expected_sends
+    )
     expected_message = {
         "recipes": ["mimas"],
         "parameters": expected_params,
@@ -53,14 +78,17 @@ def _test_zocalo(
         "zocalo.go.user": getpass.getuser(),
         "zocalo.go.host": socket.gethostname(),
     }
-    mock_transport.send.assert_called_once_with(
-        "processing_recipe", expected_message, headers=expected_headers
+    assert (
+        mock_transport.send.call_args_list
+        == [call("processing_recipe", expected_message, headers=expected_headers)]
+        * expected_sends
     )
-    mock_transport.disconnect.assert_called_once()
+    assert mock_transport.disconnect.call_count == expected_sends - 1
 
 
 def normally(function_to_run, mock_transport):
     function_to_run()
+    return 1
 
 
 def with_exception(function_to_run, mock_transport):
@@ -68,9 +96,8 @@ def with_exception(function_to_run, mock_transport):
 
     with raises(AssertionError):
         function_to_run()
-
-
-zc = ZocaloTrigger(environment=SIM_ZOCALO_ENV)
+    # Only a dropped connection is retried, as the message may have been sent
+    return 1
 
 
 @mark.parametrize(
@@ -88,6 +115,7 @@ def test_run_start(function_wrapper: Callable, expected_message: dict):
     function_wrapper (Callable): A wrapper used to test for expected exceptions.
     expected_message (Dict): The expected dictionary sent to zocalo.
     """
+    zc = ZocaloTrigger(environment=SIM_ZOCALO_ENV)
     data = ZocaloStartInfo(EXPECTED_DCID, EXPECTED_FILENAME, 0, 100, 0)
     function_to_run = partial(zc.run_start, data)
     function_to_run = partial(function_wrapper, function_to_run)
@@ -106,6 +134,125 @@ def test__run_start_and_end(function_wrapper: Callable, expected_message: dict):
     function_wrapper (Callable): A wrapper used to test for expected exceptions.
     expected_message (Dict): The expected dictionary sent to zocalo.
     """
+    zc = ZocaloTrigger(environment=SIM_ZOCALO_ENV)
     function_to_run = partial(zc.run_end, EXPECTED_DCID)
     function_to_run = partial(function_wrapper, function_to_run)
     _test_zocalo(function_to_run, expected_message)
+
+
+class RecordingTransport(OfflineTransport):
+    """Stand-in for a zocalo transport which records what is sent."""
+
+    def __init__(self, fail_sends: int = 0, send_delay_s: float = 0):
+        super().__init__()
+        self.sent: list[dict] = []
+        self.fail_sends = fail_sends
+        self.send_delay_s = send_delay_s
+        self.sending_threads: list[threading.Thread] = []
+
+    def _send(self, destination, message, **kwargs):
+        self.sending_threads.append(threading.current_thread())
+        time.sleep(self.send_delay_s)
+        if self.fail_sends:
+            self.fail_sends -= 1
+            self._connected = False
+            raise Disconnected("Connection lost")
+        # Messages are serialised by the transport before sending
+        self.sent.append(json.loads(message))
+
+
+def _connected(transport: RecordingTransport) -> RecordingTransport:
+    transport.connect()
+    return transport
+
+
+def test_transport_connection_shared_between_triggers():
+    recording = RecordingTransport()
+    factory = MagicMock(side_effect=lambda: _connected(recording))
+    transport = ZocaloTransport(SIM_ZOCALO_ENV, transport_factory=factory)
+
+    ZocaloTrigger(transport=transport).run_end(1)
+    ZocaloTrigger(transport=transport).run_end(2)
+
+    factory.assert_called_once()
+    assert [m["parameters"]["ispyb_dcid"] for m in recording.sent] == [1, 2]
+
+
+def test_shared_transport_is_per_environment():
+    assert ZocaloTrigger("a").transport is ZocaloTrigger("a").transport
+    assert ZocaloTrigger("a").transport is not ZocaloTrigger("b").transport
+
+
+def test_transport_reconnects_after_connection_lost():
+    recording = RecordingTransport(fail_sends=1)
+    factory = MagicMock(side_effect=lambda: _connected(recording))
+    transport = ZocaloTransport(SIM_ZOCALO_ENV, transport_factory=factory)
+
+    ZocaloTrigger(transport=transport).run_end(EXPECTED_DCID)
+
+    assert factory.call_count == 2
+    assert len(recording.sent) == 1
+
+
+def test_transport_does_not_retry_if_send_fails_while_connected():
+    recording = RecordingTransport()
+    recording._send = MagicMock(side_effect=ValueError("Bad message"))
+    factory = MagicMock(side_effect=lambda: _connected(recording))
+    transport = ZocaloTransport(SIM_ZOCALO_ENV, transport_factory=factory)
+
+    with raises(ValueError):
+        ZocaloTrigger(transport=transport).run_end(EXPECTED_DCID)
+
+    factory.assert_called_once()
+    recording._send.assert_called_once()
+
+
+def test_send_latency_recorded():
+    transport = ZocaloTransport(
+        SIM_ZOCALO_ENV,
+        transport_factory=lambda: _connected(RecordingTransport(send_delay_s=0.01)),
+    )
+    zc = ZocaloTrigger(transport=transport)
+    zc.run_end(1)
+    zc.run_end(2)
+
+    assert transport.stats.count == 2
+    assert transport.stats.last_s >= 0.01
+    assert transport.stats.max_s >= transport.stats.last_s
+    assert transport.stats.mean_s == pytest.approx(transport.stats.total_s / 2)
+
+
+def test_background_trigger_sends_from_worker_thread():
+    recording = RecordingTransport(send_delay_s=0.05)
+    transport = ZocaloTransport(
+        SIM_ZOCALO_ENV, transport_factory=lambda: _connected(recording)
+    )
+    zc = ZocaloTrigger(transport=transport, background=True)
+    try:
+        start = time.monotonic()
+        zc.run_start(ZocaloStartInfo(EXPECTED_DCID, EXPECTED_FILENAME, 0, 100, 0))
+        zc.run_end(EXPECTED_DCID)
+        assert time.monotonic() - start < 0.05
+
+        zc.flush()
+        assert [m["parameters"] for m in recording.sent] == [
+            EXPECTED_RUN_START_MESSAGE,
+            EXPECTED_RUN_END_MESSAGE,
+        ]
+        assert threading.current_thread() not in recording.sending_threads
+    finally:
+        zc.close()
+
+
+@patch("dodal.devices.zocalo.zocalo_interaction.LOGGER")
+def test_background_trigger_logs_send_errors(mock_logger: MagicMock):
+    recording = RecordingTransport(fail_sends=2)
+    transport = ZocaloTransport(
+        SIM_ZOCALO_ENV, transport_factory=lambda: _connected(recording)
+    )
+    zc = ZocaloTrigger(transport=transport, background=True)
+    zc.run_end(EXPECTED_DCID)
+    zc.close()
+
+    mock_logger.error.assert_called_once()
+    assert recording.sent == []
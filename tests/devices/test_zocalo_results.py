@@ -1,5 +1,6 @@
+import asyncio
+import threading
 from functools import partial
-from queue import Empty
 from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import bluesky.plan_stubs as bps
@@ -156,7 +157,7 @@ async def test_get_full_processing_results(
 
 
 @patch(
-    "dodal.devices.zocalo.zocalo_results.workflows.recipe.wrap_subscribe", autospec=True
+    "dodal.devices.zocalo.zocalo_results.workflows_recipe.wrap_subscribe", autospec=True
 )
 @patch("dodal.devices.zocalo.zocalo_results._get_zocalo_connection", autospec=True)
 @patch("dodal.devices.zocalo.zocalo_results.CLEAR_QUEUE_WAIT_S", 0)
@@ -167,21 +168,21 @@ async def test_subscribe_only_on_called_stage(
         name="zocalo", zocalo_environment=ZOCALO_ENV, timeout_s=0
     )
     mock_wrap_subscribe.assert_not_called()
-    await zocalo_results.stage()
-    mock_wrap_subscribe.assert_called_once()
-    zocalo_results._raw_results_received.put([])
-    run_engine(bps.trigger(zocalo_results))
-    mock_wrap_subscribe.assert_called_once()
-    zocalo_results._raw_results_received.put([])
-    run_engine(bps.trigger(zocalo_results))
-    zocalo_results._raw_results_received.put([])
-    run_engine(bps.trigger(zocalo_results))
+
+    def plan():
+        yield from bps.stage(zocalo_results, wait=True)
+        mock_wrap_subscribe.assert_called_once()
+        for _ in range(3):
+            zocalo_results._put_raw_results(CPU_RESULT)
+            yield from bps.trigger(zocalo_results, wait=True)
+
+    run_engine(plan())
     mock_wrap_subscribe.assert_called_once()
 
 
 @patch("dodal.devices.zocalo.zocalo_results.LOGGER")
 @patch(
-    "dodal.devices.zocalo.zocalo_results.workflows.recipe.wrap_subscribe", autospec=True
+    "dodal.devices.zocalo.zocalo_results.workflows_recipe.wrap_subscribe", autospec=True
 )
 @patch("dodal.devices.zocalo.zocalo_results._get_zocalo_connection", new=MagicMock())
 async def test_zocalo_results_trigger_log_message(
@@ -240,28 +241,28 @@ async def test_source_of_zocalo_results_correctly_identified(
 
 
 async def test_if_expecting_gpu_then_read_until_gpu_result_found(
-    zocalo_results: ZocaloResults, run_engine: RunEngine
+    zocalo_results: ZocaloResults,
 ):
     zocalo_results.results_source = ZocaloSource.GPU
     await zocalo_results.stage()
-    zocalo_results._raw_results_received.put(CPU_RESULT)
-    zocalo_results._raw_results_received.put(CPU_RESULT)
-    zocalo_results._raw_results_received.put(GPU_RESULT)
+    zocalo_results._put_raw_results(CPU_RESULT)
+    zocalo_results._put_raw_results(CPU_RESULT)
+    zocalo_results._put_raw_results(GPU_RESULT)
     zocalo_results._put_results = AsyncMock()
-    run_engine(bps.trigger(zocalo_results, wait=True))
+    await zocalo_results.trigger()
     assert zocalo_results._put_results.call_args[0][0] == [TEST_RESULTS[1]]
     assert zocalo_results._put_results.await_count == 1
 
 
 async def test_if_expecting_cpu_then_read_until_cpu_result_found(
-    zocalo_results: ZocaloResults, run_engine: RunEngine
+    zocalo_results: ZocaloResults,
 ):
     zocalo_results.results_source = ZocaloSource.CPU
     await zocalo_results.stage()
-    zocalo_results._raw_results_received.put(GPU_RESULT)
-    zocalo_results._raw_results_received.put(CPU_RESULT)
+    zocalo_results._put_raw_results(GPU_RESULT)
+    zocalo_results._put_raw_results(CPU_RESULT)
     zocalo_results._put_results = AsyncMock()
-    run_engine(bps.trigger(zocalo_results, wait=True))
+    await zocalo_results.trigger()
     assert zocalo_results._put_results.call_args[0][0] == [TEST_RESULTS[0]]
     assert zocalo_results._put_results.await_count == 1
 
@@ -269,12 +270,64 @@ async def test_if_expecting_cpu_then_read_until_cpu_result_found(
 async def test_if_zocalo_results_timeout_before_any_results_then_error(
     zocalo_results: ZocaloResults,
 ):
+    zocalo_results.timeout_s = 0.01
     await zocalo_results.stage()
-    zocalo_results._raw_results_received.get = MagicMock(side_effect=Empty)
     with pytest.raises(NoResultsFromZocaloError):
         await zocalo_results.trigger()
 
 
+async def test_results_from_other_source_kept_for_later(
+    zocalo_results: ZocaloResults,
+):
+    zocalo_results.results_source = ZocaloSource.GPU
+    await zocalo_results.stage()
+    zocalo_results._put_raw_results(CPU_RESULT)
+    zocalo_results._put_raw_results(GPU_RESULT)
+    await zocalo_results.trigger()
+
+    assert await zocalo_results.wait_for_raw_results(ZocaloSource.CPU) == CPU_RESULT
+
+
+async def test_waiting_for_results_does_not_block_event_loop(
+    zocalo_results: ZocaloResults,
+):
+    await zocalo_results.stage()
+    trigger_status = zocalo_results.trigger()
+    # Other coroutines keep running while the trigger waits
+    await asyncio.sleep(0.01)
+    assert not trigger_status.done
+    zocalo_results._put_raw_results(CPU_RESULT)
+    await trigger_status
+    assert (await zocalo_results.max_count.get_value()).tolist() == [
+        TEST_RESULTS[0]["max_count"]
+    ]
+
+
+@patch(
+    "dodal.devices.zocalo.zocalo_results.workflows_recipe.wrap_subscribe", autospec=True
+)
+async def test_results_received_on_consumer_thread_are_handed_to_event_loop(
+    mock_wrap_subscribe: MagicMock, zocalo_results: ZocaloResults
+):
+    await zocalo_results.stage()
+    receive_result = mock_wrap_subscribe.mock_calls[0].args[2]
+    recipe_wrapper = MagicMock()
+    recipe_wrapper.recipe_step = {"parameters": GPU_RESULT["recipe_parameters"]}
+
+    trigger_status = zocalo_results.trigger()
+    zocalo_results.results_source = ZocaloSource.GPU
+    consumer = threading.Thread(
+        target=receive_result,
+        args=(recipe_wrapper, {}, {"results": GPU_RESULT["results"]}),
+    )
+    consumer.start()
+    await trigger_status
+    consumer.join()
+    assert (await zocalo_results.max_count.get_value()).tolist() == [
+        TEST_RESULTS[1]["max_count"]
+    ]
+
+
 async def test_given_no_sample_id_from_zocalo_then_returns_none(
     mocked_zocalo_device, run_engine: RunEngine
 ):
@@ -0,0 +1,66 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from dodal.devices.util.async_util import latest_values
+
+
+async def _values(*values: int, error: Exception | None = None):
+    for value in values:
+        yield value
+    if error:
+        raise error
+
+
+async def test_latest_values_passes_on_values_to_idle_consumer():
+    async with aclosing(latest_values(_values(1, 2, 3))) as values:
+        assert [value async for value in values] == [1, 2, 3]
+
+
+async def test_latest_values_skips_values_that_arrive_while_consumer_busy():
+    source: asyncio.Queue[int] = asyncio.Queue()
+
+    async def from_queue():
+        while (value := await source.get()) >= 0:
+            yield value
+
+    received = []
+    async with aclosing(latest_values(from_queue())) as values:
+        source.put_nowait(1)
+        async for value in values:
+            received.append(value)
+            if value == 1:
+                for later in (2, 3, 4):
+                    source.put_nowait(later)
+                # Let the source deliver everything while we are "busy"
+                await asyncio.sleep(0.01)
+            elif value == 4:
+                source.put_nowait(-1)
+    assert received == [1, 4]
+
+
+async def test_latest_values_raises_source_error_after_pending_value():
+    received = []
+    with pytest.raises(TimeoutError):
+        async with aclosing(latest_values(_values(1, error=TimeoutError()))) as values:
+            async for value in values:
+                received.append(value)
+    assert received == [1]
+
+
+async def test_latest_values_stops_source_when_closed_early():
+    cancelled = asyncio.Event()
+
+    async def forever():
+        try:
+            while True:
+                yield 1
+                await asyncio.sleep(0)
+        finally:
+            cancelled.set()
+
+    async with aclosing(latest_values(forever())) as values:
+        async for _ in values:
+            break
+    await asyncio.wait_for(cancelled.wait(), timeout=0.5)
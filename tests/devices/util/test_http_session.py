@@ -0,0 +1,34 @@
+import asyncio
+
+from dodal.devices.util.http_session import PersistentSession
+
+
+async def test_session_is_reused_between_requests():
+    persistent = PersistentSession()
+    session = persistent.get()
+    assert persistent.get() is session
+    await persistent.close()
+    assert session.closed
+
+
+async def test_new_session_created_once_closed():
+    persistent = PersistentSession()
+    session = persistent.get()
+    await session.close()
+    new_session = persistent.get()
+    assert new_session is not session
+    await persistent.close()
+
+
+def test_new_session_created_for_new_event_loop():
+    persistent = PersistentSession()
+
+    async def get_session():
+        return persistent.get()
+
+    first = asyncio.run(get_session())
+    second = asyncio.run(get_session())
+    assert second is not first
+    for session in (first, second):
+        # The sessions' loops are closed so tidy up without waiting on them
+        session.detach()
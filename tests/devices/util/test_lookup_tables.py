@@ -86,3 +86,23 @@ def test_linear_interpolation_rejects_non_monotonic_increasing():
     )
     with pytest.raises(AssertionError):
         linear_interpolation_lut(test_s, test_t)
+
+
+def test_linear_interpolation_accepts_arrays():
+    lut_converter = linear_interpolation_lut(
+        *parse_lookup_table(TEST_BEAMLINE_DCM_ROLL_CONVERTER_TXT)
+    )
+    s = np.array([1.0, 2.0, 3.0, 5.0, 5.25, 7.0])
+    np.testing.assert_array_equal(
+        lut_converter(s), [lut_converter(float(value)) for value in s]
+    )
+
+
+def test_linear_extrapolation_accepts_arrays():
+    lut_converter = linear_extrapolation_lut(
+        *parse_lookup_table(TEST_BEAMLINE_DCM_ROLL_CONVERTER_TXT)
+    )
+    s = np.array([0.5, 1.0, 2.0, 3.0, 5.0, 5.5, 5.75, 6.0])
+    np.testing.assert_array_equal(
+        lut_converter(s), [lut_converter(float(value)) for value in s]
+    )
@@ -1,3 +1,5 @@
+import asyncio
+import time
 from unittest.mock import MagicMock, patch
 
 import bluesky.plan_stubs as bps
@@ -9,7 +11,13 @@ from ophyd_async.core import init_devices, set_mock_value
 from dodal.common.beamlines.beamline_utils import set_config_client
 from dodal.devices.synchrotron import Synchrotron, SynchrotronMode
 from dodal.plan_stubs.check_topup import (
+    DECAY_MODE_COUNTDOWN,
+    SafeCollectionWindow,
+    TopupGate,
+    TopupThresholds,
+    _load_topup_thresholds,
     check_topup_and_wait_if_necessary,
+    wait_for_safe_collection_window,
     wait_for_topup_complete,
 )
 from tests.plan_stubs.test_data import (
@@ -173,3 +181,245 @@ def test_topup_not_allowed_when_exceeds_threshold_percentage_of_topup_time(
         )
 
     mock_sleep.assert_called_with(expected_wait)
+
+
+@pytest.mark.parametrize(
+    "topup_start_countdown, topup_end_countdown, total_exposure_time, ops_time,"
+    "expected_wait",
+    [
+        (100, 108, 121, 1, 0),
+        (100, 108, 119, 1, 108 + 1),
+        (110, 120, 120, 1, 0),
+        (110.1, 120, 119.99, 1, 120 + 1),
+        (20, 60, 40, 30, 61),
+        (0, 5, 10, 1, 5 + 1),
+        (-1, 5, 10, 1, 0),
+    ],
+)
+def test_safe_collection_window_waits_as_check_topup_does(
+    topup_start_countdown: float,
+    topup_end_countdown: float,
+    total_exposure_time: float,
+    ops_time: float,
+    expected_wait: float,
+):
+    window = SafeCollectionWindow(
+        SynchrotronMode.USER, topup_start_countdown, topup_end_countdown, 1000.0, 1000.0
+    )
+    assert window.wait_s(
+        total_exposure_time + ops_time,
+        total_exposure_time,
+        TopupThresholds(threshold_exposure_s=120, gate_delay_s=1),
+        now=1000.0,
+    ) == pytest.approx(expected_wait)
+
+
+def test_safe_collection_window_predicts_countdowns():
+    window = SafeCollectionWindow(SynchrotronMode.USER, 30, 40, 1000.0, 1000.0)
+    assert window.predict(1010.0) == (20, 30)
+    assert window.predict(1050.0) == (0, 0)
+    assert window.wait_s(25, 25, TopupThresholds(), now=1010.0) == 30 + 1
+
+
+def test_safe_collection_window_predicts_each_countdown_from_its_own_update():
+    window = SafeCollectionWindow(
+        SynchrotronMode.USER,
+        time_to_topup_s=100,
+        time_to_topup_end_s=60,
+        topup_updated_at=1000.0,
+        topup_end_updated_at=1050.0,
+    )
+    assert window.predict(1060.0) == (40, 50)
+
+
+def test_safe_collection_window_gating_disabled_outside_allowed_modes():
+    now = time.time()
+    window = SafeCollectionWindow(SynchrotronMode.SHUTDOWN, 1, 5, now, now)
+    assert not window.gating_enabled
+    assert window.wait_s(100, 10, TopupThresholds()) == 0
+
+
+@patch(
+    "dodal.common.beamlines.beamline_parameters.BEAMLINE_PARAMETER_PATHS",
+    {"i03": TEST_TOPUP_LONG_DELAY_TXT},
+)
+def test_topup_thresholds_loaded_from_beamline_parameters():
+    assert _load_topup_thresholds() == TopupThresholds(
+        threshold_exposure_s=30, gate_delay_s=19
+    )
+
+
+@pytest.fixture
+def load_thresholds() -> MagicMock:
+    return MagicMock(return_value=TopupThresholds(gate_delay_s=0.05))
+
+
+@pytest.fixture
+async def topup_gate(synchrotron: Synchrotron, load_thresholds: MagicMock):
+    set_mock_value(synchrotron.synchrotron_mode, SynchrotronMode.USER)
+    set_mock_value(synchrotron.top_up_start_countdown, 600)
+    set_mock_value(synchrotron.top_up_end_countdown, 610)
+    gate = TopupGate(synchrotron, load_thresholds)
+    yield gate
+    await gate.stop()
+
+
+async def _play_trace(synchrotron: Synchrotron, trace: list[tuple[float, float]]):
+    """Set the top-up start and end countdowns after each delay in turn."""
+    for delay, (start_countdown, end_countdown) in trace:
+        await asyncio.sleep(delay)
+        set_mock_value(synchrotron.top_up_start_countdown, start_countdown)
+        set_mock_value(synchrotron.top_up_end_countdown, end_countdown)
+
+
+async def test_topup_gate_does_not_wait_when_collection_ends_before_topup(
+    topup_gate: TopupGate, load_thresholds: MagicMock
+):
+    start = time.monotonic()
+    for _ in range(3):
+        await topup_gate.wait_until_safe(total_exposure_time=10, ops_time=1)
+    assert time.monotonic() - start < 0.1
+    load_thresholds.assert_called_once()
+
+
+async def test_topup_gate_waits_for_end_of_topup_and_delay(
+    topup_gate: TopupGate, synchrotron: Synchrotron
+):
+    set_mock_value(synchrotron.top_up_start_countdown, 0.1)
+    set_mock_value(synchrotron.top_up_end_countdown, 0.2)
+    trace = asyncio.create_task(
+        _play_trace(synchrotron, [(0.1, (0, 0.1)), (0.1, (600, 610))])
+    )
+
+    start = time.monotonic()
+    await topup_gate.wait_until_safe(total_exposure_time=10, ops_time=1)
+    assert 0.2 + 0.05 <= time.monotonic() - start < 0.4
+    await trace
+
+
+async def test_topup_gate_waits_for_topup_that_overruns_its_countdown(
+    topup_gate: TopupGate, synchrotron: Synchrotron
+):
+    set_mock_value(synchrotron.top_up_start_countdown, 0)
+    set_mock_value(synchrotron.top_up_end_countdown, 0.05)
+    trace = asyncio.create_task(
+        _play_trace(synchrotron, [(0.1, (0, 0)), (0.2, (600, 610))])
+    )
+
+    start = time.monotonic()
+    await topup_gate.wait_until_safe(total_exposure_time=10, ops_time=1)
+    assert 0.3 <= time.monotonic() - start < 0.5
+    await trace
+
+
+async def test_topup_gate_does_not_wait_in_decay_mode(
+    topup_gate: TopupGate, synchrotron: Synchrotron
+):
+    set_mock_value(synchrotron.top_up_start_countdown, DECAY_MODE_COUNTDOWN)
+    set_mock_value(synchrotron.top_up_end_countdown, 0.5)
+    start = time.monotonic()
+    await topup_gate.wait_until_safe(total_exposure_time=10, ops_time=1)
+    assert time.monotonic() - start < 0.1
+
+
+async def test_topup_gate_reloads_thresholds_keeping_last_on_failure(
+    synchrotron: Synchrotron,
+):
+    thresholds = [TopupThresholds(30, 19), TopupThresholds(40, 2)]
+    load_thresholds = MagicMock(
+        side_effect=[thresholds[0], RuntimeError("No config server"), thresholds[1]]
+        + [thresholds[1]] * 100
+    )
+    gate = TopupGate(synchrotron, load_thresholds, refresh_period_s=0.02)
+    await gate.start()
+    try:
+        await asyncio.sleep(0.01)
+        assert gate.thresholds == thresholds[0]
+        await asyncio.sleep(0.02)
+        assert gate.thresholds == thresholds[0]
+        await asyncio.sleep(0.04)
+        assert gate.thresholds == thresholds[1]
+    finally:
+        await gate.stop()
+
+
+async def test_topup_gate_uses_default_thresholds_if_first_load_fails(
+    synchrotron: Synchrotron,
+):
+    gate = TopupGate(synchrotron, MagicMock(side_effect=RuntimeError("No config")))
+    try:
+        await gate.wait_until_safe(total_exposure_time=10, ops_time=1)
+        assert gate.thresholds == TopupThresholds()
+    finally:
+        await gate.stop()
+
+
+def test_wait_for_safe_collection_window_plan(
+    synchrotron: Synchrotron, load_thresholds: MagicMock, run_engine: RunEngine
+):
+    set_mock_value(synchrotron.synchrotron_mode, SynchrotronMode.USER)
+    set_mock_value(synchrotron.top_up_start_countdown, 0.1)
+    set_mock_value(synchrotron.top_up_end_countdown, 0.2)
+    gate = TopupGate(synchrotron, load_thresholds)
+
+    start = time.monotonic()
+    run_engine(wait_for_safe_collection_window(gate, 40.0, 30.0))
+    # Waits for the 0.2s countdown plus the 0.05s fudge factor, less however long
+    # ago the countdown was set
+    assert 0.2 <= time.monotonic() - start < 1.0
+
+    run_engine(bps.wait_for([gate.stop]))
+    assert not gate._subscriptions
+
+
+async def test_topup_gate_keeps_separate_update_times_for_each_countdown(
+    topup_gate: TopupGate, synchrotron: Synchrotron
+):
+    await topup_gate.start()
+    topup_updated_at = topup_gate.window.topup_updated_at
+    await asyncio.sleep(0.01)
+    set_mock_value(synchrotron.top_up_end_countdown, 605)
+
+    assert topup_gate.window.topup_updated_at == topup_updated_at
+    assert topup_gate.window.topup_end_updated_at > topup_updated_at
+
+
+def test_topup_gate_monitors_synchrotron_while_staged(
+    synchrotron: Synchrotron, load_thresholds: MagicMock, run_engine: RunEngine
+):
+    gate = TopupGate(synchrotron, load_thresholds, name="topup_gate")
+
+    def plan():
+        yield from bps.stage(gate, wait=True)
+        set_mock_value(synchrotron.top_up_start_countdown, 123)
+        assert gate.window.time_to_topup_s == 123
+        yield from bps.unstage(gate, wait=True)
+
+    run_engine(plan())
+    set_mock_value(synchrotron.top_up_start_countdown, 456)
+    assert gate.window.time_to_topup_s == 123
+    assert not gate._subscriptions
+
+
+@patch("dodal.plan_stubs.check_topup._load_topup_configuration_from_properties_file")
+def test_check_topup_uses_topup_gate_instead_of_loading_configuration(
+    load_configuration: MagicMock,
+    synchrotron: Synchrotron,
+    load_thresholds: MagicMock,
+    run_engine: RunEngine,
+):
+    set_mock_value(synchrotron.synchrotron_mode, SynchrotronMode.USER)
+    set_mock_value(synchrotron.top_up_start_countdown, 0.1)
+    set_mock_value(synchrotron.top_up_end_countdown, 0.2)
+    gate = TopupGate(synchrotron, load_thresholds)
+
+    start = time.monotonic()
+    for _ in range(2):
+        run_engine(
+            check_topup_and_wait_if_necessary(synchrotron, 40.0, 30.0, topup_gate=gate)
+        )
+    assert time.monotonic() - start >= 0.2 + 0.05
+    run_engine(bps.wait_for([gate.stop]))
+
+    load_configuration.assert_not_called()
+    load_thresholds.assert_called_once()
@@ -16,7 +16,10 @@ from ophyd_async.fastcs.eiger import EigerDetector as FastEiger
 from dodal.common.beamlines.beamline_utils import set_config_client
 from dodal.devices.detector import DetectorParams
 from dodal.plans.configure_arm_trigger_and_disarm_detector import (
+    change_roi_mode,
     configure_arm_trigger_and_disarm_detector,
+    set_cam_pvs,
+    set_mx_settings_pvs,
 )
 
 
@@ -28,20 +31,21 @@ async def fake_eiger() -> FastEiger:
     return fake_eiger
 
 
-async def test_configure_arm_trigger_and_disarm_detector(
-    fake_eiger: FastEiger,
-    eiger_params: DetectorParams,
-    run_engine: RunEngine,
-    mock_config_client: ConfigClient,
-):
-    set_config_client(mock_config_client)
-    trigger_info = TriggerInfo(
+@pytest.fixture
+def trigger_info() -> TriggerInfo:
+    return TriggerInfo(
         # Manual trigger, so setting number of triggers to 1.
         number_of_events=1,
         trigger=DetectorTrigger.INTERNAL,
         deadtime=0.0001,
     )
 
+
+@pytest.fixture
+def capturing_eiger(
+    fake_eiger: FastEiger, mock_config_client: ConfigClient
+) -> FastEiger:
+    set_config_client(mock_config_client)
     filename: str = "filename.h5"
 
     def set_detector_into_writing_state(*args, **kwargs) -> None:
@@ -60,7 +64,16 @@ async def test_configure_arm_trigger_and_disarm_detector(
         set_mock_value(fake_eiger.od.fp.frames_written, 1)
 
     callback_on_mock_execute(fake_eiger.arm_when_ready, set_frames_written)
+    return fake_eiger
 
+
+async def test_configure_arm_trigger_and_disarm_detector(
+    capturing_eiger: FastEiger,
+    eiger_params: DetectorParams,
+    trigger_info: TriggerInfo,
+    run_engine: RunEngine,
+):
+    fake_eiger = capturing_eiger
     run_engine(
         configure_arm_trigger_and_disarm_detector(
             fake_eiger, eiger_params, trigger_info
@@ -78,3 +91,37 @@ async def test_configure_arm_trigger_and_disarm_detector(
         await fake_eiger.detector.photon_energy.get_value()
         == eiger_params.expected_energy_ev
     )
+
+
+def test_stopping_preparing_and_arming_are_plan_messages(
+    capturing_eiger: FastEiger,
+    eiger_params: DetectorParams,
+    trigger_info: TriggerInfo,
+    run_engine: RunEngine,
+):
+    commands = []
+    run_engine.msg_hook = lambda msg: commands.append(msg.command)
+
+    run_engine(
+        configure_arm_trigger_and_disarm_detector(
+            capturing_eiger, eiger_params, trigger_info
+        )
+    )
+
+    arming = [
+        command
+        for command in commands
+        if command in ("unstage", "wait_for", "prepare", "kickoff")
+    ]
+    assert arming[:4] == ["unstage", "wait_for", "prepare", "kickoff"]
+
+
+@pytest.mark.parametrize("stub", [set_cam_pvs, change_roi_mode, set_mx_settings_pvs])
+def test_old_configuration_stubs_are_deprecated(
+    stub,
+    capturing_eiger: FastEiger,
+    eiger_params: DetectorParams,
+    run_engine: RunEngine,
+):
+    with pytest.deprecated_call(match="configure_eiger"):
+        run_engine(stub(capturing_eiger, eiger_params, wait=True))
@@ -1,4 +1,6 @@
+from functools import wraps
 from textwrap import dedent
+from threading import Barrier, Event
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
@@ -786,6 +788,34 @@ def test_lazy_fixtures_contains():
     assert "two" not in lf
 
 
+def test_docstrings_are_not_built_until_read(dm: DeviceManager):
+    with patch("dodal.device_manager._format_doc") as format_doc:
+
+        @dm.factory()
+        def foo() -> DocsDevice:
+            return DocsDevice()
+
+        format_doc.assert_not_called()
+        foo.__doc__  # noqa: B018
+        format_doc.assert_called_once()
+
+
+def test_variadic_args_of_wrapped_factory_not_checked(dm: DeviceManager):
+    def wrapper(func):
+        @wraps(func)
+        def wrapped(*args, **kwargs):
+            return func(*args, **kwargs)
+
+        return wrapped
+
+    @dm.factory
+    @wrapper
+    def foo():
+        return Mock()
+
+    assert foo.dependencies == set()
+
+
 def test_docstrings_for_untyped_factory(dm: DeviceManager):
     @dm.factory
     def foo():
@@ -920,3 +950,148 @@ def test_docstrings_for_v1_doc_factory_with_docs(dm: DeviceManager):
 
             Docs for DocsV1Device.""")
     pass
+
+
+def test_build_levels_group_independent_devices(dm: DeviceManager):
+    @dm.factory
+    def foo():
+        return Mock()
+
+    @dm.factory
+    def bar():
+        return Mock()
+
+    @dm.factory
+    def baz(foo, bar):
+        return Mock()
+
+    @dm.factory
+    def qux(baz, foo):
+        return Mock()
+
+    levels = dm._build_levels(dm.get_all_factories(), fixtures={})
+    assert [sorted(level) for level in levels] == [["bar", "foo"], ["baz"], ["qux"]]
+
+
+def test_build_levels_ignore_dependencies_provided_by_fixtures(dm: DeviceManager):
+    @dm.factory
+    def foo():
+        return Mock()
+
+    @dm.factory
+    def bar(foo):
+        return Mock()
+
+    assert dm._build_levels(dm.get_all_factories(), fixtures={"foo": 1}) == [
+        ["foo", "bar"]
+    ]
+
+
+def test_optional_dependency_is_built_first(dm: DeviceManager):
+    s1 = Mock()
+    s2 = Mock()
+
+    @dm.factory
+    def foo(bar=None):
+        return s1(bar)
+
+    @dm.factory
+    def bar():
+        return s2()
+
+    devices = dm.build_all()
+    s1.assert_called_once_with(s2())
+    assert devices.errors == {}
+
+
+def test_independent_devices_are_built_concurrently(dm: DeviceManager):
+    barrier = Barrier(2, timeout=0.5)
+
+    @dm.factory
+    def foo():
+        barrier.wait()
+        return Mock()
+
+    @dm.factory
+    def bar():
+        barrier.wait()
+        return Mock()
+
+    devices = dm.build_all(max_workers=2)
+    assert devices.errors == {}
+    assert devices.devices.keys() == {"foo", "bar"}
+
+
+def test_build_times_are_recorded(dm: DeviceManager):
+    @dm.factory
+    def foo():
+        return Mock()
+
+    @dm.factory
+    def bar():
+        raise ValueError("bar error")
+
+    devices = dm.build_all()
+    assert devices.build_times.keys() == {"foo"}
+    assert devices.build_times["foo"] >= 0
+
+
+def test_connect_times_are_recorded(dm: DeviceManager):
+    s1 = Mock(return_value=Mock(spec=OphydV2Device))
+
+    @dm.factory
+    def foo():
+        return s1()
+
+    con = dm.build_and_connect()
+    assert con.connect_times.keys() == {"foo"}
+    assert con.connect_times["foo"] >= 0
+
+
+def test_timings_do_not_change_result_fields(dm: DeviceManager):
+    @dm.factory
+    def foo():
+        return Mock(spec=OphydV2Device)
+
+    build = dm.build_all()
+    devices, errors, connection_specs = build
+    assert build.build_times.keys() == {"foo"}
+
+    devices, build_errors, connection_errors = build.connect()
+    assert devices.keys() == {"foo"}
+
+
+def test_on_build_called_as_each_device_is_built(dm: DeviceManager):
+    calls = []
+
+    @dm.factory
+    def foo():
+        return Mock()
+
+    @dm.factory
+    def bar(foo):
+        calls.append("build bar")
+        return Mock()
+
+    dm.build_all(on_build=lambda name, *_: calls.append(f"built {name}"))
+    assert calls == ["built foo", "build bar", "built bar"]
+
+
+def test_connection_starts_before_dependants_are_built(dm: DeviceManager):
+    foo_connecting = Event()
+    s1 = Mock(return_value=Mock(spec=OphydV2Device))
+    s1.return_value.connect.side_effect = lambda **_: foo_connecting.set()
+
+    @dm.factory
+    def foo():
+        return s1()
+
+    @dm.factory
+    def bar(foo):
+        assert foo_connecting.wait(timeout=0.5)
+        return Mock()
+
+    con = dm.build_and_connect()
+    assert con.build_errors == {}
+    assert con.connection_errors == {}
+    s1().connect.assert_called_once_with(mock=False, timeout=DEFAULT_TIMEOUT)
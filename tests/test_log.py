@@ -1,4 +1,8 @@
+import json
 import logging
+import socket
+import threading
+import time
 from pathlib import Path, PosixPath
 from typing import cast
 from unittest.mock import MagicMock, call, patch
@@ -15,11 +19,15 @@ from dodal.log import (
     BeamlineFilter,
     CircularMemoryHandler,
     DodalLogHandlers,
+    LogQueueConfig,
+    NonBlockingHandler,
+    QueueFullPolicy,
     clear_all_loggers_and_handlers,
     do_default_logging_setup,
     get_logging_file_paths,
     integrate_bluesky_and_ophyd_logging,
     set_up_all_logging_handlers,
+    set_up_graylog_handler,
 )
 
 
@@ -66,6 +74,94 @@ def test_handlers_set_at_correct_default_level(
     handlers["stream_handler"].setLevel.assert_called_once_with(logging.INFO)  # type: ignore
 
 
+@patch("dodal.log.StreamHandler", autospec=True)
+@patch("dodal.log.GELFTCPHandler", autospec=True)
+@patch("dodal.log.TimedRotatingFileHandler", autospec=True)
+@patch("dodal.log.CircularMemoryHandler", autospec=True)
+def test_handlers_queued_if_log_queue_given(
+    mock_memory_handler,
+    mock_file_handler,
+    mock_gelf_tcp_handler,
+    mock_stream_handler,
+    mock_logger: MagicMock,
+):
+    mock_memory_handler.return_value.level = logging.DEBUG
+    mock_file_handler.return_value.level = logging.INFO
+    mock_gelf_tcp_handler.return_value.level = logging.INFO
+    mock_stream_handler.return_value.level = logging.DEBUG
+    handlers = set_up_all_logging_handlers(
+        mock_logger, Path(""), "", True, 10000, log_queue=LogQueueConfig()
+    )
+
+    assert _added_handlers(mock_logger) == list(handlers.values())
+    queued = [
+        handlers["graylog_handler"],
+        handlers["info_file_handler"],
+        handlers["debug_memory_handler"],
+    ]
+    assert all(isinstance(handler, NonBlockingHandler) for handler in queued)
+    debug_memory_handler, graylog_handler, info_file_handler = (
+        cast(NonBlockingHandler, handlers[name]).target
+        for name in ("debug_memory_handler", "graylog_handler", "info_file_handler")
+    )
+
+    debug_memory_handler.setLevel.assert_called_once_with(logging.DEBUG)  # type: ignore
+    graylog_handler.setLevel.assert_called_once_with(logging.INFO)  # type: ignore
+    info_file_handler.setLevel.assert_any_call(logging.INFO)  # type: ignore
+    info_file_handler.setLevel.assert_any_call(logging.DEBUG)  # type: ignore
+    handlers["stream_handler"].setLevel.assert_called_once_with(logging.INFO)  # type: ignore
+    _close_added_handlers(mock_logger)
+
+
+def test_handlers_returned_can_be_removed_from_logger_and_closed(
+    dodal_logger_for_tests: logging.Logger,
+):
+    with patch("dodal.log.GELFTCPHandler", autospec=True) as mock_gelf_tcp_handler:
+        mock_gelf_tcp_handler.return_value.level = logging.INFO
+        handlers = set_up_all_logging_handlers(
+            dodal_logger_for_tests,
+            Path("tmp/dev"),
+            "dodal.log",
+            True,
+            10000,
+            log_queue=LogQueueConfig(),
+        )
+
+    for handler in handlers.values():
+        dodal_logger_for_tests.removeHandler(handler)
+        handler.close()
+
+    assert dodal_logger_for_tests.handlers == []
+    graylog_handler = cast(NonBlockingHandler, handlers["graylog_handler"])
+    assert not graylog_handler._listening
+    graylog_handler.target.close.assert_called_once()  # type: ignore
+
+
+@patch("dodal.log.StreamHandler", autospec=True)
+@patch("dodal.log.GELFTCPHandler", autospec=True)
+@patch("dodal.log.TimedRotatingFileHandler", autospec=True)
+@patch("dodal.log.CircularMemoryHandler", autospec=True)
+def test_handlers_added_directly_by_default(
+    mock_memory_handler,
+    mock_file_handler,
+    mock_gelf_tcp_handler,
+    mock_stream_handler,
+    mock_logger: MagicMock,
+):
+    for mock_handler in (
+        mock_memory_handler,
+        mock_file_handler,
+        mock_gelf_tcp_handler,
+        mock_stream_handler,
+    ):
+        mock_handler.return_value.level = logging.INFO
+    handlers = set_up_all_logging_handlers(mock_logger, Path(""), "", True, 10000)
+    for handler in handlers.values():
+        assert not isinstance(handler, NonBlockingHandler)
+        mock_logger.addHandler.assert_any_call(handler)
+    assert mock_logger.addHandler.call_count == len(handlers)
+
+
 @patch("dodal.log.GELFTCPHandler", autospec=True)
 def test_dev_mode_sets_correct_graypy_handler(
     mock_gelf_tcp_handler,
@@ -77,6 +173,7 @@ def test_dev_mode_sets_correct_graypy_handler(
     )
     mock_gelf_tcp_handler.assert_called_once_with("localhost", 5555)
     _close_all_handlers(handler_config)
+    _close_added_handlers(mock_logger)
 
 
 @patch("dodal.log.GELFTCPHandler", autospec=True)
@@ -92,6 +189,7 @@ def test_prod_mode_sets_correct_graypy_handler(
         "graylog-log-target.diamond.ac.uk", 12231
     )
     _close_all_handlers(handler_config)
+    _close_added_handlers(mock_logger)
 
 
 @patch("dodal.log.GELFTCPHandler", autospec=True)
@@ -125,6 +223,7 @@ def test_no_env_variable_sets_correct_file_handler(
 
     mock_file_handler.assert_has_calls(expected_calls, any_order=True)
     _close_all_handlers(handler_config)
+    clear_all_loggers_and_handlers()
 
 
 def test_beamline_filter_adds_dev_if_no_beamline():
@@ -166,12 +265,11 @@ def test_various_messages_to_graylog_get_beamline_filter(
         del environ["BEAMLINE"]
     log.beamline_filter = log.BeamlineFilter()
 
-    def mock_set_up_graylog_handler(logger, host, port):
+    def mock_set_up_graylog_handler(logger, host, port, log_queue=None):
         graylog_handler = GELFTCPHandler(host, port)
         graylog_handler.emit = MagicMock()
         graylog_handler.addFilter(log.beamline_filter)
-        log._add_handler(logger, graylog_handler)
-        return graylog_handler
+        return log._add_handler(logger, graylog_handler, log_queue)
 
     clear_all_loggers_and_handlers()
     with patch("dodal.log.set_up_graylog_handler", mock_set_up_graylog_handler):
@@ -180,8 +278,7 @@ def test_various_messages_to_graylog_get_beamline_filter(
         )
         integrate_bluesky_and_ophyd_logging(LOGGER)
 
-    mock_gelf_tcp_handler: GELFTCPHandler = handlers["graylog_handler"]
-    assert mock_gelf_tcp_handler is not None
+    mock_gelf_tcp_handler = cast(GELFTCPHandler, handlers["graylog_handler"])
     assert mock_gelf_tcp_handler.host == "localhost"
     assert mock_gelf_tcp_handler.port == 5555
 
@@ -246,6 +343,10 @@ async def test_ophyd_async_logger_integrated(caplog, dodal_logger_for_tests):
 async def test_ophyd_async_logger_configured(dodal_logger_for_tests):
     integrate_bluesky_and_ophyd_logging(dodal_logger_for_tests)
     do_default_logging_setup(True)
+    assert any(
+        isinstance(handler, NonBlockingHandler)
+        for handler in dodal_logger_for_tests.handlers
+    )
     stream_handler: logging.StreamHandler = dodal_logger_for_tests.handlers[0]
     stream_handler.level = logging.DEBUG
     stream_handler.stream.write = MagicMock()
@@ -264,6 +365,171 @@ async def test_ophyd_async_logger_configured(dodal_logger_for_tests):
     assert f"[{test_device_name}]" in stream_handler.stream.write.call_args.args[0]
 
 
+class _BlockedHandler(logging.Handler):
+    """Handler that stalls until released, like graylog when the network is slow."""
+
+    def __init__(self):
+        super().__init__()
+        self.release_event = threading.Event()
+        self.messages: list[str] = []
+        self.formatted_on: set[str] = set()
+
+    def format(self, record: logging.LogRecord) -> str:
+        self.formatted_on.add(threading.current_thread().name)
+        return super().format(record)
+
+    def emit(self, record: logging.LogRecord):
+        self.release_event.wait()
+        self.messages.append(self.format(record))
+
+
+@pytest.fixture
+def blocked_handler():
+    handler = _BlockedHandler()
+    yield handler
+    handler.release_event.set()
+
+
+def _log_to(handler: logging.Handler, messages: list[str]):
+    logger = logging.getLogger("dodal_test_non_blocking")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    try:
+        for message in messages:
+            logger.info(message)
+    finally:
+        logger.removeHandler(handler)
+
+
+def test_non_blocking_handler_does_not_wait_for_a_stalled_target(
+    blocked_handler: _BlockedHandler,
+):
+    handler = NonBlockingHandler(blocked_handler)
+    start = time.monotonic()
+    _log_to(handler, [f"message {i}" for i in range(1000)])
+    # Waiting for the target would not return until it is released
+    assert time.monotonic() - start < 2
+    assert blocked_handler.messages == []
+
+    blocked_handler.release_event.set()
+    handler.close()
+    assert len(blocked_handler.messages) == 1000
+    assert threading.current_thread().name not in blocked_handler.formatted_on
+
+
+def test_non_blocking_handler_logs_arguments_as_they_were_when_logged(
+    blocked_handler: _BlockedHandler,
+):
+    blocked_handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    handler = NonBlockingHandler(blocked_handler)
+    positions = [1.0]
+    logger = logging.getLogger("dodal_test_non_blocking")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    try:
+        logger.info("positions %s", positions)
+        positions.append(2.0)
+    finally:
+        logger.removeHandler(handler)
+
+    blocked_handler.release_event.set()
+    handler.close()
+    assert blocked_handler.messages == ["INFO positions [1.0]"]
+    assert threading.current_thread().name not in blocked_handler.formatted_on
+
+
+@pytest.mark.parametrize(
+    "policy, expected_messages, expected_blocked",
+    [
+        # The first message is taken off the queue by the listener, then blocks
+        (QueueFullPolicy.DROP_OLDEST, ["0", "3", "4"], 0),
+        (QueueFullPolicy.DROP_NEWEST, ["0", "1", "2"], 0),
+        (QueueFullPolicy.BLOCK, ["0", "1", "2"], 2),
+    ],
+)
+def test_non_blocking_handler_applies_policy_when_queue_full(
+    blocked_handler: _BlockedHandler,
+    policy: QueueFullPolicy,
+    expected_messages: list[str],
+    expected_blocked: int,
+):
+    handler = NonBlockingHandler(
+        blocked_handler, LogQueueConfig(size=2, policy=policy, block_timeout_s=0.01)
+    )
+    _log_to(handler, ["0"])
+    while handler.queue_depth:
+        time.sleep(0.001)
+    _log_to(handler, ["1", "2", "3", "4"])
+
+    blocked_handler.release_event.set()
+    handler.close()
+    assert blocked_handler.messages == expected_messages
+    assert handler.metrics.dropped == 2
+    assert handler.metrics.blocked == expected_blocked
+    assert handler.metrics.high_water_mark == 2
+
+
+def test_non_blocking_handler_does_not_queue_records_below_target_level():
+    target = MagicMock(spec=logging.Handler)
+    target.level = logging.INFO
+    handler = NonBlockingHandler(target)
+    logger = logging.getLogger("dodal_test_non_blocking")
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    logger.debug("not sent")
+    logger.info("sent")
+    logger.removeHandler(handler)
+    handler.close()
+    assert handler.metrics.enqueued == 1
+    target.handle.assert_called_once()
+
+
+def _receive_gelf_messages(server: socket.socket, messages: list[dict], expected: int):
+    connection, _ = server.accept()
+    with connection:
+        received = b""
+        while len(messages) < expected and (data := connection.recv(4096)):
+            received += data
+            *complete, received = received.split(b"\0")
+            messages.extend(json.loads(message) for message in complete)
+
+
+def test_graylog_messages_sent_to_tcp_sink_from_background_thread():
+    messages: list[dict] = []
+    with socket.create_server(("localhost", 0)) as server:
+        receiver = threading.Thread(
+            target=_receive_gelf_messages, args=(server, messages, 3), daemon=True
+        )
+        receiver.start()
+        logger = logging.getLogger("dodal_test_graylog_sink")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        set_up_graylog_handler(
+            logger, "localhost", server.getsockname()[1], LogQueueConfig()
+        )
+        for i in range(3):
+            logger.info(f"message {i}")
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+        receiver.join(timeout=0.5)
+
+    assert len(messages) == 3
+    for i, message in enumerate(messages):
+        assert message["short_message"].endswith(f"] message {i}")
+
+
+def _added_handlers(mock_logger: MagicMock) -> list[logging.Handler]:
+    return [call.args[0] for call in mock_logger.addHandler.call_args_list]
+
+
+def _close_added_handlers(mock_logger: MagicMock):
+    for handler in _added_handlers(mock_logger):
+        handler.close()
+
+
 def _close_all_handlers(handler_config: DodalLogHandlers):
     for handler in handler_config.values():
         cast(logging.Handler, handler).close()
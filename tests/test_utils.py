@@ -1,5 +1,8 @@
+import importlib
 import os
+import sys
 from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from shutil import copytree
 from typing import Any, cast
 from unittest.mock import ANY, MagicMock, Mock, patch
@@ -22,6 +25,7 @@ from dodal.utils import (
     get_hostname,
     get_run_number,
     is_v2_device_type,
+    lazy_import,
     make_all_devices,
     make_device,
 )
@@ -493,3 +497,96 @@ def test_get_beamline_name_raises_error_if_environment_variable_not_set_and_no_d
     monkeypatch.delenv("BEAMLINE", raising=False)
     with pytest.raises(ValueError):
         get_beamline_name()
+
+
+def test_lazy_import_only_executes_module_when_attribute_used(tmp_path, monkeypatch):
+    (tmp_path / "lazy_test_module.py").write_text("import sys\nsys.executed = True\n")
+    monkeypatch.syspath_prepend(tmp_path)
+    monkeypatch.setattr(sys, "executed", False, raising=False)
+    monkeypatch.delitem(sys.modules, "lazy_test_module", raising=False)
+
+    module = lazy_import("lazy_test_module")
+    assert "lazy_test_module" not in sys.modules
+    assert not sys.executed  # type: ignore
+
+    assert module.sys is sys
+    assert sys.executed  # type: ignore
+    assert sys.modules["lazy_test_module"].sys is sys
+
+
+def test_lazy_import_returns_already_imported_module():
+    assert lazy_import("os") is os
+
+
+def test_lazy_import_of_submodule(tmp_path, monkeypatch):
+    package = tmp_path / "lazy_test_package"
+    package.mkdir()
+    (package / "__init__.py").touch()
+    (package / "sub.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(tmp_path)
+    for name in ("lazy_test_package", "lazy_test_package.sub"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+    sub = lazy_import("lazy_test_package.sub")
+    assert "lazy_test_package" not in sys.modules
+    assert sub.VALUE == 1
+    assert sys.modules["lazy_test_package"].sub.VALUE == 1
+
+
+def test_lazy_import_executes_module_once_when_used_from_many_threads(
+    tmp_path, monkeypatch
+):
+    (tmp_path / "lazy_slow_module.py").write_text(
+        "import sys, time\n"
+        "sys.executions = getattr(sys, 'executions', 0) + 1\n"
+        "time.sleep(0.05)\n"
+        "VALUE = 1\n"
+    )
+    monkeypatch.syspath_prepend(tmp_path)
+    monkeypatch.setattr(sys, "executions", 0, raising=False)
+    monkeypatch.delitem(sys.modules, "lazy_slow_module", raising=False)
+    module = lazy_import("lazy_slow_module")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(executor.map(lambda _: module.VALUE, range(8)))
+
+    assert values == [1] * 8
+    assert sys.executions == 1  # type: ignore
+
+
+def test_patching_a_lazy_import_patches_the_module(tmp_path, monkeypatch):
+    (tmp_path / "lazy_patched_module.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(tmp_path)
+    monkeypatch.delitem(sys.modules, "lazy_patched_module", raising=False)
+    module = lazy_import("lazy_patched_module")
+    other_importers_module = lazy_import("lazy_patched_module")
+
+    with patch.object(module, "VALUE", 2):
+        assert other_importers_module.VALUE == 2
+        assert sys.modules["lazy_patched_module"].VALUE == 2
+    assert other_importers_module.VALUE == 1
+
+
+def test_lazy_import_only_imports_module_on_first_use(tmp_path, monkeypatch):
+    (tmp_path / "lazy_cached_module.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(tmp_path)
+    monkeypatch.delitem(sys.modules, "lazy_cached_module", raising=False)
+    module = lazy_import("lazy_cached_module")
+
+    with patch("importlib.import_module", wraps=importlib.import_module) as imports:
+        assert module.VALUE == 1
+        assert module.VALUE == 1
+        module.VALUE = 2
+    imports.assert_called_once_with("lazy_cached_module")
+    assert sys.modules["lazy_cached_module"].VALUE == 2
+
+
+def test_lazy_import_raises_for_missing_module():
+    with pytest.raises(ModuleNotFoundError):
+        lazy_import("dodal_module_that_does_not_exist")
+
+
+def test_lazy_import_raises_for_missing_submodule_when_used():
+    module = lazy_import("dodal.module_that_does_not_exist")
+    with pytest.raises(ModuleNotFoundError):
+        module.VALUE  # noqa: B018